@@ -0,0 +1,139 @@
+import argparse
+import cProfile
+import json
+import os
+import subprocess
+import sys
+from typing import Any, Dict, List, Sequence, Tuple
+
+from .constants import (
+    BENCHMARK_REPEAT,
+    END_TO_END_BENCHMARKS,
+    END_TO_END_PAGES,
+    END_TO_END_THREAD_COUNTS,
+    HASH_SEED,
+    MICRO_BENCHMARKS,
+    MONGODB_URI_VARIABLE,
+    REGRESSION_TOLERANCE,
+)
+from .suite import compare, get_environment, run_benchmark
+
+
+def parse_arguments(argv: Sequence[str]) -> argparse.Namespace:
+    """Parses the command line of the suite
+
+    Args:
+        argv (Sequence[str]): The arguments.
+
+    Returns:
+        argparse.Namespace: The options
+    """
+    parser = argparse.ArgumentParser(
+        prog="python -m benchmarks",
+        description="Runs the benchmarks against mongomock and a local fixture site and prints the results as JSON.",
+    )
+    parser.add_argument(
+        "benchmarks",
+        nargs="*",
+        help='"micro", "end_to_end" or the name of any benchmark module. Defaults to the micro and end-to-end suites.',
+    )
+    parser.add_argument(
+        "--threads",
+        type=int,
+        nargs="+",
+        default=list(END_TO_END_THREAD_COUNTS),
+        help="Thread counts of the end-to-end benchmarks.",
+    )
+    parser.add_argument(
+        "--pages", type=int, default=END_TO_END_PAGES, help="Pages on the site of the end-to-end benchmarks."
+    )
+    parser.add_argument(
+        "--repeat", type=int, default=BENCHMARK_REPEAT, help="Runs of every benchmark, the median is kept."
+    )
+    parser.add_argument("--mongodb-uri", help="Runs against a local mongod instead of mongomock.")
+    parser.add_argument("--output", help="Writes the results to this file instead of printing them.")
+    parser.add_argument("--baseline", help="Results of an earlier run, exits with 1 if a metric regressed.")
+    parser.add_argument(
+        "--tolerance",
+        type=float,
+        default=REGRESSION_TOLERANCE,
+        help="Relative change of a metric against the baseline that is put down to noise.",
+    )
+    parser.add_argument("--profile", help="Writes a cProfile of the benchmarks to this file, e.g. for tuna.")
+    return parser.parse_args(argv)
+
+
+def get_plan(names: List[str], number_of_pages: int, thread_counts: List[int]) -> List[Tuple[str, Tuple[Any, ...]]]:
+    """Gets the benchmarks to run and their arguments
+
+    Args:
+        names (List[str]): The suites and benchmark modules asked for, empty for the whole suite.
+        number_of_pages (int): Pages on the site of the end-to-end benchmarks.
+        thread_counts (List[int]): Thread counts of the end-to-end benchmarks.
+
+    Returns:
+        List[Tuple[str, Tuple[Any, ...]]]: The benchmark modules and the arguments of their run functions
+    """
+    plan: List[Tuple[str, Tuple[Any, ...]]] = []
+    for name in names or ["micro", "end_to_end"]:
+        if name == "micro":
+            plan.extend(MICRO_BENCHMARKS.items())
+        elif name in END_TO_END_BENCHMARKS:
+            plan.append((name, (number_of_pages, thread_counts)))
+        else:
+            # !Benchmarks outside the suite run with their own defaults
+            plan.append((name, MICRO_BENCHMARKS.get(name, ())))
+    return plan
+
+
+def main(argv: Sequence[str]) -> int:
+    """Runs the benchmark suite
+
+    Args:
+        argv (Sequence[str]): The command line arguments.
+
+    Returns:
+        int: The exit code, 1 if a metric regressed against the baseline
+    """
+    # !Hash randomization changes the order of sets and so the work done, it can only be fixed for a new interpreter
+    if os.environ.get("PYTHONHASHSEED") != HASH_SEED:
+        command = [sys.executable, "-m", __package__, *argv]
+        return subprocess.run(command, env={**os.environ, "PYTHONHASHSEED": HASH_SEED}, check=False).returncode
+
+    arguments = parse_arguments(argv)
+    if arguments.mongodb_uri:
+        # !Passed on through the environment, so benchmarks run in their own processes use it too
+        os.environ[MONGODB_URI_VARIABLE] = arguments.mongodb_uri
+
+    environment = get_environment(arguments.repeat)
+    profile = cProfile.Profile() if arguments.profile else None
+    benchmarks: Dict[str, Dict[str, Any]] = {}
+    for name, benchmark_arguments in get_plan(arguments.benchmarks, arguments.pages, arguments.threads):
+        print(f"Running {name}", file=sys.stderr)
+        benchmarks[name] = run_benchmark(name, benchmark_arguments, arguments.repeat, profile)
+
+    results = json.dumps({"environment": environment, "benchmarks": benchmarks}, indent=2)
+    if arguments.output:
+        os.makedirs(os.path.dirname(arguments.output) or ".", exist_ok=True)
+        with open(arguments.output, "w", encoding="utf8") as file:
+            file.write(results + "\n")
+    else:
+        print(results)
+
+    if profile is not None:
+        os.makedirs(os.path.dirname(arguments.profile) or ".", exist_ok=True)
+        profile.dump_stats(arguments.profile)
+
+    if not arguments.baseline:
+        return 0
+
+    with open(arguments.baseline, "r", encoding="utf8") as file:
+        baseline = json.load(file)
+    regressions = compare(benchmarks, baseline["benchmarks"], arguments.tolerance)
+    for regression in regressions:
+        print(f"Regression {regression}", file=sys.stderr)
+    return 1 if regressions else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
@@ -0,0 +1,86 @@
+import json
+import random
+import sys
+from time import perf_counter
+from typing import Dict, List, Tuple
+
+from src.general.canonicalize_url import canonicalize_absolute_url
+from src.parser import Parser
+
+from .parse_modes import WORDS
+
+# !Ways the same page is linked to across a site
+SPELLINGS = [
+    "{path}",
+    "./{path}",
+    "/{path}",
+    "{path}#section",
+    "{path}?utm_source=feed&utm_medium=rss",
+    "https://Example.COM/{path}",
+    "https://example.com:443/{path}",
+    "//example.com/{path}",
+    "https://example.com/a/../{path}",
+]
+
+
+def make_links(number_of_pages: int, number_of_links: int, seed: int = 0) -> List[Tuple[str, str]]:
+    """Generates links found on the pages of a site, each page being linked to under many spellings
+
+    Args:
+        number_of_pages (int): Distinct pages linked to.
+        number_of_links (int): The number of links.
+        seed (int, optional): The random seed. Defaults to 0.
+
+    Returns:
+        List[Tuple[str, str]]: The links and the url of the page they were found on
+    """
+    generator = random.Random(seed)
+    paths = [f"{generator.choice(WORDS)}/{generator.choice(WORDS)}-{page}" for page in range(number_of_pages)]
+    links = []
+    for _ in range(number_of_links):
+        spelling = generator.choice(SPELLINGS).format(path=generator.choice(paths))
+        links.append((spelling, "https://example.com/"))
+    return links
+
+
+def links_per_second(links: List[Tuple[str, str]]) -> Tuple[float, int]:
+    """Canonicalizes the links one at a time, as the parser does
+
+    Args:
+        links (List[Tuple[str, str]]): The links and the url of their page.
+
+    Returns:
+        Tuple[float, int]: Links per second and the number of distinct canonical urls
+    """
+    start = perf_counter()
+    urls = {url for link, page in links for url in Parser.parse_links([link], page)}
+    return len(links) / (perf_counter() - start), len(urls)
+
+
+def run(number_of_pages: int = 2_000, number_of_links: int = 200_000) -> Dict[str, float]:
+    """Benchmarks link canonicalization with a cold and a warm cache
+
+    Args:
+        number_of_pages (int, optional): Distinct pages linked to. Defaults to 2_000.
+        number_of_links (int, optional): The number of links. Defaults to 200_000.
+
+    Returns:
+        Dict[str, float]: Links per second, distinct links and distinct canonical urls, which are the urls queued
+    """
+    links = make_links(number_of_pages, number_of_links)
+
+    canonicalize_absolute_url.cache_clear()
+    cold, canonical_urls = links_per_second(links)
+    warm, _ = links_per_second(links)
+
+    return {
+        "cold_links_per_second": cold,
+        "warm_links_per_second": warm,
+        "distinct_links": len(set(links)),
+        "distinct_canonical_urls": canonical_urls,
+        "cache_hit_rate": canonicalize_absolute_url.cache_info().hits / (2 * number_of_links),
+    }
+
+
+if __name__ == "__main__":
+    print(json.dumps(run(*(int(argument) for argument in sys.argv[1:])), indent=2))
@@ -0,0 +1,48 @@
+# !Names a local mongod to run the benchmarks against instead of mongomock, e.g. mongodb://127.0.0.1:27017
+MONGODB_URI_VARIABLE = "BENCHMARK_MONGODB_URI"
+
+# !Seeds fixed so every run generates the same sites, documents and set orders
+RANDOM_SEED = 0
+HASH_SEED = "0"
+
+# !Micro-benchmarks of the suite and the arguments they run with, sized so the whole suite takes minutes
+MICRO_BENCHMARKS = {
+    "robots_matching": ([100, 1000],),
+    "canonicalize": (500, 20_000),
+    "extraction": (50,),
+    "tokenizer": (5, 20_000),
+    "model_reads": (1000,),
+    "model_calls": (300,),
+}
+
+# !End-to-end benchmarks, run with the number of pages and the thread counts. One thread of the crawler and
+# !of the parser hands out the work, so they need two threads to make progress
+END_TO_END_BENCHMARKS = ("end_to_end",)
+END_TO_END_PAGES = 200
+END_TO_END_THREAD_COUNTS = (2, 5, 10)
+END_TO_END_MIN_THREADS = 2
+
+# !Every metric is the median of this many runs
+BENCHMARK_REPEAT = 3
+
+# !Relative change of a metric past which it counts as a regression against the baseline
+REGRESSION_TOLERANCE = 0.1
+
+# !Metrics are compared by the direction their name implies, the others only describe the run
+HIGHER_IS_BETTER_SUFFIXES = ("_per_second", "_hit_rate", "_reuse_ratio")
+LOWER_IS_BETTER_SUFFIXES = (
+    "_seconds",
+    "_saved_to_parsed",
+    "_ms",
+    "_ns",
+    "_microseconds",
+    "_per_document",
+    "_kib",
+    "_mib",
+    "_bytes",
+    "_per_page",
+    "_per_url",
+    "_per_posting",
+    "_share_of_page",
+    "false_positive_rate",
+)
@@ -0,0 +1,94 @@
+import json
+import os
+import sys
+import tempfile
+from time import perf_counter
+from typing import Dict
+
+from src.storage import ContentStore, FileStore, SegmentStore
+
+from .fixtures import make_page
+
+
+def get_directory_size(directory: str) -> int:
+    """Gets the bytes used by the files in a directory
+
+    Args:
+        directory (str): The directory.
+
+    Returns:
+        int: The total size of the files
+    """
+    return sum(
+        os.path.getsize(os.path.join(root, file_name))
+        for root, _, file_names in os.walk(directory)
+        for file_name in file_names
+    )
+
+
+def measure(store: ContentStore, number_of_pages: int) -> Dict[str, float]:
+    """Puts, lists, reads and deletes pages with a store
+
+    Args:
+        store (ContentStore): The store, in an empty directory.
+        number_of_pages (int): The number of pages.
+
+    Returns:
+        Dict[str, float]: Operations per second and bytes on disk per page
+    """
+    pages = [make_page(page, number_of_pages, 100) * 5 for page in range(number_of_pages)]
+
+    start = perf_counter()
+    keys = [store.put(page) for page in pages]
+    put_seconds = perf_counter() - start
+    bytes_per_page = get_directory_size(store.directory) / number_of_pages  # type: ignore[attr-defined]
+
+    start = perf_counter()
+    listed = sum(1 for _ in store.keys())
+    list_seconds = perf_counter() - start
+
+    start = perf_counter()
+    for key in keys:
+        store.get(key)
+    get_seconds = perf_counter() - start
+
+    start = perf_counter()
+    for key in keys:
+        store.delete(key)
+    delete_seconds = perf_counter() - start
+
+    return {
+        "puts_per_second": number_of_pages / put_seconds,
+        "keys_listed_per_second": listed / list_seconds,
+        "gets_per_second": number_of_pages / get_seconds,
+        "deletes_per_second": number_of_pages / delete_seconds,
+        "bytes_per_page": bytes_per_page,
+        "raw_bytes_per_page": sum(len(page.encode("utf8")) for page in pages) / number_of_pages,
+    }
+
+
+def run(number_of_pages: int = 5000) -> Dict[str, float]:
+    """Compares flat uncompressed files with the sharded compressed files and the segment files
+
+    Args:
+        number_of_pages (int, optional): The number of pages. Defaults to 5000.
+
+    Returns:
+        Dict[str, float]: The measurements of every store
+    """
+    stores = {
+        "flat_files": lambda directory: FileStore(directory, "none", shard_depth=0),
+        "sharded_zlib_files": lambda directory: FileStore(directory, "zlib"),
+        "zlib_segments": lambda directory: SegmentStore(directory, "zlib"),
+    }
+
+    results: Dict[str, float] = {}
+    for name, create_store in stores.items():
+        with tempfile.TemporaryDirectory() as directory:
+            for key, value in measure(create_store(directory), number_of_pages).items():
+                results[f"{name}_{key}"] = value
+    return results
+
+
+if __name__ == "__main__":
+    print(json.dumps(run(*(int(argument) for argument in sys.argv[1:2])), indent=2))
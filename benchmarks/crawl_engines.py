@@ -0,0 +1,60 @@
+import json
+import tempfile
+from functools import partial
+from time import perf_counter, sleep
+from typing import Callable, Dict
+
+from src.crawler import AsyncCrawler, Crawler
+from src.crawler.scheduler import DomainScheduler
+from src.models import Queue
+
+from .fixtures import make_database, serve_site
+
+
+def crawl_pages_per_second(engine: Callable[..., Crawler], concurrency: int, number_of_pages: int) -> float:
+    """Crawls every page of the fixture site once and measures the throughput
+
+    Args:
+        engine (Callable[..., Crawler]): The crawler class to benchmark.
+        concurrency (int): The number of threads or fetches in flight.
+        number_of_pages (int): The number of pages to crawl.
+
+    Returns:
+        float: Pages crawled per second
+    """
+    db = make_database()
+    queue = Queue(db)
+
+    with serve_site(number_of_pages) as base_url, tempfile.TemporaryDirectory() as to_parse_directory:
+        for page in range(number_of_pages):
+            queue.add(f"{base_url}/page/{page}")
+        queue.create_indexes()
+
+        start = perf_counter()
+        # !Every fixture page is on the same host, so politeness is relaxed to measure the engines themselves
+        engine(concurrency, to_parse_directory, db, scheduler=DomainScheduler(default_rate=10_000, default_burst=100))
+        while db["crawled"].count_documents({}) < number_of_pages:
+            sleep(0.05)
+
+        return number_of_pages / (perf_counter() - start)
+
+
+def run(number_of_pages: int = 500) -> Dict[str, float]:
+    """Benchmarks the threaded crawler against the asyncio crawler
+
+    Args:
+        number_of_pages (int, optional): The number of pages to crawl per engine. Defaults to 500.
+
+    Returns:
+        Dict[str, float]: Pages crawled per second for each engine
+    """
+    return {
+        "threaded_pages_per_second": crawl_pages_per_second(Crawler, 10, number_of_pages),
+        "async_pages_per_second": crawl_pages_per_second(
+            partial(AsyncCrawler, max_concurrency_per_host=100), 100, number_of_pages
+        ),
+    }
+
+
+if __name__ == "__main__":
+    print(json.dumps(run(), indent=2))
@@ -0,0 +1,49 @@
+import json
+import multiprocessing
+import sys
+from typing import Dict, Sequence
+
+from src.crawler import Crawler
+
+from .constants import END_TO_END_MIN_THREADS, END_TO_END_PAGES, END_TO_END_THREAD_COUNTS
+from .crawl_engines import crawl_pages_per_second
+from .pipeline import crawl_and_parse
+
+
+def run(
+    number_of_pages: int = END_TO_END_PAGES, thread_counts: Sequence[int] = END_TO_END_THREAD_COUNTS
+) -> Dict[str, float]:
+    """Measures the pages per second of the crawler and of the whole pipeline against the fixture site
+
+    Args:
+        number_of_pages (int, optional): The number of pages on the site. Defaults to END_TO_END_PAGES.
+        thread_counts (Sequence[int], optional): The numbers of threads to measure. Defaults to
+            END_TO_END_THREAD_COUNTS.
+
+    Returns:
+        Dict[str, float]: Pages per second at every number of threads
+
+    Raises:
+        ValueError: If a number of threads is too low for the crawler and the parser to make progress
+    """
+    if min(thread_counts) < END_TO_END_MIN_THREADS:
+        raise ValueError(f"The crawler and the parser need at least {END_TO_END_MIN_THREADS} threads")
+
+    results: Dict[str, float] = {}
+
+    # !The crawler and parser threads never stop, so every measurement is made in a fresh process
+    with multiprocessing.get_context("spawn").Pool(1, maxtasksperchild=1) as pool:
+        for number_of_threads in thread_counts:
+            results[f"{number_of_threads}_threads_crawl_pages_per_second"] = pool.apply(
+                crawl_pages_per_second, (Crawler, number_of_threads, number_of_pages)
+            )
+            results[f"{number_of_threads}_threads_pipeline_pages_per_second"] = pool.apply(
+                crawl_and_parse, (number_of_pages, True, number_of_threads)
+            )["pages_per_second"]
+
+    return results
+
+
+if __name__ == "__main__":
+    arguments = [int(argument) for argument in sys.argv[1:]]
+    print(json.dumps(run(*arguments[:1], thread_counts=arguments[1:] or END_TO_END_THREAD_COUNTS), indent=2))
@@ -0,0 +1,73 @@
+import json
+import multiprocessing
+import resource
+import sys
+import tracemalloc
+from time import perf_counter
+from typing import Dict
+
+from src.parser.extract_page import BACKENDS, extract_page
+
+from .parse_modes import make_corpus
+
+
+def measure_backend(backend: str, number_of_pages: int) -> Dict[str, float]:
+    """Extracts the corpus with one backend, run in a fresh process so the peak memory is its own
+
+    Args:
+        backend (str): The extraction backend.
+        number_of_pages (int): Pages in the corpus.
+
+    Returns:
+        Dict[str, float]: Pages per second, the peak Python memory of one page and the peak resident memory
+    """
+    corpus = make_corpus(number_of_pages)
+    extract_page(corpus[0], backend)
+
+    start = perf_counter()
+    for html in corpus:
+        extract_page(html, backend)
+    seconds = perf_counter() - start
+
+    # !tracemalloc slows parsing down, so memory is measured on its own pass over a few pages
+    tracemalloc.start()
+    for html in corpus[:10]:
+        extract_page(html, backend)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    return {
+        "pages_per_second": number_of_pages / seconds,
+        "peak_python_kib": peak / 1024,
+        # !Includes memory allocated by C extensions, which tracemalloc does not see
+        "peak_resident_kib": resource.getrusage(resource.RUSAGE_SELF).ru_maxrss,
+    }
+
+
+def run(number_of_pages: int = 200) -> Dict[str, float]:
+    """Benchmarks every installed extraction backend on the same corpus
+
+    Args:
+        number_of_pages (int, optional): Pages in the corpus. Defaults to 200.
+
+    Returns:
+        Dict[str, float]: Pages per second and peak memory of every backend
+    """
+    results: Dict[str, float] = {}
+    context = multiprocessing.get_context("spawn")
+
+    for backend in BACKENDS:
+        try:
+            extract_page("<html></html>", backend)
+        except ValueError:
+            continue
+
+        with context.Pool(1) as pool:
+            for key, value in pool.apply(measure_backend, (backend, number_of_pages)).items():
+                results[f"{backend}_{key}"] = value
+
+    return results
+
+
+if __name__ == "__main__":
+    print(json.dumps(run(*(int(argument) for argument in sys.argv[1:2])), indent=2))
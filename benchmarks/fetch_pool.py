@@ -0,0 +1,76 @@
+import json
+import sys
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import ExitStack
+from time import perf_counter
+from typing import Callable, Dict, List
+
+import requests
+
+from src.crawler import Fetcher
+
+from .fixtures import serve_site
+
+
+def fetch_all(get: Callable[[str], requests.Response], urls: List[str], number_of_threads: int) -> float:
+    """Fetches the urls from a pool of threads, as the crawler threads do
+
+    Args:
+        get (Callable[[str], requests.Response]): Fetches a url.
+        urls (List[str]): The urls.
+        number_of_threads (int): The number of threads.
+
+    Returns:
+        float: Pages fetched per second
+    """
+    start = perf_counter()
+    with ThreadPoolExecutor(number_of_threads) as executor:
+        for response in executor.map(get, urls):
+            response.raise_for_status()
+    return len(urls) / (perf_counter() - start)
+
+
+def legacy_session_stats(urls: List[str], number_of_threads: int) -> Dict[str, float]:
+    """Fetches the urls with the single default session the crawler used to share between its threads
+
+    Args:
+        urls (List[str]): The urls.
+        number_of_threads (int): The number of threads.
+
+    Returns:
+        Dict[str, float]: Pages per second and the share of requests that reused a connection
+    """
+    session = requests.Session()
+    pages_per_second = fetch_all(session.get, urls, number_of_threads)
+
+    pools = session.get_adapter("http://").poolmanager.pools
+    connections = sum(pools[key].num_connections for key in pools.keys())
+    return {"pages_per_second": pages_per_second, "reuse_ratio": 1 - connections / len(urls)}
+
+
+def run(number_of_hosts: int = 4, number_of_pages: int = 2_000, number_of_threads: int = 20) -> Dict[str, float]:
+    """Benchmarks the session strategies of the fetcher against the old shared default session
+
+    Args:
+        number_of_hosts (int, optional): Fixture sites, each on its own port. Defaults to 4.
+        number_of_pages (int, optional): Pages fetched per strategy. Defaults to 2_000.
+        number_of_threads (int, optional): Threads fetching at once. Defaults to 20.
+
+    Returns:
+        Dict[str, float]: Pages per second and connection reuse of every strategy
+    """
+    with ExitStack() as stack:
+        sites = [stack.enter_context(serve_site()) for _ in range(number_of_hosts)]
+        urls = [f"{sites[page % number_of_hosts]}/page/{page % 1000}" for page in range(number_of_pages)]
+
+        results = {f"legacy_{key}": value for key, value in legacy_session_stats(urls, number_of_threads).items()}
+        for strategy in ("shared", "per_thread", "per_host"):
+            fetcher = Fetcher(number_of_threads, strategy)
+            results[f"{strategy}_pages_per_second"] = fetch_all(fetcher.get, urls, number_of_threads)
+            results[f"{strategy}_reuse_ratio"] = fetcher.get_stats()["reuse_ratio"]
+            fetcher.close()
+        return results
+
+
+if __name__ == "__main__":
+    print(json.dumps(run(*(int(argument) for argument in sys.argv[1:])), indent=2))
@@ -0,0 +1,231 @@
+import atexit
+import gzip
+import hashlib
+import os
+import threading
+import uuid
+from collections import Counter
+from contextlib import contextmanager
+from functools import lru_cache
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, BinaryIO, Dict, Iterator, Tuple
+
+import mongomock
+import pymongo
+import pymongo.database as _database
+
+from .constants import MONGODB_URI_VARIABLE
+
+
+def make_database() -> _database.Database[Dict[str, Any]]:
+    """Creates an empty database that behaves like the MongoDB database used by the crawler
+
+    The database is in memory, unless BENCHMARK_MONGODB_URI names a local mongod to measure real round trips. Every
+    database made on a mongod has a name of its own and is dropped when the benchmark exits.
+
+    Returns:
+        _database.Database[Dict[str, Any]]: The database class
+    """
+    uri = os.environ.get(MONGODB_URI_VARIABLE)
+    if not uri:
+        return mongomock.MongoClient()["benchmark"]
+
+    client: pymongo.MongoClient[Dict[str, Any]] = pymongo.MongoClient(uri)
+    db = client[f"benchmark_{uuid.uuid4().hex[:12]}"]
+    atexit.register(client.drop_database, db.name)
+    return db
+
+
+def make_page(page: int, number_of_pages: int, links_per_page: int) -> str:
+    """Generates a page of the fixture site
+
+    Args:
+        page (int): The number of the page.
+        number_of_pages (int): The number of pages on the site.
+        links_per_page (int): The number of links on each page.
+
+    Returns:
+        str: The HTML of the page
+    """
+    links = "".join(
+        f'<a href="/page/{(page * 7 + i * 13) % number_of_pages}">Page {i}</a>' for i in range(links_per_page)
+    )
+    return (
+        f"<html><head><title>Page {page}</title></head>"
+        f"<body><h1>Page {page}</h1><p>The quick brown fox jumps over the lazy dog {page}.</p>{links}</body></html>"
+    )
+
+
+@lru_cache(maxsize=8)
+def make_large_page(kibibytes: int, charset: str = "utf-8") -> bytes:
+    """Generates a large page declaring its charset in a meta tag only, cached so serving it allocates nothing
+
+    Args:
+        kibibytes (int): The size of the page in KiB.
+        charset (str, optional): The charset the page is encoded in. Defaults to "utf-8".
+
+    Returns:
+        bytes: The encoded page
+    """
+    paragraph = "<p>Café crème for 5 €, naïve façade and résumé of the quick brown fox.</p>"
+    body = paragraph * (kibibytes * 1024 // len(paragraph) + 1)
+    return f'<html><head><meta charset="{charset}"><title>Large</title></head><body>{body}</body></html>'.encode(
+        charset
+    )
+
+
+def get_large_body(path: str) -> Tuple[str, bytes, bool]:
+    """Gets a large page of the size in KiB after the route, chunked without a length on /stream/, as a binary file
+    on /file/ and in windows-1252 declared only in a meta tag on /latin1/
+
+    Args:
+        path (str): The path of the request.
+
+    Returns:
+        Tuple[str, bytes, bool]: The content type, the body and whether it is sent chunked
+    """
+    route, _, size = path[1:].partition("/")
+    kibibytes = int(size) if size.isdigit() else 1
+    if route == "file":
+        return "application/octet-stream", make_large_page(kibibytes), False
+    if route == "latin1":
+        return "text/html", make_large_page(kibibytes, "windows-1252"), False
+    return "text/html; charset=utf-8", make_large_page(kibibytes), route == "stream"
+
+
+def write_chunked(file: BinaryIO, data: bytes, chunk_size: int = 64 * 1024) -> None:
+    """Writes a body with chunked transfer encoding
+
+    Args:
+        file (BinaryIO): The connection.
+        data (bytes): The body.
+        chunk_size (int, optional): Bytes per chunk. Defaults to 64 * 1024.
+    """
+    for start in range(0, len(data), chunk_size):
+        piece = data[start : start + chunk_size]
+        file.write(f"{len(piece):x}\r\n".encode("ascii") + piece + b"\r\n")
+    file.write(b"0\r\n\r\n")
+
+
+@lru_cache(maxsize=8)
+def compress_body(data: bytes) -> bytes:
+    """Gzips a body, cached so large bodies are compressed once
+
+    Args:
+        data (bytes): The body.
+
+    Returns:
+        bytes: The compressed body
+    """
+    return gzip.compress(data, compresslevel=6)
+
+
+@contextmanager
+def serve_site(
+    number_of_pages: int = 1000,
+    links_per_page: int = 20,
+    validators: bool = False,
+    sent: Counter[str] | None = None,
+) -> Iterator[str]:
+    """Serves a generated site graph with a robots.txt on a local port
+
+    Args:
+        number_of_pages (int, optional): The number of pages on the site. Defaults to 1000.
+        links_per_page (int, optional): The number of links on each page. Defaults to 20.
+        validators (bool, optional): Whether pages are sent with an ETag and answered with 304 Not Modified when it
+            is sent back. Defaults to False.
+        sent (Counter[str] | None, optional): Counts the responses by status code and the body bytes sent. Defaults
+            to None.
+
+    Yields:
+        str: The base url of the site
+    """
+
+    class Handler(BaseHTTPRequestHandler):
+        """Serves the fixture site with keep-alive connections, gzip compressing bodies for clients that accept it"""
+
+        protocol_version = "HTTP/1.1"
+
+        def do_GET(self) -> None:  # pylint: disable=invalid-name
+            """Serves a single page"""
+            if self.path == "/robots.txt":
+                self.send_body(200, "text/plain", "User-agent: *\nDisallow: /private/\n")
+            elif self.path.startswith("/page/") and self.path[6:].isdigit():
+                self.send_page(make_page(int(self.path[6:]), number_of_pages, links_per_page))
+            elif self.path.startswith(("/large/", "/stream/", "/file/", "/latin1/")):
+                self.send_large()
+            else:
+                self.send_body(404, "text/plain", "Not found")
+
+        def send_page(self, body: str) -> None:
+            """Sends a page, or 304 Not Modified if the client already has it"""
+            if not validators:
+                self.send_body(200, "text/html", body)
+                return
+
+            etag = f'"{hashlib.md5(body.encode("utf8")).hexdigest()}"'
+            if self.headers.get("If-None-Match") == etag:
+                self.send_body(304, "text/html", "", {"ETag": etag})
+            else:
+                self.send_body(200, "text/html", body, {"ETag": etag})
+
+        def send_large(self) -> None:
+            """Sends a large page"""
+            content_type, data, chunked = get_large_body(self.path)
+            self.send_data(200, content_type, data, chunked=chunked)
+
+        def send_body(
+            self, status_code: int, content_type: str, body: str, headers: Dict[str, str] | None = None
+        ) -> None:
+            """Sends a complete response"""
+            self.send_data(status_code, f"{content_type}; charset=utf-8", body.encode("utf8"), headers)
+
+        def send_data(
+            self,
+            status_code: int,
+            content_type: str,
+            data: bytes,
+            headers: Dict[str, str] | None = None,
+            chunked: bool = False,
+        ) -> None:
+            """Sends a response, chunked if the length is not to be sent up front"""
+            if data and "gzip" in self.headers.get("Accept-Encoding", ""):
+                data = compress_body(data)
+                headers = {**(headers or {}), "Content-Encoding": "gzip"}
+            if sent is not None:
+                sent[str(status_code)] += 1
+                sent["bytes"] += len(data)
+            self.send_response(status_code)
+            self.send_header("Content-Type", content_type)
+            for name, value in (headers or {}).items():
+                self.send_header(name, value)
+            if chunked:
+                self.send_header("Transfer-Encoding", "chunked")
+            elif status_code != 304:
+                self.send_header("Content-Length", str(len(data)))
+            self.end_headers()
+
+            if chunked:
+                write_chunked(self.wfile, data)
+            else:
+                self.wfile.write(data)
+
+        def handle(self) -> None:
+            """Serves requests until the client closes the connection"""
+            try:
+                super().handle()
+            except (BrokenPipeError, ConnectionResetError):
+                # !Clients that stop reading a body too large for them drop the connection
+                pass
+
+        def log_message(self, format: str, *args: Any) -> None:  # pylint: disable=redefined-builtin
+            """Keeps the benchmark output quiet"""
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    try:
+        yield f"http://127.0.0.1:{server.server_address[1]}"
+    finally:
+        server.shutdown()
+        server.server_close()
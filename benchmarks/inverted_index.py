@@ -0,0 +1,106 @@
+import json
+import os
+import random
+import sys
+import tempfile
+from time import perf_counter
+from typing import Dict, List
+
+from src.indexer import IndexWriter, InvertedIndex
+
+
+def make_documents(number_of_documents: int, terms_per_document: int = 300, seed: int = 0) -> List[Dict[str, int]]:
+    """Generates token counts with the long tail of natural language, a few terms in most documents
+
+    Args:
+        number_of_documents (int): The number of documents.
+        terms_per_document (int, optional): Term occurrences in every document. Defaults to 300.
+        seed (int, optional): The random seed. Defaults to 0.
+
+    Returns:
+        List[Dict[str, int]]: The token counts of every document
+    """
+    generator = random.Random(seed)
+    documents = []
+    for _ in range(number_of_documents):
+        tokens: Dict[str, int] = {}
+        for _ in range(terms_per_document):
+            term = f"term{int(generator.paretovariate(0.8))}"
+            tokens[term] = tokens.get(term, 0) + 1
+        documents.append(tokens)
+    return documents
+
+
+def build_index(directory: str, documents: List[Dict[str, int]], run_max_postings: int) -> Dict[str, float]:
+    """Builds an index in bounded-memory runs
+
+    Args:
+        directory (str): The index directory.
+        documents (List[Dict[str, int]]): The token counts of every document.
+        run_max_postings (int): Postings kept in memory before a run is written.
+
+    Returns:
+        Dict[str, float]: Build speed, number of runs and bytes of the index per posting
+    """
+    start = perf_counter()
+    writer = IndexWriter(directory, run_max_postings)
+    for page_id, tokens in enumerate(documents):
+        writer.add(float(page_id), tokens)
+    generation = writer.commit()
+    build_seconds = perf_counter() - start
+
+    generation_path = os.path.join(directory, generation)
+    index_bytes = sum(os.path.getsize(os.path.join(generation_path, name)) for name in os.listdir(generation_path))
+    return {
+        "documents_per_second": len(documents) / build_seconds,
+        "runs": len(writer.run_paths),
+        "index_bytes_per_posting": index_bytes / sum(len(tokens) for tokens in documents),
+    }
+
+
+def query_index(directory: str) -> Dict[str, float]:
+    """Looks terms up and decodes their postings, terms being drawn like the documents' terms
+
+    Args:
+        directory (str): The index directory.
+
+    Returns:
+        Dict[str, float]: Lookup time and postings decoded per second
+    """
+    index = InvertedIndex(directory)
+    terms = [f"term{int(random.Random(seed).paretovariate(0.8))}" for seed in range(1000)]
+
+    start = perf_counter()
+    for term in terms:
+        index.find(term)
+    find_seconds = (perf_counter() - start) / len(terms)
+
+    start = perf_counter()
+    decoded_postings = sum(len(index.postings(term)) for term in terms)
+    decode_seconds = perf_counter() - start
+    index.close()
+
+    return {"find_microseconds": find_seconds * 1e6, "postings_decoded_per_second": decoded_postings / decode_seconds}
+
+
+def run(number_of_documents: int = 20_000, run_max_postings: int = 200_000) -> Dict[str, float]:
+    """Builds an index in bounded-memory runs and queries it
+
+    Args:
+        number_of_documents (int, optional): The number of documents. Defaults to 20_000.
+        run_max_postings (int, optional): Postings kept in memory before a run is written. Defaults to 200_000.
+
+    Returns:
+        Dict[str, float]: Build and lookup speed, and the size of the index
+    """
+    documents = make_documents(number_of_documents)
+    with tempfile.TemporaryDirectory() as directory:
+        return {
+            "postings": float(sum(len(tokens) for tokens in documents)),
+            **build_index(directory, documents, run_max_postings),
+            **query_index(directory),
+        }
+
+
+if __name__ == "__main__":
+    print(json.dumps(run(*(int(argument) for argument in sys.argv[1:3])), indent=2))
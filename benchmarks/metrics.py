@@ -0,0 +1,105 @@
+import json
+import sys
+from time import perf_counter
+from types import SimpleNamespace
+from typing import Callable, Dict
+
+from src.crawler import Crawler
+from src.metrics import CRAWLER_PAGES, REGISTRY, CommandMetrics, Counter, Gauge, Histogram, Registry
+
+from .crawl_engines import crawl_pages_per_second
+
+
+def nanoseconds_per_call(function: Callable[[], object], number_of_calls: int) -> float:
+    """Measures the mean time of a call
+
+    Args:
+        function (Callable[[], object]): The call.
+        number_of_calls (int): The number of calls.
+
+    Returns:
+        float: Nanoseconds per call
+    """
+    start = perf_counter()
+    for _ in range(number_of_calls):
+        function()
+    return (perf_counter() - start) / number_of_calls * 1e9
+
+
+def primitives(number_of_calls: int) -> Dict[str, float]:
+    """Measures the instruments the hot paths call
+
+    Args:
+        number_of_calls (int): Calls per instrument.
+
+    Returns:
+        Dict[str, float]: Nanoseconds per call of every instrument
+    """
+    registry = Registry()
+    counter = registry.counter("pages_total", "Pages", ("outcome",))
+    gauge = Gauge()
+    histogram = Histogram()
+
+    def time_block() -> None:
+        with histogram.time():
+            pass
+
+    def track_block() -> None:
+        with gauge.track_inprogress():
+            pass
+
+    # !Events of a database round trip, with only the fields the listener reads
+    listener = CommandMetrics()
+    started = SimpleNamespace(
+        command={"find": "crawled"}, command_name="find", connection_id=("localhost", 27017), request_id=1
+    )
+    succeeded = SimpleNamespace(
+        command_name="find", connection_id=("localhost", 27017), request_id=1, duration_micros=250
+    )
+
+    def round_trip() -> None:
+        listener.started(started)  # type: ignore[arg-type]
+        listener.succeeded(succeeded)  # type: ignore[arg-type]
+
+    return {
+        "counter_inc_ns": nanoseconds_per_call(Counter().inc, number_of_calls),
+        "labelled_counter_inc_ns": nanoseconds_per_call(lambda: counter.labels("saved").inc(), number_of_calls),
+        "histogram_observe_ns": nanoseconds_per_call(lambda: histogram.observe(0.02), number_of_calls),
+        "histogram_time_ns": nanoseconds_per_call(time_block, number_of_calls),
+        "gauge_track_inprogress_ns": nanoseconds_per_call(track_block, number_of_calls),
+        "database_round_trip_ns": nanoseconds_per_call(round_trip, number_of_calls),
+    }
+
+
+def run(number_of_calls: int = 200_000, number_of_pages: int = 500) -> Dict[str, float]:
+    """Benchmarks the metric instruments, a crawl reporting to them and rendering the metrics for a scrape
+
+    Args:
+        number_of_calls (int, optional): Calls per instrument. Defaults to 200_000.
+        number_of_pages (int, optional): Pages crawled. Defaults to 500.
+
+    Returns:
+        Dict[str, float]: Nanoseconds per instrument call, crawl throughput and the share of a page spent on metrics
+    """
+    results = primitives(number_of_calls)
+
+    saved_before = CRAWLER_PAGES.labels("saved").get()
+    pages_per_second = crawl_pages_per_second(Crawler, 10, number_of_pages)
+
+    # !A crawled page is timed twice, counted once and tracked as in progress once
+    metrics_ns = (
+        2 * results["histogram_time_ns"] + results["labelled_counter_inc_ns"] + results["gauge_track_inprogress_ns"]
+    )
+    render_seconds = nanoseconds_per_call(REGISTRY.render, 100) / 1e9
+
+    return {
+        **results,
+        "pages_per_second": pages_per_second,
+        "pages_counted": CRAWLER_PAGES.labels("saved").get() - saved_before,
+        "metrics_share_of_page": metrics_ns / 1e9 * pages_per_second,
+        "render_microseconds": render_seconds * 1e6,
+    }
+
+
+if __name__ == "__main__":
+    print(json.dumps(run(*(int(argument) for argument in sys.argv[1:])), indent=2))
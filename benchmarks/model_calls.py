@@ -0,0 +1,64 @@
+import json
+import sys
+from time import perf_counter
+from typing import Any, Callable, Dict, List
+
+from src.models import Crawled, FailedCrawled, Queue
+
+from .fixtures import make_database
+from .model_reads import make_crawled_page
+
+
+def calls_per_second(call: Callable[[Any], object], arguments: List[Any]) -> float:
+    """Calls a model method once for every argument
+
+    Args:
+        call (Callable[[Any], object]): The model method.
+        arguments (List[Any]): The arguments.
+
+    Returns:
+        float: Calls per second
+    """
+    start = perf_counter()
+    for argument in arguments:
+        call(argument)
+    return len(arguments) / (perf_counter() - start)
+
+
+def run(number_of_items: int = 2000) -> Dict[str, float]:
+    """Measures the single document adds and gets the crawler and the parser make for every page
+
+    Args:
+        number_of_items (int, optional): Items added to and read from every collection. Defaults to 2000.
+
+    Returns:
+        Dict[str, float]: Calls per second of every model method, and links per second of the bulk queue add
+    """
+    db = make_database()
+    queue, crawled, failed_crawled = Queue(db), Crawled(db), FailedCrawled(db)
+    for model in (queue, crawled, failed_crawled):
+        model.create_indexes()
+
+    urls = [f"https://example.com/page/{number}" for number in range(number_of_items)]
+    pages = [make_crawled_page(number, number_of_tokens=50, number_of_links=20) for number in range(number_of_items)]
+    results = {
+        "queue_adds_per_second": calls_per_second(queue.add, urls),
+        # !Adding the same urls again is the upsert that finds them already queued
+        "queue_repeated_adds_per_second": calls_per_second(queue.add, urls),
+        "crawled_adds_per_second": calls_per_second(lambda page: crawled.add(**page), pages),
+        "failed_crawled_adds_per_second": calls_per_second(lambda url: failed_crawled.add(url, "Not found"), urls),
+        "queue_gets_per_second": calls_per_second(lambda url: queue.get_one({"url": url}), urls),
+        "queue_exists_per_second": calls_per_second(lambda url: queue.is_exist({"url": url}), urls),
+        "crawled_gets_per_second": calls_per_second(lambda url: crawled.get_one({"url": url}), urls),
+        "crawled_lean_gets_per_second": calls_per_second(lambda url: crawled.get_one({"url": url}, lean=True), urls),
+    }
+
+    bulk_urls = [f"https://example.com/bulk/{number}" for number in range(number_of_items)]
+    start = perf_counter()
+    queue.add_many(bulk_urls)
+    results["queue_add_many_links_per_second"] = number_of_items / (perf_counter() - start)
+    return results
+
+
+if __name__ == "__main__":
+    print(json.dumps(run(*(int(argument) for argument in sys.argv[1:2])), indent=2))
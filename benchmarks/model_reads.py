@@ -0,0 +1,75 @@
+import json
+import sys
+from time import perf_counter
+from typing import Any, Callable, Dict, List
+
+from src.models import Crawled
+from src.models.crawled import CrawledModel
+
+from .fixtures import make_database
+
+
+def make_crawled_page(number: int, number_of_tokens: int = 300, number_of_links: int = 100) -> Dict[str, Any]:
+    """Generates a parsed page shaped like the ones in the crawled collection
+
+    Args:
+        number (int): The number of the page.
+        number_of_tokens (int, optional): Distinct tokens on the page. Defaults to 300.
+        number_of_links (int, optional): Links on the page. Defaults to 100.
+
+    Returns:
+        Dict[str, Any]: The arguments of Crawled.add_many for the page
+    """
+    return {
+        "url": f"https://example.com/page/{number}",
+        "status": "parsed",
+        "file_name": f"page_{number}",
+        "title": f"Page {number}",
+        "forward_links": [f"https://example.com/page/{number + link}" for link in range(number_of_links)],
+        "tokens": {f"token{(number + token) % 5000}": token % 7 + 1 for token in range(number_of_tokens)},
+    }
+
+
+def time_per_document(read: Callable[[], List[Any]]) -> float:
+    """Times a read and divides by the number of documents it returned
+
+    Args:
+        read (Callable[[], List[Any]]): The read.
+
+    Returns:
+        float: Microseconds per document
+    """
+    start = perf_counter()
+    documents = read()
+    return (perf_counter() - start) / max(len(documents), 1) * 1e6
+
+
+def run(number_of_pages: int = 2000) -> Dict[str, float]:
+    """Measures the per document cost of the validated and the lean reads of the crawled collection
+
+    Args:
+        number_of_pages (int, optional): Pages in the collection. Defaults to 2000.
+
+    Returns:
+        Dict[str, float]: Microseconds per document for every read mode, and for validation alone
+    """
+    crawled = Crawled(make_database())
+    crawled.add_many([make_crawled_page(number) for number in range(number_of_pages)])
+    raw_documents = list(crawled.collection.find())
+
+    return {
+        "validated_get_us_per_document": time_per_document(crawled.get),
+        "lean_get_us_per_document": time_per_document(lambda: crawled.get(lean=True)),
+        "projected_get_us_per_document": time_per_document(lambda: crawled.get(fields=["url", "title"])),
+        "projected_iterate_us_per_document": time_per_document(
+            lambda: [item["url"] for item in crawled.iterate(fields=["url"])]
+        ),
+        # !The database is left out, so this is the overhead the lean reads remove
+        "validation_only_us_per_document": time_per_document(
+            lambda: [CrawledModel(**item).model_dump() for item in raw_documents]
+        ),
+    }
+
+
+if __name__ == "__main__":
+    print(json.dumps(run(*(int(argument) for argument in sys.argv[1:2])), indent=2))
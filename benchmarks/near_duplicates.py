@@ -0,0 +1,146 @@
+import json
+import random
+import sys
+from time import perf_counter
+from typing import Dict, List
+
+from src.general import SimHashIndex, simhash
+from src.general.simhash import hash_term
+
+# !Words of the generated pages, drawn with a Zipf-like skew like real text
+VOCABULARY = [f"term{index}" for index in range(50_000)]
+WEIGHTS = [1 / (rank + 1) for rank in range(len(VOCABULARY))]
+
+
+def make_pages(number_of_pages: int, words_per_page: int, seed: int = 0) -> List[List[str]]:
+    """Generates the terms of distinct pages
+
+    Args:
+        number_of_pages (int): The number of pages.
+        words_per_page (int): Words on every page.
+        seed (int, optional): The random seed. Defaults to 0.
+
+    Returns:
+        List[List[str]]: The terms of every page, in order
+    """
+    generator = random.Random(seed)
+    return [generator.choices(VOCABULARY, WEIGHTS, k=words_per_page) for _ in range(number_of_pages)]
+
+
+def make_variant(terms: List[str], generator: random.Random) -> List[str]:
+    """Changes a page the way a session or tracking variant does, a few words of its header and footer changed
+
+    Args:
+        terms (List[str]): The terms of the page.
+        generator (random.Random): The random generator.
+
+    Returns:
+        List[str]: The terms of the variant
+    """
+    cut = max(len(terms) // 200, 1)
+    return generator.choices(VOCABULARY, k=cut) + terms[cut:-cut] + generator.choices(VOCABULARY, k=cut)
+
+
+def signature_throughput(pages: List[List[str]]) -> Dict[str, float]:
+    """Fingerprints the pages with a cold and a warm feature cache
+
+    Args:
+        pages (List[List[str]]): The terms of the pages.
+
+    Returns:
+        Dict[str, float]: Pages fingerprinted per second
+    """
+    results = {}
+    hash_term.cache_clear()
+    for name in ("cold", "warm"):
+        start = perf_counter()
+        for terms in pages:
+            simhash(terms)
+        results[f"{name}_pages_per_second"] = len(pages) / (perf_counter() - start)
+    return results
+
+
+def detection(pages: List[List[str]], seed: int = 0) -> Dict[str, float]:
+    """Indexes the pages and looks up a variant of every page and a page that was never indexed
+
+    Args:
+        pages (List[List[str]]): The terms of the pages, the second half is never indexed.
+        seed (int, optional): The random seed. Defaults to 0.
+
+    Returns:
+        Dict[str, float]: The share of variants found and of new pages wrongly found
+    """
+    generator = random.Random(seed)
+    indexed, new = pages[: len(pages) // 2], pages[len(pages) // 2 :]
+    index = SimHashIndex()
+    for key, terms in enumerate(indexed):
+        index.add(key, simhash(terms))
+
+    found = sum(key in index.find(simhash(make_variant(terms, generator))) for key, terms in enumerate(indexed))
+    false_matches = sum(bool(index.find(simhash(terms))) for terms in new)
+    return {"variants_found": found / len(indexed), "false_matches": false_matches / len(new)}
+
+
+def lookup_latency(number_of_fingerprints: int, number_of_lookups: int = 10_000, seed: int = 0) -> Dict[str, float]:
+    """Measures adding and finding fingerprints in an index of many pages
+
+    Args:
+        number_of_fingerprints (int): Fingerprints in the index.
+        number_of_lookups (int, optional): Lookups of near-duplicates and of new fingerprints. Defaults to 10_000.
+        seed (int, optional): The random seed. Defaults to 0.
+
+    Returns:
+        Dict[str, float]: Adds per second and the mean microseconds per lookup
+    """
+    generator = random.Random(seed)
+    fingerprints = [generator.getrandbits(64) for _ in range(number_of_fingerprints)]
+    index = SimHashIndex()
+
+    start = perf_counter()
+    for key, page_fingerprint in enumerate(fingerprints):
+        index.add(key, page_fingerprint)
+    adds_per_second = number_of_fingerprints / (perf_counter() - start)
+
+    # !Near-duplicates differ from an indexed fingerprint in up to three bits
+    queries = [
+        page_fingerprint ^ sum(1 << bit for bit in generator.sample(range(64), generator.randint(0, 3)))
+        for page_fingerprint in generator.sample(fingerprints, number_of_lookups)
+    ]
+    start = perf_counter()
+    found = sum(bool(index.find(query)) for query in queries)
+    duplicate_lookup = (perf_counter() - start) / number_of_lookups
+
+    queries = [generator.getrandbits(64) for _ in range(number_of_lookups)]
+    start = perf_counter()
+    for query in queries:
+        index.find(query)
+    new_lookup = (perf_counter() - start) / number_of_lookups
+
+    return {
+        "adds_per_second": adds_per_second,
+        "duplicate_lookup_microseconds": duplicate_lookup * 1e6,
+        "new_lookup_microseconds": new_lookup * 1e6,
+        "duplicates_found": found / number_of_lookups,
+    }
+
+
+def run(number_of_pages: int = 2_000, number_of_fingerprints: int = 1_000_000) -> Dict[str, float]:
+    """Benchmarks SimHash fingerprinting, near-duplicate detection and lookups in a large index
+
+    Args:
+        number_of_pages (int, optional): Generated pages to fingerprint. Defaults to 2_000.
+        number_of_fingerprints (int, optional): Fingerprints in the lookup index. Defaults to 1_000_000.
+
+    Returns:
+        Dict[str, float]: Throughput, detection rates and lookup latency
+    """
+    pages = make_pages(number_of_pages, 500)
+    return {
+        **signature_throughput(pages),
+        **detection(pages),
+        **lookup_latency(number_of_fingerprints),
+    }
+
+
+if __name__ == "__main__":
+    print(json.dumps(run(*(int(argument) for argument in sys.argv[1:])), indent=2))
@@ -0,0 +1,81 @@
+import json
+import random
+import sys
+from array import array
+from time import perf_counter
+from typing import Dict, Tuple
+
+from src.ranking import count_out_degree, page_rank, to_csr
+from src.ranking.page_rank import _numpy
+
+
+def make_links(number_of_pages: int, links_per_page: int = 10, seed: int = 0) -> Tuple[array, array]:
+    """Generates links whose targets follow a power law, a few pages getting most links as on the web
+
+    Args:
+        number_of_pages (int): The number of pages.
+        links_per_page (int, optional): Links on every page. Defaults to 10.
+        seed (int, optional): The random seed. Defaults to 0.
+
+    Returns:
+        Tuple[array, array]: The page every link is on and the page it points to
+    """
+    generator = random.Random(seed)
+    sources = array("q")
+    targets = array("q")
+    for source in range(number_of_pages):
+        for _ in range(links_per_page):
+            sources.append(source)
+            targets.append(min(int(generator.paretovariate(1.2)) - 1, number_of_pages - 1))
+    return sources, targets
+
+
+def rank(number_of_pages: int, sources: array, targets: array, initial: list | None) -> Tuple[list, int, float]:
+    """Ranks the pages
+
+    Args:
+        number_of_pages (int): The number of pages.
+        sources (array): The page every link is on.
+        targets (array): The page every link points to.
+        initial (list | None): Ranks to start from.
+
+    Returns:
+        Tuple[list, int, float]: The ranks, the iterations run and the seconds taken, building the sparse rows included
+    """
+    start = perf_counter()
+    out_degree = count_out_degree(number_of_pages, sources)
+    indptr, indices = to_csr(number_of_pages, sources, targets)
+    ranks, iterations = page_rank(indptr, indices, out_degree, initial=initial)
+    return ranks, iterations, perf_counter() - start
+
+
+def run(number_of_pages: int = 200_000, changed_percent: int = 1) -> Dict[str, float]:
+    """Ranks a synthetic web graph from scratch, then again from the previous ranks after changing some links
+
+    Args:
+        number_of_pages (int, optional): The number of pages. Defaults to 200_000.
+        changed_percent (int, optional): Percent of links pointed elsewhere before reranking. Defaults to 1.
+
+    Returns:
+        Dict[str, float]: Iterations and seconds of the cold and the warm start
+    """
+    sources, targets = make_links(number_of_pages)
+    ranks, cold_iterations, cold_seconds = rank(number_of_pages, sources, targets, None)
+
+    generator = random.Random(1)
+    for link in generator.sample(range(len(targets)), len(targets) * changed_percent // 100):
+        targets[link] = generator.randrange(number_of_pages)
+    _, warm_iterations, warm_seconds = rank(number_of_pages, sources, targets, ranks)
+
+    return {
+        "numpy": float(_numpy is not None),
+        "links": float(len(targets)),
+        "cold_iterations": cold_iterations,
+        "cold_seconds": cold_seconds,
+        "warm_iterations": warm_iterations,
+        "warm_seconds": warm_seconds,
+    }
+
+
+if __name__ == "__main__":
+    print(json.dumps(run(*(int(argument) for argument in sys.argv[1:3])), indent=2))
@@ -0,0 +1,174 @@
+import json
+import multiprocessing
+import os
+import random
+import sys
+import tempfile
+import threading
+from concurrent.futures import Executor, Future, ProcessPoolExecutor, ThreadPoolExecutor
+from time import perf_counter, sleep
+from typing import Any, Dict, List
+
+from src.models import Crawled
+from src.parser import Parser
+from src.parser.parser import parse_page
+from src.pipeline import QueueHandoff
+from src.storage import FileStore
+
+from .fixtures import make_database
+
+# !Pages the parser in process mode is given per process, enough for every process to be handed several at once
+PARSER_PAGES_PER_PROCESS = 8
+
+WORDS = [
+    "search",
+    "engine",
+    "crawler",
+    "index",
+    "the",
+    "of",
+    "page",
+    "rank",
+    "token",
+    "query",
+    "result",
+    "document",
+    "link",
+    "frontier",
+    "robots",
+    "politeness",
+]
+
+
+def make_corpus(number_of_pages: int, seed: int = 0) -> List[str]:
+    """Generates pages with the size and shape of typical article pages
+
+    Args:
+        number_of_pages (int): The number of pages.
+        seed (int, optional): The random seed, so every run parses the same corpus. Defaults to 0.
+
+    Returns:
+        List[str]: The HTML of the pages
+    """
+    generator = random.Random(seed)
+    pages = []
+    for page in range(number_of_pages):
+        paragraphs = "".join(
+            "<p>"
+            + " ".join(generator.choice(WORDS) for _ in range(80))
+            + f' <a href="/wiki/Article_{generator.randrange(100000)}">more</a></p>'
+            for _ in range(40)
+        )
+        links = "".join(f'<li><a href="https://example.org/{page}/{link}">Link {link}</a></li>' for link in range(60))
+        pages.append(
+            f"<html><head><title>Article {page}</title><script>var x = {page};</script></head>"
+            f"<body><nav><ul>{links}</ul></nav><main>{paragraphs}</main></body></html>"
+        )
+    return pages
+
+
+def pages_per_second(executor: Executor, corpus: List[str]) -> float:
+    """Parses the corpus with an executor
+
+    Args:
+        executor (Executor): The thread or process pool.
+        corpus (List[str]): The pages.
+
+    Returns:
+        float: Pages parsed per second
+    """
+    # !Warms the pool up so starting processes is not measured
+    list(executor.map(parse_page, corpus[:4], ["https://example.com/wiki/Start"] * 4))
+
+    start = perf_counter()
+    list(executor.map(parse_page, corpus, ["https://example.com/wiki/Start"] * len(corpus), chunksize=4))
+    return len(corpus) / (perf_counter() - start)
+
+
+def parser_process_mode(number_of_processes: int, corpus: List[str]) -> Dict[str, float]:
+    """Parses the corpus with a Parser in process mode, counting the pages its processes parse at once
+
+    Its pages per second are left out, they are bound by the link writes to mongomock rather than by parsing.
+
+    Args:
+        number_of_processes (int): Worker processes of the parser.
+        corpus (List[str]): The pages.
+
+    Returns:
+        Dict[str, float]: The most pages handed to the processes at once
+    """
+    db = make_database()
+    crawled = Crawled(db)
+    handoff = QueueHandoff()
+    lock = threading.Lock()
+    in_flight = [0, 0]
+
+    def done(_: Future[Any]) -> None:
+        with lock:
+            in_flight[0] -= 1
+
+    with tempfile.TemporaryDirectory() as to_parse_directory:
+        content_store = FileStore(to_parse_directory)
+        # !The parser is started on an empty store, so every page it parses goes through the counted pool
+        pool = Parser(
+            5,
+            to_parse_directory,
+            db,
+            content_store=content_store,
+            handoff=handoff,
+            parse_mode="processes",
+            number_of_processes=number_of_processes,
+        ).process_pool
+        assert pool is not None
+        list(pool.map(abs, range(number_of_processes)))
+
+        def counted_submit(*arguments: Any) -> Future[Any]:
+            with lock:
+                in_flight[0] += 1
+                in_flight[1] = max(in_flight)
+            future = ProcessPoolExecutor.submit(pool, *arguments)
+            future.add_done_callback(done)
+            return future
+
+        pool.submit = counted_submit  # type: ignore[method-assign]
+
+        for page, html in enumerate(corpus):
+            file_name = content_store.put(html)
+            crawled.add(f"https://example.com/wiki/{page}", "crawled", file_name)
+            handoff.publish(file_name)
+        while crawled.collection.count_documents({"status": "parsed"}) < len(corpus):
+            sleep(0.05)
+        pool.shutdown(cancel_futures=True)
+
+    return {"max_pages_in_flight": in_flight[1]}
+
+
+def run(number_of_pages: int = 400) -> Dict[str, float]:
+    """Measures how parsing scales with threads and with processes
+
+    Args:
+        number_of_pages (int, optional): Pages in the corpus. Defaults to 400.
+
+    Returns:
+        Dict[str, float]: Pages parsed per second for every pool size, the most pages the parser in process mode
+            had its processes parse at once with every number of processes, and the number of cores
+    """
+    corpus = make_corpus(number_of_pages)
+    cores = os.cpu_count() or 1
+    results: Dict[str, float] = {"cores": cores}
+
+    for workers in sorted({1, 2, 4, cores}):
+        with ThreadPoolExecutor(workers) as executor:
+            results[f"threads_{workers}_pages_per_second"] = pages_per_second(executor, corpus)
+        with ProcessPoolExecutor(workers, mp_context=multiprocessing.get_context("spawn")) as executor:
+            results[f"processes_{workers}_pages_per_second"] = pages_per_second(executor, corpus)
+
+        # !Every process should be busy, however few threads the parser was asked for
+        for key, value in parser_process_mode(workers, corpus[: workers * PARSER_PAGES_PER_PROCESS]).items():
+            results[f"parser_processes_{workers}_{key}"] = value
+
+    return results
+
+
+if __name__ == "__main__":
+    print(json.dumps(run(*(int(argument) for argument in sys.argv[1:2])), indent=2))
@@ -0,0 +1,82 @@
+import json
+import sys
+import tempfile
+from statistics import mean
+from time import perf_counter, sleep, time
+from typing import Dict
+
+from src.crawler import Crawler
+from src.crawler.scheduler import DomainScheduler
+from src.models import Queue
+from src.parser import Parser
+from src.pipeline import QueueHandoff
+from src.storage import FileStore
+
+from .fixtures import make_database, serve_site
+
+
+def crawl_and_parse(number_of_pages: int, use_handoff: bool, number_of_threads: int = 10) -> Dict[str, float]:
+    """Crawls and parses every page of the fixture site once
+
+    Args:
+        number_of_pages (int): The number of pages.
+        use_handoff (bool): Whether saved pages are announced to the parser or the parser polls the store.
+        number_of_threads (int, optional): Threads of the crawler and of the parser each. Defaults to 10.
+
+    Returns:
+        Dict[str, float]: Pages parsed per second, and the mean seconds from saving a page to parsing it
+    """
+    db = make_database()
+    queue = Queue(db)
+    handoff = QueueHandoff() if use_handoff else None
+    parsed_at: Dict[str, float] = {}
+
+    with serve_site(number_of_pages) as base_url, tempfile.TemporaryDirectory() as to_parse_directory:
+        for page in range(number_of_pages):
+            queue.add(f"{base_url}/page/{page}")
+        queue.create_indexes()
+        content_store = FileStore(to_parse_directory)
+
+        start = perf_counter()
+        # !Every fixture page is on the same host, so politeness is relaxed to measure the pipeline itself
+        scheduler = DomainScheduler(default_rate=10_000, default_burst=100)
+        Crawler(
+            number_of_threads, to_parse_directory, db, scheduler=scheduler, content_store=content_store, handoff=handoff
+        )
+        Parser(number_of_threads, to_parse_directory, db, content_store=content_store, handoff=handoff)
+
+        try:
+            while len(parsed_at) < number_of_pages:
+                now = time()
+                for item_in_db in db["crawled"].find({"status": "parsed"}, {"url": 1, "id": 1}):
+                    parsed_at.setdefault(item_in_db["url"], now - item_in_db["id"])
+                sleep(0.02)
+
+            return {
+                "pages_per_second": number_of_pages / (perf_counter() - start),
+                "mean_seconds_saved_to_parsed": mean(parsed_at.values()),
+            }
+        finally:
+            # !Pages queued twice are still being crawled, they are left to finish before their directory is removed
+            while queue.count():
+                sleep(0.02)
+
+
+def run(number_of_pages: int = 100) -> Dict[str, float]:
+    """Benchmarks the parser polling the content store against the crawler announcing pages on a handoff
+
+    Args:
+        number_of_pages (int, optional): The number of pages. Defaults to 100.
+
+    Returns:
+        Dict[str, float]: Throughput and latency of both modes
+    """
+    results: Dict[str, float] = {}
+    for name, use_handoff in (("polling", False), ("handoff", True)):
+        for key, value in crawl_and_parse(number_of_pages, use_handoff).items():
+            results[f"{name}_{key}"] = value
+    return results
+
+
+if __name__ == "__main__":
+    print(json.dumps(run(*(int(argument) for argument in sys.argv[1:2])), indent=2))
@@ -0,0 +1,102 @@
+import json
+import sys
+import tempfile
+from collections import Counter
+from time import perf_counter, sleep, time
+from typing import Any, Dict
+
+import pymongo.database as _database
+
+from src.crawler import Crawler
+from src.crawler.scheduler import DomainScheduler
+from src.models import Crawled, Queue
+from src.storage import FileStore
+
+from .fixtures import make_database, serve_site
+
+# !What the re-crawl knows about the pages: nothing, their content hash, or the validators the server sent too
+MODES = ("full", "content_hash", "conditional")
+
+
+def wait_for_crawl(db: _database.Database[Dict[str, Any]], number_of_pages: int, after: float) -> None:
+    """Waits until every page was crawled after the given time
+
+    Args:
+        db (_database.Database[Dict[str, Any]]): The database.
+        number_of_pages (int): The number of pages.
+        after (float): The timestamp the crawl started at.
+    """
+    while db["crawled"].count_documents({"crawled_at": {"$gt": after}}) < number_of_pages:
+        sleep(0.02)
+
+
+def refresh(number_of_pages: int, mode: str) -> Dict[str, float]:
+    """Crawls every page of the fixture site, then crawls them all again
+
+    Args:
+        number_of_pages (int): The number of pages.
+        mode (str): One of MODES.
+
+    Returns:
+        Dict[str, float]: Pages re-crawled per second, body bytes sent and pages saved again for the parser
+    """
+    db = make_database()
+    queue = Queue(db)
+    crawled = Crawled(db)
+    sent: Counter[str] = Counter()
+
+    with (
+        serve_site(number_of_pages, validators=mode == "conditional", sent=sent) as base_url,
+        tempfile.TemporaryDirectory() as to_parse_directory,
+    ):
+        queue.add_many([f"{base_url}/page/{page}" for page in range(number_of_pages)])
+        queue.create_indexes()
+        crawled.create_indexes()
+
+        # !Every fixture page is on the same host, so politeness is relaxed to measure the re-crawl itself
+        scheduler = DomainScheduler(default_rate=10_000, default_burst=100)
+        content_store = FileStore(to_parse_directory)
+        Crawler(10, to_parse_directory, db, scheduler=scheduler, content_store=content_store, recrawl_after=None)
+        wait_for_crawl(db, number_of_pages, 0)
+
+        # !The parser is left out, the pages are marked parsed as it would
+        for file_name in list(content_store.keys()):
+            content_store.delete(file_name)
+        db["crawled"].update_many({}, {"$set": {"status": "parsed"}})
+
+        pages = crawled.claim_recrawls(time(), number_of_pages)
+        if mode == "full":
+            pages = [{"url": page["url"]} for page in pages]
+        sent.clear()
+
+        start = perf_counter()
+        claimed_at = time()
+        queue.add_recrawls(pages)
+        wait_for_crawl(db, number_of_pages, claimed_at)
+
+        return {
+            "pages_per_second": number_of_pages / (perf_counter() - start),
+            "body_bytes": sent["bytes"],
+            "not_modified": sent["304"],
+            "pages_to_parse": db["crawled"].count_documents({"status": "crawled"}),
+        }
+
+
+def run(number_of_pages: int = 200) -> Dict[str, float]:
+    """Benchmarks refreshing a crawled site with full fetches, content hashes and conditional requests
+
+    Args:
+        number_of_pages (int, optional): The number of pages. Defaults to 200.
+
+    Returns:
+        Dict[str, float]: Throughput, bandwidth and parser work of every mode
+    """
+    results: Dict[str, float] = {}
+    for mode in MODES:
+        for key, value in refresh(number_of_pages, mode).items():
+            results[f"{mode}_{key}"] = value
+    return results
+
+
+if __name__ == "__main__":
+    print(json.dumps(run(*(int(argument) for argument in sys.argv[1:2])), indent=2))
@@ -0,0 +1,107 @@
+import json
+import random
+import sys
+from time import perf_counter
+from typing import Dict, List
+
+from src.crawler.check_robots_txt import check_robots_txt
+from src.crawler.constants import BOT_NAME
+from src.crawler.robots_matcher import RobotsMatcher
+
+
+def make_robots_txt(number_of_rules: int, seed: int = 0) -> str:
+    """Generates a robots.txt shaped like the large ones of real sites
+
+    Most rules are deep literal paths, some use wildcards and end anchors, and a few groups name other bots.
+
+    Args:
+        number_of_rules (int): The number of rules in the group for all bots.
+        seed (int, optional): The random seed. Defaults to 0.
+
+    Returns:
+        str: The robots.txt content
+    """
+    generator = random.Random(seed)
+    lines = ["User-agent: Googlebot", "Disallow: /nogoogle/", "", "User-agent: *", "Crawl-delay: 1"]
+
+    for number in range(number_of_rules):
+        kind = generator.random()
+        directive = "Allow" if generator.random() < 0.2 else "Disallow"
+        if kind < 0.7:
+            lines.append(f"{directive}: /wiki/Special:Page{number}/section{number % 97}/")
+        elif kind < 0.85:
+            lines.append(f"{directive}: /*?action=edit{number}")
+        else:
+            lines.append(f"{directive}: /files/{number}/*.pdf$")
+
+    return "\n".join(lines) + "\nSitemap: https://example.com/sitemap.xml\n"
+
+
+def make_urls(number_of_urls: int, number_of_rules: int, seed: int = 1) -> List[str]:
+    """Generates urls that hit and miss the generated rules
+
+    Args:
+        number_of_urls (int): The number of urls.
+        number_of_rules (int): The number of rules in the generated robots.txt.
+        seed (int, optional): The random seed. Defaults to 1.
+
+    Returns:
+        List[str]: The urls
+    """
+    generator = random.Random(seed)
+    urls = []
+    for _ in range(number_of_urls):
+        number = generator.randrange(number_of_rules * 2)
+        urls.append(
+            generator.choice(
+                [
+                    f"https://example.com/wiki/Special:Page{number}/section{number % 97}/article",
+                    f"https://example.com/w/index.php?title=Page{number}&action=edit{number}",
+                    f"https://example.com/files/{number}/report.pdf",
+                    f"https://example.com/wiki/Article_{number}/a/b/c/d",
+                ]
+            )
+        )
+    return urls
+
+
+def run(rule_counts: List[int] | None = None, robots_files: List[str] | None = None) -> Dict[str, float]:
+    """Measures how many urls per second can be checked against large robots.txt files
+
+    Args:
+        rule_counts (List[int] | None, optional): Sizes of the generated robots.txt files.
+        robots_files (List[str] | None, optional): Paths to real robots.txt files to benchmark as well.
+
+    Returns:
+        Dict[str, float]: Compile time, and urls per second for the compiled matcher and for reparsing per url
+    """
+    robots_txts = {f"generated_{count}": make_robots_txt(count) for count in rule_counts or [100, 1000, 10000]}
+    for robots_file in robots_files or []:
+        with open(robots_file, "r", encoding="utf8") as file:
+            robots_txts[robots_file] = file.read()
+
+    results: Dict[str, float] = {}
+    for name, robots_txt in robots_txts.items():
+        urls = make_urls(20000, max(robots_txt.count("\n"), 1))
+
+        start = perf_counter()
+        matcher = RobotsMatcher(robots_txt, BOT_NAME)
+        results[f"{name}_compile_seconds"] = perf_counter() - start
+
+        start = perf_counter()
+        for url in urls:
+            matcher.is_allowed(url)
+        results[f"{name}_compiled_urls_per_second"] = len(urls) / (perf_counter() - start)
+
+        # !Reparsing the file for every url is what check_robots_txt costs without the cache
+        sample = urls[:50]
+        start = perf_counter()
+        for url in sample:
+            check_robots_txt(url, robots_txt, BOT_NAME)
+        results[f"{name}_reparsed_urls_per_second"] = len(sample) / (perf_counter() - start)
+
+    return results
+
+
+if __name__ == "__main__":
+    print(json.dumps(run(robots_files=sys.argv[1:]), indent=2))
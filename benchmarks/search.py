@@ -0,0 +1,111 @@
+import json
+import random
+import sys
+import tempfile
+from statistics import mean, quantiles
+from time import perf_counter
+from typing import Dict, List, Tuple
+
+from src.indexer import IndexWriter, InvertedIndex
+from src.search import Searcher
+
+from .fixtures import make_database
+from .inverted_index import make_documents
+
+
+def make_queries(number_of_queries: int, seed: int = 0) -> List[List[str]]:
+    """Generates queries pairing common terms with rarer ones, the case early termination helps most
+
+    Args:
+        number_of_queries (int): The number of queries.
+        seed (int, optional): The random seed. Defaults to 0.
+
+    Returns:
+        List[List[str]]: The terms of every query
+    """
+    generator = random.Random(seed)
+    return [
+        [f"term{generator.randint(1, 3)}", f"term{generator.randint(4, 40)}", f"term{generator.randint(40, 400)}"]
+        for _ in range(number_of_queries)
+    ]
+
+
+def time_queries(
+    searcher: Searcher, index: InvertedIndex, queries: List[List[str]], early_termination: bool
+) -> Tuple[Dict[str, float], List[List[float]]]:
+    """Runs the queries
+
+    Args:
+        searcher (Searcher): The searcher.
+        index (InvertedIndex): The index.
+        queries (List[List[str]]): The queries.
+        early_termination (bool): Whether documents that cannot make the top are skipped.
+
+    Returns:
+        Tuple[Dict[str, float], List[List[float]]]: Latency and documents scored, and the top scores of every query
+    """
+    latencies = []
+    documents_scored = []
+    top_scores = []
+    for terms in queries:
+        start = perf_counter()
+        top, scored = searcher.top_documents(index, terms, 10, early_termination)
+        latencies.append(perf_counter() - start)
+        documents_scored.append(scored)
+        top_scores.append([round(score, 6) for score, _ in top])
+
+    return {
+        "mean_ms": mean(latencies) * 1000,
+        "p95_ms": quantiles(latencies, n=20)[-1] * 1000,
+        "mean_documents_scored": mean(documents_scored),
+    }, top_scores
+
+
+def build_synthetic_index(directory: str, number_of_documents: int) -> InvertedIndex:
+    """Builds an index of generated documents with ranks spread like PageRank
+
+    Args:
+        directory (str): The index directory.
+        number_of_documents (int): Documents in the index.
+
+    Returns:
+        InvertedIndex: The index
+    """
+    generator = random.Random(0)
+    writer = IndexWriter(directory)
+    for page_id, tokens in enumerate(make_documents(number_of_documents, terms_per_document=200)):
+        writer.add(float(page_id), tokens, generator.paretovariate(2))
+    writer.commit()
+    return InvertedIndex(directory)
+
+
+def run(number_of_documents: int = 50_000, number_of_queries: int = 50) -> Dict[str, float]:
+    """Benchmarks top 10 queries on a synthetic index, scoring every candidate against early termination
+
+    Args:
+        number_of_documents (int, optional): Documents in the index. Defaults to 50_000.
+        number_of_queries (int, optional): The number of queries. Defaults to 50.
+
+    Returns:
+        Dict[str, float]: Latency and documents scored of both strategies, and whether they found the same scores
+    """
+    queries = make_queries(number_of_queries)
+
+    with tempfile.TemporaryDirectory() as directory:
+        index = build_synthetic_index(directory, number_of_documents)
+        searcher = Searcher(make_database(), directory)
+
+        results: Dict[str, float] = {}
+        exhaustive, exhaustive_scores = time_queries(searcher, index, queries, False)
+        early, early_scores = time_queries(searcher, index, queries, True)
+        for key, value in exhaustive.items():
+            results[f"exhaustive_{key}"] = value
+        for key, value in early.items():
+            results[f"early_termination_{key}"] = value
+        results["same_top_scores"] = float(exhaustive_scores == early_scores)
+
+    return results
+
+
+if __name__ == "__main__":
+    print(json.dumps(run(*(int(argument) for argument in sys.argv[1:3])), indent=2))
@@ -0,0 +1,66 @@
+import json
+import sys
+from time import perf_counter
+from typing import Dict
+
+from src.general import ScalableBloomFilter
+from src.models.constants import SEEN_URLS_FALSE_POSITIVE_RATE, SEEN_URLS_INITIAL_CAPACITY
+
+
+def make_url(number: int, host: str = "example.com") -> str:
+    """Generates a url shaped like the ones found while crawling
+
+    Args:
+        number (int): The number of the url.
+        host (str, optional): The host of the url. Defaults to "example.com".
+
+    Returns:
+        str: The url
+    """
+    return f"https://www{number % 1000}.{host}/wiki/Article_{number}?section={number % 7}"
+
+
+def run(number_of_urls: int = 10_000_000, number_of_lookups: int = 1_000_000) -> Dict[str, float]:
+    """Measures the memory and speed of the seen urls filter with the default settings
+
+    Args:
+        number_of_urls (int, optional): Urls added to the filter. Defaults to 10_000_000.
+        number_of_lookups (int, optional): Urls looked up that were and were not added. Defaults to 1_000_000.
+
+    Returns:
+        Dict[str, float]: Memory, adds and lookups per second and the measured false positive rate
+    """
+    bloom_filter = ScalableBloomFilter(SEEN_URLS_INITIAL_CAPACITY, SEEN_URLS_FALSE_POSITIVE_RATE)
+
+    start = perf_counter()
+    for number in range(number_of_urls):
+        bloom_filter.add(make_url(number))
+    add_seconds = perf_counter() - start
+
+    step = max(number_of_urls // number_of_lookups, 1)
+    start = perf_counter()
+    hits = sum(make_url(number) in bloom_filter for number in range(0, number_of_urls, step))
+    hit_seconds = perf_counter() - start
+
+    start = perf_counter()
+    false_positives = sum(make_url(number, "example.org") in bloom_filter for number in range(number_of_lookups))
+    miss_seconds = perf_counter() - start
+
+    # !A set of the same urls, measured on a sample since it would not fit for large runs
+    sample = {make_url(number) for number in range(min(number_of_urls, 100_000))}
+    set_bytes_per_url = (sys.getsizeof(sample) + sum(sys.getsizeof(url) for url in sample)) / len(sample)
+
+    return {
+        "urls": number_of_urls,
+        "filter_bytes": bloom_filter.size_in_bytes,
+        "filter_bytes_per_url": bloom_filter.size_in_bytes / number_of_urls,
+        "set_bytes_per_url": set_bytes_per_url,
+        "adds_per_second": number_of_urls / add_seconds,
+        "hit_lookups_per_second": hits / hit_seconds,
+        "miss_lookups_per_second": number_of_lookups / miss_seconds,
+        "false_positive_rate": false_positives / number_of_lookups,
+    }
+
+
+if __name__ == "__main__":
+    print(json.dumps(run(*(int(argument) for argument in sys.argv[1:3])), indent=2))
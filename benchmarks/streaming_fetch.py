@@ -0,0 +1,95 @@
+import json
+import sys
+import tempfile
+import tracemalloc
+from time import perf_counter
+from typing import Dict
+
+import requests
+
+from src.crawler import Crawler
+from src.crawler.conditional_fetch import FetchedPage
+from src.storage import FileStore
+
+from .fixtures import make_database, serve_site
+
+# !Pages of the fixture site: a large page, pages past the body limit with and without a length, a binary file and
+# !a page whose charset is only in a meta tag
+CASES = {
+    "large_page": "/large/{size}",
+    "oversized_page": "/large/{oversized}",
+    "oversized_chunked_page": "/stream/{oversized}",
+    "binary_file": "/file/{size}",
+    "meta_charset_page": "/latin1/64",
+}
+
+
+class IdleCrawler(Crawler):
+    """A crawler whose threads are never started, so single links can be fetched with it"""
+
+    def main(self) -> None:
+        """Starts nothing"""
+
+
+def fetch(crawler: Crawler, url: str) -> Dict[str, float]:
+    """Fetches a url and saves it as a crawler thread does
+
+    Args:
+        crawler (Crawler): The crawler.
+        url (str): The url.
+
+    Returns:
+        Dict[str, float]: The peak memory allocated, the seconds taken, whether the page was saved and whether its
+            text was decoded correctly
+    """
+    tracemalloc.start()
+    start = perf_counter()
+    page = crawler.crawl_link(url)
+    if isinstance(page, FetchedPage):
+        crawler.save_page(page, url)
+    seconds = perf_counter() - start
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    text = ""
+    if isinstance(page, FetchedPage):
+        text = crawler.content_store.get(crawler.crawled_collection.get_one({"url": url})["file_name"])
+    return {
+        "peak_mib": peak / 1024 / 1024,
+        "seconds": seconds,
+        "saved": float(isinstance(page, FetchedPage)),
+        "decoded": float("5 €" in text),
+    }
+
+
+def run(size: int = 8 * 1024, oversized: int = 16 * 1024) -> Dict[str, float]:
+    """Benchmarks fetching large, oversized, binary and meta charset pages with buffered and streamed bodies
+
+    Args:
+        size (int, optional): KiB of the large page and of the binary file. Defaults to 8 * 1024.
+        oversized (int, optional): KiB of the pages past the body limit. Defaults to 16 * 1024.
+
+    Returns:
+        Dict[str, float]: Peak memory, seconds, saved and decoded for every case and mode
+    """
+    results = {}
+    with serve_site() as base_url, tempfile.TemporaryDirectory() as to_parse_directory:
+        urls = {case: base_url + path.format(size=size, oversized=oversized) for case, path in CASES.items()}
+
+        # !The fixture server runs in this process, so its bodies are generated before memory is measured
+        for url in urls.values():
+            requests.get(url, timeout=60)
+
+        for mode in ("buffered", "streamed"):
+            db = make_database()
+            crawler = IdleCrawler(
+                1, to_parse_directory, db, content_store=FileStore(to_parse_directory), stream_bodies=mode == "streamed"
+            )
+            for case, url in urls.items():
+                for name, value in fetch(crawler, url).items():
+                    results[f"{mode}_{case}_{name}"] = value
+    return results
+
+
+if __name__ == "__main__":
+    print(json.dumps(run(*(int(argument) for argument in sys.argv[1:])), indent=2))
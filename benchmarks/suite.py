@@ -0,0 +1,136 @@
+import cProfile
+import datetime as _dt
+import importlib
+import os
+import platform
+import random
+import statistics
+import subprocess
+from time import perf_counter
+from typing import Any, Dict, List, Sequence
+
+from .constants import (
+    HIGHER_IS_BETTER_SUFFIXES,
+    LOWER_IS_BETTER_SUFFIXES,
+    MONGODB_URI_VARIABLE,
+    RANDOM_SEED,
+)
+
+
+def get_commit() -> str:
+    """Gets the commit the benchmarks run on
+
+    Returns:
+        str: The commit hash, empty outside a git checkout
+    """
+    try:
+        result = subprocess.run(["git", "rev-parse", "HEAD"], capture_output=True, text=True, check=False)
+    except OSError:
+        return ""
+    return result.stdout.strip()
+
+
+def get_environment(repeat: int) -> Dict[str, Any]:
+    """Describes the machine and the setup the benchmarks run with, so results are only compared to like results
+
+    Args:
+        repeat (int): The number of runs every metric is the median of.
+
+    Returns:
+        Dict[str, Any]: The environment
+    """
+    return {
+        "commit": get_commit(),
+        "started_at": _dt.datetime.now(_dt.timezone.utc).isoformat(timespec="seconds"),
+        "python": f"{platform.python_implementation()} {platform.python_version()}",
+        "platform": platform.platform(),
+        "cpus": os.cpu_count(),
+        # !The uri is left out, it may hold credentials
+        "database": "mongod" if os.environ.get(MONGODB_URI_VARIABLE) else "mongomock",
+        "hash_seed": os.environ.get("PYTHONHASHSEED", ""),
+        "repeat": repeat,
+    }
+
+
+def run_benchmark(
+    name: str, arguments: Sequence[Any], repeat: int, profile: cProfile.Profile | None = None
+) -> Dict[str, Any]:
+    """Runs a benchmark module several times and keeps the median of every metric
+
+    Args:
+        name (str): The module in the benchmarks package.
+        arguments (Sequence[Any]): The arguments of its run function.
+        repeat (int): The number of runs.
+        profile (cProfile.Profile | None, optional): Profiles the runs, threads the benchmark starts are not
+            profiled. Defaults to None.
+
+    Returns:
+        Dict[str, Any]: The arguments, the seconds the runs took and the median metrics
+    """
+    module = importlib.import_module(f"{__package__}.{name}")
+    runs: List[Dict[str, float]] = []
+
+    start = perf_counter()
+    for _ in range(repeat):
+        # !Benchmarks that draw from the global generator draw the same numbers every run
+        random.seed(RANDOM_SEED)
+        if profile is not None:
+            profile.enable()
+        try:
+            runs.append(module.run(*arguments))
+        finally:
+            if profile is not None:
+                profile.disable()
+
+    return {
+        "arguments": list(arguments),
+        "seconds": perf_counter() - start,
+        "results": {metric: statistics.median(run[metric] for run in runs) for metric in runs[0]},
+    }
+
+
+def get_direction(metric: str) -> int:
+    """Gets which way a metric improves, from its name
+
+    Args:
+        metric (str): The name of the metric.
+
+    Returns:
+        int: 1 if higher is better, -1 if lower is better and 0 if it only describes the run
+    """
+    if metric.endswith(HIGHER_IS_BETTER_SUFFIXES):
+        return 1
+    if metric.endswith(LOWER_IS_BETTER_SUFFIXES):
+        return -1
+    return 0
+
+
+def compare(benchmarks: Dict[str, Dict[str, Any]], baseline: Dict[str, Dict[str, Any]], tolerance: float) -> List[str]:
+    """Finds the metrics that got worse than the baseline by more than the tolerance
+
+    Args:
+        benchmarks (Dict[str, Dict[str, Any]]): The benchmarks of this run.
+        baseline (Dict[str, Dict[str, Any]]): The benchmarks of an earlier run.
+        tolerance (float): The relative change that is put down to noise.
+
+    Returns:
+        List[str]: A description of every regression
+    """
+    regressions = []
+    for name, benchmark in benchmarks.items():
+        # !Benchmarks run with other arguments measure something else
+        previous = baseline.get(name)
+        if previous is None or previous["arguments"] != benchmark["arguments"]:
+            continue
+
+        for metric, value in benchmark["results"].items():
+            before = previous["results"].get(metric)
+            direction = get_direction(metric)
+            if not before or not direction:
+                continue
+
+            change = (value - before) / abs(before)
+            if change * direction < -tolerance:
+                regressions.append(f"{name}.{metric}: {before:.6g} -> {value:.6g} ({change:+.1%})")
+
+    return regressions
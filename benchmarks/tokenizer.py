@@ -0,0 +1,93 @@
+import json
+import random
+import string as _str
+import sys
+from collections import Counter
+from time import perf_counter
+from typing import Callable, Dict, List
+
+from src.general import Tokenizer
+from src.general.constants import HTML_BLACKLIST, STOP_WORDS
+
+from .parse_modes import WORDS
+
+# !The lists tokenize_string used to scan for every word
+LEGACY_STOP_WORDS = sorted(STOP_WORDS)
+LEGACY_HTML_BLACKLIST = sorted(HTML_BLACKLIST)
+
+
+def legacy_tokenize_string(string: str) -> Dict[str, int]:
+    """The tokenize_string this engine replaces, kept to compare against
+
+    Args:
+        string (str): The string to tokenize.
+
+    Returns:
+        Dict[str, int]: Dictionary of words and number of occurrences
+    """
+    text = string.translate(str.maketrans("", "", _str.punctuation))
+    tokens = text.split()
+    tokens = [word for word in tokens if word not in LEGACY_HTML_BLACKLIST]
+    tokens = [word for word in tokens if word not in LEGACY_STOP_WORDS]
+    return dict(Counter(tokens))
+
+
+def make_document(number_of_words: int, seed: int = 0) -> str:
+    """Generates text with stop words, capitalized words and punctuation
+
+    Args:
+        number_of_words (int): The number of words.
+        seed (int, optional): The random seed. Defaults to 0.
+
+    Returns:
+        str: The text
+    """
+    generator = random.Random(seed)
+    vocabulary = WORDS + sorted(STOP_WORDS)[:40] + [word.capitalize() for word in WORDS] + ["engines,", "pages."]
+    return " ".join(generator.choice(vocabulary) for _ in range(number_of_words))
+
+
+def words_per_second(tokenize: Callable[[str], object], documents: List[str]) -> float:
+    """Tokenizes the documents
+
+    Args:
+        tokenize (Callable[[str], object]): The tokenizer.
+        documents (List[str]): The documents.
+
+    Returns:
+        float: Words tokenized per second
+    """
+    number_of_words = sum(document.count(" ") + 1 for document in documents)
+    start = perf_counter()
+    for document in documents:
+        tokenize(document)
+    return number_of_words / (perf_counter() - start)
+
+
+def run(number_of_documents: int = 20, words_per_document: int = 50_000) -> Dict[str, float]:
+    """Benchmarks the tokenizer engine against the previous tokenize_string on large documents
+
+    Args:
+        number_of_documents (int, optional): The number of documents. Defaults to 20.
+        words_per_document (int, optional): Words in every document. Defaults to 50_000.
+
+    Returns:
+        Dict[str, float]: Words per second of every tokenizer, and the number of distinct terms each produces
+    """
+    documents = [make_document(words_per_document, seed) for seed in range(number_of_documents)]
+    tokenizers: Dict[str, Callable[[str], object]] = {
+        "legacy": legacy_tokenize_string,
+        "counts": Tokenizer().count,
+        "stemmed_counts": Tokenizer(stem=True).count,
+        "positions": Tokenizer().positions,
+    }
+
+    results: Dict[str, float] = {}
+    for name, tokenize in tokenizers.items():
+        results[f"{name}_words_per_second"] = words_per_second(tokenize, documents)
+        results[f"{name}_distinct_terms"] = len(tokenize(documents[0]))  # type: ignore[arg-type]
+    return results
+
+
+if __name__ == "__main__":
+    print(json.dumps(run(*(int(argument) for argument in sys.argv[1:3])), indent=2))
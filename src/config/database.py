@@ -4,6 +4,8 @@ import pymongo.database as _db
 import pymongo.mongo_client as _dbClient
 import pymongo.server_api as _dbServer
 
+from ..metrics import CommandMetrics
+
 
 # !Connect to database
 def database_connect(mongodb_uri: str, database_name: str) -> _db.Database[Dict[str, Any]]:
@@ -16,9 +18,9 @@ def database_connect(mongodb_uri: str, database_name: str) -> _db.Database[Dict[
     Returns:
         _db.Database[Dict[str, Any]]: The database class
     """
-    # !Create a new client and connect to the server
+    # !Create a new client and connect to the server, timing every round trip for the metrics
     client: _dbClient.MongoClient[Dict[str, Any]] = _dbClient.MongoClient(
-        mongodb_uri, server_api=_dbServer.ServerApi("1")
+        mongodb_uri, server_api=_dbServer.ServerApi("1"), event_listeners=[CommandMetrics()]
     )
 
     # !Send a ping to confirm a successful connection to database
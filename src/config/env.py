@@ -8,4 +8,8 @@ PATH_TO_ENV: str = "./env/.env"
 load_dotenv(PATH_TO_ENV)
 
 # !Env object
-ENV: Dict[str, str] = {"MONGODB_URI": getenv("MONGODB_URI", "mongodb://localhost:27017/")}
+ENV: Dict[str, str] = {
+    "MONGODB_URI": getenv("MONGODB_URI", "mongodb://localhost:27017/"),
+    "CRAWLER_MODE": getenv("CRAWLER_MODE", "threaded"),
+    "FETCH_SESSION_STRATEGY": getenv("FETCH_SESSION_STRATEGY", "shared"),
+}
@@ -4,4 +4,8 @@ DATABASE_NAME = "search_engine"
 MONGODB_URI = ENV["MONGODB_URI"]
 TO_PARSE_DIRECTORY = "./assets/toParse"
 MAX_NUMBER_OF_THREADS = 10
+CRAWLER_MODE = ENV["CRAWLER_MODE"]
+FETCH_SESSION_STRATEGY = ENV["FETCH_SESSION_STRATEGY"]
+ASYNC_MAX_CONCURRENCY = 500
+PARSER_HANDOFF = "queue"
 DEFAULT_STARTING_LINK = "https://www.wikipedia.org/"
@@ -1,3 +1,5 @@
+from .async_crawler import AsyncCrawler
 from .crawler import Crawler
+from .fetcher import Fetcher
 
-__all__ = ["Crawler"]
+__all__ = ["Crawler", "AsyncCrawler", "Fetcher"]
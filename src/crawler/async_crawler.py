@@ -0,0 +1,378 @@
+import asyncio
+import contextlib
+import threading
+from collections import defaultdict
+from typing import Any, DefaultDict, Dict, Iterator, List, Literal
+
+import httpx
+import pymongo.database as _database
+
+from ..general import get_domain
+from ..metrics import (
+    CRAWLER_BUSY_WORKERS,
+    CRAWLER_FETCH_SECONDS,
+    CRAWLER_PAGES,
+    CRAWLER_ROBOTS_SECONDS,
+    CRAWLER_WORKERS,
+    ERRORS,
+)
+from ..pipeline import PageHandoff
+from ..storage import ContentStore
+from .body_decoder import BodyDecoder, BodyRejected, check_headers
+from .conditional_fetch import FetchedPage, get_conditional_headers
+from .constants import (
+    ASYNC_MAX_CONCURRENCY_PER_HOST,
+    ASYNC_REQUEST_TIMEOUT,
+    ASYNC_STREAM_QUEUE_PIECES,
+    FETCH_CHUNK_BYTES,
+    FETCH_CONNECT_TIMEOUT,
+    FETCH_MAX_BODY_BYTES,
+    FETCH_MAX_RETRIES,
+    FETCH_STREAM_BODIES,
+    FRONTIER_BATCH_SIZE,
+    FRONTIER_IDLE_SECONDS,
+    FRONTIER_LEASE_SECONDS,
+    RECRAWL_AFTER_SECONDS,
+    SCHEDULER_MAX_PENDING,
+)
+from .crawler import Crawler
+from .get_robots_txt_url import get_robots_txt_url
+from .robots_cache import RobotsCache, RobotsResponse, RobotsRules
+from .scheduler import DomainScheduler
+
+
+# !Asyncio crawler
+class AsyncCrawler(Crawler):
+    """
+    A crawler that keeps many fetches in flight on a single event loop instead of one blocking thread per fetch.
+
+    Robots, pause, save and error handling are shared with the threaded Crawler, database and file work is run
+    off the event loop so it never blocks the fetches.
+    """
+
+    max_concurrency_per_host: int
+    timeout: float
+    client: httpx.AsyncClient
+    host_semaphores: DefaultDict[str, asyncio.Semaphore]
+
+    def __init__(
+        self,
+        max_concurrency: int,
+        to_parse_directory: str,
+        db: _database.Database[Dict[str, Any]],
+        max_concurrency_per_host: int = ASYNC_MAX_CONCURRENCY_PER_HOST,
+        timeout: float = ASYNC_REQUEST_TIMEOUT,
+        scheduler: DomainScheduler | None = None,
+        robots_cache: RobotsCache | None = None,
+        content_store: ContentStore | None = None,
+        handoff: PageHandoff | None = None,
+        recrawl_after: float | None = RECRAWL_AFTER_SECONDS,
+        stream_bodies: bool = FETCH_STREAM_BODIES,
+    ) -> None:
+        """
+        Initializes the AsyncCrawler and starts its event loop in a background thread.
+
+        Args:
+            max_concurrency (int): The maximum number of fetches in flight at once.
+            to_parse_directory (str): The directory where crawled HTML files will be stored.
+            db (Database): The database instance used for storing and retrieving URLs.
+            max_concurrency_per_host (int, optional): The maximum number of fetches in flight for a single domain.
+            timeout (float, optional): Seconds before a fetch is abandoned.
+            scheduler (DomainScheduler | None, optional): The politeness scheduler. Defaults to a new one.
+            robots_cache (RobotsCache | None, optional): The robots.txt cache. Defaults to a new one.
+            content_store (ContentStore | None, optional): Where crawled pages are stored for the parser. Defaults
+                to the configured store in to_parse_directory.
+            handoff (PageHandoff | None, optional): Announces saved pages to the parser. Defaults to None.
+            recrawl_after (float | None, optional): Seconds after which parsed pages are queued to be crawled again,
+                None to never re-crawl. Defaults to RECRAWL_AFTER_SECONDS.
+            stream_bodies (bool, optional): Whether bodies are checked by their headers and capped at
+                FETCH_MAX_BODY_BYTES as they arrive, rather than read whole. Defaults to FETCH_STREAM_BODIES.
+        """
+        self.max_concurrency_per_host = max_concurrency_per_host
+        self.timeout = timeout
+        super().__init__(
+            max_concurrency,
+            to_parse_directory,
+            db,
+            scheduler,
+            robots_cache,
+            content_store,
+            handoff,
+            recrawl_after,
+            stream_bodies=stream_bodies,
+        )
+
+    def main(self) -> None:
+        """Runs the event loop in a background thread"""
+        threading.Thread(target=asyncio.run, args=(self.run(),), daemon=True).start()
+        self.start_recrawls()
+
+    async def run(self) -> None:
+        """Creates the HTTP client and the worker coroutines"""
+        self.host_semaphores = defaultdict(lambda: asyncio.Semaphore(self.max_concurrency_per_host))
+
+        # !Connections that fail to open are retried by the transport, like the threaded crawler's fetcher does
+        limits = httpx.Limits(
+            max_connections=self.max_number_of_threads, max_keepalive_connections=self.max_number_of_threads
+        )
+        async with httpx.AsyncClient(
+            timeout=httpx.Timeout(self.timeout, connect=FETCH_CONNECT_TIMEOUT),
+            follow_redirects=True,
+            transport=httpx.AsyncHTTPTransport(limits=limits, retries=FETCH_MAX_RETRIES),
+        ) as client:
+            self.client = client
+            workers = [asyncio.create_task(self.async_crawl_work()) for _ in range(self.max_number_of_threads)]
+            CRAWLER_WORKERS.inc(len(workers))
+            try:
+                await self.async_work()
+            finally:
+                for worker in workers:
+                    worker.cancel()
+
+    async def async_work(self) -> None:
+        """Claims links from the frontier and hands them to the scheduler"""
+        while True:
+            # !Waits while the scheduler already holds enough links
+            if self.scheduler.pending() >= SCHEDULER_MAX_PENDING:
+                await asyncio.sleep(FRONTIER_IDLE_SECONDS)
+                continue
+
+            # !Claims a batch of links, they stay invisible to other workers until the lease expires
+            links = await asyncio.to_thread(self.queue_collection.claim, FRONTIER_BATCH_SIZE, FRONTIER_LEASE_SECONDS)
+
+            # !Waits briefly if there is nothing to crawl
+            if not links:
+                await asyncio.sleep(FRONTIER_IDLE_SECONDS)
+                continue
+
+            for link in links:
+                await asyncio.to_thread(self.schedule_link, link)
+
+    async def async_crawl_work(self) -> None:
+        """Continuously processes scheduled URLs for crawling"""
+        while True:
+            # !Get the next link whose domain is allowed to fetch
+            link_in_db, wait = self.scheduler.pop_ready()
+            if link_in_db is None:
+                await asyncio.sleep(min(wait, FRONTIER_IDLE_SECONDS))
+                continue
+
+            url = str(link_in_db["url"])
+
+            # !Limits how many fetches hit the same domain at once
+            async with self.host_semaphores[get_domain(url)]:
+                with CRAWLER_BUSY_WORKERS.track_inprogress():
+                    await self.async_crawl_one(url, link_in_db)
+
+    async def async_crawl_one(self, url: str, link: Dict[str, Any] | None = None) -> None:
+        """Crawls a single scheduled URL with the same semantics as Crawler.crawl_work
+
+        Args:
+            url (str): The URL to crawl.
+            link (Dict[str, Any] | None, optional): The scheduled link, with the validators of a re-crawl.
+        """
+        link = link or {}
+        domain = get_domain(url)
+
+        # !Check robot.txt
+        robots = await self.async_get_robots_txt(url)
+        if not isinstance(robots, RobotsRules):
+            await asyncio.to_thread(self.handle_error, robots[0], url, link)
+            return
+        self.scheduler.set_crawl_delay(domain, robots.crawl_delay)
+        if not robots.is_allowed(url):
+            CRAWLER_PAGES.labels("disallowed").inc()
+            await asyncio.to_thread(self.queue_collection.remove, {"url": url})
+            return
+
+        # !Get HTML, conditionally if the link is a re-crawl
+        response = await self.async_crawl_link(url, link)
+
+        # !Error management
+        if not isinstance(response, FetchedPage):
+            await asyncio.to_thread(self.handle_error, response[0], url, link)
+            return
+
+        # !Save HTML
+        self.scheduler.success(domain)
+        await asyncio.to_thread(self.save_page, response, url, link.get("content_hash", ""))
+
+    async def async_crawl_link(
+        self, url: str, link: Dict[str, Any] | None = None
+    ) -> FetchedPage | List[Literal["Not found"] | Literal["Overload"] | Literal["Error"] | Literal["Rejected"]]:
+        """
+        Crawls the given url without blocking the event loop
+
+        Args:
+            url(str): The URL to crawl.
+            link(Dict[str, Any] | None, optional): The queued link, whose validators make the request conditional.
+
+        Returns:
+            FetchedPage or List[str]: The response of the provided url or error message
+        """
+        headers = get_conditional_headers(link or {})
+        with CRAWLER_FETCH_SECONDS.time():
+            try:
+                if not self.stream_bodies:
+                    response = await self.client.get(url, headers=headers)
+                    self.report_overload(url, response.status_code, response.headers.get("Retry-After"))
+                    return self.map_fetched(response.status_code, response.text, response.headers)
+
+                async with self.client.stream("GET", url, headers=headers) as response:
+                    self.report_overload(url, response.status_code, response.headers.get("Retry-After"))
+                    if response.status_code in (200, 201):
+                        return await self.async_read_page(response)
+
+                    # !Only the status of other responses is used, their bodies are dropped
+                    await self.async_discard_body(response)
+                    return self.map_fetched(response.status_code, "", response.headers)
+            except httpx.HTTPError as error:
+                ERRORS.labels("crawler", type(error).__name__).inc()
+                return ["Error"]
+
+    async def async_read_page(
+        self, response: httpx.Response
+    ) -> FetchedPage | List[Literal["Error"] | Literal["Rejected"]]:
+        """Streams the body of a successful response to the content store as it arrives, unless its headers rule it
+        out
+
+        Args:
+            response(httpx.Response): The streamed response, with its body not read yet.
+
+        Returns:
+            FetchedPage or List[str]: The page, saved under its file_name, or error message
+        """
+        decoder = BodyDecoder(response.headers.get("Content-Type"), FETCH_MAX_BODY_BYTES)
+        try:
+            check_headers(response.headers, FETCH_MAX_BODY_BYTES)
+        except BodyRejected as error:
+            ERRORS.labels("crawler", type(error).__name__).inc()
+            return ["Rejected"]
+
+        # !The content store blocks, so it runs in a thread that takes the text from a bounded queue. The download
+        # !waits while the queue is full, so no more than ASYNC_STREAM_QUEUE_PIECES pieces are held at once.
+        pieces: asyncio.Queue[str | BaseException | None] = asyncio.Queue(ASYNC_STREAM_QUEUE_PIECES)
+        store = asyncio.ensure_future(
+            asyncio.to_thread(self.content_store.put_stream, iter_pieces(pieces, asyncio.get_running_loop()))
+        )
+        try:
+            async for chunk in response.aiter_bytes(FETCH_CHUNK_BYTES):
+                await put_piece(pieces, store, decoder.feed(chunk))
+            await put_piece(pieces, store, decoder.finish())
+            await put_piece(pieces, store, None)
+            file_name = await store
+        except (BodyRejected, httpx.HTTPError) as error:
+            # !The store is handed the error, so a body that stopped coming leaves nothing behind
+            ERRORS.labels("crawler", type(error).__name__).inc()
+            stop_pieces(pieces, error)
+            with contextlib.suppress(type(error)):
+                await store
+            return ["Rejected"] if isinstance(error, BodyRejected) else ["Error"]
+        except asyncio.CancelledError as error:
+            stop_pieces(pieces, error)
+            raise
+
+        return FetchedPage.from_headers(None, response.headers, file_name, decoder.get_content_hash())
+
+    @staticmethod
+    async def async_discard_body(response: httpx.Response) -> None:
+        """Reads and drops the body of a response so its connection can be reused, stopping once it is too large
+
+        Args:
+            response(httpx.Response): The streamed response, with its body not read yet.
+        """
+        size = 0
+        async for chunk in response.aiter_bytes(FETCH_CHUNK_BYTES):
+            size += len(chunk)
+            if size > FETCH_MAX_BODY_BYTES:
+                return
+
+    async def async_get_robots_txt(self, url: str) -> RobotsRules | List[Literal["Overload"]]:
+        """Gets the robots.txt rules for a certain link without blocking the event loop
+
+        Args:
+            url(str): The URL to get robot.txt of.
+
+        Returns:
+            RobotsRules | List[str]: The robot txt rules or the error message
+        """
+        with CRAWLER_ROBOTS_SECONDS.time():
+            return await self.robots_cache.async_get(get_robots_txt_url(url), self.async_fetch_robots_txt)
+
+    async def async_fetch_robots_txt(self, robots_txt_url: str) -> RobotsResponse:
+        """Fetches a robots.txt file without blocking the event loop
+
+        Args:
+            robots_txt_url(str): The URL of the robots.txt file.
+
+        Returns:
+            RobotsResponse: The robot txt content or the error message, and the response headers
+        """
+        try:
+            response = await self.client.get(robots_txt_url)
+        except httpx.HTTPError as error:
+            ERRORS.labels("crawler", type(error).__name__).inc()
+            # !Unreachable hosts are treated as having no robots.txt, but only for the minimum TTL
+            return "", {"Cache-Control": "no-store"}
+        self.report_overload(robots_txt_url, response.status_code, response.headers.get("Retry-After"))
+
+        return self.map_robots_txt_response(response.status_code, response.text), response.headers
+
+
+def iter_pieces(pieces: asyncio.Queue[str | BaseException | None], loop: asyncio.AbstractEventLoop) -> Iterator[str]:
+    """Takes the pieces of a body from a queue filled on the event loop, in the thread that stores them
+
+    Args:
+        pieces (asyncio.Queue[str | BaseException | None]): The queue, None once the body ended or the error that
+            stopped it.
+        loop (asyncio.AbstractEventLoop): The event loop the queue belongs to.
+
+    Returns:
+        Iterator[str]: The pieces of the text
+
+    Raises:
+        BaseException: The error that stopped the body
+    """
+    while (piece := asyncio.run_coroutine_threadsafe(pieces.get(), loop).result()) is not None:
+        if isinstance(piece, BaseException):
+            raise piece
+        yield piece
+
+
+async def put_piece(
+    pieces: asyncio.Queue[str | BaseException | None], store: asyncio.Future[str], piece: str | None
+) -> None:
+    """Puts a piece of a body in the queue, waiting while it is full unless the store stopped taking pieces
+
+    Args:
+        pieces (asyncio.Queue[str | BaseException | None]): The queue.
+        store (asyncio.Future[str]): The store of the body.
+        piece (str | None): The piece, None once the body ended.
+
+    Raises:
+        Exception: The error that stopped the store
+    """
+    # !Text held back while the charset is sniffed comes as empty pieces
+    if piece == "":
+        return
+    if not pieces.full():
+        pieces.put_nowait(piece)
+        return
+
+    put = asyncio.ensure_future(pieces.put(piece))
+    await asyncio.wait((put, store), return_when=asyncio.FIRST_COMPLETED)
+    if not put.done():
+        put.cancel()
+        await store
+
+
+def stop_pieces(pieces: asyncio.Queue[str | BaseException | None], error: BaseException) -> None:
+    """Drops the pieces of a body that were not stored yet and hands the store the error that stopped it
+
+    Args:
+        pieces (asyncio.Queue[str | BaseException | None]): The queue.
+        error (BaseException): The error.
+    """
+    while not pieces.empty():
+        pieces.get_nowait()
+    pieces.put_nowait(error)
@@ -0,0 +1,197 @@
+import codecs
+import hashlib
+import re
+from typing import Iterable, Iterator, Mapping
+
+from .constants import CONTENT_HASH_BYTES, FETCH_CHARSET_SNIFF_BYTES, FETCH_HTML_CONTENT_TYPES, FETCH_MAX_BODY_BYTES
+
+# !Charset declared in a <meta charset> or <meta http-equiv="Content-Type"> tag
+META_CHARSET = re.compile(rb"<meta[^>]*?charset\s*=\s*[\"']?\s*([a-z0-9_.:-]+)", re.IGNORECASE)
+
+# !Byte order marks, which win over every declared charset
+BYTE_ORDER_MARKS = ((codecs.BOM_UTF8, "utf-8-sig"), (codecs.BOM_UTF16_LE, "utf-16"), (codecs.BOM_UTF16_BE, "utf-16"))
+
+# !Like browsers, pages labelled latin-1 or ascii are decoded as windows-1252, which they nearly always are
+WINDOWS_1252_ALIASES = ("latin-1", "iso8859-1", "ascii")
+
+
+class BodyRejected(Exception):
+    """The body of a response is not HTML or is larger than the limit"""
+
+
+def check_headers(headers: Mapping[str, str], max_bytes: int = FETCH_MAX_BODY_BYTES) -> None:
+    """Checks the headers of a response before its body is read
+
+    Args:
+        headers (Mapping[str, str]): The response headers, looked up case insensitively.
+        max_bytes (int, optional): The largest body that is read. Defaults to FETCH_MAX_BODY_BYTES.
+
+    Raises:
+        BodyRejected: If the body is not HTML, or the server announced a body larger than the limit
+    """
+    # !Servers that send no content type are given the benefit of the doubt
+    media_type = (headers.get("Content-Type") or "").split(";")[0].strip().lower()
+    if media_type and media_type not in FETCH_HTML_CONTENT_TYPES:
+        raise BodyRejected(f"Content type {media_type} is not HTML")
+
+    # !The length is of the compressed body, so a body announced past the limit is past it once decompressed too
+    length = headers.get("Content-Length") or ""
+    if length.isdigit() and int(length) > max_bytes:
+        raise BodyRejected(f"Body of {length} bytes is larger than {max_bytes} bytes")
+
+
+def get_codec(charset: str | None) -> str | None:
+    """Gets the codec of a charset label
+
+    Args:
+        charset (str | None): The charset label.
+
+    Returns:
+        str | None: The codec name, None if the label is unknown
+    """
+    if not charset:
+        return None
+    try:
+        name = codecs.lookup(charset.strip("\"' ")).name
+    except LookupError:
+        return None
+    return "cp1252" if name in WINDOWS_1252_ALIASES else name
+
+
+def get_charset(content_type: str | None, head: bytes) -> str:
+    """Gets the charset of a body the way browsers do: byte order mark, then header, then meta tag, then UTF-8
+
+    Args:
+        content_type (str | None): The Content-Type header.
+        head (bytes): The start of the body.
+
+    Returns:
+        str: The codec to decode the body with
+    """
+    for mark, codec in BYTE_ORDER_MARKS:
+        if head.startswith(mark):
+            return codec
+
+    for parameter in (content_type or "").split(";")[1:]:
+        name, _, value = parameter.partition("=")
+        if name.strip().lower() == "charset" and (codec := get_codec(value)):
+            return codec
+
+    match = META_CHARSET.search(head[:FETCH_CHARSET_SNIFF_BYTES])
+    codec = get_codec(match.group(1).decode("ascii")) if match else None
+
+    # !A meta tag can't be read in UTF-16 unless the page isn't UTF-16, so it is taken to mean UTF-8
+    return "utf-8" if codec is None or codec.startswith("utf-16") else codec
+
+
+# !Body decoder
+class BodyDecoder:
+    """
+    Decodes a body as its chunks arrive, enforcing the size limit and hashing the text on the way.
+
+    The charset is picked once, from the byte order mark, the Content-Type header or a meta tag in the first
+    FETCH_CHARSET_SNIFF_BYTES, so only that much of the body is held back. Bytes that don't fit the charset are
+    replaced rather than failing the page.
+    """
+
+    def __init__(self, content_type: str | None, max_bytes: int = FETCH_MAX_BODY_BYTES) -> None:
+        """Initializes the decoder
+
+        Args:
+            content_type (str | None): The Content-Type header of the response.
+            max_bytes (int, optional): The largest body that is read. Defaults to FETCH_MAX_BODY_BYTES.
+        """
+        self.content_type = content_type
+        self.max_bytes = max_bytes
+        self.size = 0
+        self.head = b""
+        self.charset = ""
+        self.decoder: codecs.IncrementalDecoder | None = None
+        self.hash = hashlib.blake2b(digest_size=CONTENT_HASH_BYTES)
+
+    def feed(self, chunk: bytes) -> str:
+        """Decodes the next chunk of the body
+
+        Args:
+            chunk (bytes): The chunk, already decompressed.
+
+        Returns:
+            str: The text decoded so far, empty while the charset is still being sniffed
+
+        Raises:
+            BodyRejected: If the body grew larger than the limit
+        """
+        self.size += len(chunk)
+        if self.size > self.max_bytes:
+            raise BodyRejected(f"Body is larger than {self.max_bytes} bytes")
+
+        decoder = self.decoder
+        if decoder is None:
+            self.head += chunk
+            if len(self.head) < FETCH_CHARSET_SNIFF_BYTES:
+                return ""
+            chunk, self.head = self.head, b""
+            decoder = self.start(chunk)
+
+        return self.hashed(decoder.decode(chunk))
+
+    def finish(self) -> str:
+        """Decodes whatever is left once the body ended
+
+        Returns:
+            str: The rest of the text
+        """
+        chunk, self.head = self.head, b""
+        decoder = self.decoder or self.start(chunk)
+        return self.hashed(decoder.decode(chunk, final=True))
+
+    def decode(self, chunks: Iterable[bytes]) -> Iterator[str]:
+        """Decodes a whole body
+
+        Args:
+            chunks (Iterable[bytes]): The chunks of the body.
+
+        Returns:
+            Iterator[str]: The pieces of the text
+
+        Raises:
+            BodyRejected: If the body grew larger than the limit
+        """
+        for chunk in chunks:
+            if text := self.feed(chunk):
+                yield text
+        if text := self.finish():
+            yield text
+
+    def start(self, head: bytes) -> codecs.IncrementalDecoder:
+        """Picks the charset from the start of the body
+
+        Args:
+            head (bytes): The start of the body.
+
+        Returns:
+            codecs.IncrementalDecoder: The decoder of the charset
+        """
+        self.charset = get_charset(self.content_type, head)
+        self.decoder = codecs.getincrementaldecoder(self.charset)(errors="replace")
+        return self.decoder
+
+    def hashed(self, text: str) -> str:
+        """Adds decoded text to the content hash
+
+        Args:
+            text (str): The text.
+
+        Returns:
+            str: The same text
+        """
+        self.hash.update(text.encode("utf-8", "surrogatepass"))
+        return text
+
+    def get_content_hash(self) -> str:
+        """Gets the content hash of the text decoded so far, equal to hash_content of the whole text
+
+        Returns:
+            str: The hex digest
+        """
+        return self.hash.hexdigest()
@@ -0,0 +1,82 @@
+import hashlib
+from typing import Any, Dict, Mapping, NamedTuple
+
+from .constants import CONTENT_HASH_BYTES
+
+
+# !Fetched page
+class FetchedPage(NamedTuple):
+    """
+    A successful fetch and the validators the server sent with it.
+
+    text is None for a 304 Not Modified, and for a body that was streamed straight to the content store, which is then
+    saved under file_name with the content_hash of its text.
+    """
+
+    text: str | None
+    etag: str = ""
+    last_modified: str = ""
+    file_name: str = ""
+    content_hash: str = ""
+
+    @classmethod
+    def from_headers(
+        cls, text: str | None, headers: Mapping[str, str], file_name: str = "", content_hash: str = ""
+    ) -> "FetchedPage":
+        """Creates the fetched page from the response headers
+
+        Args:
+            text (str | None): The body of the response, None if the page was not modified or was streamed
+            headers (Mapping[str, str]): The response headers, looked up case insensitively
+            file_name (str, optional): The key of the streamed body in the content store. Defaults to "".
+            content_hash (str, optional): The content hash of the streamed body. Defaults to "".
+
+        Returns:
+            FetchedPage: The fetched page
+        """
+        return cls(text, headers.get("ETag") or "", headers.get("Last-Modified") or "", file_name, content_hash)
+
+    def is_modified(self) -> bool:
+        """Checks if the server sent a body, rather than 304 Not Modified
+
+        Returns:
+            bool: Whether there is a body, in text or in the content store
+        """
+        return self.text is not None or bool(self.file_name)
+
+    def get_validators(self) -> Dict[str, str]:
+        """Gets the validators the server sent, in the fields of the crawled collection
+
+        Returns:
+            Dict[str, str]: The etag and last_modified that were sent
+        """
+        return {name: value for name, value in (("etag", self.etag), ("last_modified", self.last_modified)) if value}
+
+
+def get_conditional_headers(link: Dict[str, Any]) -> Dict[str, str]:
+    """Gets the headers that make the server answer 304 Not Modified if the page did not change since the last crawl
+
+    Args:
+        link (Dict[str, Any]): The queued link, with the etag and last_modified of its last crawl if it is a re-crawl
+
+    Returns:
+        Dict[str, str]: The If-None-Match and If-Modified-Since headers, empty for a first crawl
+    """
+    headers = {}
+    if link.get("etag"):
+        headers["If-None-Match"] = link["etag"]
+    if link.get("last_modified"):
+        headers["If-Modified-Since"] = link["last_modified"]
+    return headers
+
+
+def hash_content(content: str) -> str:
+    """Hashes the body of a page, to tell if a re-crawled page changed when the server sent no validators
+
+    Args:
+        content (str): The body of the page
+
+    Returns:
+        str: The hex digest
+    """
+    return hashlib.blake2b(content.encode("utf-8", "surrogatepass"), digest_size=CONTENT_HASH_BYTES).hexdigest()
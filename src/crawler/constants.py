@@ -1 +1,36 @@
 BOT_NAME: str = "FrostBot"
+FRONTIER_BATCH_SIZE: int = 10
+FRONTIER_LEASE_SECONDS: float = 900
+FRONTIER_IDLE_SECONDS: float = 1
+ASYNC_MAX_CONCURRENCY_PER_HOST: int = 4
+ASYNC_REQUEST_TIMEOUT: float = 30
+ASYNC_STREAM_QUEUE_PIECES: int = 16
+SCHEDULER_DEFAULT_RATE: float = 1
+SCHEDULER_DEFAULT_BURST: float = 2
+SCHEDULER_BACKOFF_BASE_SECONDS: float = 5
+SCHEDULER_BACKOFF_MAX_SECONDS: float = 600
+SCHEDULER_MAX_BACKOFFS: int = 5
+SCHEDULER_MAX_WAIT_SECONDS: float = 60
+SCHEDULER_MAX_PENDING: int = 1000
+SCHEDULER_IDLE_SECONDS: float = 600
+ROBOTS_CACHE_TTL_SECONDS: float = 24 * 60 * 60
+ROBOTS_CACHE_MIN_TTL_SECONDS: float = 60
+ROBOTS_CACHE_MAX_TTL_SECONDS: float = 24 * 60 * 60
+ROBOTS_CACHE_MAX_BYTES: int = 64 * 1024 * 1024
+ROBOTS_CACHE_PERSIST: bool = True
+ROBOTS_CACHE_BYTES_PER_RULE: int = 512
+ROBOTS_SEGMENT_KEY_LENGTH: int = 4
+RECRAWL_AFTER_SECONDS: float = 7 * 24 * 60 * 60
+RECRAWL_BATCH_SIZE: int = 100
+RECRAWL_IDLE_SECONDS: float = 60
+FETCH_CONNECT_TIMEOUT: float = 5
+FETCH_READ_TIMEOUT: float = 30
+FETCH_MAX_RETRIES: int = 2
+FETCH_RETRY_BACKOFF: float = 0.5
+FETCH_POOL_HOSTS: int = 100
+FETCH_STREAM_BODIES: bool = True
+FETCH_MAX_BODY_BYTES: int = 10 * 1024 * 1024
+FETCH_CHUNK_BYTES: int = 64 * 1024
+FETCH_HTML_CONTENT_TYPES: tuple[str, ...] = ("text/html", "application/xhtml+xml")
+FETCH_CHARSET_SNIFF_BYTES: int = 1024
+CONTENT_HASH_BYTES: int = 16
@@ -1,27 +1,51 @@
-import queue as _queue
-import secrets
 import threading
-from pathlib import Path
-from time import sleep
-from typing import Any, Dict, List, Literal, NoReturn
+from functools import cached_property
+from time import sleep, time
+from typing import Any, Dict, List, Literal, Mapping, NoReturn
 
 import pymongo.database as _database
-from requests.sessions import Session
-
-from src.general.create_file import create_file
+import requests
 
 from ..general import get_domain
+from ..metrics import (
+    CRAWLER_BUSY_WORKERS,
+    CRAWLER_FETCH_SECONDS,
+    CRAWLER_PAGES,
+    CRAWLER_ROBOTS_SECONDS,
+    CRAWLER_WORKERS,
+    ERRORS,
+)
 from ..models import Crawled as _crawled_collection
 from ..models import FailedCrawled as _failed_crawled_collection
 from ..models import Pause as _pause_collection
 from ..models import Queue as _queue_collection
-from .check_robots_txt import check_robots_txt as _check_robots_txt
-from .constants import BOT_NAME
+from ..models import Robots as _robots_collection
+from ..pipeline import PageHandoff
+from ..storage import ContentStore, create_content_store
+from .body_decoder import BodyDecoder, BodyRejected, check_headers
+from .conditional_fetch import FetchedPage, get_conditional_headers, hash_content
+from .constants import (
+    FETCH_CHUNK_BYTES,
+    FETCH_MAX_BODY_BYTES,
+    FETCH_STREAM_BODIES,
+    FRONTIER_BATCH_SIZE,
+    FRONTIER_IDLE_SECONDS,
+    FRONTIER_LEASE_SECONDS,
+    RECRAWL_AFTER_SECONDS,
+    RECRAWL_BATCH_SIZE,
+    RECRAWL_IDLE_SECONDS,
+    ROBOTS_CACHE_PERSIST,
+    SCHEDULER_MAX_BACKOFFS,
+    SCHEDULER_MAX_PENDING,
+)
+from .fetcher import Fetcher
 from .get_robots_txt_url import get_robots_txt_url
+from .robots_cache import RobotsCache, RobotsResponse, RobotsRules
+from .scheduler import DomainScheduler, parse_retry_after
 
 
 # !This is the main crawler
-class Crawler:
+class Crawler:  # pylint: disable=too-many-instance-attributes
     """
     A class that implements a web crawler to fetch and store HTML content from specified URLs while adhering to the rules defined in robots.txt.
     """
@@ -33,14 +57,26 @@ class Crawler:
     crawled: _crawled_collection
     pause: _pause_collection
     failed_crawled: _failed_crawled_collection
-    threadTasks: _queue.Queue[float] = _queue.Queue()
-    session = Session()
+    scheduler: DomainScheduler
+    robots_cache: RobotsCache
+    content_store: ContentStore
+    handoff: PageHandoff | None
+    recrawl_after: float | None
+    fetcher: Fetcher
+    stream_bodies: bool
 
     def __init__(
         self,
         max_numbers_of_threads: int,
         to_parse_directory: str,
         db: _database.Database[Dict[str, Any]],
+        scheduler: DomainScheduler | None = None,
+        robots_cache: RobotsCache | None = None,
+        content_store: ContentStore | None = None,
+        handoff: PageHandoff | None = None,
+        recrawl_after: float | None = RECRAWL_AFTER_SECONDS,
+        fetcher: Fetcher | None = None,
+        stream_bodies: bool = FETCH_STREAM_BODIES,
     ) -> None:
         """
         Initializes the Crawler with the specified parameters for concurrent web crawling.
@@ -49,10 +85,29 @@ class Crawler:
             max_numbers_of_threads (int): The maximum number of threads to use for crawling.
             to_parse_directory (str): The directory where crawled HTML files will be stored.
             db (Database): The database instance used for storing and retrieving URLs.
+            scheduler (DomainScheduler | None, optional): The politeness scheduler. Defaults to a new one.
+            robots_cache (RobotsCache | None, optional): The robots.txt cache. Defaults to a new one.
+            content_store (ContentStore | None, optional): Where crawled pages are stored for the parser. Defaults
+                to the configured store in to_parse_directory.
+            handoff (PageHandoff | None, optional): Announces saved pages to the parser. Defaults to None.
+            recrawl_after (float | None, optional): Seconds after which parsed pages are queued to be crawled again,
+                None to never re-crawl. Defaults to RECRAWL_AFTER_SECONDS.
+            fetcher (Fetcher | None, optional): The HTTP layer. Defaults to one pooling a connection per thread.
+            stream_bodies (bool, optional): Whether bodies are checked by their headers, capped at
+                FETCH_MAX_BODY_BYTES and written to the content store as they arrive, rather than read whole.
+                Defaults to FETCH_STREAM_BODIES.
         """
         self.max_number_of_threads = max_numbers_of_threads
         self.to_parse_directory = to_parse_directory
         self.db = db
+        self.scheduler = scheduler or DomainScheduler()
+        self.robots_cache = robots_cache or RobotsCache(_robots_collection(self.db) if ROBOTS_CACHE_PERSIST else None)
+        self.content_store = content_store or create_content_store(to_parse_directory)
+        self.handoff = handoff
+        self.recrawl_after = recrawl_after
+        if fetcher is not None:
+            self.fetcher = fetcher
+        self.stream_bodies = stream_bodies
 
         self.queue_collection = _queue_collection(self.db)
         self.crawled_collection = _crawled_collection(self.db)
@@ -62,155 +117,388 @@ class Crawler:
         # !Start the main crawling process
         self.main()
 
+    @cached_property
+    def fetcher(self) -> Fetcher:
+        """The HTTP layer, pooling a connection per thread. Built on first use, so the async engine, which brings its
+        own client, never opens a pool."""
+        return Fetcher(self.max_number_of_threads)
+
     def main(self) -> None:
         """Creates the threads needed by the crawler"""
         threading.Thread(target=self.work, daemon=True).start()
         for _ in range(self.max_number_of_threads - 1):
             threading.Thread(target=self.crawl_work, daemon=True).start()
+        CRAWLER_WORKERS.inc(self.max_number_of_threads - 1)
+        self.start_recrawls()
 
-    def work(self) -> NoReturn:
-        """Assigns work for threads to do"""
-        while True:
-            # !Assigns the first 10 links in queue the crawler threads
-            for i in range(10):
-                try:
-                    self.threadTasks.put(float(self.queue_collection.get()[i]["id"]))
-                except IndexError:
-                    break
+    def start_recrawls(self) -> None:
+        """Starts queueing stale pages to be crawled again, unless re-crawling is off"""
+        if self.recrawl_after is not None:
+            threading.Thread(target=self.recrawl_work, args=(self.recrawl_after,), daemon=True).start()
 
-            # !Waits for all tasks to be completed
-            self.threadTasks.join()
+    def recrawl_work(self, recrawl_after: float) -> NoReturn:
+        """Queues the parsed pages that were crawled more than recrawl_after seconds ago, with their validators
 
-            # !Waits for 10 seconds before continuing
-            sleep(10)
+        Args:
+            recrawl_after (float): Seconds after which a page is crawled again
+        """
+        while True:
+            pages = self.crawled_collection.claim_recrawls(time() - recrawl_after, RECRAWL_BATCH_SIZE)
+            self.queue_collection.add_recrawls(pages)
 
-    def crawl_work(self) -> NoReturn:
-        """Continuously processes URLs from the queue for crawling"""
+            # !Waits once every stale page is queued
+            if len(pages) < RECRAWL_BATCH_SIZE:
+                sleep(RECRAWL_IDLE_SECONDS)
 
+    def work(self) -> NoReturn:
+        """Claims links from the frontier and hands them to the scheduler"""
         while True:
-            # !Get link from database
-            link_in_db = self.queue_collection.get_one({"id": self.threadTasks.get()})
-
-            # !Checks if link does not exist
-            if link_in_db is None:
-                self.complete_task()
+            # !Waits while the scheduler already holds enough links
+            if self.scheduler.pending() >= SCHEDULER_MAX_PENDING:
+                sleep(FRONTIER_IDLE_SECONDS)
                 continue
 
-            # !Checks if we are to pause on crawling the link
-            if self.paused_collection.get_one({"url": get_domain(link_in_db["url"])}):
-                self.complete_task()
-                continue
+            # !Claims a batch of links, they stay invisible to other workers until the lease expires
+            links = self.queue_collection.claim(FRONTIER_BATCH_SIZE, FRONTIER_LEASE_SECONDS)
 
-            # !Check robot.txt
-            robot_txt = self.get_robots_txt(str(link_in_db["url"]))
-            if not isinstance(robot_txt, str):
-                self.handle_error(robot_txt[0], link_in_db["url"])
+            # !Waits briefly if there is nothing to crawl
+            if not links:
+                sleep(FRONTIER_IDLE_SECONDS)
                 continue
-            if not _check_robots_txt(str(link_in_db["url"]), robot_txt, BOT_NAME):
-                self.queue_collection.remove({"url": link_in_db["url"]})
-                self.complete_task()
 
-            # !Get HTML
-            response = self.crawl_link(link_in_db["url"])
+            for link in links:
+                self.schedule_link(link)
 
-            # !Error management
-            if not isinstance(response, str):
-                self.handle_error(response[0], link_in_db["url"])
-                continue
+    def schedule_link(self, link: Dict[str, Any]) -> None:
+        """Hands a claimed link to the scheduler, or back to the queue if its domain can't fetch it soon
+
+        Args:
+            link (Dict[str, Any]): The claimed link
+        """
+        domain = get_domain(link["url"])
 
-            # !Save HTML
-            self.save_html(response, link_in_db["url"])
-            self.complete_task()
+        # !The pause collection is only checked the first time a domain is seen
+        if not self.scheduler.knows(domain) and (
+            paused := self.paused_collection.get_one({"url": domain}, fields=["exp_date"])
+        ):
+            self.scheduler.pause(domain, paused["exp_date"])
 
-    def complete_task(self) -> None:
-        """Marks the current task as completed"""
-        self.threadTasks.task_done()
+        if not self.scheduler.add(link):
+            self.queue_collection.release(link["url"], self.scheduler.wait_time(domain))
+
+    def crawl_work(self) -> NoReturn:
+        """Continuously processes URLs from the queue for crawling"""
+
+        while True:
+            # !Get the next link whose domain is allowed to fetch
+            link_in_db = self.scheduler.get()
+            url = str(link_in_db["url"])
+            domain = get_domain(url)
+
+            with CRAWLER_BUSY_WORKERS.track_inprogress():
+                # !Check robot.txt
+                robots = self.get_robots_txt(url)
+                if not isinstance(robots, RobotsRules):
+                    self.handle_error(robots[0], url, link_in_db)
+                    continue
+                self.scheduler.set_crawl_delay(domain, robots.crawl_delay)
+                if not robots.is_allowed(url):
+                    CRAWLER_PAGES.labels("disallowed").inc()
+                    self.queue_collection.remove({"url": url})
+                    continue
+
+                # !Get HTML, conditionally if the link is a re-crawl
+                response = self.crawl_link(url, link_in_db)
+
+                # !Error management
+                if not isinstance(response, FetchedPage):
+                    self.handle_error(response[0], url, link_in_db)
+                    continue
+
+                # !Save HTML
+                self.scheduler.success(domain)
+                self.save_page(response, url, link_in_db.get("content_hash", ""))
 
     def handle_error(
-        self, error_message: Literal["Not found"] | Literal["Overload"] | Literal["Error"], url: str
+        self,
+        error_message: Literal["Not found"] | Literal["Overload"] | Literal["Error"] | Literal["Rejected"],
+        url: str,
+        link: Dict[str, Any] | None = None,
     ) -> None:
         """Handles errors encountered during the crawling process.
 
         Args:
-            error_message(str): The type of error encountered, which can be "Not found", "Overload", or "Error".
+            error_message(str): The type of error encountered, which can be "Not found", "Overload", "Error" or
+                "Rejected" for a body that is not HTML or is too large.
             url: The URL associated with the error.
+            link(Dict[str, Any] | None, optional): The claimed link, with the validators of a re-crawl. Defaults to
+                the url alone.
 
         Returns:
             None
         """
+        CRAWLER_PAGES.labels(error_message.lower().replace(" ", "_")).inc()
         if error_message == "Overload":
-            self.paused_collection.add(get_domain(url))
+            self.handle_overload(link or {"url": url})
         elif error_message == "Error":
             self.queue_collection.remove({"url": url})
         elif error_message == "Not found":
-            self.failed_crawled.add(url, "not found")
-        self.complete_task()
+            self.queue_collection.remove({"url": url})
+            self.failed_crawled_collection.add(url, "not found")
+        elif error_message == "Rejected":
+            self.queue_collection.remove({"url": url})
+            self.failed_crawled_collection.add(url, "rejected")
+
+    def handle_overload(self, link: Dict[str, Any]) -> None:
+        """Retries the link once its domain's backoff is over, pausing the domain once the backoffs keep failing
+
+        Args:
+            link(Dict[str, Any]): The claimed link that was answered with an overload, kept whole so a re-crawl
+                is retried with its validators.
+
+        Returns:
+            None
+        """
+        domain = get_domain(link["url"])
+
+        # !Short in-memory backoff
+        if self.scheduler.failures(domain) < SCHEDULER_MAX_BACKOFFS:
+            self.schedule_link(link)
+            return
 
-    def crawl_link(self, url: str) -> str | List[Literal["Not found"] | Literal["Overload"] | Literal["Error"]]:
+        # !Pauses the domain and hands its links back to the queue until the pause expires
+        paused = self.paused_collection.add(domain)
+        for paused_link in [link, *self.scheduler.pause(domain, paused["exp_date"])]:
+            self.queue_collection.release(paused_link["url"], paused["exp_date"] - time())
+
+    def crawl_link(
+        self, url: str, link: Dict[str, Any] | None = None
+    ) -> FetchedPage | List[Literal["Not found"] | Literal["Overload"] | Literal["Error"] | Literal["Rejected"]]:
         """
         Crawls the given url
 
         Args:
             url(str): The URL to crawl.
+            link(Dict[str, Any] | None, optional): The queued link, whose validators make the request conditional.
 
         Returns:
-            str or List[str]: The response of the provided url or error message
+            FetchedPage or List[str]: The response of the provided url or error message
         """
-        # !Send request
-        response = self.session.get(url)
+        with CRAWLER_FETCH_SECONDS.time():
+            # !Send request, connections that keep failing or hang are given up on
+            try:
+                response = self.fetcher.get(url, headers=get_conditional_headers(link or {}), stream=self.stream_bodies)
+            except requests.RequestException as error:
+                ERRORS.labels("crawler", type(error).__name__).inc()
+                return ["Error"]
+            self.report_overload(url, response.status_code, response.headers.get("Retry-After"))
+
+            if not self.stream_bodies:
+                return self.map_fetched(response.status_code, response.text, response.headers)
+            if response.status_code in (200, 201):
+                return self.stream_page(response)
+
+            # !Only the status of other responses is used, their bodies are dropped
+            self.discard_body(response)
+            return self.map_fetched(response.status_code, "", response.headers)
+
+    def stream_page(self, response: requests.Response) -> FetchedPage | List[Literal["Error"] | Literal["Rejected"]]:
+        """Streams the body of a successful response to the content store, unless its headers rule it out
 
-        # !Check status code
-        status_code_map: Dict[int, str | List[Literal["Not found"] | Literal["Overload"] | Literal["Error"]]] = {
-            200: response.text,
-            201: response.text,
-            **{code: ["Not found"] for code in range(400, 429)},
-            **{code: ["Overload"] for code in range(429, 504)},
-        }
+        Args:
+            response(requests.Response): The response, with its body not read yet.
 
-        return status_code_map.get(response.status_code, ["Error"])
+        Returns:
+            FetchedPage or List[str]: The page, saved under its file_name, or error message
+        """
+        decoder = BodyDecoder(response.headers.get("Content-Type"), FETCH_MAX_BODY_BYTES)
+        try:
+            check_headers(response.headers, FETCH_MAX_BODY_BYTES)
+            file_name = self.content_store.put_stream(decoder.decode(response.iter_content(FETCH_CHUNK_BYTES)))
+        except (BodyRejected, requests.RequestException) as error:
+            # !The rest of the body is never downloaded, its connection is dropped instead
+            ERRORS.labels("crawler", type(error).__name__).inc()
+            response.close()
+            return ["Rejected"] if isinstance(error, BodyRejected) else ["Error"]
+
+        return FetchedPage.from_headers(None, response.headers, file_name, decoder.get_content_hash())
+
+    @staticmethod
+    def discard_body(response: requests.Response) -> None:
+        """Reads and drops the body of a response so its connection can be reused, or drops the connection if the
+        body is too large
+
+        Args:
+            response(requests.Response): The response, with its body not read yet.
+        """
+        size = 0
+        try:
+            for chunk in response.iter_content(FETCH_CHUNK_BYTES):
+                size += len(chunk)
+                if size > FETCH_MAX_BODY_BYTES:
+                    break
+        except requests.RequestException:
+            pass
+        response.close()
+
+    def report_overload(self, url: str, status_code: int, retry_after: str | None) -> None:
+        """Backs the domain off in the scheduler if the server is overloaded
+
+        Args:
+            url(str): The URL that was requested.
+            status_code(int): The status code of the response.
+            retry_after(str | None): The Retry-After header of the response.
+        """
+        if 429 <= status_code <= 503:
+            self.scheduler.backoff(get_domain(url), parse_retry_after(retry_after))
+
+    @staticmethod
+    def map_response(
+        status_code: int, text: str
+    ) -> str | List[Literal["Not found"] | Literal["Overload"] | Literal["Error"]]:
+        """
+        Maps the status code of a crawled page to its content or error message
+
+        Args:
+            status_code(int): The status code of the response.
+            text(str): The body of the response.
+
+        Returns:
+            str or List[str]: The body of the response or error message
+        """
+        if status_code in (200, 201):
+            return text
+
+        if 400 <= status_code < 429:
+            return ["Not found"]
+
+        return ["Overload"] if 429 <= status_code <= 503 else ["Error"]
+
+    @staticmethod
+    def map_fetched(
+        status_code: int, text: str, headers: Mapping[str, str]
+    ) -> FetchedPage | List[Literal["Not found"] | Literal["Overload"] | Literal["Error"]]:
+        """
+        Maps a response to the fetched page, with its validators, or error message
+
+        Args:
+            status_code(int): The status code of the response.
+            text(str): The body of the response.
+            headers(Mapping[str, str]): The headers of the response.
+
+        Returns:
+            FetchedPage or List[str]: The fetched page, without text if it was not modified, or error message
+        """
+        if status_code == 304:
+            return FetchedPage.from_headers(None, headers)
+
+        response = Crawler.map_response(status_code, text)
+        return response if isinstance(response, list) else FetchedPage.from_headers(response, headers)
 
     # !Get robot.txt for the particular link
-    def get_robots_txt(self, url: str) -> str | List[Literal["Overload"]]:
-        """Gets the robots.txt content for a certain link
+    def get_robots_txt(self, url: str) -> RobotsRules | List[Literal["Overload"]]:
+        """Gets the robots.txt rules for a certain link, fetching them only if they are not cached
         Args:
             url(str): The URL to get robot.txt of.
 
         Returns:
-            str | List[str]: The robot txt content or the error message
+            RobotsRules | List[str]: The robot txt rules or the error message
         """
-        robots_txt_url = get_robots_txt_url(url)
+        with CRAWLER_ROBOTS_SECONDS.time():
+            return self.robots_cache.get(get_robots_txt_url(url), self.fetch_robots_txt)
 
-        response = self.session.get(robots_txt_url)
+    def fetch_robots_txt(self, robots_txt_url: str) -> RobotsResponse:
+        """Fetches a robots.txt file
+        Args:
+            robots_txt_url(str): The URL of the robots.txt file.
 
-        if response.status_code in (200, 201):
-            return response.text
+        Returns:
+            RobotsResponse: The robot txt content or the error message, and the response headers
+        """
+        try:
+            response = self.fetcher.get(robots_txt_url)
+        except requests.RequestException as error:
+            ERRORS.labels("crawler", type(error).__name__).inc()
+            # !Unreachable hosts are treated as having no robots.txt, but only for the minimum TTL
+            return "", {"Cache-Control": "no-store"}
+        self.report_overload(robots_txt_url, response.status_code, response.headers.get("Retry-After"))
 
-        if 400 <= response.status_code < 429:
+        return self.map_robots_txt_response(response.status_code, response.text), response.headers
+
+    @staticmethod
+    def map_robots_txt_response(status_code: int, text: str) -> str | List[Literal["Overload"]]:
+        """Maps the status code of a robots.txt response to its content or error message
+
+        Args:
+            status_code(int): The status code of the response.
+            text(str): The body of the response.
+
+        Returns:
+            str | List[str]: The robot txt content or the error message
+        """
+        if status_code in (200, 201):
+            return text
+
+        if 400 <= status_code < 429:
             return ""
 
-        return ["Overload"] if 429 <= response.status_code <= 503 else ""
+        return ["Overload"] if 429 <= status_code <= 503 else ""
 
-    def save_html(self, response: str, url: str) -> None:
-        """Saves the HTML response to a file and updates the crawling state.
+    def save_page(self, page: FetchedPage, url: str, previous_hash: str = "") -> None:
+        """Saves a fetched page for the parser, unless a re-crawl found it unchanged
+
+        Args:
+            page(FetchedPage): The fetched page.
+            url(str): The URL of the page.
+            previous_hash(str, optional): The content hash of the last crawl of the page, empty for a first crawl.
+        """
+        content_hash = page.content_hash or (None if page.text is None else hash_content(page.text))
+
+        # !A 304, or the same body from a server without validators, is neither saved nor parsed again
+        if not page.is_modified() or content_hash == previous_hash:
+            CRAWLER_PAGES.labels("unchanged").inc()
+            if page.file_name:
+                self.content_store.delete(page.file_name)
+            self.queue_collection.remove({"url": url})
+            self.crawled_collection.mark_unchanged(url, page.get_validators())
+            return
+
+        CRAWLER_PAGES.labels("saved").inc()
+        validators = {**page.get_validators(), "content_hash": content_hash or ""}
+        if page.text is None:
+            self.record_page(page.file_name, url, validators)
+        else:
+            self.save_html(page.text, url, validators)
+
+    def save_html(self, response: str, url: str, validators: Dict[str, str] | None = None) -> None:
+        """Saves the HTML response to the content store and updates the crawling state.
 
         Args:
             response(str): The HTML content to be saved.
             url(str): The URL associated with the HTML content.
+            validators(Dict[str, str] | None, optional): The etag, last_modified and content_hash of the response.
+                Defaults to the content hash only.
 
         Returns:
             None
         """
-        file_name = self.get_filename()
-        create_file(f"{file_name}.html", self.to_parse_directory, response)
-        self.queue_collection.remove({"url": url})
-        self.crawled_collection.add(url, "crawled", file_name)
+        file_name = self.content_store.put(response)
+        self.record_page(file_name, url, validators or {"content_hash": hash_content(response)})
 
-    def get_filename(self) -> str:
-        """Gets the filename for the crawled data to be stored"""
-        while True:
-            # !Generate random filename
-            file_name = secrets.token_urlsafe(10)[:13]
+    def record_page(self, file_name: str, url: str, validators: Dict[str, str]) -> None:
+        """Records a page that is in the content store as crawled and hands it to the parser
+
+        Args:
+            file_name(str): The key of the page in the content store.
+            url(str): The URL of the page.
+            validators(Dict[str, str]): The etag, last_modified and content_hash of the response.
+        """
+        # !Recorded as crawled before it leaves the queue, so the parser never finds the url in neither and queues it.
+        # !A parser that checked the crawled collection just before the save can still queue it once more, which
+        # !costs one more fetch of the page. Closing that would need the check and the add in one transaction.
+        self.crawled_collection.save_crawled(url, file_name, validators)
+        self.queue_collection.remove({"url": url})
 
-            # !Check if already being used
-            if not Path(f"{self.to_parse_directory}/{file_name}.txt").exists():
-                return file_name
+        # !Announced last, so the parser finds the page in the crawled collection
+        if self.handoff is not None:
+            self.handoff.publish(file_name)
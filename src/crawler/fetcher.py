@@ -0,0 +1,230 @@
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Dict, List, Mapping
+from urllib.parse import urlsplit
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.request import ACCEPT_ENCODING
+from urllib3.util.retry import Retry
+
+from ..constants import FETCH_SESSION_STRATEGY
+from .constants import (
+    FETCH_CONNECT_TIMEOUT,
+    FETCH_MAX_RETRIES,
+    FETCH_POOL_HOSTS,
+    FETCH_READ_TIMEOUT,
+    FETCH_RETRY_BACKOFF,
+)
+
+SESSION_STRATEGIES = ("shared", "per_thread", "per_host")
+
+
+@dataclass
+class FetchStats:
+    """Counts of the requests sent and the connections opened for them, summed over every session"""
+
+    requests: int = 0
+    connections: int = 0
+    retries: int = 0
+    errors: int = 0
+
+    def as_dict(self) -> Dict[str, float]:
+        """Gets the counts and the share of requests sent on a connection that was already open
+
+        Returns:
+            Dict[str, float]: The counts and the reuse ratio
+        """
+        reused = max(self.requests - self.connections, 0)
+        return {
+            "requests": self.requests,
+            "connections": self.connections,
+            "reused_connections": reused,
+            "reuse_ratio": reused / self.requests if self.requests else 0.0,
+            "retries": self.retries,
+            "errors": self.errors,
+        }
+
+
+# !Fetcher
+class Fetcher:  # pylint: disable=too-many-instance-attributes
+    """
+    The HTTP layer of the threaded crawler: pooled keep-alive connections, timeouts, compression and retries.
+
+    Sessions are handed out by strategy. "shared" uses one session whose per-host pool holds a connection for every
+    worker. "per_thread" gives every thread its own session, so threads never wait on each other's pool. "per_host"
+    gives every host its own session, so a slow host cannot take the connections of the others. Only failures to
+    connect or read are retried here, overloaded servers are backed off by the scheduler instead.
+    """
+
+    def __init__(
+        self,
+        pool_size: int,
+        strategy: str = FETCH_SESSION_STRATEGY,
+        connect_timeout: float = FETCH_CONNECT_TIMEOUT,
+        read_timeout: float = FETCH_READ_TIMEOUT,
+        max_retries: int = FETCH_MAX_RETRIES,
+        retry_backoff: float = FETCH_RETRY_BACKOFF,
+        pool_hosts: int = FETCH_POOL_HOSTS,
+    ) -> None:
+        """Initializes the fetcher, sessions are created as they are first needed
+
+        Args:
+            pool_size (int): Connections kept open per host, the number of workers that fetch at once.
+            strategy (str, optional): "shared", "per_thread" or "per_host". Defaults to FETCH_SESSION_STRATEGY.
+            connect_timeout (float, optional): Seconds to wait for a connection. Defaults to FETCH_CONNECT_TIMEOUT.
+            read_timeout (float, optional): Seconds to wait between bytes of the response. Defaults to
+                FETCH_READ_TIMEOUT.
+            max_retries (int, optional): Retries of a request whose connection failed. Defaults to FETCH_MAX_RETRIES.
+            retry_backoff (float, optional): Base of the exponential wait between retries. Defaults to
+                FETCH_RETRY_BACKOFF.
+            pool_hosts (int, optional): Hosts a session keeps connections to. Defaults to FETCH_POOL_HOSTS.
+
+        Raises:
+            ValueError: If the strategy is unknown
+        """
+        if strategy not in SESSION_STRATEGIES:
+            raise ValueError(f"Unknown session strategy {strategy}, use one of {', '.join(SESSION_STRATEGIES)}")
+
+        self.pool_size = pool_size
+        self.strategy = strategy
+        self.timeout = (connect_timeout, read_timeout)
+        self.retry = Retry(
+            total=max_retries,
+            connect=max_retries,
+            read=max_retries,
+            status=0,
+            backoff_factor=retry_backoff,
+            allowed_methods=frozenset({"GET", "HEAD"}),
+            raise_on_status=False,
+            respect_retry_after_header=False,
+        )
+        self.pool_hosts = pool_hosts
+
+        # !Reentrant, closing an evicted session counts its connections while the lock is held
+        self.lock = threading.RLock()
+        self.local = threading.local()
+        self.sessions: OrderedDict[str, requests.Session] = OrderedDict()
+        self.adapters: List[HTTPAdapter] = []
+        self.stats = FetchStats()
+        self.disposed_connections = 0
+
+    def create_session(self, pool_size: int, pool_hosts: int) -> requests.Session:
+        """Creates a session with pooled adapters
+
+        Args:
+            pool_size (int): Connections kept open per host.
+            pool_hosts (int): Hosts connections are kept to.
+
+        Returns:
+            requests.Session: The session
+        """
+        # !urllib3 accepts br and zstd only when brotli and zstandard are installed to decode them
+        session = requests.Session()
+        session.headers["Accept-Encoding"] = ACCEPT_ENCODING
+        adapter = HTTPAdapter(pool_connections=pool_hosts, pool_maxsize=pool_size, max_retries=self.retry)
+        for scheme in ("http://", "https://"):
+            session.mount(scheme, adapter)
+
+        # !Pools dropped to make room for other hosts take their connection counts with them, so they are kept
+        pools = adapter.poolmanager.pools
+        dispose = pools.dispose_func
+
+        def count_and_dispose(pool: Any) -> None:
+            with self.lock:
+                self.disposed_connections += pool.num_connections
+            if dispose is not None:
+                dispose(pool)
+
+        pools.dispose_func = count_and_dispose
+
+        with self.lock:
+            self.adapters.append(adapter)
+        return session
+
+    def get_session(self, url: str) -> requests.Session:
+        """Gets the session to fetch a url with
+
+        Args:
+            url (str): The url.
+
+        Returns:
+            requests.Session: The session
+        """
+        if self.strategy == "per_thread":
+            session = getattr(self.local, "session", None)
+            if session is None:
+                session = self.local.session = self.create_session(1, self.pool_hosts)
+            return session
+
+        key = urlsplit(url).netloc.lower() if self.strategy == "per_host" else ""
+        with self.lock:
+            session = self.sessions.get(key)
+            if session is not None:
+                self.sessions.move_to_end(key)
+                return session
+
+            # !Like the host pools of a session, only the sessions of the pool_hosts most recently used hosts are kept
+            if len(self.sessions) >= self.pool_hosts:
+                _, evicted = self.sessions.popitem(last=False)
+                self.adapters.remove(evicted.get_adapter("http://"))
+                evicted.close()
+
+            # !A per-host session only talks to one host, the shared one to every host. It is created under the lock,
+            # !so two threads reaching a new host at once share one session.
+            pool_hosts = 1 if self.strategy == "per_host" else self.pool_hosts
+            session = self.sessions[key] = self.create_session(self.pool_size, pool_hosts)
+        return session
+
+    def get(self, url: str, headers: Mapping[str, str] | None = None, stream: bool = False) -> requests.Response:
+        """Fetches a url
+
+        Args:
+            url (str): The url.
+            headers (Mapping[str, str] | None, optional): Extra request headers. Defaults to None.
+            stream (bool, optional): Whether only the headers are read, leaving the body to be read from the
+                response in chunks. Defaults to False.
+
+        Returns:
+            requests.Response: The response, decompressed as it is read
+
+        Raises:
+            requests.RequestException: If the request failed after every retry or timed out
+        """
+        try:
+            response = self.get_session(url).get(url, headers=headers, timeout=self.timeout, stream=stream)
+        except requests.RequestException:
+            with self.lock:
+                self.stats.errors += 1
+            raise
+
+        retries = response.raw.retries
+        with self.lock:
+            self.stats.requests += 1
+            self.stats.retries += len(retries.history) if retries is not None else 0
+        return response
+
+    def get_stats(self) -> Dict[str, float]:
+        """Gets the number of requests and of connections opened for them
+
+        Returns:
+            Dict[str, float]: The counts and the share of requests that reused a connection
+        """
+        with self.lock:
+            adapters = list(self.adapters)
+            stats = FetchStats(self.stats.requests, self.disposed_connections, self.stats.retries, self.stats.errors)
+
+        for adapter in adapters:
+            pools = adapter.poolmanager.pools
+            for key in pools.keys():
+                # !The pool may be dropped between listing and reading it, its count is then in disposed_connections
+                pool = pools.get(key)
+                stats.connections += pool.num_connections if pool is not None else 0
+        return stats.as_dict()
+
+    def close(self) -> None:
+        """Closes every pooled connection"""
+        with self.lock:
+            for adapter in self.adapters:
+                adapter.close()
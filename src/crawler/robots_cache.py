@@ -0,0 +1,276 @@
+import asyncio
+import sys
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from email.utils import parsedate_to_datetime
+from time import time
+from typing import Awaitable, Callable, Dict, List, Literal, Mapping, Tuple
+
+from ..models import Robots as _robots_collection
+from .constants import (
+    BOT_NAME,
+    ROBOTS_CACHE_BYTES_PER_RULE,
+    ROBOTS_CACHE_MAX_BYTES,
+    ROBOTS_CACHE_MAX_TTL_SECONDS,
+    ROBOTS_CACHE_MIN_TTL_SECONDS,
+    ROBOTS_CACHE_TTL_SECONDS,
+)
+from .robots_matcher import RobotsMatcher
+
+RobotsResponse = Tuple[str | List[Literal["Overload"]], Mapping[str, str]]
+
+
+# !Parsed robots.txt of a host
+class RobotsRules:
+    """The parsed robots.txt rules of a single host for the crawler's bot"""
+
+    __slots__ = ("content", "matcher", "crawl_delay", "exp_date", "size")
+
+    def __init__(self, content: str, exp_date: float, bot_name: str = BOT_NAME) -> None:
+        """Parses the robots.txt content
+
+        Args:
+            content (str): The content of the robots.txt file
+            exp_date (float): The timestamp the content has to be fetched again
+            bot_name (str, optional): The name of the bot the rules apply to. Defaults to BOT_NAME.
+        """
+        self.content = content
+        self.matcher = RobotsMatcher(content, bot_name)
+        self.crawl_delay = self.matcher.crawl_delay
+        self.exp_date = exp_date
+
+        # !The compiled trie takes roughly a few hundred bytes per rule on top of the content
+        self.size = sys.getsizeof(content) + ROBOTS_CACHE_BYTES_PER_RULE * self.matcher.number_of_rules
+
+    def is_expired(self) -> bool:
+        """Checks if the robots.txt has to be fetched again"""
+        return self.exp_date <= time()
+
+    def is_allowed(self, url: str) -> bool:
+        """Checks if the url may be crawled
+
+        Args:
+            url (str): The url to check
+
+        Returns:
+            bool: True if the url may be crawled
+        """
+        return self.matcher.is_allowed(url)
+
+
+@dataclass
+class _Flight:
+    """A robots.txt fetch that other threads are waiting on"""
+
+    done: threading.Event = field(default_factory=threading.Event)
+    result: RobotsRules | List[Literal["Overload"]] = field(default_factory=lambda: ["Overload"])
+
+
+# !Shared robots.txt cache
+class RobotsCache:
+    """
+    Cache of parsed robots.txt files keyed by the robots.txt url, so keyed by scheme and domain.
+
+    Entries expire after ROBOTS_CACHE_TTL_SECONDS or the lifetime given by the HTTP caching headers, the least
+    recently used entries are evicted once the cache grows past max_bytes, and concurrent misses for the same host
+    share a single fetch. With a Robots collection the entries also survive restarts.
+    """
+
+    def __init__(
+        self, robots_collection: _robots_collection | None = None, max_bytes: int = ROBOTS_CACHE_MAX_BYTES
+    ) -> None:
+        """Initializes the cache
+
+        Args:
+            robots_collection (_robots_collection | None, optional): Collection the entries are persisted to.
+            max_bytes (int, optional): Approximate memory the entries may use. Defaults to ROBOTS_CACHE_MAX_BYTES.
+        """
+        self.robots_collection = robots_collection
+        self.max_bytes = max_bytes
+        self.size = 0
+        self.entries: OrderedDict[str, RobotsRules] = OrderedDict()
+        self.lock = threading.Lock()
+        self.flights: Dict[str, _Flight] = {}
+        self.async_flights: Dict[str, asyncio.Future[RobotsRules | List[Literal["Overload"]]]] = {}
+
+    def get(
+        self, robots_txt_url: str, fetch: Callable[[str], RobotsResponse]
+    ) -> RobotsRules | List[Literal["Overload"]]:
+        """Gets the rules of a host, fetching them if they are not cached
+
+        Args:
+            robots_txt_url (str): The url of the robots.txt file
+            fetch (Callable[[str], RobotsResponse]): Fetches the robots.txt content and the response headers
+
+        Returns:
+            RobotsRules | List[Literal["Overload"]]: The rules or the error message
+        """
+        if rules := self.peek(robots_txt_url):
+            return rules
+
+        # !Only the first thread to miss fetches, the others wait for its result
+        with self.lock:
+            flight = self.flights.get(robots_txt_url)
+            is_leader = flight is None
+            if flight is None:
+                flight = self.flights[robots_txt_url] = _Flight()
+
+        if not is_leader:
+            flight.done.wait()
+            return flight.result
+
+        try:
+            if (rules := self.load(robots_txt_url)) is None:
+                content, headers = fetch(robots_txt_url)
+                rules = content if not isinstance(content, str) else self.store(robots_txt_url, content, headers)
+            flight.result = rules
+            return rules
+        finally:
+            with self.lock:
+                del self.flights[robots_txt_url]
+            flight.done.set()
+
+    async def async_get(
+        self, robots_txt_url: str, fetch: Callable[[str], Awaitable[RobotsResponse]]
+    ) -> RobotsRules | List[Literal["Overload"]]:
+        """Gets the rules of a host without blocking the event loop, fetching them if they are not cached
+
+        Args:
+            robots_txt_url (str): The url of the robots.txt file
+            fetch (Callable[[str], Awaitable[RobotsResponse]]): Fetches the robots.txt content and the response
+                headers
+
+        Returns:
+            RobotsRules | List[Literal["Overload"]]: The rules or the error message
+        """
+        if rules := self.peek(robots_txt_url):
+            return rules
+
+        # !Only the first coroutine to miss fetches, the others await its result
+        if flight := self.async_flights.get(robots_txt_url):
+            return await asyncio.shield(flight)
+
+        flight = self.async_flights[robots_txt_url] = asyncio.get_running_loop().create_future()
+        try:
+            if (rules := await asyncio.to_thread(self.load, robots_txt_url)) is None:
+                content, headers = await fetch(robots_txt_url)
+                if isinstance(content, str):
+                    rules = await asyncio.to_thread(self.store, robots_txt_url, content, headers)
+                else:
+                    rules = content
+            flight.set_result(rules)
+            return rules
+        except BaseException:
+            flight.set_result(["Overload"])
+            raise
+        finally:
+            del self.async_flights[robots_txt_url]
+
+    def peek(self, robots_txt_url: str) -> RobotsRules | None:
+        """Gets the rules of a host from memory if they have not expired
+
+        Args:
+            robots_txt_url (str): The url of the robots.txt file
+
+        Returns:
+            RobotsRules | None: The rules or None if they are not cached
+        """
+        with self.lock:
+            rules = self.entries.get(robots_txt_url)
+            if rules is None:
+                return None
+
+            if rules.is_expired():
+                self.evict(robots_txt_url)
+                return None
+
+            self.entries.move_to_end(robots_txt_url)
+            return rules
+
+    def load(self, robots_txt_url: str) -> RobotsRules | None:
+        """Gets the rules of a host from memory or from the database if they have not expired
+
+        Args:
+            robots_txt_url (str): The url of the robots.txt file
+
+        Returns:
+            RobotsRules | None: The rules or None if they are not cached
+        """
+        if (rules := self.peek(robots_txt_url)) or self.robots_collection is None:
+            return rules
+
+        item_in_db = self.robots_collection.get_one({"url": robots_txt_url}, fields=["content", "exp_date"])
+        if item_in_db is None or item_in_db["exp_date"] <= time():
+            return None
+
+        rules = RobotsRules(item_in_db["content"], item_in_db["exp_date"])
+        self.insert(robots_txt_url, rules)
+        return rules
+
+    def store(self, robots_txt_url: str, content: str, headers: Mapping[str, str]) -> RobotsRules:
+        """Parses and caches a freshly fetched robots.txt
+
+        Args:
+            robots_txt_url (str): The url of the robots.txt file
+            content (str): The content of the robots.txt file
+            headers (Mapping[str, str]): The headers of the response
+
+        Returns:
+            RobotsRules: The parsed rules
+        """
+        rules = RobotsRules(content, time() + get_ttl(headers))
+        self.insert(robots_txt_url, rules)
+
+        if self.robots_collection is not None:
+            self.robots_collection.add(robots_txt_url, content, rules.exp_date)
+
+        return rules
+
+    def insert(self, robots_txt_url: str, rules: RobotsRules) -> None:
+        """Adds rules to memory, evicting the least recently used entries past the memory cap
+
+        Args:
+            robots_txt_url (str): The url of the robots.txt file
+            rules (RobotsRules): The parsed rules
+        """
+        with self.lock:
+            self.evict(robots_txt_url)
+            self.entries[robots_txt_url] = rules
+            self.size += rules.size
+
+            while self.size > self.max_bytes and len(self.entries) > 1:
+                self.evict(next(iter(self.entries)))
+
+    def evict(self, robots_txt_url: str) -> None:
+        """Removes an entry from memory. The caller must hold the lock."""
+        if (rules := self.entries.pop(robots_txt_url, None)) is not None:
+            self.size -= rules.size
+
+
+def get_ttl(headers: Mapping[str, str]) -> float:
+    """Gets how long a robots.txt may be cached from the HTTP caching headers
+
+    Args:
+        headers (Mapping[str, str]): The headers of the response
+
+    Returns:
+        float: Seconds the robots.txt may be cached, clamped between the minimum and maximum TTL
+    """
+    ttl: float = ROBOTS_CACHE_TTL_SECONDS
+    cache_control = [directive.strip().lower() for directive in headers.get("Cache-Control", "").split(",")]
+
+    if "no-store" in cache_control or "no-cache" in cache_control:
+        ttl = 0
+    elif max_age := next((directive for directive in cache_control if directive.startswith("max-age=")), None):
+        try:
+            ttl = float(max_age.removeprefix("max-age="))
+        except ValueError:
+            pass
+    elif expires := headers.get("Expires"):
+        try:
+            ttl = parsedate_to_datetime(expires).timestamp() - time()
+        except (TypeError, ValueError):
+            pass
+
+    return min(max(ttl, ROBOTS_CACHE_MIN_TTL_SECONDS), ROBOTS_CACHE_MAX_TTL_SECONDS)
@@ -0,0 +1,254 @@
+import re
+from typing import Dict, List, Pattern, Tuple
+from urllib.parse import quote, urlparse
+
+from .constants import BOT_NAME, ROBOTS_SEGMENT_KEY_LENGTH
+
+# !Characters kept as they are when percent-encoding paths and patterns
+SAFE_PATH_CHARACTERS = "/:@!$&'()*+,;=?%~-._"
+
+# !Priority, allow and compiled pattern of a wildcard rule
+WildcardRule = Tuple[int, bool, Pattern[str]]
+
+
+class _Node:
+    """A node of the rule trie, the labels from the root to the node spell the literal prefix of its rules"""
+
+    __slots__ = ("label", "children", "rule", "end_rule", "wildcard_rules")
+
+    def __init__(self, label: str = "") -> None:
+        self.label = label
+        self.children: Dict[str, _Node] = {}
+        self.rule: bool | None = None
+        self.end_rule: bool | None = None
+        self.wildcard_rules: List[WildcardRule] | None = None
+
+    def insert(self, prefix: str) -> "_Node":
+        """Gets the node for the prefix, splitting edges so the prefix ends on a node
+
+        Args:
+            prefix (str): The literal prefix below this node.
+
+        Returns:
+            _Node: The node the prefix ends on
+        """
+        node = self
+        position = 0
+        while position < len(prefix):
+            child = node.children.get(prefix[position])
+            if child is None:
+                child = node.children[prefix[position]] = _Node(prefix[position:])
+                return child
+
+            # !Splits the edge where the prefix leaves it
+            common = 0
+            while common < len(child.label) and position + common < len(prefix):
+                if child.label[common] != prefix[position + common]:
+                    break
+                common += 1
+            if common < len(child.label):
+                middle = _Node(child.label[:common])
+                child.label = child.label[common:]
+                middle.children[child.label[0]] = child
+                node.children[prefix[position]] = child = middle
+
+            node = child
+            position += common
+
+        return node
+
+    def add_wildcard_rule(self, rule: WildcardRule) -> None:
+        """Attaches a wildcard rule whose literal prefix ends on this node
+
+        Args:
+            rule (WildcardRule): The wildcard rule.
+        """
+        self.wildcard_rules = self.wildcard_rules or []
+        self.wildcard_rules.append(rule)
+
+
+# !Compiled robots.txt matcher
+class RobotsMatcher:
+    """
+    robots.txt rules of a single host, compiled once for one bot.
+
+    Follows RFC 9309: the groups naming the bot are used, or the "*" groups if none do, "*" and "$" are supported
+    in patterns, and the longest matching rule decides with Allow winning ties.
+
+    Rules without wildcards are stored in a radix trie, so a lookup walks the path once instead of testing every
+    rule. Wildcard rules hang off the trie node of their literal prefix, unless the longest literal they require
+    after a "*" is longer than that prefix: then they are indexed by the end of that literal and a lookup only
+    tries them when it shows up in the path. Matching therefore costs time proportional to the length of the path.
+    """
+
+    __slots__ = ("root", "crawl_delay", "number_of_rules", "segment_rules", "segment_key_lengths")
+
+    def __init__(self, robot_txt: str, bot_name: str = BOT_NAME) -> None:
+        """Parses and compiles the robots.txt content
+
+        Args:
+            robot_txt (str): The content of the robots.txt file.
+            bot_name (str, optional): The name of the bot the rules apply to. Defaults to BOT_NAME.
+        """
+        self.root = _Node()
+        self.number_of_rules = 0
+        self.segment_rules: Dict[str, List[WildcardRule]] = {}
+        self.segment_key_lengths: List[int] = []
+
+        rules, self.crawl_delay = parse_groups(robot_txt, bot_name)
+        for allow, pattern in rules:
+            self.add_rule(pattern, allow)
+
+    def add_rule(self, pattern: str, allow: bool) -> None:
+        """Adds a rule to the matcher
+
+        Args:
+            pattern (str): The path pattern of the rule.
+            allow (bool): True for Allow rules, False for Disallow rules.
+        """
+        pattern = quote(re.sub(r"\*+", "*", pattern), safe=SAFE_PATH_CHARACTERS)
+        is_anchored = pattern.endswith("$")
+        literal = pattern[:-1] if is_anchored else pattern
+        prefix, wildcard, rest = literal.partition("*")
+        self.number_of_rules += 1
+
+        if wildcard:
+            regex = "".join(".*" if part == "*" else re.escape(part) for part in re.split(r"(\*)", literal))
+            rule = (len(pattern), allow, re.compile(regex + (r"\Z" if is_anchored else "")))
+
+            # !Rules are found through whichever of their prefix and their required literal is more selective
+            segment = max(rest.split("*"), key=len)
+            if len(segment) > len(prefix):
+                key = segment[-ROBOTS_SEGMENT_KEY_LENGTH:]
+                self.segment_rules.setdefault(key, []).append(rule)
+                if len(key) not in self.segment_key_lengths:
+                    self.segment_key_lengths.append(len(key))
+            else:
+                self.root.insert(prefix).add_wildcard_rule(rule)
+            return
+
+        # !Allow wins when an Allow and a Disallow rule have the same pattern
+        node = self.root.insert(prefix)
+        if is_anchored:
+            node.end_rule = allow or bool(node.end_rule)
+        else:
+            node.rule = allow or bool(node.rule)
+
+    def is_allowed(self, url: str) -> bool:
+        """Checks if the url may be crawled
+
+        Args:
+            url (str): The url to check.
+
+        Returns:
+            bool: True if the url may be crawled
+        """
+        parsed_url = urlparse(url)
+        path = quote(parsed_url.path or "/", safe=SAFE_PATH_CHARACTERS)
+        if parsed_url.query:
+            path = f"{path}?{parsed_url.query}"
+
+        return self.is_path_allowed(path)
+
+    def is_path_allowed(self, path: str) -> bool:
+        """Checks if the path, including its query, may be crawled
+
+        Args:
+            path (str): The path to check.
+
+        Returns:
+            bool: True if the path may be crawled
+        """
+        # !The robots.txt file itself is always allowed
+        if path == "/robots.txt" or self.number_of_rules == 0:
+            return True
+
+        best_length, best_allow = -1, True
+
+        def wins(length: int, allow: bool) -> bool:
+            return length > best_length or (length == best_length and allow)
+
+        def consider(rules: List[WildcardRule]) -> None:
+            nonlocal best_length, best_allow
+            for length, allow, regex in rules:
+                if wins(length, allow) and regex.match(path):
+                    best_length, best_allow = length, allow
+
+        # !Literal rules and wildcard rules without a required literal, found by walking the trie
+        node: _Node | None = self.root
+        depth = 0
+        while node is not None:
+            if node.rule is not None and wins(depth, node.rule):
+                best_length, best_allow = depth, node.rule
+            if node.end_rule is not None and depth == len(path) and wins(depth + 1, node.end_rule):
+                best_length, best_allow = depth + 1, node.end_rule
+            if node.wildcard_rules:
+                consider(node.wildcard_rules)
+
+            if depth == len(path):
+                break
+
+            # !Rules only end on nodes, so a path leaving an edge halfway matches nothing deeper
+            node = node.children.get(path[depth])
+            if node is not None:
+                if not path.startswith(node.label, depth):
+                    break
+                depth += len(node.label)
+
+        # !Wildcard rules whose required literal appears in the path
+        for key_length in self.segment_key_lengths:
+            for start in range(len(path) - key_length + 1):
+                if rules := self.segment_rules.get(path[start : start + key_length]):
+                    consider(rules)
+
+        return best_allow
+
+
+def parse_groups(robot_txt: str, bot_name: str) -> Tuple[List[Tuple[bool, str]], float | None]:
+    """Gets the rules and Crawl-delay of the groups that apply to the bot
+
+    Args:
+        robot_txt (str): The content of the robots.txt file.
+        bot_name (str): The name of the bot.
+
+    Returns:
+        Tuple[List[Tuple[bool, str]], float | None]: The (allow, pattern) rules and the Crawl-delay
+    """
+    bot_name = bot_name.lower()
+    rules: Dict[str, List[Tuple[bool, str]]] = {}
+    delays: Dict[str, float] = {}
+    current_agents: List[str] = []
+    in_rules = False
+
+    for line in robot_txt.splitlines():
+        key, separator, value = line.split("#", 1)[0].partition(":")
+        key, value = key.strip().lower(), value.strip()
+        if not separator:
+            continue
+
+        if key == "user-agent":
+            # !Consecutive user-agent lines share the same group
+            if in_rules:
+                current_agents, in_rules = [], False
+            agent = value.split("/", 1)[0].strip().lower()
+            current_agents.append(agent)
+            rules.setdefault(agent, [])
+        elif key in ("allow", "disallow"):
+            in_rules = True
+            # !An empty Disallow allows everything, so it adds no rule
+            if value:
+                for agent in current_agents:
+                    rules[agent].append((key == "allow", value))
+        elif key == "crawl-delay":
+            in_rules = True
+            try:
+                delay = float(value)
+            except ValueError:
+                continue
+            for agent in current_agents:
+                delays.setdefault(agent, delay)
+        elif key != "sitemap":
+            in_rules = True
+
+    agent = bot_name if bot_name in rules else "*"
+    return rules.get(agent, []), delays.get(agent)
@@ -0,0 +1,353 @@
+import heapq
+import threading
+from collections import deque
+from dataclasses import dataclass, field
+from email.utils import parsedate_to_datetime
+from time import time
+from typing import Any, Deque, Dict, List, Tuple
+
+from ..general import get_domain
+from .constants import (
+    SCHEDULER_BACKOFF_BASE_SECONDS,
+    SCHEDULER_BACKOFF_MAX_SECONDS,
+    SCHEDULER_DEFAULT_BURST,
+    SCHEDULER_DEFAULT_RATE,
+    SCHEDULER_IDLE_SECONDS,
+    SCHEDULER_MAX_WAIT_SECONDS,
+)
+
+
+@dataclass
+class DomainState:  # pylint: disable=too-many-instance-attributes
+    """Politeness state of a single domain"""
+
+    rate: float = SCHEDULER_DEFAULT_RATE
+    capacity: float = SCHEDULER_DEFAULT_BURST
+    tokens: float = SCHEDULER_DEFAULT_BURST
+    last_refill: float = 0
+    blocked_until: float = 0
+    failures: int = 0
+    scheduled: bool = False
+    last_used: float = 0
+    pending: Deque[Dict[str, Any]] = field(default_factory=deque)
+
+    def refill(self, now: float) -> None:
+        """Adds the tokens earned since the last refill
+
+        Args:
+            now (float): The current timestamp
+        """
+        self.tokens = min(self.capacity, self.tokens + (now - self.last_refill) * self.rate)
+        self.last_refill = now
+
+    def ready_at(self, now: float) -> float:
+        """Gets the time the domain is next allowed to fetch
+
+        Args:
+            now (float): The current timestamp
+
+        Returns:
+            float: The timestamp the domain is next allowed to fetch
+        """
+        self.refill(now)
+        token_at = now if self.tokens >= 1 else now + (1 - self.tokens) / self.rate
+        return max(token_at, self.blocked_until)
+
+
+# !Per-domain politeness scheduler
+class DomainScheduler:  # pylint: disable=too-many-instance-attributes
+    """
+    In-memory per-domain scheduler.
+
+    Every domain gets a token bucket, robots.txt Crawl-delay slows its bucket down and overloads block it with an
+    exponential backoff. Domains with pending links sit on a heap ordered by the time they are next allowed to
+    fetch, so workers always get a link from the domain that is ready soonest.
+
+    The state of a domain is dropped once it has no pending links, its backoff or pause is over and it was not used for
+    idle_seconds, so a long crawl keeps state only for the domains it is still fetching from.
+    """
+
+    def __init__(
+        self,
+        default_rate: float = SCHEDULER_DEFAULT_RATE,
+        default_burst: float = SCHEDULER_DEFAULT_BURST,
+        idle_seconds: float = SCHEDULER_IDLE_SECONDS,
+    ) -> None:
+        """Initializes the scheduler
+
+        Args:
+            default_rate (float, optional): Fetches per second for domains without a Crawl-delay.
+            default_burst (float, optional): Fetches a domain without a Crawl-delay may make back to back.
+            idle_seconds (float, optional): Seconds a domain with nothing pending is kept after it was last used.
+                Defaults to SCHEDULER_IDLE_SECONDS.
+        """
+        self.default_rate = default_rate
+        self.default_burst = default_burst
+        self.idle_seconds = idle_seconds
+        self.next_eviction = time() + idle_seconds
+        self.domains: Dict[str, DomainState] = {}
+        self.ready: List[Tuple[float, int, str]] = []
+        self.number_pending = 0
+        self.counter = 0
+        self.condition = threading.Condition()
+
+    def knows(self, domain: str) -> bool:
+        """Checks if the scheduler already keeps state for the domain
+
+        Args:
+            domain (str): The domain to check
+
+        Returns:
+            bool: If the domain is known
+        """
+        with self.condition:
+            return domain in self.domains
+
+    def add(self, link: Dict[str, Any]) -> bool:
+        """Adds a link to the pending links of its domain
+
+        Args:
+            link (Dict[str, Any]): The link, it must have a url key
+
+        Returns:
+            bool: False if the link would wait more than SCHEDULER_MAX_WAIT_SECONDS behind the links of its domain
+        """
+        domain = get_domain(link["url"])
+        with self.condition:
+            now = time()
+            if now >= self.next_eviction:
+                self.evict_idle_locked(now)
+
+            state = self.get_state(domain)
+            if self.wait_time_locked(state, now) > SCHEDULER_MAX_WAIT_SECONDS:
+                return False
+
+            state.pending.append(link)
+            self.number_pending += 1
+            self.schedule(domain, state, now)
+            return True
+
+    def pop_ready(self) -> Tuple[Dict[str, Any] | None, float]:
+        """Takes a link from the domain that is allowed to fetch the soonest without waiting
+
+        Returns:
+            Tuple[Dict[str, Any] | None, float]: The link and 0 if one is ready, otherwise None and the seconds
+                until the next link is ready
+        """
+        with self.condition:
+            return self.pop_ready_locked()
+
+    def get(self, timeout: float | None = None) -> Dict[str, Any] | None:
+        """Blocks until a link is allowed to be fetched
+
+        Args:
+            timeout (float | None, optional): The maximum seconds to wait. Defaults to None.
+
+        Returns:
+            Dict[str, Any] | None: The link or None if the timeout ran out
+        """
+        deadline = None if timeout is None else time() + timeout
+        with self.condition:
+            while True:
+                link, wait = self.pop_ready_locked()
+                if link is not None:
+                    return link
+
+                if deadline is not None:
+                    if (remaining := deadline - time()) <= 0:
+                        return None
+                    wait = min(wait, remaining)
+
+                self.condition.wait(None if wait == float("inf") else wait)
+
+    def pending(self) -> int:
+        """Gets the number of links waiting to be fetched"""
+        with self.condition:
+            return self.number_pending
+
+    def set_crawl_delay(self, domain: str, crawl_delay: float | None) -> None:
+        """Limits the domain to one fetch every crawl_delay seconds
+
+        Args:
+            domain (str): The domain
+            crawl_delay (float | None): The Crawl-delay from robots.txt, None restores the default rate
+        """
+        with self.condition:
+            state = self.get_state(domain)
+            state.refill(time())
+            if crawl_delay and crawl_delay > 0:
+                state.rate, state.capacity = 1 / crawl_delay, 1
+            else:
+                state.rate, state.capacity = self.default_rate, self.default_burst
+            state.tokens = min(state.tokens, state.capacity)
+
+    def backoff(self, domain: str, retry_after: float | None = None) -> None:
+        """Blocks the domain after an overload, doubling the wait on every consecutive overload
+
+        Args:
+            domain (str): The domain
+            retry_after (float | None, optional): Seconds asked for by the Retry-After header. Defaults to None.
+        """
+        with self.condition:
+            state = self.get_state(domain)
+            state.failures += 1
+            delay = min(SCHEDULER_BACKOFF_BASE_SECONDS * 2 ** (state.failures - 1), SCHEDULER_BACKOFF_MAX_SECONDS)
+            if retry_after is not None:
+                delay = min(max(retry_after, 0), SCHEDULER_BACKOFF_MAX_SECONDS)
+            state.blocked_until = max(state.blocked_until, time() + delay)
+
+    def pause(self, domain: str, until: float) -> List[Dict[str, Any]]:
+        """Blocks the domain until the given time and hands back its pending links
+
+        Args:
+            domain (str): The domain
+            until (float): The timestamp the domain may be fetched again
+
+        Returns:
+            List[Dict[str, Any]]: The pending links of the domain, they are no longer scheduled
+        """
+        with self.condition:
+            state = self.get_state(domain)
+            state.blocked_until = max(state.blocked_until, until)
+
+            links = list(state.pending)
+            state.pending.clear()
+            self.number_pending -= len(links)
+            return links
+
+    def success(self, domain: str) -> None:
+        """Resets the backoff of the domain after a successful fetch
+
+        Args:
+            domain (str): The domain
+        """
+        with self.condition:
+            self.get_state(domain).failures = 0
+
+    def failures(self, domain: str) -> int:
+        """Gets the number of consecutive overloads of the domain
+
+        Args:
+            domain (str): The domain
+
+        Returns:
+            int: The number of consecutive overloads
+        """
+        with self.condition:
+            return self.get_state(domain).failures
+
+    def wait_time(self, domain: str) -> float:
+        """Gets the seconds until a newly added link of the domain could be fetched
+
+        Args:
+            domain (str): The domain
+
+        Returns:
+            float: The seconds to wait
+        """
+        with self.condition:
+            return self.wait_time_locked(self.get_state(domain), time())
+
+    def get_state(self, domain: str) -> DomainState:
+        """Gets the state of the domain, creating it if needed. The caller must hold the condition."""
+        now = time()
+        if (state := self.domains.get(domain)) is None:
+            state = self.domains[domain] = DomainState(
+                rate=self.default_rate, capacity=self.default_burst, tokens=self.default_burst, last_refill=now
+            )
+        state.last_used = now
+        return state
+
+    def evict_idle_locked(self, now: float) -> int:
+        """Drops the state of the domains with nothing pending or blocked that were not used for idle_seconds. The
+        caller must hold the condition.
+
+        Args:
+            now (float): The current timestamp
+
+        Returns:
+            int: The number of domains dropped
+        """
+        # !Their buckets are full again and a new overload starts a new backoff, so a fresh state behaves the same
+        idle = [
+            domain
+            for domain, state in self.domains.items()
+            if not state.pending
+            and not state.scheduled
+            and state.blocked_until <= now
+            and now - state.last_used >= self.idle_seconds
+        ]
+        for domain in idle:
+            del self.domains[domain]
+
+        self.next_eviction = now + self.idle_seconds
+        return len(idle)
+
+    @staticmethod
+    def wait_time_locked(state: DomainState, now: float) -> float:
+        """Gets the seconds until a newly added link of the domain could be fetched. The caller must hold the
+        condition."""
+        return state.ready_at(now) + len(state.pending) / state.rate - now
+
+    def schedule(self, domain: str, state: DomainState, now: float) -> None:
+        """Pushes the domain on the heap if it has pending links. The caller must hold the condition."""
+        if state.scheduled or not state.pending:
+            return
+
+        state.scheduled = True
+        self.counter += 1
+        heapq.heappush(self.ready, (state.ready_at(now), self.counter, domain))
+        self.condition.notify()
+
+    def pop_ready_locked(self) -> Tuple[Dict[str, Any] | None, float]:
+        """Takes a link from the domain that is ready soonest. The caller must hold the condition."""
+        now = time()
+        while self.ready:
+            ready_at, _, domain = self.ready[0]
+            if ready_at > now:
+                return None, ready_at - now
+
+            heapq.heappop(self.ready)
+            state = self.domains[domain]
+            state.scheduled = False
+
+            # !The pending links may have been handed back by pause
+            if not state.pending:
+                continue
+
+            # !The domain may have been blocked after it was pushed
+            if (actual_ready_at := state.ready_at(now)) > now:
+                state.scheduled = True
+                self.counter += 1
+                heapq.heappush(self.ready, (actual_ready_at, self.counter, domain))
+                continue
+
+            state.tokens -= 1
+            state.last_used = now
+            link = state.pending.popleft()
+            self.number_pending -= 1
+            self.schedule(domain, state, now)
+            return link, 0
+
+        return None, float("inf")
+
+
+def parse_retry_after(retry_after: str | None) -> float | None:
+    """Parses the Retry-After header
+
+    Args:
+        retry_after (str | None): The value of the header, either seconds or an HTTP date
+
+    Returns:
+        float | None: The seconds to wait or None if the header is missing or invalid
+    """
+    if not retry_after:
+        return None
+
+    if retry_after.strip().isdigit():
+        return float(retry_after)
+
+    try:
+        return parsedate_to_datetime(retry_after).timestamp() - time()
+    except (TypeError, ValueError):
+        return None
@@ -1,7 +1,25 @@
+from .bloom_filter import BloomFilter, ScalableBloomFilter
+from .canonicalize_url import canonicalize_url
 from .create_directory import create_directory
 from .get_domain import get_domain
 from .get_scheme import get_scheme
 from .open_file import open_file
+from .simhash import SimHashIndex, simhash
+from .stem_word import stem_word
 from .tokenize_string import tokenize_string
+from .tokenizer import Tokenizer
 
-__all__ = ["create_directory", "get_scheme", "get_domain", "tokenize_string", "open_file"]
+__all__ = [
+    "BloomFilter",
+    "ScalableBloomFilter",
+    "canonicalize_url",
+    "create_directory",
+    "get_scheme",
+    "get_domain",
+    "tokenize_string",
+    "Tokenizer",
+    "stem_word",
+    "open_file",
+    "simhash",
+    "SimHashIndex",
+]
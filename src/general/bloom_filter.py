@@ -0,0 +1,204 @@
+import hashlib
+import math
+import struct
+import threading
+from typing import BinaryIO, Iterable, List
+
+# !Header of a single filter in a snapshot: capacity, false positive rate, count, number of hashes, number of bits
+FILTER_HEADER = struct.Struct("<QdQIQ")
+SNAPSHOT_MAGIC = b"FGBF1"
+
+
+# !Bloom filter
+class BloomFilter:
+    """A fixed size Bloom filter sized for a number of items and a false positive rate"""
+
+    def __init__(self, capacity: int, false_positive_rate: float) -> None:
+        """Initializes an empty filter
+
+        Args:
+            capacity (int): The number of items the filter is sized for.
+            false_positive_rate (float): The false positive rate once the filter holds capacity items.
+        """
+        self.capacity = capacity
+        self.false_positive_rate = false_positive_rate
+        self.count = 0
+        self.number_of_bits = max(8, math.ceil(-capacity * math.log(false_positive_rate) / math.log(2) ** 2))
+        self.number_of_hashes = max(1, round(self.number_of_bits / capacity * math.log(2)))
+        self.bits = bytearray((self.number_of_bits + 7) // 8)
+
+    def positions(self, item: str) -> List[int]:
+        """Gets the bits of the item using double hashing
+
+        Args:
+            item (str): The item.
+
+        Returns:
+            List[int]: The positions of the bits of the item
+        """
+        digest = hashlib.blake2b(item.encode("utf8"), digest_size=16).digest()
+        first, second = int.from_bytes(digest[:8], "little"), int.from_bytes(digest[8:], "little") | 1
+        return [(first + index * second) % self.number_of_bits for index in range(self.number_of_hashes)]
+
+    def add(self, item: str) -> None:
+        """Adds an item
+
+        Args:
+            item (str): The item.
+        """
+        for position in self.positions(item):
+            self.bits[position >> 3] |= 1 << (position & 7)
+        self.count += 1
+
+    def __contains__(self, item: object) -> bool:
+        """Checks if the item may have been added, false positives happen at about the false positive rate
+
+        Args:
+            item (object): The item.
+
+        Returns:
+            bool: False if the item was definitely never added
+        """
+        if not isinstance(item, str):
+            return False
+
+        bits = self.bits
+        return all(bits[position >> 3] & (1 << (position & 7)) for position in self.positions(item))
+
+    def write(self, file: BinaryIO) -> None:
+        """Writes the filter to a binary file
+
+        Args:
+            file (BinaryIO): The file.
+        """
+        file.write(
+            FILTER_HEADER.pack(
+                self.capacity, self.false_positive_rate, self.count, self.number_of_hashes, self.number_of_bits
+            )
+        )
+        file.write(self.bits)
+
+    @classmethod
+    def read(cls, file: BinaryIO) -> "BloomFilter":
+        """Reads a filter written by write
+
+        Args:
+            file (BinaryIO): The file.
+
+        Returns:
+            BloomFilter: The filter
+
+        Raises:
+            ValueError: If the file ends before the bits the header sized the filter for
+        """
+        capacity, false_positive_rate, count, number_of_hashes, number_of_bits = FILTER_HEADER.unpack(
+            file.read(FILTER_HEADER.size)
+        )
+        size = (number_of_bits + 7) // 8
+        if len(bits := file.read(size)) != size:
+            raise ValueError("Truncated Bloom filter snapshot")
+
+        bloom_filter = cls.__new__(cls)
+        bloom_filter.capacity = capacity
+        bloom_filter.false_positive_rate = false_positive_rate
+        bloom_filter.count = count
+        bloom_filter.number_of_hashes = number_of_hashes
+        bloom_filter.number_of_bits = number_of_bits
+        bloom_filter.bits = bytearray(bits)
+        return bloom_filter
+
+
+# !Scalable Bloom filter
+class ScalableBloomFilter:
+    """
+    A Bloom filter that keeps its false positive rate as it grows.
+
+    Once the newest filter is full a filter twice as large with half the false positive rate is added, so the
+    overall false positive rate stays below twice the configured one however many items are added.
+    """
+
+    def __init__(self, initial_capacity: int, false_positive_rate: float) -> None:
+        """Initializes an empty filter
+
+        Args:
+            initial_capacity (int): The number of items the first filter is sized for.
+            false_positive_rate (float): The target false positive rate.
+        """
+        self.filters = [BloomFilter(initial_capacity, false_positive_rate / 2)]
+        self.lock = threading.Lock()
+
+    def add(self, item: str) -> None:
+        """Adds an item
+
+        Args:
+            item (str): The item.
+        """
+        with self.lock:
+            newest = self.filters[-1]
+            if newest.count >= newest.capacity:
+                newest = BloomFilter(newest.capacity * 2, newest.false_positive_rate / 2)
+                self.filters.append(newest)
+            newest.add(item)
+
+    def add_many(self, items: Iterable[str]) -> None:
+        """Adds many items
+
+        Args:
+            items (Iterable[str]): The items.
+        """
+        for item in items:
+            self.add(item)
+
+    def __contains__(self, item: object) -> bool:
+        """Checks if the item may have been added
+
+        Args:
+            item (object): The item.
+
+        Returns:
+            bool: False if the item was definitely never added
+        """
+        return any(item in bloom_filter for bloom_filter in reversed(self.filters))
+
+    def __len__(self) -> int:
+        """Gets the number of items added"""
+        return sum(bloom_filter.count for bloom_filter in self.filters)
+
+    @property
+    def size_in_bytes(self) -> int:
+        """Gets the memory used by the bits of the filters"""
+        return sum(len(bloom_filter.bits) for bloom_filter in self.filters)
+
+    def write(self, file: BinaryIO) -> None:
+        """Writes the filters to a binary file
+
+        Args:
+            file (BinaryIO): The file.
+        """
+        with self.lock:
+            file.write(SNAPSHOT_MAGIC)
+            file.write(struct.pack("<I", len(self.filters)))
+            for bloom_filter in self.filters:
+                bloom_filter.write(file)
+
+    @classmethod
+    def read(cls, file: BinaryIO) -> "ScalableBloomFilter":
+        """Reads filters written by write
+
+        Args:
+            file (BinaryIO): The file.
+
+        Returns:
+            ScalableBloomFilter: The filter
+
+        Raises:
+            ValueError: If the file is not a snapshot of a filter or is cut short
+        """
+        if file.read(len(SNAPSHOT_MAGIC)) != SNAPSHOT_MAGIC:
+            raise ValueError("Not a Bloom filter snapshot")
+
+        (number_of_filters,) = struct.unpack("<I", file.read(4))
+        scalable_filter = cls.__new__(cls)
+        scalable_filter.filters = [BloomFilter.read(file) for _ in range(number_of_filters)]
+        scalable_filter.lock = threading.Lock()
+        return scalable_filter
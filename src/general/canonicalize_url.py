@@ -0,0 +1,120 @@
+import re
+from functools import lru_cache
+from urllib.parse import parse_qsl, quote, urlencode, urljoin, urlsplit, urlunsplit
+
+from .constants import (
+    CANONICAL_URL_CACHE_SIZE,
+    DEFAULT_PORTS,
+    NON_HTML_EXTENSIONS,
+    TRACKING_PARAM_PREFIXES,
+    TRACKING_PARAMS,
+)
+
+# !Characters left as they are in paths and queries, everything else is percent encoded
+PATH_SAFE_CHARACTERS = "/%:@!$&'()*+,;=-._~"
+QUERY_SAFE_CHARACTERS = "%:@!$'()*+,;/?-._~"
+WHITESPACE = str.maketrans("", "", "\t\n\r")
+PERCENT_ESCAPE = re.compile(r"%[0-9a-f][0-9A-Fa-f]|%[0-9A-F][a-f]")
+
+
+def remove_dot_segments(path: str) -> str:
+    """Resolves "." and ".." segments of a path, as in RFC 3986 section 5.2.4
+
+    Args:
+        path (str): The path.
+
+    Returns:
+        str: The path without dot segments
+    """
+    if "." not in path:
+        return path
+
+    segments: list[str] = []
+    for segment in path.split("/"):
+        if segment == "..":
+            if len(segments) > 1:
+                segments.pop()
+        elif segment != ".":
+            segments.append(segment)
+
+    # !A path ending in a dot segment is a directory
+    if path.endswith(("/.", "/..")):
+        segments.append("")
+    return "/".join(segments)
+
+
+def is_tracking_param(name: str) -> bool:
+    """Checks if a query parameter only tracks where a visit came from
+
+    Args:
+        name (str): The name of the parameter.
+
+    Returns:
+        bool: If the parameter is dropped
+    """
+    name = name.lower()
+    return name in TRACKING_PARAMS or name.startswith(TRACKING_PARAM_PREFIXES)
+
+
+@lru_cache(CANONICAL_URL_CACHE_SIZE)
+def canonicalize_absolute_url(url: str) -> str | None:
+    """Gets the canonical spelling of an absolute url, memoized since the same links are on most pages of a site
+
+    Args:
+        url (str): The absolute url.
+
+    Returns:
+        str | None: The canonical url, None if it is not an http(s) url to a page
+    """
+    try:
+        parts = urlsplit(url)
+        port = parts.port
+    except ValueError:
+        return None
+
+    scheme = parts.scheme.lower()
+    host = (parts.hostname or "").rstrip(".")
+    if scheme not in DEFAULT_PORTS or not host:
+        return None
+
+    # !Host names are case insensitive, credentials and default ports are dropped
+    netloc = f"[{host}]" if ":" in host else host
+    if port is not None and port != DEFAULT_PORTS[scheme]:
+        netloc = f"{netloc}:{port}"
+
+    # !Percent escapes are case insensitive, so they are uppercased
+    path = quote(parts.path, safe=PATH_SAFE_CHARACTERS)
+    path = remove_dot_segments(PERCENT_ESCAPE.sub(lambda escape: escape.group().upper(), path)) or "/"
+    if path.lower().endswith(NON_HTML_EXTENSIONS):
+        return None
+
+    # !Parameters are sorted so the order they were written in does not make another url
+    params = sorted(
+        (name, value) for name, value in parse_qsl(parts.query, keep_blank_values=True) if not is_tracking_param(name)
+    )
+    query = urlencode(params, safe=QUERY_SAFE_CHARACTERS, quote_via=quote)
+
+    return urlunsplit((scheme, netloc, path, query, ""))
+
+
+def canonicalize_url(link: str, base: str) -> str | None:
+    """Resolves a link against the url of its page and gets its canonical spelling
+
+    The scheme and host are lowercased, default ports, credentials, fragments and tracking parameters are dropped,
+    dot segments are resolved, the query parameters are sorted and unsafe characters are percent encoded.
+
+    Args:
+        link (str): The link, absolute or relative.
+        base (str): The url the link is relative to, the page url or its <base> element.
+
+    Returns:
+        str | None: The canonical url, None if it is not an http(s) url to a page
+    """
+    link = link.translate(WHITESPACE).strip()
+    if not link or link.startswith("#"):
+        return None
+
+    try:
+        return canonicalize_absolute_url(urljoin(base, link))
+    except ValueError:
+        return None
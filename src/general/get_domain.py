@@ -9,5 +9,11 @@ def get_domain(url: str) -> str:
     Returns:
         str: The domain of the given url
     """
-    sub_domain = urlparse(url).netloc.split(".")
+    netloc = urlparse(url).netloc
+    sub_domain = netloc.split(".")
+
+    # !Hosts without a registrable domain (localhost, IP addresses) are kept as they are
+    if len(sub_domain) < 2 or sub_domain[-1].split(":")[0].isdigit():
+        return netloc
+
     return f"{sub_domain[-2]}.{sub_domain[-1]}"
@@ -0,0 +1,242 @@
+import hashlib
+from array import array
+from functools import lru_cache
+from typing import Dict, List, Tuple
+
+from .constants import SIMHASH_CACHE_SIZE, SIMHASH_SHINGLE_SIZE
+
+try:
+    import numpy as _numpy
+except ImportError:  # pragma: no cover - numpy is optional
+    _numpy = None
+
+FINGERPRINT_BITS = 64
+FINGERPRINT_MASK = (1 << FINGERPRINT_BITS) - 1
+
+# !Odd multipliers that weigh every position of a shingle differently, then the splitmix64 finalizer constants
+POSITION_MULTIPLIERS = [(0x9E3779B97F4A7C15 * (2 * position + 1)) & FINGERPRINT_MASK for position in range(16)]
+MIX_MULTIPLIERS = (0xBF58476D1CE4E5B9, 0x94D049BB133111EB)
+
+
+@lru_cache(SIMHASH_CACHE_SIZE)
+def hash_term(term: str) -> int:
+    """Hashes a term, the same in every process so fingerprints can be stored
+
+    Args:
+        term (str): The term.
+
+    Returns:
+        int: The 64 bit hash
+    """
+    return int.from_bytes(hashlib.blake2b(term.encode("utf8"), digest_size=8).digest(), "little")
+
+
+def mix(value: int) -> int:
+    """Scrambles a 64 bit value with the splitmix64 finalizer, so every bit depends on every term of the shingle
+
+    Args:
+        value (int): The value.
+
+    Returns:
+        int: The scrambled value
+    """
+    value ^= value >> 30
+    value = (value * MIX_MULTIPLIERS[0]) & FINGERPRINT_MASK
+    value ^= value >> 27
+    value = (value * MIX_MULTIPLIERS[1]) & FINGERPRINT_MASK
+    return value ^ (value >> 31)
+
+
+def count_bits(hashes: array) -> List[int]:
+    """Counts, for every bit position, the hashes with that bit set
+
+    Args:
+        hashes (array): The 64 bit hashes.
+
+    Returns:
+        List[int]: The counts, from the lowest bit
+    """
+    # !The hashes are laid end to end in one integer, a mask with the bit of every hash counts them all at once
+    words = int.from_bytes(hashes.tobytes(), "little")
+    repunit = ((1 << (FINGERPRINT_BITS * len(hashes))) - 1) // FINGERPRINT_MASK
+    return [(words & (repunit << bit)).bit_count() for bit in range(FINGERPRINT_BITS)]
+
+
+def simhash_numpy(term_hashes: List[int], size: int, number_of_shingles: int) -> List[int]:
+    """Hashes the shingles and counts their bits with numpy
+
+    Args:
+        term_hashes (List[int]): The hashes of the terms, in order.
+        size (int): Terms per shingle.
+        number_of_shingles (int): The number of shingles.
+
+    Returns:
+        List[int]: The number of shingle hashes with every bit set
+    """
+    terms = _numpy.array(term_hashes, dtype=_numpy.uint64)
+    hashes = _numpy.zeros(number_of_shingles, dtype=_numpy.uint64)
+    for position in range(min(size, len(term_hashes))):
+        hashes += terms[position : position + number_of_shingles] * _numpy.uint64(POSITION_MULTIPLIERS[position])
+
+    hashes ^= hashes >> _numpy.uint64(30)
+    hashes *= _numpy.uint64(MIX_MULTIPLIERS[0])
+    hashes ^= hashes >> _numpy.uint64(27)
+    hashes *= _numpy.uint64(MIX_MULTIPLIERS[1])
+    hashes ^= hashes >> _numpy.uint64(31)
+
+    bits = _numpy.unpackbits(hashes.astype("<u8").view(_numpy.uint8).reshape(-1, 8), axis=1, bitorder="little")
+    return bits.sum(axis=0, dtype=_numpy.int64).tolist()
+
+
+def simhash_python(term_hashes: List[int], size: int, number_of_shingles: int) -> List[int]:
+    """Hashes the shingles and counts their bits without numpy, with the same result
+
+    Args:
+        term_hashes (List[int]): The hashes of the terms, in order.
+        size (int): Terms per shingle.
+        number_of_shingles (int): The number of shingles.
+
+    Returns:
+        List[int]: The number of shingle hashes with every bit set
+    """
+    hashes = [0] * number_of_shingles
+    for position in range(min(size, len(term_hashes))):
+        multiplier = POSITION_MULTIPLIERS[position]
+        window = term_hashes[position : position + number_of_shingles]
+        hashes = [value + term * multiplier for value, term in zip(hashes, window)]
+    return count_bits(array("Q", [mix(value & FINGERPRINT_MASK) for value in hashes]))
+
+
+def simhash(terms: List[str], size: int = SIMHASH_SHINGLE_SIZE) -> int:
+    """Computes the SimHash of a text from its shingles, texts with mostly the same shingles get fingerprints a few
+    bits apart
+
+    Shingles, runs of size consecutive terms, are the features rather than single terms, since the frequent terms of
+    a language would otherwise outweigh the rest and give every page about the same fingerprint. A shingle is hashed
+    from the cached hashes of its terms instead of its text.
+
+    Args:
+        terms (List[str]): The terms of the text, in order.
+        size (int, optional): Terms per shingle, at most 16. Defaults to SIMHASH_SHINGLE_SIZE.
+
+    Returns:
+        int: The fingerprint, 0 without terms
+    """
+    if not terms:
+        return 0
+
+    # !A text shorter than a shingle is a single shingle
+    number_of_shingles = max(len(terms) - size + 1, 1)
+    term_hashes = list(map(hash_term, terms))
+    if _numpy is not None:
+        counts = simhash_numpy(term_hashes, size, number_of_shingles)
+    else:
+        counts = simhash_python(term_hashes, size, number_of_shingles)
+
+    # !A bit is set when most shingle hashes have it set
+    fingerprint = 0
+    for bit, count in enumerate(counts):
+        if count * 2 > number_of_shingles:
+            fingerprint |= 1 << bit
+    return fingerprint
+
+
+# !SimHash index
+class SimHashIndex:
+    """
+    Finds fingerprints within max_distance bits of a fingerprint without comparing it to every stored one.
+
+    Fingerprints are split into max_distance + 1 bands. Two fingerprints that differ in at most max_distance bits are
+    equal on at least one band, so only the fingerprints sharing a band with the query are compared.
+    """
+
+    def __init__(self, max_distance: int = 3) -> None:
+        """Initializes an empty index
+
+        Args:
+            max_distance (int, optional): The most bits near-duplicates differ in. Defaults to 3.
+        """
+        self.max_distance = max_distance
+        self.count = 0
+
+        # !The shift and mask of every band, the last band takes the bits left over
+        number_of_bands = max_distance + 1
+        edges = [index * FINGERPRINT_BITS // number_of_bands for index in range(number_of_bands + 1)]
+        self.bands: List[Tuple[int, int]] = [(start, (1 << (end - start)) - 1) for start, end in zip(edges, edges[1:])]
+
+        # !Buckets hold the fingerprints and keys in flat arrays, a few times smaller than lists of integers
+        self.buckets: List[Dict[int, Tuple[array, array]]] = [{} for _ in self.bands]
+
+    def add(self, key: float, fingerprint: int) -> None:
+        """Adds a fingerprint
+
+        Args:
+            key (float): What the fingerprint is of, e.g. the id of a page.
+            fingerprint (int): The fingerprint.
+        """
+        for (shift, mask), buckets in zip(self.bands, self.buckets):
+            band = (fingerprint >> shift) & mask
+            bucket = buckets.get(band)
+            if bucket is None:
+                bucket = buckets[band] = (array("Q"), array("d"))
+            bucket[0].append(fingerprint)
+            bucket[1].append(key)
+        self.count += 1
+
+    def remove(self, key: float, fingerprint: int | None = None) -> bool:
+        """Removes the fingerprint of a key, e.g. the old fingerprint of a page that changed
+
+        Args:
+            key (float): What the fingerprint is of.
+            fingerprint (int | None, optional): The fingerprint, which limits the search to its buckets. None searches
+                every bucket. Defaults to None.
+
+        Returns:
+            bool: Whether the key was in the index
+        """
+        found = False
+        for (shift, mask), buckets in zip(self.bands, self.buckets):
+            if fingerprint is None:
+                bands = list(buckets)
+            else:
+                bands = [(fingerprint >> shift) & mask]
+            for band in bands:
+                bucket = buckets.get(band)
+                if bucket is None or key not in bucket[1]:
+                    continue
+                position = bucket[1].index(key)
+                del bucket[0][position]
+                del bucket[1][position]
+                if not bucket[1]:
+                    del buckets[band]
+                found = True
+                # !A key is in one bucket of every band
+                break
+
+        if found:
+            self.count -= 1
+        return found
+
+    def find(self, fingerprint: int) -> List[float]:
+        """Finds the keys of the fingerprints within max_distance bits
+
+        Args:
+            fingerprint (int): The fingerprint.
+
+        Returns:
+            List[float]: The keys, closest first
+        """
+        matches: Dict[float, int] = {}
+        for (shift, mask), buckets in zip(self.bands, self.buckets):
+            bucket = buckets.get((fingerprint >> shift) & mask)
+            if bucket is None:
+                continue
+            for candidate, key in zip(*bucket):
+                distance = (candidate ^ fingerprint).bit_count()
+                if distance <= self.max_distance:
+                    matches[key] = distance
+        return sorted(matches, key=matches.__getitem__)
+
+    def __len__(self) -> int:
+        """Gets the number of fingerprints added"""
+        return self.count
@@ -0,0 +1,240 @@
+from typing import List, Tuple
+
+# !Suffixes of every Porter step with their replacement, longest first so the longest matching suffix is used
+STEP_2_SUFFIXES: List[Tuple[str, str]] = [
+    ("ational", "ate"),
+    ("ization", "ize"),
+    ("iveness", "ive"),
+    ("fulness", "ful"),
+    ("ousness", "ous"),
+    ("tional", "tion"),
+    ("biliti", "ble"),
+    ("entli", "ent"),
+    ("ousli", "ous"),
+    ("ation", "ate"),
+    ("alism", "al"),
+    ("aliti", "al"),
+    ("iviti", "ive"),
+    ("enci", "ence"),
+    ("anci", "ance"),
+    ("izer", "ize"),
+    ("abli", "able"),
+    ("alli", "al"),
+    ("ator", "ate"),
+    ("eli", "e"),
+]
+STEP_3_SUFFIXES: List[Tuple[str, str]] = [
+    ("icate", "ic"),
+    ("ative", ""),
+    ("alize", "al"),
+    ("iciti", "ic"),
+    ("ical", "ic"),
+    ("ness", ""),
+    ("ful", ""),
+]
+STEP_4_SUFFIXES: List[str] = [
+    "ement",
+    "ance",
+    "ence",
+    "able",
+    "ible",
+    "ment",
+    "ant",
+    "ent",
+    "ion",
+    "ism",
+    "ate",
+    "iti",
+    "ous",
+    "ive",
+    "ize",
+    "al",
+    "er",
+    "ic",
+    "ou",
+]
+
+
+def is_consonant(word: str, index: int) -> bool:
+    """Checks if a letter is a consonant, "y" being one only at the start or after a vowel
+
+    Args:
+        word (str): The word.
+        index (int): The position of the letter.
+
+    Returns:
+        bool: If the letter is a consonant
+    """
+    letter = word[index]
+    if letter in "aeiou":
+        return False
+    if letter == "y":
+        return index == 0 or not is_consonant(word, index - 1)
+    return True
+
+
+def measure(stem: str) -> int:
+    """Counts the vowel-consonant sequences of a stem, the m of the Porter algorithm
+
+    Args:
+        stem (str): The stem.
+
+    Returns:
+        int: The number of vowel-consonant sequences
+    """
+    count = 0
+    previous_is_vowel = False
+    for index in range(len(stem)):
+        consonant = is_consonant(stem, index)
+        if consonant and previous_is_vowel:
+            count += 1
+        previous_is_vowel = not consonant
+    return count
+
+
+def has_vowel(stem: str) -> bool:
+    """Checks if a stem contains a vowel
+
+    Args:
+        stem (str): The stem.
+
+    Returns:
+        bool: If the stem contains a vowel
+    """
+    return any(not is_consonant(stem, index) for index in range(len(stem)))
+
+
+def ends_double_consonant(word: str) -> bool:
+    """Checks if a word ends with the same consonant twice
+
+    Args:
+        word (str): The word.
+
+    Returns:
+        bool: If the word ends with a double consonant
+    """
+    return len(word) > 1 and word[-1] == word[-2] and is_consonant(word, len(word) - 1)
+
+
+def ends_cvc(word: str) -> bool:
+    """Checks if a word ends consonant, vowel, consonant, the last not being w, x or y
+
+    Args:
+        word (str): The word.
+
+    Returns:
+        bool: If the word ends consonant, vowel, consonant
+    """
+    length = len(word)
+    return (
+        length > 2
+        and is_consonant(word, length - 3)
+        and not is_consonant(word, length - 2)
+        and is_consonant(word, length - 1)
+        and word[-1] not in "wxy"
+    )
+
+
+def replace_suffix(word: str, suffixes: List[Tuple[str, str]], minimum_measure: int) -> str:
+    """Replaces the longest matching suffix, if the measure of what is left is over the minimum
+
+    Args:
+        word (str): The word.
+        suffixes (List[Tuple[str, str]]): The suffixes and their replacements, longest first.
+        minimum_measure (int): The measure the stem has to be over.
+
+    Returns:
+        str: The word with the suffix replaced
+    """
+    for suffix, replacement in suffixes:
+        if word.endswith(suffix):
+            stem = word[: -len(suffix)]
+            return stem + replacement if measure(stem) > minimum_measure else word
+    return word
+
+
+def remove_inflections(word: str) -> str:
+    """Runs step 1 of the Porter algorithm, removing plurals, past participles and gerunds
+
+    Args:
+        word (str): The word.
+
+    Returns:
+        str: The word without inflections
+    """
+    # !Step 1a, plurals
+    if word.endswith("sses") or word.endswith("ies"):
+        word = word[:-2]
+    elif word.endswith("s") and not word.endswith("ss"):
+        word = word[:-1]
+
+    # !Step 1b, past participles and gerunds
+    if word.endswith("eed"):
+        if measure(word[:-3]) > 0:
+            word = word[:-1]
+    else:
+        for suffix in ("ed", "ing"):
+            if word.endswith(suffix) and has_vowel(word[: -len(suffix)]):
+                word = word[: -len(suffix)]
+                if word.endswith(("at", "bl", "iz")):
+                    word += "e"
+                elif ends_double_consonant(word) and word[-1] not in "lsz":
+                    word = word[:-1]
+                elif measure(word) == 1 and ends_cvc(word):
+                    word += "e"
+                break
+
+    # !Step 1c, y to i
+    if word.endswith("y") and has_vowel(word[:-1]):
+        word = word[:-1] + "i"
+
+    return word
+
+
+def remove_endings(word: str) -> str:
+    """Runs steps 4 and 5 of the Porter algorithm, removing suffixes from long stems and a final e or l
+
+    Args:
+        word (str): The word.
+
+    Returns:
+        str: The word without endings
+    """
+    # !Step 4, suffixes removed from long stems
+    for suffix in STEP_4_SUFFIXES:
+        if word.endswith(suffix):
+            stem = word[: -len(suffix)]
+            if measure(stem) > 1 and (suffix != "ion" or stem.endswith(("s", "t"))):
+                word = stem
+            break
+
+    # !Step 5, final e and double l
+    if word.endswith("e"):
+        stem = word[:-1]
+        if measure(stem) > 1 or (measure(stem) == 1 and not ends_cvc(stem)):
+            word = stem
+    if word.endswith("ll") and measure(word) > 1:
+        word = word[:-1]
+
+    return word
+
+
+def stem_word(word: str) -> str:
+    """Reduces a lowercase english word to its stem with the Porter algorithm, e.g. "connections" to "connect"
+
+    Args:
+        word (str): The lowercase word.
+
+    Returns:
+        str: The stem of the word
+    """
+    if len(word) < 3 or not word.isalpha() or not word.isascii():
+        return word
+
+    word = remove_inflections(word)
+
+    # !Steps 2 and 3, double and single suffixes
+    word = replace_suffix(word, STEP_2_SUFFIXES, 0)
+    word = replace_suffix(word, STEP_3_SUFFIXES, 0)
+
+    return remove_endings(word)
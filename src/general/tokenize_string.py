@@ -1,8 +1,9 @@
-import string as _str
-from collections import Counter
 from typing import Dict
 
-from .constants import HTML_BLACKLIST, STOP_WORDS
+from .tokenizer import Tokenizer
+
+# !Shared by every caller, so the stem cache is shared as well
+DEFAULT_TOKENIZER = Tokenizer()
 
 
 def tokenize_string(string: str) -> Dict[str, int]:
@@ -12,19 +13,6 @@ def tokenize_string(string: str) -> Dict[str, int]:
         string(str): The string to tokenize.
 
     Returns:
-        Dict[str,int]: Dictionary of words and number of occurrences
+        Dict[str,int]: Dictionary of case folded terms and number of occurrences
     """
-    # !Remove punctuation
-    text = string.translate(str.maketrans("", "", _str.punctuation))
-
-    # !Split the string into a list of words
-    tokens = text.split()
-
-    # !Remove blacklist tags
-    tokens = [word for word in tokens if word not in HTML_BLACKLIST]
-
-    # !Remove stop words
-    tokens = [word for word in tokens if word not in STOP_WORDS]
-
-    # !Return count of words
-    return dict(Counter(tokens))
+    return DEFAULT_TOKENIZER.count(string)
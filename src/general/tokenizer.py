@@ -0,0 +1,101 @@
+import re
+from collections import Counter
+from functools import lru_cache
+from itertools import filterfalse
+from typing import Callable, Dict, FrozenSet, List
+
+from .constants import HTML_BLACKLIST, STEM_CACHE_SIZE, STOP_WORDS, TOKEN_PATTERN, TOKENIZER_STEM
+from .stem_word import stem_word
+
+
+# !Tokenizer engine
+class Tokenizer:
+    """
+    Splits text into case folded terms in one regular expression pass, dropping stop words with a single set lookup
+    and optionally stemming them.
+
+    Stems are memoized, so stemming costs a dictionary lookup for all but the first occurrence of a word.
+    """
+
+    pattern: re.Pattern[str]
+    stop_words: FrozenSet[str]
+    stem: Callable[[str], str] | None
+
+    def __init__(
+        self,
+        stem: bool = TOKENIZER_STEM,
+        stop_words: FrozenSet[str] = STOP_WORDS | HTML_BLACKLIST,
+        pattern: str = TOKEN_PATTERN,
+        stem_cache_size: int = STEM_CACHE_SIZE,
+    ) -> None:
+        """Initializes the tokenizer
+
+        Args:
+            stem (bool, optional): Whether terms are reduced to their stem. Defaults to TOKENIZER_STEM.
+            stop_words (FrozenSet[str], optional): Case folded words that are dropped. Defaults to STOP_WORDS and
+                HTML_BLACKLIST.
+            pattern (str, optional): Regular expression matching a word. Defaults to TOKEN_PATTERN.
+            stem_cache_size (int, optional): Stems memoized. Defaults to STEM_CACHE_SIZE.
+        """
+        self.pattern = re.compile(pattern)
+        self.stop_words = frozenset(stop_words)
+        self.stem = lru_cache(stem_cache_size)(stem_word) if stem else None
+
+    def words(self, text: str) -> List[str]:
+        """Splits text into case folded words, stop words included
+
+        Args:
+            text (str): The text.
+
+        Returns:
+            List[str]: The words
+        """
+        return self.pattern.findall(text.casefold())
+
+    def tokenize(self, text: str) -> List[str]:
+        """Splits text into terms, in order
+
+        Args:
+            text (str): The text.
+
+        Returns:
+            List[str]: The terms
+        """
+        terms = filterfalse(self.stop_words.__contains__, self.words(text))
+        if self.stem is not None:
+            return list(map(self.stem, terms))
+        return list(terms)
+
+    def count(self, text: str) -> Dict[str, int]:
+        """Counts the terms of text
+
+        Args:
+            text (str): The text.
+
+        Returns:
+            Dict[str, int]: Dictionary of terms and number of occurrences
+        """
+        terms = filterfalse(self.stop_words.__contains__, self.words(text))
+        if self.stem is not None:
+            return dict(Counter(map(self.stem, terms)))
+        return dict(Counter(terms))
+
+    def positions(self, text: str) -> Dict[str, List[int]]:
+        """Finds where every term of text is
+
+        Positions count every word, stop words included, so the gaps between terms are kept for phrase queries.
+
+        Args:
+            text (str): The text.
+
+        Returns:
+            Dict[str, List[int]]: Dictionary of terms and their word positions, in order
+        """
+        positions: Dict[str, List[int]] = {}
+        stop_words = self.stop_words
+        for position, word in enumerate(self.words(text)):
+            if word in stop_words:
+                continue
+            term = self.stem(word) if self.stem is not None else word
+            positions.setdefault(term, []).append(position)
+        return positions
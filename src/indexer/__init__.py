@@ -0,0 +1,5 @@
+from .index_writer import IndexWriter
+from .indexer import Indexer
+from .inverted_index import InvertedIndex, TermEntry
+
+__all__ = ["IndexWriter", "Indexer", "InvertedIndex", "TermEntry"]
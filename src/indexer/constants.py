@@ -0,0 +1,4 @@
+INDEX_DIRECTORY: str = "./assets/index"
+INDEX_RUN_MAX_POSTINGS: int = 2_000_000
+INDEX_INTERVAL: float = 600
+POSTINGS_BLOCK_SIZE: int = 128
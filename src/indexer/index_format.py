@@ -0,0 +1,39 @@
+import os
+import struct
+
+# !Files of an index generation
+DOCUMENTS_FILE = "documents.bin"
+DICTIONARY_FILE = "dictionary.bin"
+TERMS_FILE = "terms.bin"
+POSTINGS_FILE = "postings.bin"
+META_FILE = "meta.json"
+CURRENT_FILE = "CURRENT"
+
+# !Document: id of the page in the crawled collection, number of terms, rank
+DOCUMENT_ENTRY = struct.Struct("<dIf")
+
+# !Dictionary entry, sorted by term: term offset and length, postings offset and length, document frequency, highest
+# !term frequency
+DICTIONARY_ENTRY = struct.Struct("<QIQIII")
+
+# !Skip entry of a postings block: last document, length of the block, highest term frequency in the block
+SKIP_ENTRY = struct.Struct("<III")
+
+# !Run record header: term length, document frequency, highest term frequency, last document, postings length
+RUN_RECORD_HEADER = struct.Struct("<IIIII")
+
+
+def read_current_generation(directory: str) -> str | None:
+    """Gets the generation readers should open
+
+    Args:
+        directory (str): The index directory
+
+    Returns:
+        str | None: The generation, None if no index was built yet
+    """
+    try:
+        with open(os.path.join(directory, CURRENT_FILE), "r", encoding="utf-8") as file:
+            return file.read().strip() or None
+    except FileNotFoundError:
+        return None
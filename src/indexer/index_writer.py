@@ -0,0 +1,366 @@
+import heapq
+import json
+import os
+import shutil
+from contextlib import ExitStack
+from dataclasses import dataclass, field
+from itertools import groupby
+from time import time_ns
+from typing import BinaryIO, Dict, Iterator, List, Tuple
+
+from .constants import INDEX_RUN_MAX_POSTINGS, POSTINGS_BLOCK_SIZE
+from .index_format import (
+    CURRENT_FILE,
+    DICTIONARY_ENTRY,
+    DICTIONARY_FILE,
+    DOCUMENT_ENTRY,
+    DOCUMENTS_FILE,
+    META_FILE,
+    POSTINGS_FILE,
+    RUN_RECORD_HEADER,
+    SKIP_ENTRY,
+    TERMS_FILE,
+    read_current_generation,
+)
+from .postings import encode_postings, encode_varint, iter_postings
+
+# !A term of a run: the run, where its encoded postings are in the run file and their length, document frequency and
+# !highest term frequency
+RunRecord = Tuple[str, int, int, int, int, int]
+
+
+@dataclass(slots=True)
+class _RunTerm:
+    """Postings of a term in the run being built, encoded as they are added"""
+
+    postings: bytearray = field(default_factory=bytearray)
+    last_document: int = 0
+    document_frequency: int = 0
+    max_frequency: int = 0
+
+
+# !Postings block writer
+class _BlockWriter:
+    """
+    Writes the postings of a term to the postings file a block at a time.
+
+    The skip table goes in front of the blocks, so its room is reserved from the document frequency and every skip
+    entry is written into it as soon as its block is, leaving only the block being filled in memory.
+    """
+
+    def __init__(self, file: BinaryIO, document_frequency: int, block_size: int) -> None:
+        """Starts the postings of a term at the current position of the file
+
+        Args:
+            file (BinaryIO): The postings file.
+            document_frequency (int): The number of postings of the term.
+            block_size (int): Postings per block.
+        """
+        self.file = file
+        self.block_size = block_size
+        self.start = file.tell()
+        self.skip_offset = self.start
+        self.block_offset = self.start + -(-document_frequency // block_size) * SKIP_ENTRY.size
+        self.block: List[Tuple[int, int]] = []
+        self.previous_document = 0
+
+    def add(self, document: int, frequency: int) -> None:
+        """Adds a posting, writing the block once it is full
+
+        Args:
+            document (int): The document number, higher than the one of the posting before.
+            frequency (int): The term frequency.
+        """
+        self.block.append((document, frequency))
+        if len(self.block) == self.block_size:
+            self.write_block()
+
+    def write_block(self) -> None:
+        """Writes the block being filled and its skip entry"""
+        encoded_block = bytearray()
+        encode_postings(self.block, encoded_block, self.previous_document)
+        self.previous_document = self.block[-1][0]
+
+        self.write_at(
+            self.skip_offset,
+            SKIP_ENTRY.pack(self.previous_document, len(encoded_block), max(frequency for _, frequency in self.block)),
+        )
+        self.write_at(self.block_offset, encoded_block)
+        self.skip_offset += SKIP_ENTRY.size
+        self.block_offset += len(encoded_block)
+        self.block = []
+
+    def write_at(self, offset: int, data: bytes | bytearray) -> None:
+        """Writes at an offset of the file, seeking only when it is elsewhere
+
+        Terms of a single block are written in order, so only longer posting lists flush the file buffer to seek.
+
+        Args:
+            offset (int): The offset.
+            data (bytes | bytearray): The bytes.
+        """
+        if self.file.tell() != offset:
+            self.file.seek(offset)
+        self.file.write(data)
+
+    def finish(self) -> int:
+        """Writes the last block and leaves the file at the end of the postings
+
+        Returns:
+            int: The length of the skip table and the blocks
+        """
+        if self.block:
+            self.write_block()
+        if self.file.tell() != self.block_offset:
+            self.file.seek(self.block_offset)
+        return self.block_offset - self.start
+
+
+# !Inverted index writer
+class IndexWriter:  # pylint: disable=too-many-instance-attributes
+    """
+    Builds a new generation of the inverted index from documents added in increasing document number order.
+
+    Postings are kept in memory until run_max_postings are buffered, then written as a run sorted by term. Commit
+    merges the runs into the final files, so memory stays bounded however many documents are indexed.
+    """
+
+    def __init__(
+        self,
+        directory: str,
+        run_max_postings: int = INDEX_RUN_MAX_POSTINGS,
+        block_size: int = POSTINGS_BLOCK_SIZE,
+    ) -> None:
+        """Starts a new generation in the index directory
+
+        Args:
+            directory (str): The index directory
+            run_max_postings (int, optional): Postings buffered before a run is written. Defaults to
+                INDEX_RUN_MAX_POSTINGS.
+            block_size (int, optional): Postings per block of the final postings. Defaults to POSTINGS_BLOCK_SIZE.
+        """
+        self.directory = directory
+        self.run_max_postings = run_max_postings
+        self.block_size = block_size
+        self.generation = str(time_ns())
+        self.path = os.path.join(directory, self.generation)
+        os.makedirs(self.path)
+
+        self.documents_file = open(os.path.join(self.path, DOCUMENTS_FILE), "wb")  # pylint: disable=consider-using-with
+        self.number_of_documents = 0
+        self.total_length = 0
+        self.min_length: int | None = None
+        self.max_rank = 0.0
+
+        self.run: Dict[str, _RunTerm] = {}
+        self.run_postings = 0
+        self.run_paths: List[str] = []
+
+    def add(self, page_id: float, tokens: Dict[str, int], rank: float = 1) -> int:
+        """Adds a document
+
+        Args:
+            page_id (float): The id of the page in the crawled collection
+            tokens (Dict[str, int]): The terms of the page and their number of occurrences
+            rank (float, optional): The rank of the page. Defaults to 1.
+
+        Returns:
+            int: The document number
+        """
+        document = self.number_of_documents
+        length = sum(tokens.values())
+        entry = DOCUMENT_ENTRY.pack(page_id, length, rank)
+        self.documents_file.write(entry)
+        self.number_of_documents += 1
+        self.total_length += length
+        self.min_length = length if self.min_length is None else min(self.min_length, length)
+
+        # !The highest rank is a bound for the search, so it is taken from the stored, single precision, rank
+        self.max_rank = max(self.max_rank, DOCUMENT_ENTRY.unpack(entry)[2])
+
+        for term, frequency in tokens.items():
+            run_term = self.run.get(term)
+            if run_term is None:
+                run_term = self.run[term] = _RunTerm()
+            encode_varint(document - run_term.last_document, run_term.postings)
+            encode_varint(frequency, run_term.postings)
+            run_term.last_document = document
+            run_term.document_frequency += 1
+            run_term.max_frequency = max(run_term.max_frequency, frequency)
+
+        self.run_postings += len(tokens)
+        if self.run_postings >= self.run_max_postings:
+            self.write_run()
+
+        return document
+
+    def write_run(self) -> None:
+        """Writes the buffered postings as a run sorted by term"""
+        if not self.run:
+            return
+
+        path = os.path.join(self.path, f"run-{len(self.run_paths)}.bin")
+        with open(path, "wb") as file:
+            # !Code point order of the strings is the byte order of their UTF-8 encoding, which readers search by
+            for term in sorted(self.run):
+                run_term = self.run[term]
+                encoded_term = term.encode("utf-8")
+                file.write(
+                    RUN_RECORD_HEADER.pack(
+                        len(encoded_term),
+                        run_term.document_frequency,
+                        run_term.max_frequency,
+                        run_term.last_document,
+                        len(run_term.postings),
+                    )
+                )
+                file.write(encoded_term)
+                file.write(run_term.postings)
+
+        self.run_paths.append(path)
+        self.run = {}
+        self.run_postings = 0
+
+    @staticmethod
+    def read_run(path: str, run: int) -> Iterator[RunRecord]:
+        """Streams the records of a run, skipping over their postings
+
+        Args:
+            path (str): The path of the run
+            run (int): The number of the run
+
+        Returns:
+            Iterator[RunRecord]: The terms in order, with where their postings are
+        """
+        with open(path, "rb") as file:
+            while header := file.read(RUN_RECORD_HEADER.size):
+                term_length, document_frequency, max_frequency, _, postings_length = RUN_RECORD_HEADER.unpack(header)
+                term = file.read(term_length).decode("utf-8")
+                postings_offset = file.tell()
+                file.seek(postings_length, os.SEEK_CUR)
+                yield term, run, postings_offset, postings_length, document_frequency, max_frequency
+
+    def merge_term(
+        self, records: Iterator[RunRecord], run_files: List[BinaryIO], postings_file: BinaryIO
+    ) -> Tuple[int, int, int]:
+        """Joins the postings of a term from every run that has it into blocks written to the postings file
+
+        Runs hold consecutive document ranges and the first gap of a run is from document 0, so the postings are the
+        run postings in run order. They are decoded one run at a time and written a block at a time, so memory does
+        not grow with the document frequency of the term.
+
+        Args:
+            records (Iterator[RunRecord]): The records of the term, in run order
+            run_files (List[BinaryIO]): The runs, opened to read the postings
+            postings_file (BinaryIO): Where the postings are written
+
+        Returns:
+            Tuple[int, int, int]: The length of the postings, the document frequency and the highest term frequency
+        """
+        term_records = list(records)
+        document_frequency = sum(record[4] for record in term_records)
+        block_writer = _BlockWriter(postings_file, document_frequency, self.block_size)
+
+        for _, run, postings_offset, postings_length, _, _ in term_records:
+            run_file = run_files[run]
+            run_file.seek(postings_offset)
+            for document, frequency in iter_postings(run_file.read(postings_length)):
+                block_writer.add(document, frequency)
+
+        return block_writer.finish(), document_frequency, max(record[5] for record in term_records)
+
+    def merge_runs(self) -> int:
+        """Merges the runs into the dictionary, terms and postings files, streaming them in term order
+
+        Returns:
+            int: The number of terms
+        """
+        terms_offset = 0
+        postings_offset = 0
+        number_of_terms = 0
+
+        with (
+            ExitStack() as stack,
+            open(os.path.join(self.path, DICTIONARY_FILE), "wb") as dictionary_file,
+            open(os.path.join(self.path, TERMS_FILE), "wb") as terms_file,
+            open(os.path.join(self.path, POSTINGS_FILE), "wb") as postings_file,
+        ):
+            # !A second handle on every run reads the postings while the first walks the terms
+            run_files = [stack.enter_context(open(path, "rb")) for path in self.run_paths]
+            for term, records in groupby(
+                heapq.merge(
+                    *(self.read_run(path, run) for run, path in enumerate(self.run_paths)),
+                    key=lambda record: record[0],
+                ),
+                key=lambda record: record[0],
+            ):
+                postings_length, document_frequency, max_frequency = self.merge_term(records, run_files, postings_file)
+                encoded_term = term.encode("utf-8")
+                terms_file.write(encoded_term)
+                dictionary_file.write(
+                    DICTIONARY_ENTRY.pack(
+                        terms_offset,
+                        len(encoded_term),
+                        postings_offset,
+                        postings_length,
+                        document_frequency,
+                        max_frequency,
+                    )
+                )
+                terms_offset += len(encoded_term)
+                postings_offset += postings_length
+                number_of_terms += 1
+
+        return number_of_terms
+
+    def commit(self) -> str:
+        """Merges the runs into the final files and makes the generation the one readers open
+
+        Returns:
+            str: The generation
+        """
+        self.write_run()
+        self.documents_file.close()
+        number_of_terms = self.merge_runs()
+
+        for path in self.run_paths:
+            os.remove(path)
+
+        with open(os.path.join(self.path, META_FILE), "w", encoding="utf-8") as meta_file:
+            json.dump(
+                {
+                    "documents": self.number_of_documents,
+                    "terms": number_of_terms,
+                    "total_length": self.total_length,
+                    "min_length": self.min_length or 0,
+                    "max_rank": self.max_rank,
+                    "block_size": self.block_size,
+                },
+                meta_file,
+            )
+
+        # !Readers open the generation CURRENT names, which is swapped atomically
+        previous_generation = read_current_generation(self.directory)
+        current_path = os.path.join(self.directory, CURRENT_FILE)
+        with open(f"{current_path}.tmp", "w", encoding="utf-8") as current_file:
+            current_file.write(self.generation)
+        os.replace(f"{current_path}.tmp", current_path)
+
+        self.remove_old_generations(previous_generation)
+        return self.generation
+
+    def abort(self) -> None:
+        """Drops the generation being built"""
+        self.documents_file.close()
+        shutil.rmtree(self.path, ignore_errors=True)
+
+    def remove_old_generations(self, previous_generation: str | None) -> None:
+        """Removes every generation but this one and the previous one, which readers may still have open
+
+        Args:
+            previous_generation (str | None): The generation CURRENT named before this one
+        """
+        for name in os.listdir(self.directory):
+            path = os.path.join(self.directory, name)
+            if name not in (self.generation, previous_generation) and os.path.isdir(path):
+                shutil.rmtree(path, ignore_errors=True)
@@ -0,0 +1,74 @@
+import logging
+import threading
+from time import sleep
+from typing import Any, Dict, NoReturn
+
+import pymongo.database as _database
+
+from ..metrics import ERRORS
+from ..models import Crawled as _crawled_collection
+from .constants import INDEX_DIRECTORY, INDEX_INTERVAL, INDEX_RUN_MAX_POSTINGS
+from .index_writer import IndexWriter
+
+logger = logging.getLogger(__name__)
+
+
+# !Indexer
+class Indexer:
+    """Builds the inverted index of the parsed pages in the crawled collection"""
+
+    def __init__(
+        self,
+        db: _database.Database[Dict[str, Any]],
+        directory: str = INDEX_DIRECTORY,
+        run_max_postings: int = INDEX_RUN_MAX_POSTINGS,
+    ) -> None:
+        """Initializes the indexer
+
+        Args:
+            db (_database.Database[Dict[str, Any]]): Database class
+            directory (str, optional): The index directory. Defaults to INDEX_DIRECTORY.
+            run_max_postings (int, optional): Postings kept in memory before a run is written. Defaults to
+                INDEX_RUN_MAX_POSTINGS.
+        """
+        self.directory = directory
+        self.run_max_postings = run_max_postings
+        self.crawled = _crawled_collection(db)
+
+    def build(self) -> str:
+        """Builds a new generation of the index from every parsed page, streamed from the database
+
+        Returns:
+            str: The generation
+        """
+        writer = IndexWriter(self.directory, self.run_max_postings)
+        try:
+            for page in self.crawled.iterate({"status": "parsed"}, fields=["id", "tokens", "rank"]):
+                writer.add(page["id"], page["tokens"], page.get("rank", 1))
+            return writer.commit()
+        except BaseException:
+            writer.abort()
+            raise
+
+    def start(self, interval: float = INDEX_INTERVAL) -> None:
+        """Rebuilds the index every interval seconds in a background thread
+
+        Args:
+            interval (float, optional): Seconds between builds. Defaults to INDEX_INTERVAL.
+        """
+        threading.Thread(target=self.work, args=(interval,), daemon=True).start()
+
+    def work(self, interval: float) -> NoReturn:
+        """Rebuilds the index forever
+
+        Args:
+            interval (float): Seconds between builds
+        """
+        while True:
+            # !A failed build is tried again after the interval, searches keep using the last index meanwhile
+            try:
+                self.build()
+            except Exception as error:  # pylint: disable=broad-exception-caught
+                ERRORS.labels("indexer", type(error).__name__).inc()
+                logger.exception("Building the index failed")
+            sleep(interval)
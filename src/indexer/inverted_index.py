@@ -0,0 +1,191 @@
+import json
+import mmap
+import os
+from typing import Iterator, List, NamedTuple, Tuple
+
+from .constants import INDEX_DIRECTORY
+from .index_format import (
+    DICTIONARY_ENTRY,
+    DICTIONARY_FILE,
+    DOCUMENT_ENTRY,
+    DOCUMENTS_FILE,
+    META_FILE,
+    POSTINGS_FILE,
+    TERMS_FILE,
+    read_current_generation,
+)
+from .postings import NO_MORE_DOCUMENTS, PostingsCursor
+
+
+# !Dictionary entry
+class TermEntry(NamedTuple):
+    """A term of the dictionary and where its postings are"""
+
+    term: str
+    postings_offset: int
+    postings_length: int
+    document_frequency: int
+    max_term_frequency: int
+
+
+def map_file(path: str) -> mmap.mmap | bytes:
+    """Memory maps a file read-only
+
+    Args:
+        path (str): The path of the file
+
+    Returns:
+        mmap.mmap | bytes: The memory map, or empty bytes for an empty file, which cannot be mapped
+    """
+    with open(path, "rb") as file:
+        if os.fstat(file.fileno()).st_size == 0:
+            return b""
+        return mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+
+
+# !Inverted index reader
+class InvertedIndex:  # pylint: disable=too-many-instance-attributes
+    """
+    Read-only view of the current generation of the inverted index.
+
+    The files are memory mapped, so opening an index reads nothing up front and the operating system keeps the hot
+    parts of the dictionary and postings in its page cache. Terms are found by binary search over the fixed-width
+    dictionary entries.
+    """
+
+    def __init__(self, directory: str = INDEX_DIRECTORY) -> None:
+        """Opens the current generation of the index
+
+        Args:
+            directory (str, optional): The index directory. Defaults to INDEX_DIRECTORY.
+
+        Raises:
+            FileNotFoundError: If no index was built yet
+        """
+        generation = read_current_generation(directory)
+        if generation is None:
+            raise FileNotFoundError(f"No index in {directory}")
+
+        self.directory = directory
+        self.generation = generation
+        path = os.path.join(directory, generation)
+
+        with open(os.path.join(path, META_FILE), "r", encoding="utf-8") as meta_file:
+            meta = json.load(meta_file)
+        self.number_of_documents: int = meta["documents"]
+        self.number_of_terms: int = meta["terms"]
+        self.total_length: int = meta["total_length"]
+        self.min_length: int = meta["min_length"]
+        self.max_rank: float = meta["max_rank"]
+        self.block_size: int = meta["block_size"]
+
+        self.documents = map_file(os.path.join(path, DOCUMENTS_FILE))
+        self.dictionary = map_file(os.path.join(path, DICTIONARY_FILE))
+        self.terms = map_file(os.path.join(path, TERMS_FILE))
+        self.postings_data = map_file(os.path.join(path, POSTINGS_FILE))
+
+    @property
+    def average_length(self) -> float:
+        """The average number of terms of a document"""
+        return self.total_length / self.number_of_documents if self.number_of_documents else 0.0
+
+    def is_current(self) -> bool:
+        """Checks if a newer generation was built since the index was opened
+
+        Returns:
+            bool: False once a newer generation should be opened
+        """
+        return read_current_generation(self.directory) == self.generation
+
+    def entry(self, index: int) -> TermEntry:
+        """Reads a dictionary entry
+
+        Args:
+            index (int): The position of the term in the sorted dictionary
+
+        Returns:
+            TermEntry: The entry
+        """
+        term_offset, term_length, postings_offset, postings_length, document_frequency, max_term_frequency = (
+            DICTIONARY_ENTRY.unpack_from(self.dictionary, index * DICTIONARY_ENTRY.size)
+        )
+        term = self.terms[term_offset : term_offset + term_length].decode("utf-8")
+        return TermEntry(term, postings_offset, postings_length, document_frequency, max_term_frequency)
+
+    def find(self, term: str) -> TermEntry | None:
+        """Finds a term by binary search
+
+        Args:
+            term (str): The term
+
+        Returns:
+            TermEntry | None: The entry, None if no document has the term
+        """
+        low, high = 0, self.number_of_terms
+        while low < high:
+            middle = (low + high) // 2
+            entry = self.entry(middle)
+            if entry.term == term:
+                return entry
+            if entry.term < term:
+                low = middle + 1
+            else:
+                high = middle
+        return None
+
+    def cursor(self, entry: TermEntry) -> PostingsCursor:
+        """Gets a cursor over the postings of a term, reading them straight from the memory map
+
+        Args:
+            entry (TermEntry): The entry of the term
+
+        Returns:
+            PostingsCursor: The cursor
+        """
+        view = memoryview(self.postings_data)[entry.postings_offset : entry.postings_offset + entry.postings_length]
+        return PostingsCursor(view, entry.document_frequency, self.block_size)
+
+    def postings(self, term: str | TermEntry) -> List[Tuple[int, int]]:
+        """Gets the documents with a term
+
+        Args:
+            term (str | TermEntry): The term or its entry
+
+        Returns:
+            List[Tuple[int, int]]: Document numbers, in increasing order, and term frequencies
+        """
+        entry = self.find(term) if isinstance(term, str) else term
+        if entry is None:
+            return []
+
+        postings = []
+        cursor = self.cursor(entry)
+        while cursor.document != NO_MORE_DOCUMENTS:
+            postings.append((cursor.document, cursor.frequency))
+            cursor.next()
+        return postings
+
+    def document(self, document: int) -> Tuple[float, int, float]:
+        """Gets a document
+
+        Args:
+            document (int): The document number
+
+        Returns:
+            Tuple[float, int, float]: The id of the page in the crawled collection, its number of terms and its rank
+        """
+        return DOCUMENT_ENTRY.unpack_from(self.documents, document * DOCUMENT_ENTRY.size)
+
+    def iterate_terms(self) -> Iterator[TermEntry]:
+        """Streams the dictionary in term order
+
+        Returns:
+            Iterator[TermEntry]: The entries
+        """
+        return (self.entry(index) for index in range(self.number_of_terms))
+
+    def close(self) -> None:
+        """Unmaps the files"""
+        for view in (self.documents, self.dictionary, self.terms, self.postings_data):
+            if isinstance(view, mmap.mmap):
+                view.close()
@@ -0,0 +1,225 @@
+from bisect import bisect_left
+from typing import Iterator, List, Tuple
+
+from .constants import POSTINGS_BLOCK_SIZE
+from .index_format import SKIP_ENTRY
+
+# !Document of a cursor past its last posting
+NO_MORE_DOCUMENTS = 2**63
+
+
+def encode_varint(value: int, output: bytearray) -> None:
+    """Appends a non-negative integer in 7 bit groups, the high bit set on every byte but the last
+
+    Args:
+        value (int): The integer.
+        output (bytearray): Where the bytes are appended.
+    """
+    while value > 0x7F:
+        output.append((value & 0x7F) | 0x80)
+        value >>= 7
+    output.append(value)
+
+
+def decode_varint(buffer: bytes | memoryview, offset: int) -> Tuple[int, int]:
+    """Reads an integer written by encode_varint
+
+    Args:
+        buffer (bytes | memoryview): The bytes.
+        offset (int): Where the integer starts.
+
+    Returns:
+        Tuple[int, int]: The integer and the offset after it
+    """
+    value = 0
+    shift = 0
+    while True:
+        byte = buffer[offset]
+        offset += 1
+        value |= (byte & 0x7F) << shift
+        if byte < 0x80:
+            return value, offset
+        shift += 7
+
+
+def encode_postings(postings: List[Tuple[int, int]], output: bytearray, previous_document: int = 0) -> None:
+    """Appends postings as the gap from the previous document number and the term frequency, both varints
+
+    Args:
+        postings (List[Tuple[int, int]]): Document numbers, in increasing order, and term frequencies.
+        output (bytearray): Where the bytes are appended.
+        previous_document (int, optional): The document the first gap is from. Defaults to 0.
+    """
+    for document, frequency in postings:
+        encode_varint(document - previous_document, output)
+        encode_varint(frequency, output)
+        previous_document = document
+
+
+def decode_postings(buffer: bytes | memoryview) -> List[Tuple[int, int]]:
+    """Reads postings written by encode_postings
+
+    Args:
+        buffer (bytes | memoryview): The bytes of the postings of one term.
+
+    Returns:
+        List[Tuple[int, int]]: Document numbers and term frequencies
+    """
+    postings = []
+    document = 0
+    offset = 0
+    end = len(buffer)
+    while offset < end:
+        gap, offset = decode_varint(buffer, offset)
+        frequency, offset = decode_varint(buffer, offset)
+        document += gap
+        postings.append((document, frequency))
+    return postings
+
+
+def iter_postings(buffer: bytes | memoryview) -> Iterator[Tuple[int, int]]:
+    """Reads postings written by encode_postings one at a time, so long posting lists are never held decoded
+
+    Args:
+        buffer (bytes | memoryview): The bytes of the postings of one term.
+
+    Returns:
+        Iterator[Tuple[int, int]]: Document numbers and term frequencies
+    """
+    document = 0
+    offset = 0
+    end = len(buffer)
+    while offset < end:
+        gap, offset = decode_varint(buffer, offset)
+        frequency, offset = decode_varint(buffer, offset)
+        document += gap
+        yield document, frequency
+
+
+def encode_blocks(postings: List[Tuple[int, int]], block_size: int = POSTINGS_BLOCK_SIZE) -> bytearray:
+    """Encodes the postings of a term as a skip table followed by blocks of block_size postings
+
+    The skip table has the last document and highest term frequency of every block, so readers jump over blocks
+    without decoding them.
+
+    Args:
+        postings (List[Tuple[int, int]]): Document numbers, in increasing order, and term frequencies.
+        block_size (int, optional): Postings per block. Defaults to POSTINGS_BLOCK_SIZE.
+
+    Returns:
+        bytearray: The skip table and the blocks
+    """
+    skips = bytearray()
+    blocks = bytearray()
+    previous_document = 0
+    for start in range(0, len(postings), block_size):
+        block = postings[start : start + block_size]
+        encoded_block = bytearray()
+        encode_postings(block, encoded_block, previous_document)
+        previous_document = block[-1][0]
+        skips += SKIP_ENTRY.pack(previous_document, len(encoded_block), max(frequency for _, frequency in block))
+        blocks += encoded_block
+    return skips + blocks
+
+
+# !Cursor over the postings of a term
+class PostingsCursor:  # pylint: disable=too-many-instance-attributes
+    """
+    Walks the postings of a term in document order, decoding one block at a time.
+
+    advance jumps to a document through the skip table, so postings in skipped blocks are never decoded.
+    """
+
+    def __init__(
+        self, buffer: bytes | memoryview, document_frequency: int, block_size: int = POSTINGS_BLOCK_SIZE
+    ) -> None:
+        """Reads the skip table and moves to the first posting
+
+        Args:
+            buffer (bytes | memoryview): The skip table and blocks written by encode_blocks.
+            document_frequency (int): The number of postings.
+            block_size (int, optional): Postings per block. Defaults to POSTINGS_BLOCK_SIZE.
+        """
+        number_of_blocks = -(-document_frequency // block_size)
+        skips_length = number_of_blocks * SKIP_ENTRY.size
+        skips = list(SKIP_ENTRY.iter_unpack(buffer[:skips_length]))
+
+        self.buffer = buffer
+        self.last_documents = [last_document for last_document, _, _ in skips]
+        self.block_max_frequencies = [max_frequency for _, _, max_frequency in skips]
+        self.block_offsets = []
+        offset = skips_length
+        for _, block_length, _ in skips:
+            self.block_offsets.append(offset)
+            offset += block_length
+        self.block_offsets.append(offset)
+
+        self.block = -1
+        self.documents: List[int] = []
+        self.frequencies: List[int] = []
+        self.position = 0
+        self.document = NO_MORE_DOCUMENTS
+        self.load_block(0)
+
+    def load_block(self, block: int) -> None:
+        """Decodes a block and moves to its first posting
+
+        Args:
+            block (int): The block number
+        """
+        self.block = block
+        self.position = 0
+        if block >= len(self.last_documents):
+            self.documents, self.frequencies = [], []
+            self.document = NO_MORE_DOCUMENTS
+            return
+
+        previous_document = self.last_documents[block - 1] if block else 0
+        postings = decode_postings(self.buffer[self.block_offsets[block] : self.block_offsets[block + 1]])
+        self.documents = [previous_document + document for document, _ in postings]
+        self.frequencies = [frequency for _, frequency in postings]
+        self.document = self.documents[0]
+
+    @property
+    def frequency(self) -> int:
+        """The term frequency of the current document"""
+        return self.frequencies[self.position]
+
+    @property
+    def block_max_frequency(self) -> int:
+        """The highest term frequency in the current block"""
+        return self.block_max_frequencies[self.block]
+
+    def next(self) -> int:
+        """Moves to the next posting
+
+        Returns:
+            int: The document, NO_MORE_DOCUMENTS after the last posting
+        """
+        self.position += 1
+        if self.position < len(self.documents):
+            self.document = self.documents[self.position]
+        else:
+            self.load_block(self.block + 1)
+        return self.document
+
+    def advance(self, target: int) -> int:
+        """Moves to the first posting at or after a document
+
+        Args:
+            target (int): The document
+
+        Returns:
+            int: The document moved to, NO_MORE_DOCUMENTS if there is none
+        """
+        if self.document >= target:
+            return self.document
+
+        if target > self.last_documents[self.block]:
+            self.load_block(bisect_left(self.last_documents, target, self.block + 1))
+            if self.document >= target:
+                return self.document
+
+        self.position = bisect_left(self.documents, target, self.position)
+        self.document = self.documents[self.position]
+        return self.document
@@ -3,10 +3,32 @@ import math
 import uvicorn
 from fastapi import FastAPI
 
-from .constants import MAX_NUMBER_OF_THREADS, TO_PARSE_DIRECTORY
+from .constants import (
+    ASYNC_MAX_CONCURRENCY,
+    CRAWLER_MODE,
+    FETCH_SESSION_STRATEGY,
+    MAX_NUMBER_OF_THREADS,
+    PARSER_HANDOFF,
+    TO_PARSE_DIRECTORY,
+)
+from .crawler import AsyncCrawler as _AsyncCrawler
 from .crawler import Crawler as _Crawler
+from .crawler import Fetcher as _Fetcher
+from .indexer import Indexer as _Indexer
+from .metrics import FETCH_CONNECTIONS, QUEUE_LINKS
+from .metrics import router as metrics_router
+from .models import NearDuplicates as _NearDuplicates
+from .models import Queue as _Queue
+from .models import SeenUrls as _SeenUrls
 from .parser import Parser as _Parser
+from .pipeline import CollectionHandoff as _CollectionHandoff
+from .pipeline import PageHandoff as _PageHandoff
+from .pipeline import QueueHandoff as _QueueHandoff
+from .ranking import Ranker as _Ranker
+from .search import Searcher as _Searcher
+from .search import router as search_router
 from .setup import setup
+from .storage import create_content_store
 
 
 # !Main code
@@ -26,8 +48,64 @@ async def main() -> None:
 def background_task() -> None:
     """Background tasks to run while runing the API"""
     db = setup()
-    _Crawler(math.ceil(MAX_NUMBER_OF_THREADS / 2), TO_PARSE_DIRECTORY, db)
-    _Parser(math.ceil(MAX_NUMBER_OF_THREADS / 2), TO_PARSE_DIRECTORY, db)
+
+    # !The crawler and the parser share one store, segment stores keep their index in memory
+    content_store = create_content_store(TO_PARSE_DIRECTORY)
+
+    # !Saved pages are announced to the parser, "poll" falls back to scanning the content store
+    handoff: _PageHandoff | None = None
+    if PARSER_HANDOFF == "queue":
+        handoff = _QueueHandoff()
+    elif PARSER_HANDOFF == "collection":
+        handoff = _CollectionHandoff(db)
+
+    if CRAWLER_MODE == "async":
+        _AsyncCrawler(ASYNC_MAX_CONCURRENCY, TO_PARSE_DIRECTORY, db, content_store=content_store, handoff=handoff)
+    else:
+        # !Every crawler thread gets a pooled connection to the host it is fetching from
+        number_of_threads = math.ceil(MAX_NUMBER_OF_THREADS / 2)
+        fetcher = _Fetcher(number_of_threads, FETCH_SESSION_STRATEGY)
+        _Crawler(
+            number_of_threads,
+            TO_PARSE_DIRECTORY,
+            db,
+            content_store=content_store,
+            handoff=handoff,
+            fetcher=fetcher,
+        )
+        for stat in ("requests", "connections", "reuse_ratio", "retries", "errors"):
+            FETCH_CONNECTIONS.labels(stat).set_function(lambda stat=stat: fetcher.get_stats()[stat])
+
+    # !Read when the metrics are scraped rather than kept up to date by every queue write
+    QUEUE_LINKS.set_function(_Queue(db).count)
+
+    # !Filter of the urls already seen, so the parser skips them without asking the database
+    seen_urls = _SeenUrls(db)
+    seen_urls.load()
+    seen_urls.start_snapshots()
+
+    # !Fingerprints of the parsed pages, so mirrors and variants of a page are not parsed into the index again
+    near_duplicates = _NearDuplicates(db)
+    near_duplicates.load()
+
+    _Parser(
+        math.ceil(MAX_NUMBER_OF_THREADS / 2),
+        TO_PARSE_DIRECTORY,
+        db,
+        seen_urls=seen_urls,
+        content_store=content_store,
+        handoff=handoff,
+        near_duplicates=near_duplicates,
+    )
+
+    # !Ranks the pages by their links and rebuilds the inverted index of the parsed pages in the background
+    _Ranker(db).start()
+    _Indexer(db).start()
+
+    # !The search endpoint picks up every new generation of the index
+    app.state.searcher = _Searcher(db)
 
 
 app = FastAPI()
+app.include_router(search_router)
+app.include_router(metrics_router)
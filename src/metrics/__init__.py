@@ -0,0 +1,42 @@
+from .command_metrics import CommandMetrics
+from .instruments import (
+    CRAWLER_BUSY_WORKERS,
+    CRAWLER_FETCH_SECONDS,
+    CRAWLER_PAGES,
+    CRAWLER_ROBOTS_SECONDS,
+    CRAWLER_WORKERS,
+    DATABASE_SECONDS,
+    ERRORS,
+    FETCH_CONNECTIONS,
+    PARSER_BUSY_WORKERS,
+    PARSER_PAGES,
+    PARSER_PARSE_SECONDS,
+    PARSER_WORKERS,
+    QUEUE_LINKS,
+)
+from .registry import REGISTRY, Registry
+from .routes import router
+from .series import Counter, Gauge, Histogram
+
+__all__ = [
+    "REGISTRY",
+    "Registry",
+    "Counter",
+    "Gauge",
+    "Histogram",
+    "CommandMetrics",
+    "router",
+    "CRAWLER_PAGES",
+    "CRAWLER_FETCH_SECONDS",
+    "CRAWLER_ROBOTS_SECONDS",
+    "CRAWLER_WORKERS",
+    "CRAWLER_BUSY_WORKERS",
+    "FETCH_CONNECTIONS",
+    "PARSER_PAGES",
+    "PARSER_PARSE_SECONDS",
+    "PARSER_WORKERS",
+    "PARSER_BUSY_WORKERS",
+    "DATABASE_SECONDS",
+    "QUEUE_LINKS",
+    "ERRORS",
+]
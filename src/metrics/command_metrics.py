@@ -0,0 +1,61 @@
+from typing import Any, Dict, Tuple
+
+from pymongo import monitoring
+
+from .instruments import DATABASE_SECONDS, ERRORS
+
+
+# !Database command metrics
+class CommandMetrics(monitoring.CommandListener):
+    """
+    Observes the latency of every round trip to the database, by collection and command, and counts failed commands.
+
+    Being a listener of the client, it sees the calls of every model without wrapping them, and getMore round trips
+    of cursors that are read in batches are counted on their own.
+    """
+
+    def __init__(self) -> None:
+        """Initializes the listener"""
+        # !Collection of every command in flight, by connection and request id
+        self.collections: Dict[Tuple[Any, int], str] = {}
+
+    def started(self, event: monitoring.CommandStartedEvent) -> None:
+        """Remembers the collection of a command, which the events of its reply don't carry
+
+        Args:
+            event (monitoring.CommandStartedEvent): The event.
+        """
+        # !Most commands name their collection, getMore names its cursor and the collection separately
+        collection = event.command.get(event.command_name)
+        if not isinstance(collection, str):
+            collection = str(event.command.get("collection", ""))
+        self.collections[(event.connection_id, event.request_id)] = collection
+
+    def succeeded(self, event: monitoring.CommandSucceededEvent) -> None:
+        """Observes the latency of a command
+
+        Args:
+            event (monitoring.CommandSucceededEvent): The event.
+        """
+        self.observe(event)
+
+    def failed(self, event: monitoring.CommandFailedEvent) -> None:
+        """Observes the latency of a command and counts the failure by its class
+
+        Args:
+            event (monitoring.CommandFailedEvent): The event.
+        """
+        self.observe(event)
+
+        # !Network failures carry the exception class, failures reported by the server their code name
+        failure = event.failure
+        ERRORS.labels("database", str(failure.get("errtype") or failure.get("codeName") or "OperationFailure")).inc()
+
+    def observe(self, event: monitoring.CommandSucceededEvent | monitoring.CommandFailedEvent) -> None:
+        """Observes the latency of a command
+
+        Args:
+            event (monitoring.CommandSucceededEvent | monitoring.CommandFailedEvent): The event.
+        """
+        collection = self.collections.pop((event.connection_id, event.request_id), "")
+        DATABASE_SECONDS.labels(collection, event.command_name).observe(event.duration_micros / 1e6)
@@ -0,0 +1,38 @@
+from .registry import REGISTRY
+
+# !Crawler
+CRAWLER_PAGES = REGISTRY.counter("crawler_pages_total", "Links the crawler finished, by outcome", ("outcome",))
+CRAWLER_FETCH_SECONDS = REGISTRY.histogram(
+    "crawler_fetch_seconds", "Seconds to fetch a page, its body included"
+).labels()
+CRAWLER_ROBOTS_SECONDS = REGISTRY.histogram(
+    "crawler_robots_seconds", "Seconds to get the robots.txt rules of a link, from the cache or the host"
+).labels()
+CRAWLER_WORKERS = REGISTRY.gauge("crawler_workers", "Threads or coroutines crawling links").labels()
+CRAWLER_BUSY_WORKERS = REGISTRY.gauge(
+    "crawler_busy_workers", "Crawler workers busy with a link rather than waiting for one"
+).labels()
+FETCH_CONNECTIONS = REGISTRY.gauge(
+    "fetch_connections", "Requests sent by the threaded crawler and the connections opened for them", ("stat",)
+)
+
+# !Parser
+PARSER_PAGES = REGISTRY.counter("parser_pages_total", "Pages the parser finished, by outcome", ("outcome",))
+PARSER_PARSE_SECONDS = REGISTRY.histogram(
+    "parser_parse_seconds", "Seconds to extract the title, links, tokens and fingerprint of a page"
+).labels()
+PARSER_WORKERS = REGISTRY.gauge("parser_workers", "Threads parsing pages").labels()
+PARSER_BUSY_WORKERS = REGISTRY.gauge(
+    "parser_busy_workers", "Parser threads busy with a page rather than waiting for one"
+).labels()
+
+# !Database
+DATABASE_SECONDS = REGISTRY.histogram(
+    "database_command_seconds", "Seconds of a database round trip, by collection and command", ("collection", "command")
+)
+QUEUE_LINKS = REGISTRY.gauge("queue_links", "Links waiting in the queue collection, estimated").labels()
+
+# !Errors
+ERRORS = REGISTRY.counter(
+    "errors_total", "Errors by the component they happened in and their class", ("component", "error")
+)
@@ -0,0 +1,223 @@
+import math
+import threading
+from typing import Callable, Dict, Generic, Iterator, List, Tuple, TypeVar
+
+from .constants import LATENCY_BUCKETS, METRICS_NAMESPACE
+from .series import Counter, Gauge, Histogram
+
+SeriesT = TypeVar("SeriesT", Counter, Gauge, Histogram)
+
+
+def format_value(value: float) -> str:
+    """Formats a sample value for the text exposition format
+
+    Args:
+        value (float): The value.
+
+    Returns:
+        str: The value, without a fraction if it is whole
+    """
+    value = float(value)
+    if math.isinf(value):
+        return "+Inf" if value > 0 else "-Inf"
+    return str(int(value)) if value.is_integer() else repr(value)
+
+
+def format_labels(names: Tuple[str, ...], values: Tuple[str, ...]) -> str:
+    """Formats the labels of a sample
+
+    Args:
+        names (Tuple[str, ...]): The label names.
+        values (Tuple[str, ...]): The label values.
+
+    Returns:
+        str: The labels in braces, empty without labels
+    """
+    if not names:
+        return ""
+    return "{" + ",".join(f'{name}="{escape_label(value)}"' for name, value in zip(names, values)) + "}"
+
+
+def escape_label(value: str) -> str:
+    """Escapes a label value for the text exposition format
+
+    Args:
+        value (str): The label value.
+
+    Returns:
+        str: The value with backslashes, quotes and line breaks escaped
+    """
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+# !Metric family
+class Family(Generic[SeriesT]):
+    """A metric and its series, one for every combination of label values"""
+
+    def __init__(
+        self, name: str, help_text: str, kind: str, labelnames: Tuple[str, ...], factory: Callable[[], SeriesT]
+    ) -> None:
+        """Initializes the metric without series
+
+        Args:
+            name (str): The full name of the metric.
+            help_text (str): What the metric measures.
+            kind (str): "counter", "gauge" or "histogram".
+            labelnames (Tuple[str, ...]): The names of the labels.
+            factory (Callable[[], SeriesT]): Creates the series of new label values.
+        """
+        self.name = name
+        self.help_text = help_text
+        self.kind = kind
+        self.labelnames = labelnames
+        self.factory = factory
+        self.lock = threading.Lock()
+        self.children: Dict[Tuple[str, ...], SeriesT] = {}
+
+    def labels(self, *values: str) -> SeriesT:
+        """Gets the series of the label values, creating it the first time
+
+        Args:
+            *values (str): The label values, in the order of the label names.
+
+        Returns:
+            SeriesT: The series
+
+        Raises:
+            ValueError: If the number of values does not match the label names
+        """
+        child = self.children.get(values)
+        if child is not None:
+            return child
+
+        if len(values) != len(self.labelnames):
+            raise ValueError(f"{self.name} takes the labels {', '.join(self.labelnames) or 'none'}")
+        with self.lock:
+            return self.children.setdefault(values, self.factory())
+
+    def collect(self) -> Iterator[str]:
+        """Gets the lines of the metric in the text exposition format
+
+        Returns:
+            Iterator[str]: The lines
+        """
+        yield f"# HELP {self.name} {self.help_text}"
+        yield f"# TYPE {self.name} {self.kind}"
+        for values, child in sorted(self.children.items()):
+            labels = format_labels(self.labelnames, values)
+            if not isinstance(child, Histogram):
+                yield f"{self.name}{labels} {format_value(child.get())}"
+                continue
+
+            counts, total = child.get()
+            for bound, count in zip((*child.buckets, math.inf), counts):
+                bucket_labels = format_labels((*self.labelnames, "le"), (*values, format_value(float(bound))))
+                yield f"{self.name}_bucket{bucket_labels} {count}"
+            yield f"{self.name}_sum{labels} {format_value(total)}"
+            yield f"{self.name}_count{labels} {counts[-1]}"
+
+
+# !Metrics registry
+class Registry:
+    """The metrics of the process, rendered in the Prometheus text exposition format when they are scraped"""
+
+    def __init__(self, namespace: str = METRICS_NAMESPACE) -> None:
+        """Initializes an empty registry
+
+        Args:
+            namespace (str, optional): Prefix of every metric name. Defaults to METRICS_NAMESPACE.
+        """
+        self.namespace = namespace
+        self.lock = threading.Lock()
+        self.families: Dict[str, Family[Counter] | Family[Gauge] | Family[Histogram]] = {}
+
+    def counter(self, name: str, help_text: str, labelnames: Tuple[str, ...] = ()) -> Family[Counter]:
+        """Registers a counter
+
+        Args:
+            name (str): The name, without the namespace.
+            help_text (str): What the counter counts.
+            labelnames (Tuple[str, ...], optional): The names of the labels. Defaults to ().
+
+        Returns:
+            Family[Counter]: The counter
+        """
+        return self.register(Family(self.get_name(name), help_text, "counter", labelnames, Counter))
+
+    def gauge(self, name: str, help_text: str, labelnames: Tuple[str, ...] = ()) -> Family[Gauge]:
+        """Registers a gauge
+
+        Args:
+            name (str): The name, without the namespace.
+            help_text (str): What the gauge measures.
+            labelnames (Tuple[str, ...], optional): The names of the labels. Defaults to ().
+
+        Returns:
+            Family[Gauge]: The gauge
+        """
+        return self.register(Family(self.get_name(name), help_text, "gauge", labelnames, Gauge))
+
+    def histogram(
+        self,
+        name: str,
+        help_text: str,
+        labelnames: Tuple[str, ...] = (),
+        buckets: Tuple[float, ...] = LATENCY_BUCKETS,
+    ) -> Family[Histogram]:
+        """Registers a histogram
+
+        Args:
+            name (str): The name, without the namespace.
+            help_text (str): What the histogram observes.
+            labelnames (Tuple[str, ...], optional): The names of the labels. Defaults to ().
+            buckets (Tuple[float, ...], optional): The sorted upper bounds of the buckets. Defaults to LATENCY_BUCKETS.
+
+        Returns:
+            Family[Histogram]: The histogram
+        """
+        return self.register(
+            Family(self.get_name(name), help_text, "histogram", labelnames, lambda: Histogram(buckets))
+        )
+
+    def get_name(self, name: str) -> str:
+        """Gets the full name of a metric
+
+        Args:
+            name (str): The name, without the namespace.
+
+        Returns:
+            str: The name with the namespace
+        """
+        return f"{self.namespace}_{name}" if self.namespace else name
+
+    def register(self, family: Family[SeriesT]) -> Family[SeriesT]:
+        """Adds a metric to the registry
+
+        Args:
+            family (Family[SeriesT]): The metric.
+
+        Returns:
+            Family[SeriesT]: The same metric
+
+        Raises:
+            ValueError: If a metric with the same name is registered
+        """
+        with self.lock:
+            if family.name in self.families:
+                raise ValueError(f"The metric {family.name} is already registered")
+            self.families[family.name] = family
+        return family
+
+    def render(self) -> str:
+        """Renders every metric in the text exposition format
+
+        Returns:
+            str: The metrics
+        """
+        with self.lock:
+            families: List[Family[Counter] | Family[Gauge] | Family[Histogram]] = list(self.families.values())
+        return "".join(f"{line}\n" for family in families for line in family.collect())
+
+
+# !The registry the whole process reports to
+REGISTRY = Registry()
@@ -0,0 +1,18 @@
+from fastapi import APIRouter
+from fastapi.responses import PlainTextResponse
+
+from .constants import METRICS_CONTENT_TYPE
+from .registry import REGISTRY
+
+router = APIRouter()
+
+
+# !Metrics endpoint
+@router.get("/metrics", response_class=PlainTextResponse)
+def metrics() -> PlainTextResponse:
+    """Gets the metrics of the crawler, the parser and the database for Prometheus to scrape
+
+    Returns:
+        PlainTextResponse: The metrics in the text exposition format
+    """
+    return PlainTextResponse(REGISTRY.render(), media_type=METRICS_CONTENT_TYPE)
@@ -0,0 +1,164 @@
+import threading
+from bisect import bisect_left
+from dataclasses import dataclass
+from time import perf_counter
+from typing import Callable, List, Tuple
+
+from .constants import LATENCY_BUCKETS
+
+
+# !Counter
+class Counter:
+    """A value that only goes up, like the pages fetched, rates are taken by the scraper"""
+
+    def __init__(self) -> None:
+        """Initializes the counter at zero"""
+        self.lock = threading.Lock()
+        self.value = 0.0
+
+    def inc(self, amount: float = 1) -> None:
+        """Adds to the counter
+
+        Args:
+            amount (float, optional): The amount. Defaults to 1.
+        """
+        with self.lock:
+            self.value += amount
+
+    def get(self) -> float:
+        """Gets the value
+
+        Returns:
+            float: The value
+        """
+        return self.value
+
+
+# !Gauge
+class Gauge:
+    """A value that goes up and down, like the busy threads, or that is read from a function when it is scraped"""
+
+    def __init__(self) -> None:
+        """Initializes the gauge at zero"""
+        self.lock = threading.Lock()
+        self.value = 0.0
+        self.function: Callable[[], float] | None = None
+
+    def set(self, value: float) -> None:
+        """Sets the gauge
+
+        Args:
+            value (float): The value.
+        """
+        self.value = value
+
+    def inc(self, amount: float = 1) -> None:
+        """Adds to the gauge
+
+        Args:
+            amount (float, optional): The amount. Defaults to 1.
+        """
+        with self.lock:
+            self.value += amount
+
+    def set_function(self, function: Callable[[], float]) -> None:
+        """Reads the gauge from a function whenever it is scraped, for values that are costly to keep up to date
+
+        Args:
+            function (Callable[[], float]): Gets the value.
+        """
+        self.function = function
+
+    def track_inprogress(self) -> "_InProgress":
+        """Counts the code in a with block as in progress while it runs
+
+        Returns:
+            _InProgress: The context manager
+        """
+        return _InProgress(self)
+
+    def get(self) -> float:
+        """Gets the value
+
+        Returns:
+            float: The value
+        """
+        return self.function() if self.function is not None else self.value
+
+
+# !Histogram
+class Histogram:
+    """Counts observations, like latencies, into buckets with the sum and count of every observation"""
+
+    def __init__(self, buckets: Tuple[float, ...] = LATENCY_BUCKETS) -> None:
+        """Initializes the histogram without observations
+
+        Args:
+            buckets (Tuple[float, ...], optional): The sorted upper bounds of the buckets. Defaults to LATENCY_BUCKETS.
+        """
+        self.lock = threading.Lock()
+        self.buckets = buckets
+
+        # !Counts per bucket, not cumulative, the last one for values past every bound
+        self.counts = [0] * (len(buckets) + 1)
+        self.sum = 0.0
+
+    def observe(self, value: float) -> None:
+        """Adds an observation
+
+        Args:
+            value (float): The observation.
+        """
+        index = bisect_left(self.buckets, value)
+        with self.lock:
+            self.counts[index] += 1
+            self.sum += value
+
+    def time(self) -> "_Timer":
+        """Observes the seconds the code in a with block takes
+
+        Returns:
+            _Timer: The context manager
+        """
+        return _Timer(self)
+
+    def get(self) -> Tuple[List[int], float]:
+        """Gets the cumulative count of every bucket and the sum of the observations
+
+        Returns:
+            Tuple[List[int], float]: The count of observations up to each bound, the last being the total count, and
+                the sum
+        """
+        with self.lock:
+            counts, total = list(self.counts), self.sum
+        for index in range(1, len(counts)):
+            counts[index] += counts[index - 1]
+        return counts, total
+
+
+# !Plain context managers, generator based ones cost several times as much on the hot paths
+@dataclass
+class _InProgress:
+    """Adds one to a gauge while a with block runs"""
+
+    gauge: Gauge
+
+    def __enter__(self) -> None:
+        self.gauge.inc()
+
+    def __exit__(self, *exc_info: object) -> None:
+        self.gauge.inc(-1)
+
+
+@dataclass
+class _Timer:
+    """Observes the seconds a with block takes into a histogram"""
+
+    histogram: Histogram
+    start: float = 0.0
+
+    def __enter__(self) -> None:
+        self.start = perf_counter()
+
+    def __exit__(self, *exc_info: object) -> None:
+        self.histogram.observe(perf_counter() - self.start)
@@ -1,6 +1,21 @@
 from .crawled import Crawled
 from .failed_crawled import FailedCrawled
+from .near_duplicates import NearDuplicates
+from .page_events import PageEvents
 from .pause import Pause
 from .queue import Queue
+from .robots import Robots
+from .seen_urls import SeenUrls
+from .write_buffer import WriteBuffer
 
-__all__ = ["Crawled", "Queue", "Pause", "FailedCrawled"]
+__all__ = [
+    "Crawled",
+    "Queue",
+    "Pause",
+    "FailedCrawled",
+    "PageEvents",
+    "Robots",
+    "SeenUrls",
+    "NearDuplicates",
+    "WriteBuffer",
+]
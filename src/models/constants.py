@@ -2,3 +2,16 @@ QUEUE_COLLECTION_NAME: str = "queue"
 CRAWLED_COLLECTION_NAME: str = "crawled"
 PAUSE_COLLECTION_NAME: str = "pause"
 FAILED_CRAWLED_COLLECTION_NAME: str = "failed_crawled"
+ROBOTS_COLLECTION_NAME: str = "robots"
+WRITE_BUFFER_MAX_SIZE: int = 500
+WRITE_BUFFER_MAX_DELAY: float = 1
+SEEN_URLS_INITIAL_CAPACITY: int = 10_000_000
+SEEN_URLS_FALSE_POSITIVE_RATE: float = 0.001
+SEEN_URLS_SNAPSHOT_PATH: str = "./assets/seen_urls.bloom"
+SEEN_URLS_SNAPSHOT_INTERVAL: float = 300
+SEEN_URLS_LOAD_BATCH_SIZE: int = 10_000
+READ_BATCH_SIZE: int = 1000
+PAGE_EVENTS_COLLECTION_NAME: str = "page_events"
+PAGE_EVENTS_COLLECTION_BYTES: int = 64 * 1024 * 1024
+NEAR_DUPLICATE_MAX_DISTANCE: int = 3
+NEAR_DUPLICATE_MIN_TERMS: int = 20
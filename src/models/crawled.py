@@ -1,11 +1,16 @@
 import datetime as _dt
-from typing import Any, Dict, List
+import threading
+from typing import Any, Dict, Iterator, List, Set, Tuple
 
 import pydantic as _pydantic
+import pymongo as _pymongo
 import pymongo.collection as _collection
 import pymongo.database as _db
+import pymongo.errors as _errors
 
-from .constants import CRAWLED_COLLECTION_NAME
+from .constants import CRAWLED_COLLECTION_NAME, READ_BATCH_SIZE
+from .projections import get_projection
+from .upserts import create_unique_index, has_index, upsert_many, upsert_one
 
 
 # !Crawled model
@@ -16,10 +21,73 @@ class CrawledModel(_pydantic.BaseModel):
     url: str
     status: str
     file_name: str
-    rank: int
+    rank: float
     title: str
     forward_links: list[str]
     tokens: dict[str, int]
+    etag: str = ""
+    last_modified: str = ""
+    content_hash: str = ""
+    crawled_at: float = 0
+    simhash: int = 0
+    duplicate_of: float = 0
+
+
+# !Pages added at once get ids this far apart
+PAGE_ID_STEP = 1e-6
+
+# !The last page id handed out by this process
+_last_page_id = [0.0]
+_page_id_lock = threading.Lock()
+
+
+def new_page_ids(count: int = 1) -> List[float]:
+    """Gets page ids from the clock, never the same one twice in a process
+
+    Pages saved in the same microsecond, or added in overlapping batches, get different ids, so the search index and
+    the near-duplicate index, which hold pages by id, never mix them up.
+
+    Args:
+        count (int, optional): The number of ids. Defaults to 1.
+
+    Returns:
+        List[float]: The ids, in increasing order
+    """
+    with _page_id_lock:
+        start = max(_dt.datetime.now().timestamp(), _last_page_id[0] + PAGE_ID_STEP)
+        page_ids = [start + index * PAGE_ID_STEP for index in range(count)]
+        _last_page_id[0] = page_ids[-1]
+    return page_ids
+
+
+def parsed_keys(
+    title: str,
+    forward_links: List[str],
+    tokens: Dict[str, int],
+    simhash: int = 0,
+    duplicate_of: float | None = None,
+) -> Dict[str, Any]:
+    """Gets the keys the parser writes to a page
+
+    Args:
+        title (str): Title of the page
+        forward_links (List[str]): All the links that the page links to
+        tokens (Dict[str, int]): Token of the words on the page
+        simhash (int, optional): The SimHash fingerprint of the page. Defaults to 0.
+        duplicate_of (float | None, optional): The id of the page it is a near-duplicate of. Defaults to None.
+
+    Returns:
+        Dict[str, Any]: The keys, with the status "duplicate" for near-duplicates and "parsed" otherwise
+    """
+    return {
+        "title": title,
+        "forward_links": forward_links,
+        "tokens": tokens,
+        # !MongoDB integers are signed 64 bit, so the upper half of the fingerprints is stored negative
+        "simhash": simhash - (1 << 64) if simhash >= 1 << 63 else simhash,
+        "duplicate_of": duplicate_of or 0,
+        "status": "parsed" if duplicate_of is None else "duplicate",
+    }
 
 
 # !Crawled database collection
@@ -48,14 +116,14 @@ class Crawled:
         Return:
             bool: If the particular item exists
         """
-        return bool(self.get_one(field))
+        return self.collection.find_one(field, {"_id": 1}) is not None
 
     def add(
         self,
         url: str,
         status: str,
         file_name: str,
-        rank: int = 1,
+        rank: float = 1,
         title: str = "",
         forward_links: list[str] | None = None,
         tokens: dict[str, int] | None = None,
@@ -66,7 +134,7 @@ class Crawled:
             url (str): The url to add
             status (str): The status of the url to add
             file_name (str): Name of the file where the html document of the link is stored
-            rank (int, optional): The rank of the url. Defaults to 1.
+            rank (float, optional): The rank of the url, 1 for an average page. Defaults to 1.
             title (str, optional): Title of the page the url links to. Defaults to "".
             forward_links (list[str] | None, optional): All the links that the url's page links to. Defaults to None.
             tokens (dict[str, int] | None, optional): Token of the words on the page. Defaults to None.
@@ -82,7 +150,7 @@ class Crawled:
             tokens = {}
 
         link = CrawledModel(
-            id=_dt.datetime.now().timestamp(),
+            id=new_page_ids()[0],
             url=url,
             status=status,
             file_name=file_name,
@@ -92,33 +160,177 @@ class Crawled:
             tokens=tokens,
         )
 
-        # !Check if link already in database if it is returns it
-        if self.is_exist({"url": link.url}):
-            if item_in_db := self.get_one({"url": link.url}):
-                return CrawledModel(**item_in_db).model_dump()
+        # !Inserts the link unless it is already in the database, in a single atomic upsert
+        return CrawledModel(**upsert_one(self.collection, link.model_dump())).model_dump()
+
+    def add_many(self, links: List[Dict[str, Any]]) -> int:
+        """Adds many items to the crawled collection with a single unordered bulk write
+
+        Args:
+            links (List[Dict[str, Any]]): The items, each with the arguments taken by add
+
+        Returns:
+            int: The number of items that were newly added
+        """
+        if not links:
+            return 0
+
+        # !Verifies urls using pydantic
+        items = [
+            CrawledModel(**{"id": page_id, "rank": 1, "title": "", "forward_links": [], "tokens": {}, **link})
+            for page_id, link in zip(new_page_ids(len(links)), links)
+        ]
+
+        return upsert_many(self.collection, [item.model_dump() for item in items])
+
+    def save_crawled(self, url: str, file_name: str, validators: Dict[str, str]) -> None:
+        """Stores a freshly downloaded page for the parser, adding it or replacing the previous download of the url
 
-        # !If not in database creates a new instance.
-        self.collection.insert_one(link.model_dump())
+        Args:
+            url (str): The url of the page
+            file_name (str): Name of the file where the html document of the page is stored
+            validators (Dict[str, str]): The etag, last_modified and content_hash of the response, the ones missing
+                are cleared
+        """
+        # !Verifies the new item using pydantic, only what the crawler knows is overwritten on a re-crawl
+        page = CrawledModel(
+            id=new_page_ids()[0],
+            url=url,
+            status="crawled",
+            file_name=file_name,
+            rank=1,
+            title="",
+            forward_links=[],
+            tokens={},
+            crawled_at=_dt.datetime.now().timestamp(),
+            **{"etag": "", "last_modified": "", "content_hash": "", **validators},
+        ).model_dump()
+        crawled_keys = ["status", "file_name", "etag", "last_modified", "content_hash", "crawled_at"]
+        update = {
+            "$set": {key: page[key] for key in crawled_keys},
+            "$setOnInsert": {key: value for key, value in page.items() if key not in crawled_keys},
+        }
+
+        try:
+            self.collection.update_one({"url": url}, update, upsert=True)
+        except _errors.DuplicateKeyError:
+            # !Two concurrent upserts of a new url both try to insert, the loser updates the winner's item
+            self.collection.update_one({"url": url}, update)
+
+    def mark_unchanged(self, url: str, validators: Dict[str, str]) -> None:
+        """Records a re-crawl that found the page unchanged, leaving what the parser wrote as it is
 
-        # !Returns the inserted item
-        return link.model_dump()
+        Args:
+            url (str): The url of the page
+            validators (Dict[str, str]): The validators the server sent again, the ones missing are kept
+        """
+        self.collection.update_one({"url": url}, {"$set": {**validators, "crawled_at": _dt.datetime.now().timestamp()}})
+
+    def claim_recrawls(self, crawled_before: float, limit: int) -> List[Dict[str, Any]]:
+        """Claims parsed pages last crawled before the given time, so they are not claimed again until they are stale
+        again. Near-duplicates are re-crawled too, they stop being duplicates once either copy changes.
+
+        Args:
+            crawled_before (float): Pages crawled at or before this timestamp are stale
+            limit (int): The maximum number of pages to claim
 
-    def get_one(self, filter_keys: Dict[str, Any] | None) -> Dict[str, Any] | None:
+        Returns:
+            List[Dict[str, Any]]: The url, etag, last_modified and content_hash of the pages, stalest first
+        """
+        pages = list(
+            self.collection.find(
+                {"status": {"$in": ["parsed", "duplicate"]}, "crawled_at": {"$lte": crawled_before}},
+                get_projection(["url", "etag", "last_modified", "content_hash"]),
+                sort=[("crawled_at", _pymongo.ASCENDING)],
+                limit=limit,
+            )
+        )
+        if pages:
+            self.collection.update_many(
+                {"url": {"$in": [page["url"] for page in pages]}},
+                {"$set": {"crawled_at": _dt.datetime.now().timestamp()}},
+            )
+        return pages
+
+    def get_one(
+        self, filter_keys: Dict[str, Any] | None, fields: List[str] | None = None, lean: bool = False
+    ) -> Dict[str, Any] | None:
         """Gets one item from the database using the given filter
 
         Args:
             filter_keys (Dict[str, Any] | None): The filter
+            fields (List[str] | None, optional): Only fetches these fields and skips validation. Defaults to None.
+            lean (bool, optional): Returns the stored document without validating it. Defaults to False.
 
         Returns:
             Dict[str, Any] | None: Returns the item if found and none if not found
         """
+        if fields is not None or lean:
+            return self.collection.find_one(filter_keys, get_projection(fields))
 
         item_in_db = self.collection.find_one(filter_keys)
         return None if item_in_db is None else CrawledModel(**item_in_db).model_dump()
 
-    def get(self) -> List[Dict[str, str | int | float | list[str] | dict[str, int]]]:
-        """Gets all the items in the collection"""
-        return [CrawledModel(**item).model_dump() for item in self.collection.find()]
+    def get_urls(self, urls: List[str]) -> Set[str]:
+        """Gets which of the given urls are in the collection with a single query
+
+        Args:
+            urls (List[str]): The urls to look for
+
+        Returns:
+            Set[str]: The urls that are in the collection
+        """
+        if not urls:
+            return set()
+
+        return {item["url"] for item in self.collection.find({"url": {"$in": urls}}, {"_id": 0, "url": 1})}
+
+    def create_indexes(self) -> None:
+        """Creates the indexes used to look up pages by url, file name, id and crawl time, and backfills the crawl
+        time of pages crawled before it was stored"""
+        # !Pages saved since the crawl time index was created all have a crawl time, so the unindexed backfill runs once
+        if not has_index(self.collection, "status_1_crawled_at_1"):
+            self.collection.update_many({"crawled_at": {"$exists": False}}, {"$set": {"crawled_at": 0}})
+        self.collection.create_index("file_name")
+        self.collection.create_index("id")
+        self.collection.create_index([("status", _pymongo.ASCENDING), ("crawled_at", _pymongo.ASCENDING)])
+        create_unique_index(self.collection, "url")
+
+    def get(
+        self, filter_keys: Dict[str, Any] | None = None, fields: List[str] | None = None, lean: bool = False
+    ) -> List[Dict[str, str | int | float | list[str] | dict[str, int]]]:
+        """Gets all the items in the collection, or the ones matching the filter
+
+        Args:
+            filter_keys (Dict[str, Any] | None, optional): The filter. Defaults to None.
+            fields (List[str] | None, optional): Only fetches these fields and skips validation. Defaults to None.
+            lean (bool, optional): Returns the stored documents without validating them. Defaults to False.
+
+        Returns:
+            List[Dict[str, str | int | float | list[str] | dict[str, int]]]: The items
+        """
+        if fields is not None or lean:
+            return list(self.iterate(filter_keys, fields))
+
+        return [CrawledModel(**item).model_dump() for item in self.collection.find(filter_keys)]
+
+    def iterate(
+        self,
+        filter_keys: Dict[str, Any] | None = None,
+        fields: List[str] | None = None,
+        batch_size: int = READ_BATCH_SIZE,
+    ) -> Iterator[Dict[str, Any]]:
+        """Streams the stored documents without validating them, fetching batch_size documents per round trip
+
+        Args:
+            filter_keys (Dict[str, Any] | None, optional): The filter. Defaults to None.
+            fields (List[str] | None, optional): Only fetches these fields. Defaults to None.
+            batch_size (int, optional): Documents fetched per round trip. Defaults to READ_BATCH_SIZE.
+
+        Returns:
+            Iterator[Dict[str, Any]]: The documents
+        """
+        return self.collection.find(filter_keys, get_projection(fields), batch_size=batch_size)
 
     def remove(self, filter_keys: Dict[str, Any]) -> None:
         """Removes item from database
@@ -140,3 +352,86 @@ class Crawled:
             keys (dict[str, str  |  int  |  float  |  list[str]  |  dict[str, int]]): The keys to update
         """
         self.collection.update_one(filter_keys, {"$set": keys})
+
+    def start_parsing(self, file_name: str, statuses: List[str] | None = None) -> bool:
+        """Atomically marks a page as being parsed, so only one parser process parses it
+
+        Args:
+            file_name (str): The name of the file of the page
+            statuses (List[str] | None, optional): The statuses the page may be claimed from. Defaults to
+                ["crawled"].
+
+        Returns:
+            bool: True if this call claimed the page
+        """
+        claimed = self.collection.find_one_and_update(
+            {"file_name": file_name, "status": {"$in": statuses or ["crawled"]}},
+            {"$set": {"status": "parsing"}},
+            projection={"_id": 1},
+        )
+        return claimed is not None
+
+    def mark_parsed(
+        self,
+        url: str,
+        title: str,
+        forward_links: List[str],
+        tokens: Dict[str, int],
+        simhash: int = 0,
+        duplicate_of: float | None = None,
+    ) -> None:
+        """Writes everything the parser found on a page and marks it parsed, in a single atomic update
+
+        Args:
+            url (str): The url of the page, the unique key of the collection
+            title (str): Title of the page
+            forward_links (List[str]): All the links that the page links to
+            tokens (Dict[str, int]): Token of the words on the page
+            simhash (int, optional): The SimHash fingerprint of the page. Defaults to 0.
+            duplicate_of (float | None, optional): The id of the page it is a near-duplicate of, which marks it
+                "duplicate" instead of "parsed". Defaults to None.
+        """
+        self.collection.update_one(
+            {"url": url}, {"$set": parsed_keys(title, forward_links, tokens, simhash, duplicate_of)}
+        )
+
+    def mark_parsed_many(self, pages: List[Dict[str, Any]]) -> None:
+        """Marks many pages parsed with a single unordered bulk write
+
+        Args:
+            pages (List[Dict[str, Any]]): The pages, each with the arguments taken by mark_parsed
+        """
+        if pages:
+            self.collection.bulk_write(
+                [
+                    _pymongo.UpdateOne(
+                        {"url": page["url"]},
+                        {"$set": parsed_keys(**{key: value for key, value in page.items() if key != "url"})},
+                    )
+                    for page in pages
+                ],
+                ordered=False,
+            )
+
+    def set_ranks(self, ranks: List[Tuple[str, float]]) -> None:
+        """Writes the ranks of many pages with a single unordered bulk write
+
+        Args:
+            ranks (List[Tuple[str, float]]): The urls of the pages and their ranks
+        """
+        if ranks:
+            self.collection.bulk_write(
+                [_pymongo.UpdateOne({"url": url}, {"$set": {"rank": rank}}) for url, rank in ranks],
+                ordered=False,
+            )
+
+    def update_many(self, updates: List[Tuple[Dict[str, Any], Dict[str, Any]]]) -> None:
+        """Updates many items in the database with a single unordered bulk write
+
+        Args:
+            updates (List[Tuple[Dict[str, Any], Dict[str, Any]]]): The filters and the keys to update
+        """
+        if updates:
+            self.collection.bulk_write(
+                [_pymongo.UpdateOne(filter_keys, {"$set": keys}) for filter_keys, keys in updates], ordered=False
+            )
@@ -1,11 +1,14 @@
 import datetime as _dt
-from typing import Any, Dict, List
+from typing import Any, Dict, Iterator, List, Tuple
 
 import pydantic as _pydantic
+import pymongo as _pymongo
 import pymongo.collection as _collection
 import pymongo.database as _db
 
-from .constants import FAILED_CRAWLED_COLLECTION_NAME
+from .constants import FAILED_CRAWLED_COLLECTION_NAME, READ_BATCH_SIZE
+from .projections import get_projection
+from .upserts import create_unique_index, upsert_many, upsert_one
 
 
 # !Failed crawled model
@@ -42,7 +45,7 @@ class FailedCrawled:
         Return:
             bool: If the particular item exists
         """
-        return bool(self.get_one(filter_keys))
+        return self.collection.find_one(filter_keys, {"_id": 1}) is not None
 
     def add(self, url: str, reason: str) -> Dict[str, Any]:
         """Creates a new item in the failed crawled collection in the database
@@ -58,36 +61,86 @@ class FailedCrawled:
         # !Verifies url using pydantic
         link = FailedCrawledModel(id=_dt.datetime.now().timestamp(), url=url, reason=reason)
 
-        # !Check if link already in database if it is returns it
-        if self.is_exist({"url": link.url}):
-            if item_in_db := self.get_one({"url": link.url}):
-                return FailedCrawledModel(**item_in_db).model_dump()
+        # !Inserts the link unless it is already in the database, in a single atomic upsert
+        return FailedCrawledModel(**upsert_one(self.collection, link.model_dump())).model_dump()
 
-        # !If not in database creates a new instance.
-        self.collection.insert_one(link.model_dump())
+    def add_many(self, links: List[Tuple[str, str]]) -> int:
+        """Adds many failed links with a single unordered bulk write
 
-        # !Returns the inserted item
-        return link.model_dump()
+        Args:
+            links (List[Tuple[str, str]]): The urls and the reasons they failed
+
+        Returns:
+            int: The number of links that were newly added
+        """
+        if not links:
+            return 0
+
+        # !Verifies urls using pydantic
+        now = _dt.datetime.now().timestamp()
+        items = [FailedCrawledModel(id=now, url=url, reason=reason) for url, reason in links]
+
+        return upsert_many(self.collection, [item.model_dump() for item in items])
 
-    def get_one(self, filter_keys: Dict[str, Any] | None) -> Dict[str, Any] | None:
+    def get_one(
+        self, filter_keys: Dict[str, Any] | None, fields: List[str] | None = None, lean: bool = False
+    ) -> Dict[str, Any] | None:
         """Gets one item from the database using the given filter
 
         Args:
             filter_keys (Dict[str, Any] | None): The filter
+            fields (List[str] | None, optional): Only fetches these fields and skips validation. Defaults to None.
+            lean (bool, optional): Returns the stored document without validating it. Defaults to False.
 
         Returns:
             Dict[str, Any] | None: Returns the item if found and none if not found
         """
+        if fields is not None or lean:
+            return self.collection.find_one(filter_keys, get_projection(fields))
 
         item_in_db = self.collection.find_one(filter_keys)
-        if item_in_db is None:
-            return None
+        return None if item_in_db is None else FailedCrawledModel(**item_in_db).model_dump()
 
-        return FailedCrawledModel(**item_in_db).model_dump()
+    def create_indexes(self) -> None:
+        """Creates the indexes used to look up failed links by url and id"""
+        self.collection.create_index("id")
+        create_unique_index(self.collection, "url")
+
+    def get(
+        self, filter_keys: Dict[str, Any] | None = None, fields: List[str] | None = None, lean: bool = False
+    ) -> List[Dict[str, str | float]]:
+        """Gets all the items in the collection, or the ones matching the filter
+
+        Args:
+            filter_keys (Dict[str, Any] | None, optional): The filter. Defaults to None.
+            fields (List[str] | None, optional): Only fetches these fields and skips validation. Defaults to None.
+            lean (bool, optional): Returns the stored documents without validating them. Defaults to False.
+
+        Returns:
+            List[Dict[str, str | float]]: The items
+        """
+        if fields is not None or lean:
+            return list(self.iterate(filter_keys, fields))
 
-    def get(self) -> List[Dict[str, str | float]]:
-        """Gets all the items in the collection"""
-        return [FailedCrawledModel(**item).model_dump() for item in self.collection.find()]
+        return [FailedCrawledModel(**item).model_dump() for item in self.collection.find(filter_keys)]
+
+    def iterate(
+        self,
+        filter_keys: Dict[str, Any] | None = None,
+        fields: List[str] | None = None,
+        batch_size: int = READ_BATCH_SIZE,
+    ) -> Iterator[Dict[str, Any]]:
+        """Streams the stored documents without validating them, fetching batch_size documents per round trip
+
+        Args:
+            filter_keys (Dict[str, Any] | None, optional): The filter. Defaults to None.
+            fields (List[str] | None, optional): Only fetches these fields. Defaults to None.
+            batch_size (int, optional): Documents fetched per round trip. Defaults to READ_BATCH_SIZE.
+
+        Returns:
+            Iterator[Dict[str, Any]]: The documents
+        """
+        return self.collection.find(filter_keys, get_projection(fields), batch_size=batch_size)
 
     def remove(self, filter_keys: Dict[str, Any]) -> None:
         """Removes item from database
@@ -109,3 +162,14 @@ class FailedCrawled:
             keys (dict[str, str  |  int  |  float  |  list[str]  |  dict[str, int]]): The keys to update
         """
         self.collection.update_one(filter_keys, {"$set": keys})
+
+    def update_many(self, updates: List[Tuple[Dict[str, Any], Dict[str, Any]]]) -> None:
+        """Updates many items in the database with a single unordered bulk write
+
+        Args:
+            updates (List[Tuple[Dict[str, Any], Dict[str, Any]]]): The filters and the keys to update
+        """
+        if updates:
+            self.collection.bulk_write(
+                [_pymongo.UpdateOne(filter_keys, {"$set": keys}) for filter_keys, keys in updates], ordered=False
+            )
@@ -0,0 +1,101 @@
+import threading
+from typing import Any, Dict
+
+import pymongo.database as _db
+
+from ..general import SimHashIndex
+from ..general.simhash import FINGERPRINT_MASK
+from .constants import NEAR_DUPLICATE_MAX_DISTANCE, NEAR_DUPLICATE_MIN_TERMS, READ_BATCH_SIZE
+from .crawled import Crawled
+
+
+# !Near-duplicate pages
+class NearDuplicates:
+    """
+    SimHash fingerprints of the parsed pages, to tell when a page is a mirror, print view or url variant of one
+    already parsed.
+
+    Pages whose fingerprints are at most max_distance bits apart are near-duplicates. The index is loaded from the
+    fingerprints the parser stored in the crawled collection.
+    """
+
+    def __init__(
+        self,
+        db: _db.Database[Dict[str, Any]],
+        max_distance: int = NEAR_DUPLICATE_MAX_DISTANCE,
+        min_terms: int = NEAR_DUPLICATE_MIN_TERMS,
+    ) -> None:
+        """Initializes an empty index, call load to fill it
+
+        Args:
+            db (_db.Database[Dict[str, Any]]): The database class
+            max_distance (int, optional): The most bits the fingerprints of near-duplicates differ in. Defaults to
+                NEAR_DUPLICATE_MAX_DISTANCE.
+            min_terms (int, optional): Pages with fewer distinct terms are never near-duplicates, their fingerprints
+                say too little. Defaults to NEAR_DUPLICATE_MIN_TERMS.
+        """
+        self.db = db
+        self.min_terms = min_terms
+        self.index = SimHashIndex(max_distance)
+        self.lock = threading.Lock()
+
+    def load(self, batch_size: int = READ_BATCH_SIZE) -> int:
+        """Fills the index from the fingerprints of the parsed pages
+
+        Args:
+            batch_size (int, optional): Documents fetched per round trip. Defaults to READ_BATCH_SIZE.
+
+        Returns:
+            int: The number of fingerprints loaded
+        """
+        number_of_pages = 0
+        for page in Crawled(self.db).iterate(
+            {"status": "parsed", "simhash": {"$ne": 0}}, ["id", "simhash"], batch_size
+        ):
+            # !Fingerprints are stored as signed 64 bit integers
+            self.index.add(page["id"], page["simhash"] & FINGERPRINT_MASK)
+            number_of_pages += 1
+        return number_of_pages
+
+    def check(
+        self, page_id: float, fingerprint: int, number_of_terms: int, previous_fingerprint: int = 0
+    ) -> float | None:
+        """Gets the page the page is a near-duplicate of, or adds the page to the index if it is not one
+
+        Args:
+            page_id (float): The id of the page
+            fingerprint (int): The SimHash of the page
+            number_of_terms (int): The number of distinct terms of the page
+            previous_fingerprint (int, optional): The SimHash stored when the page was parsed before, which is
+                replaced. Defaults to 0.
+
+        Returns:
+            float | None: The id of the page it duplicates, None if it is not a near-duplicate
+        """
+        # !Finding and adding is one step, so two copies parsed at once are not both kept
+        with self.lock:
+            # !A page that changed is only found by its new fingerprint
+            if previous_fingerprint:
+                self.index.remove(page_id, previous_fingerprint & FINGERPRINT_MASK)
+            if number_of_terms < self.min_terms:
+                return None
+
+            matches = self.index.find(fingerprint)
+            duplicate_of = next((match for match in matches if match != page_id), None)
+            if duplicate_of is None and page_id not in matches:
+                self.index.add(page_id, fingerprint)
+        return duplicate_of
+
+    def remove(self, page_id: float, fingerprint: int | None = None) -> bool:
+        """Removes the fingerprint of a page, so no page is found to duplicate it any more
+
+        Args:
+            page_id (float): The id of the page
+            fingerprint (int | None, optional): Its stored SimHash, None to search the whole index. Defaults to None.
+
+        Returns:
+            bool: Whether the page was in the index
+        """
+        with self.lock:
+            # !Fingerprints are stored as signed 64 bit integers
+            return self.index.remove(page_id, None if fingerprint is None else fingerprint & FINGERPRINT_MASK)
@@ -0,0 +1,80 @@
+import datetime as _dt
+from typing import Any, Dict
+
+import pydantic as _pydantic
+import pymongo as _pymongo
+import pymongo.collection as _collection
+import pymongo.cursor as _cursor
+import pymongo.database as _db
+
+from .constants import PAGE_EVENTS_COLLECTION_BYTES, PAGE_EVENTS_COLLECTION_NAME
+
+
+# !Page event model
+class PageEventModel(_pydantic.BaseModel):
+    """Model for the items in page events collection in the database"""
+
+    id: float
+    file_name: str
+
+
+# !Page events database collection
+class PageEvents:
+    """
+    Capped collection of "page saved" events, tailed by parsers in other processes.
+
+    Being capped, the oldest events are dropped once it is full, which is fine since parsers recover pages they
+    missed by scanning the content store on start.
+    """
+
+    collection: _collection.Collection[Dict[str, Any]]
+
+    def __init__(self, db: _db.Database[Dict[str, Any]]) -> None:
+        """Initializes the model class
+
+        Args:
+            db (_db.Database[Dict[str, Any]]): The database class
+        """
+        self.db = db
+        self.collection = db[PAGE_EVENTS_COLLECTION_NAME]
+
+    def create_collection(self, size: int = PAGE_EVENTS_COLLECTION_BYTES) -> None:
+        """Creates the capped collection if it does not exist
+
+        Args:
+            size (int, optional): Bytes kept before the oldest events are dropped. Defaults to
+                PAGE_EVENTS_COLLECTION_BYTES.
+        """
+        if PAGE_EVENTS_COLLECTION_NAME not in self.db.list_collection_names():
+            self.db.create_collection(PAGE_EVENTS_COLLECTION_NAME, capped=True, size=size)
+
+    def add(self, file_name: str) -> Dict[str, Any]:
+        """Adds a "page saved" event
+
+        Args:
+            file_name (str): The key of the page in the content store
+
+        Returns:
+            Dict[str, Any]: The newly added item
+        """
+
+        # !Verifies the event using pydantic
+        event = PageEventModel(id=_dt.datetime.now().timestamp(), file_name=file_name)
+        self.collection.insert_one(event.model_dump())
+
+        # !Returns the inserted item
+        return event.model_dump()
+
+    def tail(self, since: float) -> _cursor.Cursor[Dict[str, Any]]:
+        """Gets a tailable cursor over the events added at or after a time
+
+        The cursor waits on the server for new events, next(cursor, None) returns None when there are none yet and
+        the cursor stops being alive when it has to be created again.
+
+        Args:
+            since (float): The time of the first event to get
+
+        Returns:
+            _cursor.Cursor[Dict[str, Any]]: The cursor
+        """
+        return self.collection.find({"id": {"$gte": since}}, {"_id": 0}, cursor_type=_pymongo.CursorType.TAILABLE_AWAIT)
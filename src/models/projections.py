@@ -0,0 +1,13 @@
+from typing import Dict, List
+
+
+def get_projection(fields: List[str] | None) -> Dict[str, int]:
+    """Gets the projection that fetches only the given fields, without the mongodb _id
+
+    Args:
+        fields (List[str] | None): The fields, None for every field
+
+    Returns:
+        Dict[str, int]: The projection
+    """
+    return {"_id": 0, **dict.fromkeys(fields or [], 1)}
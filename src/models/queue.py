@@ -1,11 +1,14 @@
 import datetime as _dt
-from typing import Any, Dict, List
+from typing import Any, Dict, Iterator, List, Tuple
 
 import pydantic as _pydantic
+import pymongo as _pymongo
 import pymongo.collection as _collection
 import pymongo.database as _db
 
-from .constants import QUEUE_COLLECTION_NAME
+from .constants import QUEUE_COLLECTION_NAME, READ_BATCH_SIZE
+from .projections import get_projection
+from .upserts import create_unique_index, has_index, upsert_many, upsert_one
 
 
 # !Queue model
@@ -14,6 +17,10 @@ class QueueModel(_pydantic.BaseModel):
 
     id: float
     url: str
+    lease_expires: float = 0
+    etag: str = ""
+    last_modified: str = ""
+    content_hash: str = ""
 
 
 # !Queue database collection
@@ -42,7 +49,7 @@ class Queue:
         Return:
             bool: If the particular item exists
         """
-        return bool(self.get_one(field))
+        return self.collection.find_one(field, {"_id": 1}) is not None
 
     def add(self, url: str) -> Dict[str, Any]:
         """Creates a new item in the queue collection in the database
@@ -57,35 +64,169 @@ class Queue:
         # !Verifies url using pydantic
         link = QueueModel(id=_dt.datetime.now().timestamp(), url=url)
 
-        # !Check if link already in database if it is returns it
-        if self.is_exist({"url": link.url}):
-            if item_in_db := self.get_one({"url": link.url}):
-                return QueueModel(**item_in_db).model_dump()
+        # !Inserts the link unless it is already in the database, in a single atomic upsert
+        return QueueModel(**upsert_one(self.collection, link.model_dump())).model_dump()
 
-        # !If not in database creates a new instance.
-        self.collection.insert_one(link.model_dump())
+    def add_many(self, urls: List[str]) -> int:
+        """Adds many links to the queue with a single unordered bulk write, links already queued are left as they are
 
-        # !Returns the inserted item
-        return link.model_dump()
+        Args:
+            urls (List[str]): The urls to add
+
+        Returns:
+            int: The number of links that were newly added
+        """
+        if not urls:
+            return 0
+
+        # !Verifies urls using pydantic, ids keep the order the links were found in
+        now = _dt.datetime.now().timestamp()
+        links = [QueueModel(id=now + index * 1e-6, url=url) for index, url in enumerate(urls)]
+
+        return upsert_many(self.collection, [link.model_dump() for link in links])
+
+    def add_recrawls(self, pages: List[Dict[str, Any]]) -> int:
+        """Queues pages to crawl again with the validators of their last crawl, with a single unordered bulk write
+
+        Args:
+            pages (List[Dict[str, Any]]): The pages, with their url and optionally etag, last_modified and
+                content_hash
+
+        Returns:
+            int: The number of pages that were newly added
+        """
+        if not pages:
+            return 0
+
+        # !Verifies urls using pydantic, the validators are sent back to the server by the crawler
+        now = _dt.datetime.now().timestamp()
+        links = [
+            QueueModel(
+                id=now + index * 1e-6,
+                url=page["url"],
+                etag=page.get("etag", ""),
+                last_modified=page.get("last_modified", ""),
+                content_hash=page.get("content_hash", ""),
+            )
+            for index, page in enumerate(pages)
+        ]
 
-    def get_one(self, filter_keys: Dict[str, Any] | None) -> Dict[str, Any] | None:
+        return upsert_many(self.collection, [link.model_dump() for link in links])
+
+    def get_one(
+        self, filter_keys: Dict[str, Any] | None, fields: List[str] | None = None, lean: bool = False
+    ) -> Dict[str, Any] | None:
         """Gets one item from the database using the given filter
 
         Args:
             filter_keys (Dict[str, Any] | None): The filter
+            fields (List[str] | None, optional): Only fetches these fields and skips validation. Defaults to None.
+            lean (bool, optional): Returns the stored document without validating it. Defaults to False.
 
         Returns:
             Dict[str, Any] | None: Returns the item if found and none if not found
         """
+        if fields is not None or lean:
+            return self.collection.find_one(filter_keys, get_projection(fields))
+
+        item_in_db = self.collection.find_one(filter_keys)
+        return None if item_in_db is None else QueueModel(**item_in_db).model_dump()
+
+    def claim(self, batch_size: int, lease_seconds: float) -> List[Dict[str, Any]]:
+        """Claims a batch of links from the queue and leases them to the caller
+
+        Each link is claimed with a single atomic update, so claimed links are invisible to other workers
+        until their lease expires. Links whose lease has expired are claimed again.
+
+        Args:
+            batch_size (int): The maximum number of links to claim
+            lease_seconds (float): How long the links stay invisible to other workers
+
+        Returns:
+            List[Dict[str, Any]]: The claimed links, oldest first
+        """
+        claimed: List[Dict[str, Any]] = []
+
+        for _ in range(batch_size):
+            now = _dt.datetime.now().timestamp()
+            item_in_db = self.collection.find_one_and_update(
+                {"lease_expires": {"$lte": now}},
+                {"$set": {"lease_expires": now + lease_seconds}},
+                sort=[("lease_expires", _pymongo.ASCENDING), ("id", _pymongo.ASCENDING)],
+                return_document=_pymongo.ReturnDocument.AFTER,
+            )
+
+            # !Stops once there are no visible links left
+            if item_in_db is None:
+                break
+
+            claimed.append(QueueModel(**item_in_db).model_dump())
+
+        return claimed
+
+    def count(self) -> int:
+        """Estimates the number of queued links from the collection metadata, without scanning the collection
+
+        Returns:
+            int: The number of links
+        """
+        return self.collection.estimated_document_count()
 
-        if item_in_db := self.collection.find_one(filter_keys):
-            return QueueModel(**item_in_db).model_dump()
+    def release(self, url: str, delay: float = 0) -> None:
+        """Makes a claimed link visible to other workers again
 
-        return item_in_db
+        Args:
+            url (str): The url to release
+            delay (float, optional): Seconds before the link becomes visible. Defaults to 0.
+        """
+        self.collection.update_one(
+            {"url": url}, {"$set": {"lease_expires": _dt.datetime.now().timestamp() + max(delay, 0)}}
+        )
 
-    def get(self) -> List[Dict[str, str | float]]:
-        """Gets all the items in the collection"""
-        return [QueueModel(**item).model_dump() for item in self.collection.find()]
+    def create_indexes(self) -> None:
+        """Creates the indexes used to look up and claim links and backfills links added before leases existed"""
+        # !Links added since the lease index was created all have a lease, so the unindexed backfill runs once
+        if not has_index(self.collection, "lease_expires_1_id_1"):
+            self.collection.update_many({"lease_expires": {"$exists": False}}, {"$set": {"lease_expires": 0}})
+        self.collection.create_index([("lease_expires", _pymongo.ASCENDING), ("id", _pymongo.ASCENDING)])
+        self.collection.create_index("id")
+        create_unique_index(self.collection, "url")
+
+    def get(
+        self, filter_keys: Dict[str, Any] | None = None, fields: List[str] | None = None, lean: bool = False
+    ) -> List[Dict[str, str | float]]:
+        """Gets all the items in the collection, or the ones matching the filter
+
+        Args:
+            filter_keys (Dict[str, Any] | None, optional): The filter. Defaults to None.
+            fields (List[str] | None, optional): Only fetches these fields and skips validation. Defaults to None.
+            lean (bool, optional): Returns the stored documents without validating them. Defaults to False.
+
+        Returns:
+            List[Dict[str, str | float]]: The items
+        """
+        if fields is not None or lean:
+            return list(self.iterate(filter_keys, fields))
+
+        return [QueueModel(**item).model_dump() for item in self.collection.find(filter_keys)]
+
+    def iterate(
+        self,
+        filter_keys: Dict[str, Any] | None = None,
+        fields: List[str] | None = None,
+        batch_size: int = READ_BATCH_SIZE,
+    ) -> Iterator[Dict[str, Any]]:
+        """Streams the stored documents without validating them, fetching batch_size documents per round trip
+
+        Args:
+            filter_keys (Dict[str, Any] | None, optional): The filter. Defaults to None.
+            fields (List[str] | None, optional): Only fetches these fields. Defaults to None.
+            batch_size (int, optional): Documents fetched per round trip. Defaults to READ_BATCH_SIZE.
+
+        Returns:
+            Iterator[Dict[str, Any]]: The documents
+        """
+        return self.collection.find(filter_keys, get_projection(fields), batch_size=batch_size)
 
     def remove(self, filter_keys: Dict[str, Any]) -> None:
         """Removes item from database
@@ -107,3 +248,14 @@ class Queue:
             keys (dict[str, str  |  int  |  float  |  list[str]  |  dict[str, int]]): The keys to update
         """
         self.collection.update_one(filter_keys, {"$set": keys})
+
+    def update_many(self, updates: List[Tuple[Dict[str, Any], Dict[str, Any]]]) -> None:
+        """Updates many items in the database with a single unordered bulk write
+
+        Args:
+            updates (List[Tuple[Dict[str, Any], Dict[str, Any]]]): The filters and the keys to update
+        """
+        if updates:
+            self.collection.bulk_write(
+                [_pymongo.UpdateOne(filter_keys, {"$set": keys}) for filter_keys, keys in updates], ordered=False
+            )
@@ -0,0 +1,153 @@
+import datetime as _dt
+from typing import Any, Dict, Iterator, List
+
+import pydantic as _pydantic
+import pymongo.collection as _collection
+import pymongo.database as _db
+import pymongo.errors as _errors
+
+from .constants import READ_BATCH_SIZE, ROBOTS_COLLECTION_NAME
+from .projections import get_projection
+from .upserts import create_unique_index
+
+
+# !Robots model
+class RobotsModel(_pydantic.BaseModel):
+    """Model for the items in robots collection in the database"""
+
+    id: float
+    url: str
+    content: str
+    exp_date: float
+
+
+# !Robots database collection
+class Robots:
+    """Robots database collection"""
+
+    collection: _collection.Collection[Dict[str, Any]]
+
+    def __init__(self, db: _db.Database[Dict[str, Any]]) -> None:
+        """Initializes the model class
+
+        Args:
+            db (_db.Database[Dict[str, Any]]): The database class
+        """
+        self.db = db
+        self.collection = db[ROBOTS_COLLECTION_NAME]
+
+    def is_exist(self, field: Dict[str, Any]) -> bool:
+        """
+        Checks if the particular link exists in database
+
+        Args:
+            field(Dict[str,Any]): The filter
+
+        Return:
+            bool: If the particular item exists
+        """
+        return self.collection.find_one(field, {"_id": 1}) is not None
+
+    def add(self, url: str, content: str, exp_date: float) -> Dict[str, Any]:
+        """Creates or replaces the robots.txt of a host in the robots collection in the database
+
+        Args:
+            url (str): The url of the robots.txt file
+            content (str): The content of the robots.txt file
+            exp_date (float): The timestamp the content has to be fetched again
+
+        Returns:
+            Dict[str, Any]: The newly added item
+        """
+
+        # !Verifies url using pydantic
+        robots = RobotsModel(id=_dt.datetime.now().timestamp(), url=url, content=content, exp_date=exp_date)
+
+        # !A newer robots.txt always replaces the old one, a concurrent insert of the same url is replaced as well
+        try:
+            self.collection.replace_one({"url": robots.url}, robots.model_dump(), upsert=True)
+        except _errors.DuplicateKeyError:
+            self.collection.replace_one({"url": robots.url}, robots.model_dump())
+
+        # !Returns the inserted item
+        return robots.model_dump()
+
+    def get_one(
+        self, filter_keys: Dict[str, Any] | None, fields: List[str] | None = None, lean: bool = False
+    ) -> Dict[str, Any] | None:
+        """Gets one item from the database using the given filter
+
+        Args:
+            filter_keys (Dict[str, Any] | None): The filter
+            fields (List[str] | None, optional): Only fetches these fields and skips validation. Defaults to None.
+            lean (bool, optional): Returns the stored document without validating it. Defaults to False.
+
+        Returns:
+            Dict[str, Any] | None: Returns the item if found and none if not found
+        """
+        if fields is not None or lean:
+            return self.collection.find_one(filter_keys, get_projection(fields))
+
+        item_in_db = self.collection.find_one(filter_keys)
+        return None if item_in_db is None else RobotsModel(**item_in_db).model_dump()
+
+    def create_indexes(self) -> None:
+        """Creates the index used to look up robots.txt files by url"""
+        create_unique_index(self.collection, "url")
+
+    def get(
+        self, filter_keys: Dict[str, Any] | None = None, fields: List[str] | None = None, lean: bool = False
+    ) -> List[Dict[str, str | float]]:
+        """Gets all the items in the collection, or the ones matching the filter
+
+        Args:
+            filter_keys (Dict[str, Any] | None, optional): The filter. Defaults to None.
+            fields (List[str] | None, optional): Only fetches these fields and skips validation. Defaults to None.
+            lean (bool, optional): Returns the stored documents without validating them. Defaults to False.
+
+        Returns:
+            List[Dict[str, str | float]]: The items
+        """
+        if fields is not None or lean:
+            return list(self.iterate(filter_keys, fields))
+
+        return [RobotsModel(**item).model_dump() for item in self.collection.find(filter_keys)]
+
+    def iterate(
+        self,
+        filter_keys: Dict[str, Any] | None = None,
+        fields: List[str] | None = None,
+        batch_size: int = READ_BATCH_SIZE,
+    ) -> Iterator[Dict[str, Any]]:
+        """Streams the stored documents without validating them, fetching batch_size documents per round trip
+
+        Args:
+            filter_keys (Dict[str, Any] | None, optional): The filter. Defaults to None.
+            fields (List[str] | None, optional): Only fetches these fields. Defaults to None.
+            batch_size (int, optional): Documents fetched per round trip. Defaults to READ_BATCH_SIZE.
+
+        Returns:
+            Iterator[Dict[str, Any]]: The documents
+        """
+        return self.collection.find(filter_keys, get_projection(fields), batch_size=batch_size)
+
+    def remove(self, filter_keys: Dict[str, Any]) -> None:
+        """Removes item from database
+
+        Args:
+            filter_keys (Dict[str, Any]): The filter
+        """
+        self.collection.delete_many(filter_keys)
+
+    def update(
+        self,
+        filter_keys: Dict[str, Any],
+        keys: dict[str, str | int | float | list[str] | dict[str, int]],
+    ) -> None:
+        """Updates an item in the database
+
+        Args:
+            filter_keys (Dict[str, Any]): The filter to use to get the item to update
+            keys (dict[str, str  |  int  |  float  |  list[str]  |  dict[str, int]]): The keys to update
+        """
+        self.collection.update_one(filter_keys, {"$set": keys})
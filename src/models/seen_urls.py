@@ -0,0 +1,167 @@
+import os
+import struct
+import threading
+from time import time
+from typing import Any, Dict, List
+
+import pymongo.database as _db
+
+from ..general import ScalableBloomFilter
+from .constants import (
+    SEEN_URLS_FALSE_POSITIVE_RATE,
+    SEEN_URLS_INITIAL_CAPACITY,
+    SEEN_URLS_LOAD_BATCH_SIZE,
+    SEEN_URLS_SNAPSHOT_INTERVAL,
+    SEEN_URLS_SNAPSHOT_PATH,
+)
+from .crawled import Crawled
+from .queue import Queue
+
+# !Header of a snapshot: the time it was taken
+SNAPSHOT_HEADER = struct.Struct("<d")
+
+
+# !Seen urls filter
+class SeenUrls:
+    """
+    Probabilistic set of every url in the crawled and queue collections, checked before the database.
+
+    A url the filter has never seen is new for certain, so it can go to the queue without looking it up. A false
+    positive drops a new url, which happens for about false_positive_rate of them. Urls are only added once they are
+    written to the queue, so neither the filter nor its snapshots hold a url whose write was lost.
+
+    The filter is loaded from the last snapshot plus the urls added to the collections after it was taken, and is
+    snapshotted to disk every snapshot_interval seconds.
+    """
+
+    def __init__(
+        self,
+        db: _db.Database[Dict[str, Any]],
+        snapshot_path: str | None = SEEN_URLS_SNAPSHOT_PATH,
+        initial_capacity: int = SEEN_URLS_INITIAL_CAPACITY,
+        false_positive_rate: float = SEEN_URLS_FALSE_POSITIVE_RATE,
+    ) -> None:
+        """Initializes an empty filter, call load to fill it
+
+        Args:
+            db (_db.Database[Dict[str, Any]]): The database class
+            snapshot_path (str | None, optional): The file snapshots are written to, None disables them. Defaults to
+                SEEN_URLS_SNAPSHOT_PATH.
+            initial_capacity (int, optional): Urls the filter is sized for before it grows. Defaults to
+                SEEN_URLS_INITIAL_CAPACITY.
+            false_positive_rate (float, optional): The target false positive rate. Defaults to
+                SEEN_URLS_FALSE_POSITIVE_RATE.
+        """
+        self.db = db
+        self.snapshot_path = snapshot_path
+        self.bloom_filter = ScalableBloomFilter(initial_capacity, false_positive_rate)
+        self.closed = threading.Event()
+
+    def load(self, batch_size: int = SEEN_URLS_LOAD_BATCH_SIZE) -> int:
+        """Fills the filter from the last snapshot and the collections
+
+        Args:
+            batch_size (int, optional): Documents fetched per round trip. Defaults to SEEN_URLS_LOAD_BATCH_SIZE.
+
+        Returns:
+            int: The number of urls loaded from the collections
+        """
+        snapshot_time = self.read_snapshot()
+
+        # !The ids of the collections are the time the items were added
+        number_of_urls = 0
+        for collection in (Crawled(self.db), Queue(self.db)):
+            for item_in_db in collection.iterate({"id": {"$gt": snapshot_time}}, ["url"], batch_size):
+                self.bloom_filter.add(item_in_db["url"])
+                number_of_urls += 1
+
+        return number_of_urls
+
+    def __contains__(self, url: object) -> bool:
+        """Checks if the url may have been seen
+
+        Args:
+            url (object): The url.
+
+        Returns:
+            bool: False if the url was definitely never seen
+        """
+        return url in self.bloom_filter
+
+    def add(self, url: str) -> None:
+        """Marks a url as seen
+
+        Args:
+            url (str): The url.
+        """
+        self.bloom_filter.add(url)
+
+    def add_many(self, urls: List[str]) -> None:
+        """Marks urls as seen, once they are written to the queue
+
+        Args:
+            urls (List[str]): The urls.
+        """
+        for url in urls:
+            self.bloom_filter.add(url)
+
+    def filter_new(self, urls: List[str]) -> List[str]:
+        """Gets the urls that were never seen, without marking them, so they are only marked once they are written
+
+        Args:
+            urls (List[str]): The urls.
+
+        Returns:
+            List[str]: The new urls, without duplicates
+        """
+        return [url for url in dict.fromkeys(urls) if url not in self.bloom_filter]
+
+    def read_snapshot(self) -> float:
+        """Replaces the filter with the snapshot on disk
+
+        Returns:
+            float: The time the snapshot was taken, 0 if there is none
+        """
+        if self.snapshot_path is None or not os.path.exists(self.snapshot_path):
+            return 0
+
+        try:
+            with open(self.snapshot_path, "rb") as file:
+                (snapshot_time,) = SNAPSHOT_HEADER.unpack(file.read(SNAPSHOT_HEADER.size))
+                self.bloom_filter = ScalableBloomFilter.read(file)
+        except (ValueError, struct.error):
+            # !A snapshot that is not whole is ignored, the filter is rebuilt from every url in the collections
+            return 0
+
+        return snapshot_time
+
+    def snapshot(self) -> None:
+        """Writes the filter to disk"""
+        if self.snapshot_path is None:
+            return
+
+        # !Urls added while writing are loaded from the collections again, since they are newer than the snapshot
+        snapshot_time = time()
+        temporary_path = f"{self.snapshot_path}.tmp"
+        with open(temporary_path, "wb") as file:
+            file.write(SNAPSHOT_HEADER.pack(snapshot_time))
+            self.bloom_filter.write(file)
+        os.replace(temporary_path, self.snapshot_path)
+
+    def start_snapshots(self, interval: float = SEEN_URLS_SNAPSHOT_INTERVAL) -> None:
+        """Starts the thread that snapshots the filter
+
+        Args:
+            interval (float, optional): Seconds between snapshots. Defaults to SEEN_URLS_SNAPSHOT_INTERVAL.
+        """
+
+        def work() -> None:
+            while not self.closed.wait(interval):
+                self.snapshot()
+
+        threading.Thread(target=work, daemon=True).start()
+
+    def close(self) -> None:
+        """Stops the snapshot thread and writes a last snapshot"""
+        self.closed.set()
+        self.snapshot()
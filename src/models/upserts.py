@@ -0,0 +1,111 @@
+from typing import Any, Dict, List
+
+import pymongo as _pymongo
+import pymongo.collection as _collection
+import pymongo.errors as _errors
+
+# !Error code of a write that broke a unique index
+DUPLICATE_KEY_ERROR = 11000
+
+
+def upsert_one(
+    collection: _collection.Collection[Dict[str, Any]], item: Dict[str, Any], key: str = "url"
+) -> Dict[str, Any]:
+    """Inserts the item unless an item with the same key exists, in a single atomic round trip
+
+    Args:
+        collection (_collection.Collection[Dict[str, Any]]): The collection
+        item (Dict[str, Any]): The item to insert
+        key (str, optional): The unique field. Defaults to "url".
+
+    Returns:
+        Dict[str, Any]: The item in the database, the existing one if there was one
+    """
+    try:
+        item_in_db = collection.find_one_and_update(
+            {key: item[key]},
+            {"$setOnInsert": item},
+            upsert=True,
+            return_document=_pymongo.ReturnDocument.AFTER,
+        )
+    except _errors.DuplicateKeyError:
+        # !Two concurrent upserts of a new key both try to insert, the loser reads the winner's item
+        item_in_db = collection.find_one({key: item[key]})
+
+    return item_in_db if item_in_db is not None else item
+
+
+def upsert_many(
+    collection: _collection.Collection[Dict[str, Any]], items: List[Dict[str, Any]], key: str = "url"
+) -> int:
+    """Inserts the items whose key is not in the collection yet with a single unordered bulk write
+
+    Args:
+        collection (_collection.Collection[Dict[str, Any]]): The collection
+        items (List[Dict[str, Any]]): The items to insert
+        key (str, optional): The unique field. Defaults to "url".
+
+    Returns:
+        int: The number of items that were newly added
+    """
+    if not items:
+        return 0
+
+    try:
+        result = collection.bulk_write(
+            [_pymongo.UpdateOne({key: item[key]}, {"$setOnInsert": item}, upsert=True) for item in items],
+            ordered=False,
+        )
+        return result.upserted_count
+    except _errors.BulkWriteError as error:
+        # !Items another writer inserted first are already there, any other error is real
+        if any(write_error["code"] != DUPLICATE_KEY_ERROR for write_error in error.details["writeErrors"]):
+            raise
+        return error.details["nUpserted"]
+
+
+def has_index(collection: _collection.Collection[Dict[str, Any]], name: str, unique: bool = False) -> bool:
+    """Checks if an index exists, so migrations that run before it is created only scan the collection once
+
+    Args:
+        collection (_collection.Collection[Dict[str, Any]]): The collection
+        name (str): The name of the index, e.g. "url_1"
+        unique (bool, optional): Only counts the index if it is unique. Defaults to False.
+
+    Returns:
+        bool: Whether the index exists
+    """
+    index = collection.index_information().get(name)
+    return index is not None and (not unique or bool(index.get("unique")))
+
+
+def create_unique_index(collection: _collection.Collection[Dict[str, Any]], key: str = "url") -> int:
+    """Creates a unique index on the field, first removing the duplicates left by racy inserts
+
+    The oldest item of every duplicated key is kept. Once the index exists there can be no duplicates, so the
+    collection is not scanned again.
+
+    Args:
+        collection (_collection.Collection[Dict[str, Any]]): The collection
+        key (str, optional): The field. Defaults to "url".
+
+    Returns:
+        int: The number of duplicates removed
+    """
+    if has_index(collection, f"{key}_1", unique=True):
+        return 0
+
+    removed = 0
+    duplicates = collection.aggregate(
+        [
+            {"$sort": {"_id": _pymongo.ASCENDING}},
+            {"$group": {"_id": f"${key}", "ids": {"$push": "$_id"}, "count": {"$sum": 1}}},
+            {"$match": {"count": {"$gt": 1}}},
+        ],
+        allowDiskUse=True,
+    )
+    for duplicate in duplicates:
+        removed += collection.delete_many({"_id": {"$in": duplicate["ids"][1:]}}).deleted_count
+
+    collection.create_index(key, unique=True)
+    return removed
@@ -0,0 +1,103 @@
+import logging
+import threading
+from typing import Any, Callable, Generic, List, TypeVar
+
+from ..metrics import ERRORS
+from .constants import WRITE_BUFFER_MAX_DELAY, WRITE_BUFFER_MAX_SIZE
+
+T = TypeVar("T")
+
+logger = logging.getLogger(__name__)
+
+
+# !Background write buffer
+class WriteBuffer(Generic[T]):
+    """
+    Collects items for one of the bulk write methods of the models, e.g. Queue.add_many, and writes them in a
+    single call once max_size items are buffered or max_delay seconds have passed.
+
+    Items of a failed write are put back and written again with the next batch, so the bulk write methods have to be
+    safe to repeat.
+    """
+
+    def __init__(
+        self,
+        flush_items: Callable[[List[T]], Any],
+        max_size: int = WRITE_BUFFER_MAX_SIZE,
+        max_delay: float = WRITE_BUFFER_MAX_DELAY,
+    ) -> None:
+        """Initializes the buffer and starts the thread that flushes it on time
+
+        Args:
+            flush_items (Callable[[List[T]], Any]): Writes a batch of items, e.g. Queue.add_many
+            max_size (int, optional): Items buffered before they are written. Defaults to WRITE_BUFFER_MAX_SIZE.
+            max_delay (float, optional): Seconds an item may wait before it is written. Defaults to
+                WRITE_BUFFER_MAX_DELAY.
+        """
+        self.flush_items = flush_items
+        self.max_size = max_size
+        self.max_delay = max_delay
+        self.items: List[T] = []
+        self.lock = threading.Lock()
+        self.closed = threading.Event()
+
+        threading.Thread(target=self.work, daemon=True).start()
+
+    def add(self, item: T) -> None:
+        """Buffers an item
+
+        Args:
+            item (T): The item to write
+        """
+        self.extend([item])
+
+    def extend(self, items: List[T]) -> None:
+        """Buffers many items, writing the buffer if it is full
+
+        Args:
+            items (List[T]): The items to write
+        """
+        with self.lock:
+            self.items.extend(items)
+            is_full = len(self.items) >= self.max_size
+
+        if is_full:
+            self.try_flush()
+
+    def flush(self) -> None:
+        """Writes every buffered item, putting them back if the write fails
+
+        Raises:
+            Exception: Whatever the write raised
+        """
+        with self.lock:
+            items, self.items = self.items, []
+
+        if not items:
+            return
+
+        try:
+            self.flush_items(items)
+        except BaseException:
+            # !Written again ahead of the items buffered since
+            with self.lock:
+                self.items[:0] = items
+            raise
+
+    def try_flush(self) -> None:
+        """Writes every buffered item, logging a failed write instead of raising, its items are written next time"""
+        try:
+            self.flush()
+        except Exception as error:  # pylint: disable=broad-exception-caught
+            ERRORS.labels("write_buffer", type(error).__name__).inc()
+            logger.exception("Writing %d buffered items failed, retrying", len(self.items))
+
+    def close(self) -> None:
+        """Writes every buffered item and stops the flushing thread"""
+        self.closed.set()
+        self.flush()
+
+    def work(self) -> None:
+        """Flushes the buffer every max_delay seconds, which also retries a failed write"""
+        while not self.closed.wait(self.max_delay):
+            self.try_flush()
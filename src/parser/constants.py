@@ -0,0 +1,7 @@
+BUFFER_QUEUE_WRITES: bool = True
+BUFFER_PARSED_WRITES: bool = True
+PARSE_MODE: str = "threads"
+PARSE_PROCESSES: int | None = None
+PARSE_THREADS_PER_PROCESS: int = 2
+EXTRACTION_BACKEND: str = "auto"
+INVISIBLE_TAGS: frozenset[str] = frozenset({"script", "style", "noscript", "template"})
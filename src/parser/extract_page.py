@@ -0,0 +1,195 @@
+from html.parser import HTMLParser
+from typing import Callable, Dict, List, NamedTuple, Tuple
+
+from bs4 import BeautifulSoup, NavigableString, Tag
+from bs4.element import Comment, Declaration, Doctype, ProcessingInstruction
+
+from .constants import EXTRACTION_BACKEND, INVISIBLE_TAGS
+
+try:
+    from lxml import etree as _etree
+except ImportError:  # pragma: no cover - lxml is optional
+    _etree = None
+
+
+# !Extracted page
+class ExtractedPage(NamedTuple):
+    """The parts of a page the parser uses, base being the href of its <base> element"""
+
+    title: str | None
+    links: List[str]
+    text: str
+    base: str | None = None
+
+
+class _Collector:
+    """
+    Collects the title, the links and the visible text from start, end and data events.
+
+    It is the target of both the lxml parser and the HTMLParser backend, so both see the page the same way.
+    """
+
+    def __init__(self) -> None:
+        self.title: str | None = None
+        self.base: str | None = None
+        self.title_parts: List[str] | None = None
+        self.links: List[str] = []
+        self.text_parts: List[str] = []
+        self.invisible_depth = 0
+
+    def start(self, tag: str, attributes: Dict[str, str | None]) -> None:
+        """Handles an opening tag
+
+        Args:
+            tag (str): The name of the tag.
+            attributes (Dict[str, str | None]): The attributes of the tag.
+        """
+        tag = tag.lower()
+        if tag == "a":
+            if href := attributes.get("href"):
+                self.links.append(href)
+        elif tag in INVISIBLE_TAGS:
+            self.invisible_depth += 1
+        elif tag == "title" and self.title is None:
+            self.title_parts = []
+        elif tag == "base" and self.base is None:
+            self.base = attributes.get("href") or None
+
+    def end(self, tag: str) -> None:
+        """Handles a closing tag
+
+        Args:
+            tag (str): The name of the tag.
+        """
+        tag = tag.lower()
+        if tag in INVISIBLE_TAGS:
+            self.invisible_depth = max(self.invisible_depth - 1, 0)
+        elif tag == "title" and self.title_parts is not None:
+            self.title = "".join(self.title_parts)
+            self.title_parts = None
+
+    def data(self, data: str) -> None:
+        """Handles text
+
+        Args:
+            data (str): The text.
+        """
+        if self.invisible_depth:
+            return
+        if self.title_parts is not None:
+            self.title_parts.append(data)
+        self.text_parts.append(data)
+
+    def close(self) -> ExtractedPage:
+        """Gets the extracted page once the whole document is fed"""
+        return ExtractedPage(self.title, self.links, " ".join(self.text_parts), self.base)
+
+
+class _StreamingParser(HTMLParser):
+    """Feeds the events of the standard library tokenizer to a collector"""
+
+    def __init__(self, collector: _Collector) -> None:
+        super().__init__(convert_charrefs=True)
+        self.collector = collector
+
+    def handle_starttag(self, tag: str, attrs: List[Tuple[str, str | None]]) -> None:
+        self.collector.start(tag, dict(attrs))
+
+    def handle_endtag(self, tag: str) -> None:
+        self.collector.end(tag)
+
+    def handle_data(self, data: str) -> None:
+        self.collector.data(data)
+
+
+def extract_with_lxml(html: str) -> ExtractedPage:
+    """Extracts a page with lxml's C parser, streaming its events into a collector without building a tree
+
+    Args:
+        html (str): The HTML of the page
+
+    Returns:
+        ExtractedPage: The title, links and visible text
+    """
+    if _etree is None:
+        raise ValueError("The lxml backend needs the lxml package")
+
+    collector = _Collector()
+    parser = _etree.HTMLParser(target=collector, recover=True, remove_comments=True, remove_pis=True)
+    parser.feed(html)
+    return parser.close()
+
+
+def extract_with_html_parser(html: str) -> ExtractedPage:
+    """Extracts a page with the standard library tokenizer, without building a tree
+
+    Args:
+        html (str): The HTML of the page
+
+    Returns:
+        ExtractedPage: The title, links and visible text
+    """
+    collector = _Collector()
+    parser = _StreamingParser(collector)
+    parser.feed(html)
+    parser.close()
+    return collector.close()
+
+
+def extract_with_beautiful_soup(html: str) -> ExtractedPage:
+    """Extracts a page from a BeautifulSoup tree, walking it once
+
+    Args:
+        html (str): The HTML of the page
+
+    Returns:
+        ExtractedPage: The title, links and visible text
+    """
+    soup = BeautifulSoup(html, "html.parser")
+    title_tag = soup.title
+    base_tag = soup.find("base", href=True)
+    links: List[str] = []
+    text_parts: List[str] = []
+
+    for element in soup.descendants:
+        if isinstance(element, Tag):
+            if element.name == "a" and (href := element.get("href")):
+                links.append(str(href))
+        elif isinstance(element, NavigableString) and not isinstance(
+            element, (Comment, Declaration, Doctype, ProcessingInstruction)
+        ):
+            if not any(parent.name in INVISIBLE_TAGS for parent in element.parents):
+                text_parts.append(str(element))
+
+    title = None if title_tag is None else title_tag.get_text()
+    base = str(base_tag["href"]) if isinstance(base_tag, Tag) else None
+    return ExtractedPage(title, links, " ".join(text_parts), base)
+
+
+# !Extraction backends by name
+BACKENDS: Dict[str, Callable[[str], ExtractedPage]] = {
+    "lxml": extract_with_lxml,
+    "html_parser": extract_with_html_parser,
+    "beautiful_soup": extract_with_beautiful_soup,
+}
+
+
+def extract_page(html: str, backend: str = EXTRACTION_BACKEND) -> ExtractedPage:
+    """Extracts the title, links and visible text of a page in a single pass
+
+    Args:
+        html (str): The HTML of the page
+        backend (str, optional): "lxml", "html_parser", "beautiful_soup" or "auto" for lxml when it is installed
+            and html_parser otherwise. Defaults to EXTRACTION_BACKEND.
+
+    Returns:
+        ExtractedPage: The title, links and visible text
+
+    Raises:
+        ValueError: If the backend is unknown or not installed
+    """
+    if backend == "auto":
+        backend = "lxml" if _etree is not None else "html_parser"
+    if backend not in BACKENDS:
+        raise ValueError(f"Unknown extraction backend {backend}, use one of auto, {', '.join(BACKENDS)}")
+    return BACKENDS[backend](html)
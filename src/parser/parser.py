@@ -1,32 +1,74 @@
+import logging
+import multiprocessing
+import os
 import queue as _queue
-from concurrent.futures import ThreadPoolExecutor
-from os import listdir, remove
+import threading
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from itertools import islice
 from time import sleep
-from typing import Any, NoReturn
+from typing import Any, Dict, List, NoReturn, Tuple
+from urllib.parse import urljoin
 
 import pymongo.database as _database
-from bs4 import BeautifulSoup
 
-from ..general import get_domain, get_scheme, open_file, tokenize_string
+from ..general import canonicalize_url, simhash
+from ..general.tokenize_string import DEFAULT_TOKENIZER
+from ..metrics import ERRORS, PARSER_BUSY_WORKERS, PARSER_PAGES, PARSER_PARSE_SECONDS, PARSER_WORKERS
 from ..models import Crawled as _crawled_collection
+from ..models import NearDuplicates
 from ..models import Queue as _queue_collection
-
-
-class Parser:
+from ..models import SeenUrls, WriteBuffer
+from ..pipeline import PageHandoff
+from ..storage import ContentStore, create_content_store
+from .constants import (
+    BUFFER_PARSED_WRITES,
+    BUFFER_QUEUE_WRITES,
+    EXTRACTION_BACKEND,
+    PARSE_MODE,
+    PARSE_PROCESSES,
+    PARSE_THREADS_PER_PROCESS,
+)
+from .extract_page import extract_page
+
+logger = logging.getLogger(__name__)
+
+
+class Parser:  # pylint: disable=too-many-instance-attributes
     """Parser for processing HTML files and extracting links."""
 
     max_number_of_threads: int
+    number_of_parse_threads: int
     to_parse_directory: str
     db: _database.Database[dict[str, Any]]
     threadTasks: _queue.Queue[str] = _queue.Queue()
     crawled: _crawled_collection
     queue: _queue_collection
+    queue_buffer: WriteBuffer[str] | None
+    seen_urls: SeenUrls | None
+    near_duplicates: NearDuplicates | None
+    content_store: ContentStore
+    handoff: PageHandoff | None
+    process_pool: ProcessPoolExecutor | None
+    number_of_processes: int | None
+    parsed_buffer: WriteBuffer[Tuple[str, Dict[str, Any]]] | None
+    extraction_backend: str
 
     def __init__(
         self,
         max_number_of_threads: int,
         to_parse_directory: str,
         db: _database.Database[dict[str, Any]],
+        buffer_queue_writes: bool = BUFFER_QUEUE_WRITES,
+        buffer_parsed_writes: bool = BUFFER_PARSED_WRITES,
+        seen_urls: SeenUrls | None = None,
+        content_store: ContentStore | None = None,
+        handoff: PageHandoff | None = None,
+        parse_mode: str = PARSE_MODE,
+        number_of_processes: int | None = PARSE_PROCESSES,
+        extraction_backend: str = EXTRACTION_BACKEND,
+        near_duplicates: NearDuplicates | None = None,
     ) -> None:
         """Initializes the parser
 
@@ -34,6 +76,26 @@ class Parser:
             max_number_of_threads (int): The maximum number of treads to be used.
             to_parse_directory (str): The directory where html files are stored
             db (_database.Database[dict[str, Any]]): Database class
+            buffer_queue_writes (bool, optional): Whether found links are written to the queue in the background,
+                batched across pages. Defaults to BUFFER_QUEUE_WRITES.
+            buffer_parsed_writes (bool, optional): Whether parsed pages are written to the crawled collection in the
+                background, batched across pages, and deleted from the content store once written. Defaults to
+                BUFFER_PARSED_WRITES.
+            seen_urls (SeenUrls | None, optional): Filter of the urls already in the crawled and queue collections,
+                found links are checked against it instead of the database. Defaults to None.
+            content_store (ContentStore | None, optional): Where the crawler stores pages. Defaults to the
+                configured store in to_parse_directory.
+            handoff (PageHandoff | None, optional): Announces pages as the crawler saves them. Without it the
+                content store is polled. Defaults to None.
+            parse_mode (str, optional): "threads" to parse on the parser threads, "processes" to parse in worker
+                processes while the threads only read pages and write results. Defaults to PARSE_MODE.
+            number_of_processes (int | None, optional): Worker processes in process mode, None for one per core.
+                There are at least PARSE_THREADS_PER_PROCESS parser threads for every process. Defaults to
+                PARSE_PROCESSES.
+            extraction_backend (str, optional): How pages are read, "lxml", "html_parser", "beautiful_soup" or
+                "auto" for lxml when it is installed. Defaults to EXTRACTION_BACKEND.
+            near_duplicates (NearDuplicates | None, optional): Fingerprints of the parsed pages. Near-duplicates of a
+                parsed page are marked "duplicate", without their links or tokens. Defaults to None.
         """
         self.max_number_of_threads = max_number_of_threads
         self.to_parse_directory = to_parse_directory
@@ -42,6 +104,33 @@ class Parser:
         # !Get crawled and queue collections
         self.queue = _queue_collection(self.db)
         self.crawled = _crawled_collection(self.db)
+        self.queue_buffer = WriteBuffer(self.write_links) if buffer_queue_writes else None
+        self.parsed_buffer = WriteBuffer(self.write_parsed_pages) if buffer_parsed_writes else None
+        self.seen_urls = seen_urls
+        self.near_duplicates = near_duplicates
+        self.content_store = content_store or create_content_store(to_parse_directory)
+        self.handoff = handoff
+        self.extraction_backend = extraction_backend
+
+        # !One thread assigns the pages, the others parse them
+        self.number_of_parse_threads = max_number_of_threads - 1
+
+        # !Parsing is pure CPU work, so process mode moves it out of the GIL
+        self.process_pool = None
+        self.number_of_processes = number_of_processes
+        self.process_pool_lock = threading.Lock()
+        if parse_mode == "processes":
+            self.process_pool = self.create_process_pool()
+
+            # !Every thread waits for its page to be parsed, so there are enough of them to keep every process busy
+            # !while others read pages and write what was found
+            self.number_of_parse_threads = max(
+                self.number_of_parse_threads, (number_of_processes or os.cpu_count() or 1) * PARSE_THREADS_PER_PROCESS
+            )
+
+        # !With a handoff the dispatcher blocks once the parser threads are busy, which in turn blocks the crawler
+        if handoff is not None:
+            self.threadTasks = _queue.Queue(self.number_of_parse_threads * 2)  # pylint: disable=invalid-name
 
         # !Create threads
         self.create_threads()
@@ -49,21 +138,21 @@ class Parser:
     # !Create threads
     def create_threads(self) -> None:
         """Creates threads"""
-        with ThreadPoolExecutor(max_workers=self.max_number_of_threads) as executor:
-            executor.submit(self.work)
-            for _ in range(self.max_number_of_threads - 1):
-                executor.submit(self.parse_work)
+        if self.handoff is None:
+            threading.Thread(target=self.work, daemon=True).start()
+        else:
+            threading.Thread(target=self.handoff_work, args=(self.handoff,), daemon=True).start()
+        for _ in range(self.number_of_parse_threads):
+            threading.Thread(target=self.parse_work, daemon=True).start()
+        PARSER_WORKERS.inc(self.number_of_parse_threads)
 
     # !Assigns work to threads
     def work(self) -> NoReturn:
         """Assigns work to threads"""
         while True:
-            # !Assigns the first 10 files in to_parse directory to parser threads
-            for i in range(10):
-                try:
-                    self.threadTasks.put(listdir(self.to_parse_directory)[i])
-                except IndexError:
-                    break
+            # !Assigns the first 10 pages in the content store to parser threads
+            for file_name in islice(self.content_store.keys(), 10):
+                self.threadTasks.put(file_name)
 
             # !Waits for all tasks to be completed
             self.threadTasks.join()
@@ -71,116 +160,196 @@ class Parser:
             # !Waits for 10 seconds before continuing
             sleep(10)
 
+    # !Assigns pages to threads as the crawler saves them
+    def handoff_work(self, handoff: PageHandoff) -> NoReturn:
+        """Assigns pages announced by the handoff to threads, after the pages saved before the parser started
+
+        Args:
+            handoff (PageHandoff): The handoff the crawler announces pages on
+        """
+        # !Pages saved before a restart were never announced, so they are only found by scanning the store once
+        for file_name in self.content_store.keys():
+            if handoff.claim(file_name):
+                self.threadTasks.put(file_name)
+
+        while True:
+            self.threadTasks.put(handoff.consume())
+
     # !Picks a downloaded html document and parse it
     def parse_work(self) -> NoReturn:
         """Continuously processes HTML files for parsing and link extraction"""
         while True:
             file_name = self.threadTasks.get()
-            base_file_name = file_name.rstrip(".html")
-
-            file = open_file(file_name, self.to_parse_directory, "utf8")
-
-            soup = BeautifulSoup(file, "html.parser")
-
-            # !Get links
-            links = self.get_links(soup)
-
-            # !Parse links
-            current_page = self.crawled.get_one({"file_name": base_file_name})
-            if not current_page:
+            process_pool = self.process_pool
+            # !A page that fails to parse stays in the content store, the recovery scan tries it again on the next start
+            try:
+                with PARSER_BUSY_WORKERS.track_inprogress():
+                    self.parse_one(file_name)
+            except Exception as error:  # pylint: disable=broad-exception-caught
+                ERRORS.labels("parser", type(error).__name__).inc()
+                logger.exception("Parsing %s failed", file_name)
+                if isinstance(error, BrokenProcessPool):
+                    self.replace_process_pool(process_pool)
+            finally:
+                # !Done with task
                 self.complete_task()
-                continue
 
-            accepted_links = self.parse_links(links, current_page["url"])
+    def create_process_pool(self) -> ProcessPoolExecutor:
+        """Starts the worker processes of process mode
 
-            # !Add accepted links to queue
-            for link in accepted_links:
-                if not self.crawled.get_one({"url": link}):
-                    self.queue.add(link)
+        Returns:
+            ProcessPoolExecutor: The pool
+        """
+        return ProcessPoolExecutor(self.number_of_processes, mp_context=multiprocessing.get_context("spawn"))
 
-            # !Update crawled
-            title = str((soup.title.string if soup.title else "No Title")).replace("\n", "").replace("  ", "")
-            self.crawled.update({"file_name": base_file_name}, {"title": title})
-            self.crawled.update({"file_name": base_file_name}, {"forward_links": accepted_links})
+    def replace_process_pool(self, broken_pool: ProcessPoolExecutor | None) -> None:
+        """Starts a new pool in place of one a dead worker process broke, which fails every page submitted to it
 
-            # !Tokenize text
-            tokens = tokenize_string(soup.get_text())
-            self.crawled.update({"file_name": file_name.rstrip(".html")}, {"tokens": tokens})
+        Args:
+            broken_pool (ProcessPoolExecutor | None): The broken pool, it is only replaced once by all the threads
+                that find it broken
+        """
+        with self.process_pool_lock:
+            if broken_pool is None or self.process_pool is not broken_pool:
+                return
+            broken_pool.shutdown(wait=False, cancel_futures=True)
+            self.process_pool = self.create_process_pool()
 
-            # !Convert links status to parsed
-            self.crawled.update({"file_name": file_name.rstrip(".html")}, {"status": "parsed"})
+    def parse_one(self, file_name: str) -> None:
+        """Parses a page of the content store and saves what was found on it
 
-            # !Done with task
-            remove(f"{self.to_parse_directory}/{file_name}")
-            self.complete_task()
+        Args:
+            file_name (str): The key of the page in the content store
+        """
+        # !A page found by the recovery scan may also be announced, and is gone once the first copy is parsed
+        try:
+            file = self.content_store.get(file_name)
+        except KeyError:
+            PARSER_PAGES.labels("missing").inc()
+            return
+
+        current_page = self.crawled.get_one({"file_name": file_name}, fields=["url", "id", "simhash"])
+        if not current_page:
+            PARSER_PAGES.labels("missing").inc()
+            return
+
+        # !Get the title, links, tokens and fingerprint
+        with PARSER_PARSE_SECONDS.time():
+            if self.process_pool is not None:
+                title, accepted_links, tokens, fingerprint = self.process_pool.submit(
+                    parse_page, file, current_page["url"], self.extraction_backend
+                ).result()
+            else:
+                title, accepted_links, tokens, fingerprint = parse_page(
+                    file, current_page["url"], self.extraction_backend
+                )
+
+        # !Near-duplicates keep neither their links nor their tokens, so they add nothing to the queue or index
+        duplicate_of = None
+        if self.near_duplicates is not None:
+            duplicate_of = self.near_duplicates.check(
+                current_page["id"], fingerprint, len(tokens), current_page.get("simhash", 0)
+            )
+        if duplicate_of is not None:
+            accepted_links, tokens = [], {}
+        self.enqueue_links(accepted_links)
+        PARSER_PAGES.labels("parsed" if duplicate_of is None else "duplicate").inc()
+
+        # !Everything found on the page is written in one update, batched with other pages when buffering
+        page = {
+            "url": current_page["url"],
+            "title": title,
+            "forward_links": accepted_links,
+            "tokens": tokens,
+            "simhash": fingerprint,
+            "duplicate_of": duplicate_of,
+        }
+        if self.parsed_buffer is not None:
+            self.parsed_buffer.add((file_name, page))
+        else:
+            self.crawled.mark_parsed(**page)
+            self.content_store.delete(file_name)
+
+    def enqueue_links(self, links: List[str]) -> None:
+        """Adds the links that were never crawled or queued to the queue
 
-    @staticmethod
-    def get_links(soup: BeautifulSoup) -> list[str]:
-        """Extracts links from the html
+        Args:
+            links (List[str]): The links found on a page
+        """
+        if self.seen_urls is not None:
+            new_links = self.seen_urls.filter_new(links)
+        else:
+            crawled_links = self.crawled.get_urls(links)
+            new_links = [link for link in links if link not in crawled_links]
+        if self.queue_buffer is not None:
+            self.queue_buffer.extend(new_links)
+        else:
+            self.write_links(new_links)
+
+    def write_links(self, links: List[str]) -> None:
+        """Adds links to the queue in one bulk write, then marks them as seen
 
         Args:
-            soup (BeautifulSoup): The beautiful soup html soup
+            links (List[str]): The links, a link found on several pages before the write may be in it more than once
+        """
+        # !Marked only once written, a link lost with a failed write or a crash is still new the next time it is found
+        links = list(dict.fromkeys(links))
+        self.queue.add_many(links)
+        if self.seen_urls is not None:
+            self.seen_urls.add_many(links)
 
-        Returns:
-            list[str]: List of links found
+    def write_parsed_pages(self, pages: List[Tuple[str, Dict[str, Any]]]) -> None:
+        """Writes parsed pages to the crawled collection in one bulk write, then deletes them from the content store
+
+        Args:
+            pages (List[Tuple[str, Dict[str, Any]]]): The file names and the arguments taken by Crawled.mark_parsed
         """
-        return [link for link in [link.get("href") for link in soup.find_all("a")] if link is not None if link != ""]
+        self.crawled.mark_parsed_many([page for _, page in pages])
+        for file_name, _ in pages:
+            self.content_store.delete(file_name)
 
-    def parse_links(self, links: list[str], current_page: str) -> list[str]:
-        """Parses the provided links
+    @staticmethod
+    def parse_links(links: list[str], current_page: str) -> list[str]:
+        """Resolves the provided links and keeps the canonical url of the ones to pages, once each
 
         Args:
             links (list[str]): Links to parse
-            current_page (str): The website where the links where found
+            current_page (str): The url the links are relative to, the website where the links where found or its
+                <base> element
 
         Returns:
             list[str]: A list of parsed links
         """
+        canonical_urls = (canonicalize_url(link, current_page) for link in links)
+        return list(dict.fromkeys(url for url in canonical_urls if url is not None))
 
-        def clean_link(link: str, scheme: str) -> str:
-            return link.replace(f"{scheme}://", "").replace(" ", "").replace("\t", "").replace("\n", "")
-
-        def is_non_html(link: str) -> bool:
-            return link[-4:].lower() in [".jpg", ".png", ".gif", ".svg", ".pdf"]
-
-        def is_malformed(link: str) -> bool:
-            return not link.split("/")[0].replace(".", "").replace("-", "").isalnum() or link[0] in (
-                "#",
-                "(",
-                "{",
-                "?",
-                "<",
-                "\\",
-            )
-
-        def is_false_link(link: str) -> bool:
-            return any(link.lower().startswith(prefix) for prefix in ("mailto:", "javascript:", "tel:", "./"))
+    def complete_task(self) -> None:
+        """Complete task"""
+        self.threadTasks.task_done()
 
-        def standardize_link(link: str, domain: str) -> str:
-            if link.startswith("//"):
-                return link.replace("//", "").split(":")[0]
-            elif link.startswith("/"):
-                return domain + link
-            return link
 
-        accepted_links: list[str] = []
-        domain = get_domain(current_page)
+def parse_page(html: str, url: str, backend: str = EXTRACTION_BACKEND) -> Tuple[str, List[str], Dict[str, int], int]:
+    """Extracts the title, accepted links, tokens and SimHash fingerprint of a page
 
-        for link in links:
-            scheme = get_scheme(link) if link.startswith("http") else get_scheme(current_page)
-            link = clean_link(link, scheme)
+    Runs in the worker processes in process mode, so it only takes and returns values that can be pickled.
 
-            if is_non_html(link) or is_malformed(link) or is_false_link(link):
-                continue
+    Args:
+        html (str): The HTML of the page
+        url (str): The url of the page
+        backend (str, optional): The extraction backend. Defaults to EXTRACTION_BACKEND.
 
-            link = standardize_link(link, domain)
-            if link[-1] == "/":
-                link = link[:-1]
+    Returns:
+        Tuple[str, List[str], Dict[str, int], int]: The title, the accepted links, the token counts and the
+            fingerprint
+    """
+    # !The title, links and visible text come out of one pass over the page
+    page = extract_page(html, backend)
 
-            accepted_links.append(f"{scheme}://{link}")
+    title = (page.title if page.title is not None else "No Title").replace("\n", "").replace("  ", "")
+    accepted_links = Parser.parse_links(page.links, urljoin(url, page.base) if page.base else url)
 
-        return accepted_links
+    # !The terms are counted for the index and fingerprinted in order
+    terms = DEFAULT_TOKENIZER.tokenize(page.text)
+    tokens = dict(Counter(terms))
 
-    def complete_task(self) -> None:
-        """Complete task"""
-        self.threadTasks.task_done()
+    return title, accepted_links, tokens, simhash(terms)
@@ -0,0 +1,3 @@
+from .page_handoff import CollectionHandoff, PageHandoff, QueueHandoff
+
+__all__ = ["PageHandoff", "QueueHandoff", "CollectionHandoff"]
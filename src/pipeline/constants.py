@@ -0,0 +1,2 @@
+HANDOFF_MAX_SIZE: int = 1000
+HANDOFF_IDLE_SECONDS: float = 1
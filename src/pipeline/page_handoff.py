@@ -0,0 +1,140 @@
+import queue as _queue
+from abc import ABC, abstractmethod
+from time import sleep, time
+from typing import Any, Dict
+
+import pymongo.cursor as _cursor
+import pymongo.database as _database
+
+from ..models import Crawled as _crawled_collection
+from ..models import PageEvents as _page_events_collection
+from .constants import HANDOFF_IDLE_SECONDS, HANDOFF_MAX_SIZE
+
+
+# !Crawler to parser handoff
+class PageHandoff(ABC):
+    """Hands pages saved by the crawler to the parser as soon as they are saved"""
+
+    @abstractmethod
+    def publish(self, file_name: str) -> None:
+        """Announces a saved page, called by the crawler once the page is in the content store and crawled collection
+
+        Args:
+            file_name (str): The key of the page in the content store
+        """
+
+    @abstractmethod
+    def consume(self) -> str:
+        """Waits for the next saved page
+
+        Returns:
+            str: The key of the page in the content store
+        """
+
+    def claim(self, file_name: str) -> bool:  # pylint: disable=unused-argument
+        """Claims a page found by the recovery scan on start
+
+        Args:
+            file_name (str): The key of the page in the content store
+
+        Returns:
+            bool: True if this parser should parse the page
+        """
+        return True
+
+
+# !In-process handoff
+class QueueHandoff(PageHandoff):
+    """
+    Handoff through a bounded in-process queue, for a crawler and parser running in the same process.
+
+    A full queue blocks the crawler until the parser catches up.
+    """
+
+    def __init__(self, max_size: int = HANDOFF_MAX_SIZE) -> None:
+        """Initializes the queue
+
+        Args:
+            max_size (int, optional): Pages waiting before the crawler is blocked. Defaults to HANDOFF_MAX_SIZE.
+        """
+        self.pages: _queue.Queue[str] = _queue.Queue(max_size)
+
+    def publish(self, file_name: str) -> None:
+        """Announces a saved page
+
+        Args:
+            file_name (str): The key of the page in the content store
+        """
+        self.pages.put(file_name)
+
+    def consume(self) -> str:
+        """Waits for the next saved page
+
+        Returns:
+            str: The key of the page in the content store
+        """
+        return self.pages.get()
+
+
+# !Multi-process handoff
+class CollectionHandoff(PageHandoff):
+    """
+    Handoff through a capped collection tailed by every parser, for crawlers and parsers in separate processes.
+
+    Every parser sees every event, so a page is claimed by atomically moving its crawled status to "parsing" and
+    only the parser that wins parses it. The content store has to be shared between the processes, so a FileStore.
+    """
+
+    def __init__(self, db: _database.Database[Dict[str, Any]]) -> None:
+        """Initializes the handoff, creating the capped collection if needed
+
+        Args:
+            db (_database.Database[Dict[str, Any]]): Database class
+        """
+        self.page_events = _page_events_collection(db)
+        self.crawled = _crawled_collection(db)
+        self.page_events.create_collection()
+
+        # !Pages saved before the parser started are found by the recovery scan instead
+        self.last_id = time()
+        self.cursor: _cursor.Cursor[Dict[str, Any]] | None = None
+
+    def publish(self, file_name: str) -> None:
+        """Announces a saved page
+
+        Args:
+            file_name (str): The key of the page in the content store
+        """
+        self.page_events.add(file_name)
+
+    def consume(self) -> str:
+        """Waits for the next saved page that no other parser claimed
+
+        Returns:
+            str: The key of the page in the content store
+        """
+        while True:
+            # !A tailable cursor dies when the collection is empty or it fell behind, so it is opened again
+            if self.cursor is None or not self.cursor.alive:
+                self.cursor = self.page_events.tail(self.last_id)
+
+            event = next(self.cursor, None)
+            if event is None:
+                if not self.cursor.alive:
+                    sleep(HANDOFF_IDLE_SECONDS)
+                continue
+
+            self.last_id = event["id"]
+            if self.crawled.start_parsing(event["file_name"]):
+                return event["file_name"]
+
+    def claim(self, file_name: str) -> bool:
+        """Claims a page found by the recovery scan, including pages a stopped parser was parsing
+
+        Args:
+            file_name (str): The key of the page in the content store
+
+        Returns:
+            bool: True if this parser should parse the page
+        """
+        return self.crawled.start_parsing(file_name, ["crawled", "parsing"])
@@ -0,0 +1,4 @@
+from .page_rank import count_out_degree, page_rank, to_csr
+from .ranker import LinkGraph, Ranker
+
+__all__ = ["LinkGraph", "Ranker", "count_out_degree", "page_rank", "to_csr"]
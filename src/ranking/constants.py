@@ -0,0 +1,8 @@
+PAGE_RANK_DAMPING: float = 0.85
+PAGE_RANK_TOLERANCE: float = 1e-6
+PAGE_RANK_MAX_ITERATIONS: int = 100
+PAGE_RANK_WARM_START: bool = True
+# !Stored ranks are scaled so the average page has rank 1, changes smaller than this are not written
+RANK_WRITE_TOLERANCE: float = 1e-3
+RANK_WRITE_BATCH_SIZE: int = 1000
+RANK_INTERVAL: float = 3600
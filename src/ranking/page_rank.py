@@ -0,0 +1,178 @@
+from array import array
+from typing import Any, Callable, List, Sequence, Tuple
+
+from .constants import PAGE_RANK_DAMPING, PAGE_RANK_MAX_ITERATIONS, PAGE_RANK_TOLERANCE
+
+try:
+    import numpy as _numpy
+except ImportError:  # pragma: no cover - numpy is optional
+    _numpy = None
+
+
+def count_out_degree(number_of_pages: int, sources: Sequence[int]) -> array:
+    """Counts the links on every page
+
+    Args:
+        number_of_pages (int): The number of pages.
+        sources (Sequence[int]): The page every link is on.
+
+    Returns:
+        array: The number of links on every page
+    """
+    if _numpy is not None:
+        counts = _numpy.bincount(_numpy.asarray(sources, dtype=_numpy.int64), minlength=number_of_pages)
+        return array("q", counts.astype(_numpy.int64).tobytes())
+
+    out_degree = array("q", bytes(8 * number_of_pages))
+    for source in sources:
+        out_degree[source] += 1
+    return out_degree
+
+
+def to_csr(number_of_pages: int, sources: Sequence[int], targets: Sequence[int]) -> Tuple[array, array]:
+    """Sorts links by target into compressed sparse rows, the transposed link matrix power iteration multiplies by
+
+    Args:
+        number_of_pages (int): The number of pages.
+        sources (Sequence[int]): The page every link is on.
+        targets (Sequence[int]): The page every link points to.
+
+    Returns:
+        Tuple[array, array]: Row pointers, the links to page i being from indices[indptr[i]:indptr[i + 1]], and the
+            source pages
+    """
+    if _numpy is not None:
+        target_pages = _numpy.asarray(targets, dtype=_numpy.int64)
+        counts = _numpy.bincount(target_pages, minlength=number_of_pages)
+        order = _numpy.argsort(target_pages, kind="stable")
+        indptr = array("q", _numpy.concatenate(([0], _numpy.cumsum(counts))).astype(_numpy.int64).tobytes())
+        indices = array("q", _numpy.asarray(sources, dtype=_numpy.int64)[order].tobytes())
+        return indptr, indices
+
+    indptr = array("q", bytes(8 * (number_of_pages + 1)))
+    for target in targets:
+        indptr[target + 1] += 1
+    for page in range(number_of_pages):
+        indptr[page + 1] += indptr[page]
+
+    # !Counting sort, filling every row from its start
+    indices = array("q", bytes(8 * len(targets)))
+    next_position = array("q", indptr[:-1])
+    for source, target in zip(sources, targets):
+        indices[next_position[target]] = source
+        next_position[target] += 1
+
+    return indptr, indices
+
+
+def page_rank(
+    indptr: array,
+    indices: array,
+    out_degree: array,
+    initial: Sequence[float] | None = None,
+    damping: float = PAGE_RANK_DAMPING,
+    tolerance: float = PAGE_RANK_TOLERANCE,
+    max_iterations: int = PAGE_RANK_MAX_ITERATIONS,
+) -> Tuple[List[float], int]:
+    """Computes PageRank by power iteration, with NumPy when it is installed
+
+    The rank of pages without links is spread over every page, so ranks keep summing to 1.
+
+    Args:
+        indptr (array): Row pointers of the links sorted by target, from to_csr.
+        indices (array): Source pages of the links sorted by target, from to_csr.
+        out_degree (array): The number of links on every page.
+        initial (Sequence[float] | None, optional): Ranks to start from, e.g. the previous ones, which converges in
+            far fewer iterations when little changed. Defaults to None for the same rank for every page.
+        damping (float, optional): Probability of following a link rather than jumping to a random page. Defaults to
+            PAGE_RANK_DAMPING.
+        tolerance (float, optional): Iteration stops once the ranks moved less than this, summed. Defaults to
+            PAGE_RANK_TOLERANCE.
+        max_iterations (int, optional): The most iterations run. Defaults to PAGE_RANK_MAX_ITERATIONS.
+
+    Returns:
+        Tuple[List[float], int]: The ranks, summing to 1, and the number of iterations run
+    """
+    number_of_pages = len(out_degree)
+    if number_of_pages == 0:
+        return [], 0
+
+    if initial is None or len(initial) != number_of_pages or sum(initial) <= 0:
+        initial = [1.0] * number_of_pages
+
+    ranks: Any
+    if _numpy is not None:
+        ranks = _numpy.array(initial, dtype=_numpy.float64)
+        ranks /= ranks.sum()
+        step = numpy_step(indptr, indices, out_degree, damping)
+    else:
+        total = sum(initial)
+        ranks = [rank / total for rank in initial]
+        step = python_step(indptr, indices, out_degree, damping)
+
+    iterations = 0
+    while iterations < max_iterations:
+        iterations += 1
+        ranks, change = step(ranks)
+        if change < tolerance:
+            break
+
+    return list(ranks) if _numpy is None else ranks.tolist(), iterations
+
+
+def numpy_step(indptr: array, indices: array, out_degree: array, damping: float) -> Callable[[Any], Tuple[Any, float]]:
+    """Makes one power iteration with NumPy
+
+    Args:
+        indptr (array): Row pointers of the links sorted by target.
+        indices (array): Source pages of the links sorted by target.
+        out_degree (array): The number of links on every page.
+        damping (float): Probability of following a link.
+
+    Returns:
+        Callable[[Any], Tuple[Any, float]]: Takes the ranks as an ndarray and gives the next ones and how much
+            they moved, summed
+    """
+    number_of_pages = len(out_degree)
+    sources = _numpy.frombuffer(indices, dtype=_numpy.int64)
+    rows = _numpy.repeat(_numpy.arange(number_of_pages), _numpy.diff(_numpy.frombuffer(indptr, dtype=_numpy.int64)))
+    degrees = _numpy.frombuffer(out_degree, dtype=_numpy.int64)
+    dangling = degrees == 0
+    inverse_degrees = _numpy.where(dangling, 0.0, 1.0 / _numpy.maximum(degrees, 1))
+
+    def step(ranks: Any) -> Tuple[Any, float]:
+        new_ranks = _numpy.bincount(rows, weights=(ranks * inverse_degrees)[sources], minlength=number_of_pages)
+        new_ranks = damping * (new_ranks + ranks[dangling].sum() / number_of_pages) + (1 - damping) / number_of_pages
+        return new_ranks, float(_numpy.abs(new_ranks - ranks).sum())
+
+    return step
+
+
+def python_step(indptr: array, indices: array, out_degree: array, damping: float) -> Callable[[Any], Tuple[Any, float]]:
+    """Makes one power iteration in pure Python
+
+    Args:
+        indptr (array): Row pointers of the links sorted by target.
+        indices (array): Source pages of the links sorted by target.
+        out_degree (array): The number of links on every page.
+        damping (float): Probability of following a link.
+
+    Returns:
+        Callable[[Any], Tuple[Any, float]]: Takes the ranks as a list and gives the next ones and how much they
+            moved, summed
+    """
+    number_of_pages = len(out_degree)
+    dangling = [page for page in range(number_of_pages) if out_degree[page] == 0]
+    inverse_degrees = [1 / degree if degree else 0.0 for degree in out_degree]
+    jump = (1 - damping) / number_of_pages
+
+    def step(ranks: Any) -> Tuple[Any, float]:
+        shares = [rank * inverse_degree for rank, inverse_degree in zip(ranks, inverse_degrees)]
+        spread = damping * sum(ranks[page] for page in dangling) / number_of_pages + jump
+        new_ranks = [
+            damping * sum(shares[source] for source in indices[indptr[page] : indptr[page + 1]]) + spread
+            for page in range(number_of_pages)
+        ]
+        return new_ranks, sum(abs(new_rank - rank) for new_rank, rank in zip(new_ranks, ranks))
+
+    return step
@@ -0,0 +1,167 @@
+import logging
+import threading
+from array import array
+from dataclasses import dataclass
+from time import sleep
+from typing import Any, Dict, List, NoReturn, Tuple
+
+import pymongo.database as _database
+
+from ..metrics import ERRORS
+from ..models import Crawled as _crawled_collection
+from .constants import (
+    PAGE_RANK_DAMPING,
+    PAGE_RANK_MAX_ITERATIONS,
+    PAGE_RANK_TOLERANCE,
+    PAGE_RANK_WARM_START,
+    RANK_INTERVAL,
+    RANK_WRITE_BATCH_SIZE,
+    RANK_WRITE_TOLERANCE,
+)
+from .page_rank import count_out_degree, page_rank, to_csr
+
+logger = logging.getLogger(__name__)
+
+
+# !Link graph
+@dataclass
+class LinkGraph:
+    """The crawled pages as compact integer ids and the links between them in compressed sparse rows"""
+
+    urls: List[str]
+    ranks: List[float]
+    out_degree: array
+    indptr: array
+    indices: array
+
+    @classmethod
+    def from_links(cls, urls: List[str], ranks: List[float], sources: array, targets: array) -> "LinkGraph":
+        """Builds the sparse rows from the links
+
+        Args:
+            urls (List[str]): The url of every page, its unique key in the crawled collection
+            ranks (List[float]): The stored rank of every page
+            sources (array): The page every link is on
+            targets (array): The page every link points to
+
+        Returns:
+            LinkGraph: The link graph
+        """
+        indptr, indices = to_csr(len(urls), sources, targets)
+        return cls(urls, ranks, count_out_degree(len(urls), sources), indptr, indices)
+
+    @property
+    def number_of_links(self) -> int:
+        """The number of links between crawled pages"""
+        return len(self.indices)
+
+
+# !Ranker
+class Ranker:
+    """Ranks the crawled pages with PageRank over their forward links and writes the ranks back in bulk"""
+
+    def __init__(
+        self,
+        db: _database.Database[Dict[str, Any]],
+        damping: float = PAGE_RANK_DAMPING,
+        tolerance: float = PAGE_RANK_TOLERANCE,
+        max_iterations: int = PAGE_RANK_MAX_ITERATIONS,
+        warm_start: bool = PAGE_RANK_WARM_START,
+    ) -> None:
+        """Initializes the ranker
+
+        Args:
+            db (_database.Database[Dict[str, Any]]): Database class
+            damping (float, optional): Probability of following a link. Defaults to PAGE_RANK_DAMPING.
+            tolerance (float, optional): Summed change of the ranks at which iteration stops. Defaults to
+                PAGE_RANK_TOLERANCE.
+            max_iterations (int, optional): The most iterations run. Defaults to PAGE_RANK_MAX_ITERATIONS.
+            warm_start (bool, optional): Whether iteration starts from the stored ranks, so a graph that changed a
+                little converges in a few iterations. Defaults to PAGE_RANK_WARM_START.
+        """
+        self.crawled = _crawled_collection(db)
+        self.damping = damping
+        self.tolerance = tolerance
+        self.max_iterations = max_iterations
+        self.warm_start = warm_start
+
+    def load_graph(self) -> LinkGraph:
+        """Streams the crawled collection twice, once to number the pages and once to turn links into ids
+
+        Returns:
+            LinkGraph: The link graph
+        """
+        urls: List[str] = []
+        ranks: List[float] = []
+        page_numbers: Dict[str, int] = {}
+        for page in self.crawled.iterate(None, fields=["url", "rank"]):
+            page_numbers[page["url"]] = len(urls)
+            urls.append(page["url"])
+            ranks.append(page.get("rank", 1))
+
+        # !Links to pages that were never crawled are left out, and a page linking to another many times counts once
+        sources = array("q")
+        targets = array("q")
+        for page in self.crawled.iterate({"status": "parsed"}, fields=["url", "forward_links"]):
+            # !Pages crawled since the first pass are ranked the next time
+            source = page_numbers.get(page["url"])
+            if source is None:
+                continue
+            for target in {page_numbers.get(link) for link in page["forward_links"]}:
+                if target is not None and target != source:
+                    sources.append(source)
+                    targets.append(target)
+
+        return LinkGraph.from_links(urls, ranks, sources, targets)
+
+    def rank(self) -> Tuple[int, int]:
+        """Ranks every crawled page
+
+        Returns:
+            Tuple[int, int]: The number of iterations run and the number of ranks written
+        """
+        graph = self.load_graph()
+        number_of_pages = len(graph.urls)
+
+        # !Stored ranks are scaled so the average page has rank 1, which is also the rank of a page never ranked
+        ranks, iterations = page_rank(
+            graph.indptr,
+            graph.indices,
+            graph.out_degree,
+            initial=graph.ranks if self.warm_start else None,
+            damping=self.damping,
+            tolerance=self.tolerance,
+            max_iterations=self.max_iterations,
+        )
+        changed = [
+            (url, rank * number_of_pages)
+            for url, rank, stored_rank in zip(graph.urls, ranks, graph.ranks)
+            if abs(rank * number_of_pages - stored_rank) > RANK_WRITE_TOLERANCE
+        ]
+
+        for start in range(0, len(changed), RANK_WRITE_BATCH_SIZE):
+            self.crawled.set_ranks(changed[start : start + RANK_WRITE_BATCH_SIZE])
+        return iterations, len(changed)
+
+    def start(self, interval: float = RANK_INTERVAL) -> None:
+        """Ranks the pages every interval seconds in a background thread
+
+        Args:
+            interval (float, optional): Seconds between rankings. Defaults to RANK_INTERVAL.
+        """
+        threading.Thread(target=self.work, args=(interval,), daemon=True).start()
+
+    def work(self, interval: float) -> NoReturn:
+        """Ranks the pages forever
+
+        Args:
+            interval (float): Seconds between rankings
+        """
+        while True:
+            # !A failed ranking is tried again after the interval, the stored ranks stay as they are meanwhile
+            try:
+                self.rank()
+            except Exception as error:  # pylint: disable=broad-exception-caught
+                ERRORS.labels("ranker", type(error).__name__).inc()
+                logger.exception("Ranking the pages failed")
+            sleep(interval)
@@ -0,0 +1,5 @@
+from .routes import router
+from .search_response import SearchHit, SearchResponse, SearchTiming
+from .searcher import Searcher
+
+__all__ = ["SearchHit", "SearchResponse", "SearchTiming", "Searcher", "router"]
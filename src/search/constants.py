@@ -0,0 +1,6 @@
+BM25_K1: float = 1.2
+BM25_B: float = 0.75
+RANK_WEIGHT: float = 1.0
+SEARCH_DEFAULT_LIMIT: int = 10
+SEARCH_MAX_LIMIT: int = 100
+INDEX_REFRESH_SECONDS: float = 5
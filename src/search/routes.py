@@ -0,0 +1,45 @@
+from fastapi import APIRouter, Depends, HTTPException, Query, Request
+
+from .constants import SEARCH_DEFAULT_LIMIT, SEARCH_MAX_LIMIT
+from .search_response import SearchResponse
+from .searcher import Searcher
+
+router = APIRouter()
+
+
+def get_searcher(request: Request) -> Searcher:
+    """Gets the searcher the background tasks put on the app
+
+    Args:
+        request (Request): The request
+
+    Returns:
+        Searcher: The searcher
+
+    Raises:
+        HTTPException: If the app has not started yet
+    """
+    searcher: Searcher | None = getattr(request.app.state, "searcher", None)
+    if searcher is None:
+        raise HTTPException(status_code=503, detail="The search engine is starting")
+    return searcher
+
+
+# !Search endpoint
+@router.get("/search")
+def search(
+    q: str = Query(min_length=1, description="The query"),
+    limit: int = Query(SEARCH_DEFAULT_LIMIT, ge=1, le=SEARCH_MAX_LIMIT, description="Pages to return"),
+    searcher: Searcher = Depends(get_searcher),
+) -> SearchResponse:
+    """Searches the crawled pages
+
+    Args:
+        q (str): The query
+        limit (int): Pages to return
+        searcher (Searcher): The searcher
+
+    Returns:
+        SearchResponse: The best pages with their score, and where the time of the query went
+    """
+    return searcher.search(q, limit)
@@ -0,0 +1,32 @@
+from typing import List
+
+import pydantic as _pydantic
+
+
+# !Search hit model
+class SearchHit(_pydantic.BaseModel):
+    """A page found by a search"""
+
+    url: str
+    title: str
+    score: float
+
+
+# !Search timing model
+class SearchTiming(_pydantic.BaseModel):
+    """Where the time of a search went, in milliseconds"""
+
+    index_ms: float
+    fetch_ms: float
+    total_ms: float
+
+
+# !Search response model
+class SearchResponse(_pydantic.BaseModel):
+    """The response of the search endpoint"""
+
+    query: str
+    terms: List[str]
+    results: List[SearchHit]
+    documents_scored: int
+    timing: SearchTiming
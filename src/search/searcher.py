@@ -0,0 +1,262 @@
+import heapq
+import math
+import threading
+from dataclasses import dataclass
+from itertools import accumulate
+from time import monotonic, perf_counter
+from typing import Any, Dict, List, Tuple
+
+import pymongo.database as _database
+
+from ..general.tokenize_string import DEFAULT_TOKENIZER
+from ..indexer import InvertedIndex
+from ..indexer.constants import INDEX_DIRECTORY
+from ..indexer.postings import NO_MORE_DOCUMENTS, PostingsCursor
+from ..models import Crawled as _crawled_collection
+from .constants import BM25_B, BM25_K1, INDEX_REFRESH_SECONDS, RANK_WEIGHT
+from .search_response import SearchHit, SearchResponse, SearchTiming
+
+
+@dataclass
+class _TermScorer:
+    """A query term: its postings cursor, BM25 weight and the highest score it can add to a document"""
+
+    cursor: PostingsCursor
+    idf: float
+    max_score: float
+
+
+# !Searcher
+class Searcher:  # pylint: disable=too-many-instance-attributes
+    """
+    Ranks the pages of the inverted index for a query with BM25 plus a prior from the rank of the page.
+
+    Documents are scored one at a time across the postings of the query terms, keeping the best in a bounded heap.
+    With early termination the terms are split MaxScore style: once the heap is full, terms that together cannot lift
+    a document over the lowest score in the heap are only looked up, through their skip tables, for documents found in
+    the other terms, so a query costs far less than reading every posting of its terms.
+    """
+
+    def __init__(
+        self,
+        db: _database.Database[Dict[str, Any]],
+        directory: str = INDEX_DIRECTORY,
+        k1: float = BM25_K1,
+        b: float = BM25_B,
+        rank_weight: float = RANK_WEIGHT,
+    ) -> None:
+        """Initializes the searcher, the index being opened on the first search
+
+        Args:
+            db (_database.Database[Dict[str, Any]]): Database class
+            directory (str, optional): The index directory. Defaults to INDEX_DIRECTORY.
+            k1 (float, optional): How quickly more occurrences of a term stop adding to the score. Defaults to BM25_K1.
+            b (float, optional): How much longer pages are penalized, from 0 to 1. Defaults to BM25_B.
+            rank_weight (float, optional): Weight of log(1 + rank) in the score. Defaults to RANK_WEIGHT.
+        """
+        self.crawled = _crawled_collection(db)
+        self.directory = directory
+        self.k1 = k1
+        self.b = b
+        self.rank_weight = rank_weight
+
+        self.lock = threading.Lock()
+        self.index: InvertedIndex | None = None
+        self.checked_at = -math.inf
+
+    def get_index(self) -> InvertedIndex | None:
+        """Gets the current generation of the index, checking for a newer one every INDEX_REFRESH_SECONDS
+
+        Returns:
+            InvertedIndex | None: The index, None if it was never built
+        """
+        with self.lock:
+            if monotonic() - self.checked_at >= INDEX_REFRESH_SECONDS:
+                self.checked_at = monotonic()
+                # !The previous generation is unmapped once the searches still using it are done with it
+                if self.index is None or not self.index.is_current():
+                    try:
+                        self.index = InvertedIndex(self.directory)
+                    except FileNotFoundError:
+                        self.index = None
+            return self.index
+
+    def term_score(self, idf: float, frequency: int, length: int, average_length: float) -> float:
+        """Scores a term of a document with BM25
+
+        Args:
+            idf (float): The inverse document frequency of the term
+            frequency (int): Occurrences of the term in the document
+            length (int): Number of terms of the document
+            average_length (float): Average number of terms of a document
+
+        Returns:
+            float: The score
+        """
+        normalization = self.k1 * (1 - self.b + self.b * length / average_length)
+        return idf * frequency * (self.k1 + 1) / (frequency + normalization)
+
+    def open_terms(self, index: InvertedIndex, terms: List[str]) -> List[_TermScorer]:
+        """Opens the postings of the query terms found in the index
+
+        Args:
+            index (InvertedIndex): The index
+            terms (List[str]): The query terms
+
+        Returns:
+            List[_TermScorer]: The terms, sorted by the highest score they can add so the ones that can be skipped
+                come first
+        """
+        scorers: List[_TermScorer] = []
+        for term in dict.fromkeys(terms):
+            entry = index.find(term)
+            if entry is None:
+                continue
+            frequency = entry.document_frequency
+            idf = math.log(1 + (index.number_of_documents - frequency + 0.5) / (frequency + 0.5))
+            max_score = self.term_score(idf, entry.max_term_frequency, index.min_length, index.average_length or 1.0)
+            scorers.append(_TermScorer(index.cursor(entry), idf, max_score))
+
+        scorers.sort(key=lambda scorer: scorer.max_score)
+        return scorers
+
+    def score_document(
+        self,
+        index: InvertedIndex,
+        document: int,
+        scorers: List[_TermScorer],
+        essential: int,
+        bounds: List[float],
+        threshold: float,
+    ) -> float:
+        """Scores a document, moving the cursors of the essential terms past it
+
+        Args:
+            index (InvertedIndex): The index
+            document (int): The document number
+            scorers (List[_TermScorer]): The query terms
+            essential (int): The position of the first term whose postings are walked
+            bounds (List[float]): The highest score the terms up to every position can add together
+            threshold (float): The lowest score in the full heap, -inf until it is full
+
+        Returns:
+            float: The score, only a bound if it cannot go over the threshold
+        """
+        average_length = index.average_length or 1.0
+        _, length, rank = index.document(document)
+        score = self.rank_weight * math.log1p(rank)
+        for scorer in scorers[essential:]:
+            if scorer.cursor.document == document:
+                score += self.term_score(scorer.idf, scorer.cursor.frequency, length, average_length)
+                scorer.cursor.next()
+
+        # !Skipped terms are looked up for this document only while they can still lift it into the heap
+        for position in range(essential - 1, -1, -1):
+            if score + bounds[position] <= threshold:
+                break
+            cursor = scorers[position].cursor
+            if cursor.advance(document) == document:
+                score += self.term_score(scorers[position].idf, cursor.frequency, length, average_length)
+        return score
+
+    def top_documents(
+        self, index: InvertedIndex, terms: List[str], limit: int, early_termination: bool = True
+    ) -> Tuple[List[Tuple[float, int]], int]:
+        """Finds the best scoring documents for the terms
+
+        Args:
+            index (InvertedIndex): The index
+            terms (List[str]): The query terms
+            limit (int): Documents to return
+            early_termination (bool, optional): Whether documents that cannot make the top are skipped. Defaults to
+                True.
+
+        Returns:
+            Tuple[List[Tuple[float, int]], int]: The scores and document numbers, best first, and the number of
+                documents scored
+        """
+        scorers = self.open_terms(index, terms)
+        max_prior = self.rank_weight * math.log1p(index.max_rank)
+        bounds = list(accumulate(scorer.max_score for scorer in scorers))
+
+        heap: List[Tuple[float, int]] = []
+        threshold = -math.inf
+        essential = 0
+        documents_scored = 0
+
+        while essential < len(scorers):
+            document = min(scorer.cursor.document for scorer in scorers[essential:])
+            if document == NO_MORE_DOCUMENTS:
+                break
+
+            score = self.score_document(index, document, scorers, essential, bounds, threshold)
+            documents_scored += 1
+            if len(heap) < limit:
+                heapq.heappush(heap, (score, document))
+            elif score > heap[0][0]:
+                heapq.heapreplace(heap, (score, document))
+
+            # !Terms that cannot lift a document into the heap on their own stop being walked
+            if early_termination and len(heap) == limit:
+                threshold = heap[0][0]
+                while essential < len(scorers) and bounds[essential] + max_prior <= threshold:
+                    essential += 1
+
+        return sorted(heap, reverse=True), documents_scored
+
+    def fetch_hits(self, index: InvertedIndex, top: List[Tuple[float, int]]) -> List[SearchHit]:
+        """Gets the url and title of the best documents with one query
+
+        Args:
+            index (InvertedIndex): The index
+            top (List[Tuple[float, int]]): The scores and document numbers, best first
+
+        Returns:
+            List[SearchHit]: The pages, best first, without pages removed since the index was built
+        """
+        page_ids = [index.document(document)[0] for _, document in top]
+        pages = {
+            page["id"]: page for page in self.crawled.get({"id": {"$in": page_ids}}, fields=["id", "url", "title"])
+        }
+        return [
+            SearchHit(url=pages[page_id]["url"], title=pages[page_id]["title"], score=score)
+            for (score, _), page_id in zip(top, page_ids)
+            if page_id in pages
+        ]
+
+    def search(self, query: str, limit: int, early_termination: bool = True) -> SearchResponse:
+        """Searches the index and gets the url and title of the best pages
+
+        Args:
+            query (str): The query
+            limit (int): Pages to return
+            early_termination (bool, optional): Whether documents that cannot make the top are skipped. Defaults to
+                True.
+
+        Returns:
+            SearchResponse: The pages, best first, and where the time went
+        """
+        start = perf_counter()
+        terms = DEFAULT_TOKENIZER.tokenize(query)
+        index = self.get_index()
+
+        top: List[Tuple[float, int]] = []
+        documents_scored = 0
+        if index is not None and terms:
+            top, documents_scored = self.top_documents(index, terms, limit, early_termination)
+        index_done = perf_counter()
+
+        results = self.fetch_hits(index, top) if index is not None and top else []
+        done = perf_counter()
+
+        return SearchResponse(
+            query=query,
+            terms=terms,
+            results=results,
+            documents_scored=documents_scored,
+            timing=SearchTiming(
+                index_ms=(index_done - start) * 1000,
+                fetch_ms=(done - index_done) * 1000,
+                total_ms=(done - start) * 1000,
+            ),
+        )
@@ -11,7 +11,7 @@ from .constants import (
     TO_PARSE_DIRECTORY,
 )
 from .general import create_directory
-from .models import Crawled, Queue
+from .models import Crawled, FailedCrawled, Pause, Queue, Robots
 
 
 # !Setup fuction
@@ -21,6 +21,7 @@ def setup() -> _db.Database[_typing.Dict[str, _typing.Any]]:
 
     Does the following:
         - Connects to the database
+        - Creates the indexes of every collection.
         - Adds starting link if no other link in it.
         - Creates necessary folders.
     """
@@ -34,7 +35,11 @@ def setup() -> _db.Database[_typing.Dict[str, _typing.Any]]:
     queue = Queue(db)
     crawled = Crawled(db)
 
-    if len(crawled.get()) == 0 and len(queue.get()) == 0:
+    # !Indexes keep lookups off collection scans and make the unique urls safe against concurrent inserts
+    for collection in (queue, crawled, Pause(db), FailedCrawled(db), Robots(db)):
+        collection.create_indexes()
+
+    if not crawled.is_exist({}) and not queue.is_exist({}):
         queue.add(DEFAULT_STARTING_LINK)
 
     return db
@@ -0,0 +1,6 @@
+from .content_store import ContentStore
+from .create_content_store import create_content_store
+from .file_store import FileStore
+from .segment_store import SegmentStore
+
+__all__ = ["ContentStore", "FileStore", "SegmentStore", "create_content_store"]
@@ -0,0 +1,89 @@
+import zlib
+from typing import Dict, Iterable, Iterator
+
+from .constants import CONTENT_COMPRESSION_LEVEL
+
+try:
+    import zstandard as _zstandard
+except ImportError:  # pragma: no cover - zstd is optional
+    _zstandard = None
+
+# !Codec ids stored next to every compressed body
+CODECS: Dict[str, int] = {"none": 0, "zlib": 1, "zstd": 2}
+
+
+def check_codec(codec: str) -> None:
+    """Checks that the codec can be used
+
+    Args:
+        codec (str): "none", "zlib" or "zstd"
+
+    Raises:
+        ValueError: If the codec is unknown or zstd is not installed
+    """
+    if codec not in CODECS:
+        raise ValueError(f"Unknown compression {codec}, use one of {', '.join(CODECS)}")
+    if codec == "zstd" and _zstandard is None:
+        raise ValueError("zstd compression needs the zstandard package")
+
+
+def compress(content: str, codec: str, level: int = CONTENT_COMPRESSION_LEVEL) -> bytes:
+    """Encodes and compresses a page body
+
+    Args:
+        content (str): The page body
+        codec (str): "none", "zlib" or "zstd"
+        level (int, optional): The compression level. Defaults to CONTENT_COMPRESSION_LEVEL.
+
+    Returns:
+        bytes: The compressed body
+    """
+    data = content.encode("utf8")
+    if codec == "zlib":
+        return zlib.compress(data, level)
+    if codec == "zstd" and _zstandard is not None:
+        return _zstandard.ZstdCompressor(level=level).compress(data)
+    return data
+
+
+def compress_stream(chunks: Iterable[str], codec: str, level: int = CONTENT_COMPRESSION_LEVEL) -> Iterator[bytes]:
+    """Encodes and compresses a page body piece by piece, without holding all of it
+
+    Args:
+        chunks (Iterable[str]): The pieces of the page body
+        codec (str): "none", "zlib" or "zstd"
+        level (int, optional): The compression level. Defaults to CONTENT_COMPRESSION_LEVEL.
+
+    Returns:
+        Iterator[bytes]: The compressed body, in pieces
+    """
+    compressor = None
+    if codec == "zlib":
+        compressor = zlib.compressobj(level)
+    elif codec == "zstd" and _zstandard is not None:
+        compressor = _zstandard.ZstdCompressor(level=level).compressobj()
+
+    for chunk in chunks:
+        data = chunk.encode("utf8")
+        yield data if compressor is None else compressor.compress(data)
+    if compressor is not None:
+        yield compressor.flush()
+
+
+def decompress(data: bytes, codec: str) -> str:
+    """Decompresses and decodes a page body
+
+    Args:
+        data (bytes): The compressed body
+        codec (str): The codec it was compressed with
+
+    Returns:
+        str: The page body
+    """
+    if codec == "zlib":
+        data = zlib.decompress(data)
+    elif codec == "zstd":
+        check_codec(codec)
+        # !Streamed frames don't record their size, which the one-shot decompress needs
+        data = _zstandard.ZstdDecompressor().decompressobj().decompress(data)
+    return data.decode("utf8")
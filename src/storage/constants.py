@@ -0,0 +1,7 @@
+CONTENT_STORE_KIND: str = "files"
+CONTENT_COMPRESSION: str = "zlib"
+CONTENT_COMPRESSION_LEVEL: int = 6
+CONTENT_SHARD_DEPTH: int = 2
+CONTENT_KEY_LENGTH: int = 13
+SEGMENT_MAX_BYTES: int = 256 * 1024 * 1024
+SEGMENT_MIN_LIVE_RATIO: float = 0.5
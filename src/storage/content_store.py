@@ -0,0 +1,73 @@
+import secrets
+from abc import ABC, abstractmethod
+from typing import Iterable, Iterator
+
+from .constants import CONTENT_KEY_LENGTH
+
+
+# !Content store
+class ContentStore(ABC):
+    """Storage for downloaded pages waiting to be parsed, the crawler puts pages in and the parser takes them out"""
+
+    @abstractmethod
+    def put(self, content: str) -> str:
+        """Stores a page
+
+        Args:
+            content (str): The page body
+
+        Returns:
+            str: The key of the page, stored as file_name in the crawled collection
+        """
+
+    def put_stream(self, chunks: Iterable[str]) -> str:
+        """Stores a page that arrives in pieces, stores that can write it as it comes override this
+
+        Args:
+            chunks (Iterable[str]): The pieces of the page body
+
+        Returns:
+            str: The key of the page, stored as file_name in the crawled collection
+        """
+        return self.put("".join(chunks))
+
+    @abstractmethod
+    def get(self, key: str) -> str:
+        """Reads a page
+
+        Args:
+            key (str): The key of the page
+
+        Returns:
+            str: The page body
+
+        Raises:
+            KeyError: If there is no page with the key
+        """
+
+    @abstractmethod
+    def delete(self, key: str) -> None:
+        """Removes a page once it is parsed
+
+        Args:
+            key (str): The key of the page
+        """
+
+    @abstractmethod
+    def keys(self) -> Iterator[str]:
+        """Gets the keys of every stored page"""
+
+    @abstractmethod
+    def __contains__(self, key: object) -> bool:
+        """Checks if a page is stored
+
+        Args:
+            key (object): The key of the page
+        """
+
+    def new_key(self) -> str:
+        """Gets a random key that is not used yet"""
+        while True:
+            key = secrets.token_urlsafe(10)[:CONTENT_KEY_LENGTH]
+            if key not in self:
+                return key
@@ -0,0 +1,28 @@
+from .constants import CONTENT_COMPRESSION, CONTENT_STORE_KIND
+from .content_store import ContentStore
+from .file_store import FileStore
+from .segment_store import SegmentStore
+
+
+def create_content_store(
+    directory: str, kind: str = CONTENT_STORE_KIND, compression: str = CONTENT_COMPRESSION
+) -> ContentStore:
+    """Creates the content store configured for the project
+
+    Args:
+        directory (str): The directory the pages are stored in
+        kind (str, optional): "files" for a file per page or "segments" for append-only segment files. Defaults to
+            CONTENT_STORE_KIND.
+        compression (str, optional): "none", "zlib" or "zstd". Defaults to CONTENT_COMPRESSION.
+
+    Returns:
+        ContentStore: The content store
+
+    Raises:
+        ValueError: If the kind is unknown
+    """
+    if kind == "files":
+        return FileStore(directory, compression)
+    if kind == "segments":
+        return SegmentStore(directory, compression)
+    raise ValueError(f"Unknown content store {kind}, use files or segments")
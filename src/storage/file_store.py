@@ -0,0 +1,152 @@
+import hashlib
+import os
+from typing import Dict, Iterable, Iterator
+
+from .compression import check_codec, compress_stream, decompress
+from .constants import CONTENT_COMPRESSION, CONTENT_SHARD_DEPTH
+from .content_store import ContentStore
+
+# !File extension of the pages of each codec
+EXTENSIONS: Dict[str, str] = {"none": ".html", "zlib": ".html.z", "zstd": ".html.zst"}
+
+
+# !File per page content store
+class FileStore(ContentStore):
+    """
+    Stores every page in its own compressed file, sharded into nested directories by a hash prefix of its key so no
+    directory grows past a few thousand entries.
+
+    Pages saved as flat .html files in the directory by older versions are still read, listed and deleted.
+    """
+
+    def __init__(
+        self, directory: str, compression: str = CONTENT_COMPRESSION, shard_depth: int = CONTENT_SHARD_DEPTH
+    ) -> None:
+        """Initializes the store
+
+        Args:
+            directory (str): The directory the pages are stored in
+            compression (str, optional): "none", "zlib" or "zstd". Defaults to CONTENT_COMPRESSION.
+            shard_depth (int, optional): Levels of 256 directories the pages are spread over. Defaults to
+                CONTENT_SHARD_DEPTH.
+        """
+        check_codec(compression)
+        self.directory = directory
+        self.compression = compression
+        self.shard_depth = shard_depth
+
+    def put(self, content: str) -> str:
+        """Stores a page
+
+        Args:
+            content (str): The page body
+
+        Returns:
+            str: The key of the page
+        """
+        return self.put_stream((content,))
+
+    def put_stream(self, chunks: Iterable[str]) -> str:
+        """Stores a page that arrives in pieces, compressing and writing each piece as it comes
+
+        Args:
+            chunks (Iterable[str]): The pieces of the page body
+
+        Returns:
+            str: The key of the page
+        """
+        key = self.new_key()
+        path = self.get_path(key, self.compression)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+
+        # !Written under a temporary name so the parser never reads a half written page
+        try:
+            with open(f"{path}.tmp", "wb") as file:
+                for data in compress_stream(chunks, self.compression):
+                    file.write(data)
+        except BaseException:
+            # !The pieces may stop coming, a body that grew too large or a dropped connection leaves no file behind
+            os.remove(f"{path}.tmp")
+            raise
+        os.replace(f"{path}.tmp", path)
+
+        return key
+
+    def get(self, key: str) -> str:
+        """Reads a page
+
+        Args:
+            key (str): The key of the page
+
+        Returns:
+            str: The page body
+
+        Raises:
+            KeyError: If there is no page with the key
+        """
+        for codec, path in self.get_paths(key):
+            try:
+                with open(path, "rb") as file:
+                    return decompress(file.read(), codec)
+            except FileNotFoundError:
+                continue
+
+        raise KeyError(key)
+
+    def delete(self, key: str) -> None:
+        """Removes a page
+
+        Args:
+            key (str): The key of the page
+        """
+        for _, path in self.get_paths(key):
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                pass
+
+    def keys(self) -> Iterator[str]:
+        """Gets the keys of every stored page, walking the shards lazily"""
+        for _, _, file_names in os.walk(self.directory):
+            for file_name in file_names:
+                for extension in EXTENSIONS.values():
+                    if file_name.endswith(extension):
+                        yield file_name.removesuffix(extension)
+                        break
+
+    def __contains__(self, key: object) -> bool:
+        """Checks if a page is stored
+
+        Args:
+            key (object): The key of the page
+        """
+        return isinstance(key, str) and any(os.path.exists(path) for _, path in self.get_paths(key))
+
+    def get_path(self, key: str, codec: str) -> str:
+        """Gets the path of a page in its shard
+
+        Args:
+            key (str): The key of the page
+            codec (str): The codec the page is compressed with
+
+        Returns:
+            str: The path of the page
+        """
+        digest = hashlib.blake2b(key.encode("utf8"), digest_size=self.shard_depth or 1).hexdigest()
+        shards = [digest[index * 2 : index * 2 + 2] for index in range(self.shard_depth)]
+        return os.path.join(self.directory, *shards, f"{key}{EXTENSIONS[codec]}")
+
+    def get_paths(self, key: str) -> Iterator[tuple[str, str]]:
+        """Gets every path a page may be at, the configured codec first
+
+        Args:
+            key (str): The key of the page
+
+        Returns:
+            Iterator[tuple[str, str]]: The codecs and paths
+        """
+        yield self.compression, self.get_path(key, self.compression)
+        for codec in EXTENSIONS:
+            if codec != self.compression:
+                yield codec, self.get_path(key, codec)
+        yield "none", os.path.join(self.directory, f"{key}{EXTENSIONS['none']}")
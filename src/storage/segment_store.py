@@ -0,0 +1,354 @@
+import mmap
+import os
+import struct
+import threading
+import zlib
+from dataclasses import dataclass, field
+from typing import BinaryIO, Dict, Iterable, Iterator, Set, Tuple
+
+from .compression import CODECS, check_codec, compress_stream, decompress
+from .constants import CONTENT_COMPRESSION, SEGMENT_MAX_BYTES, SEGMENT_MIN_LIVE_RATIO
+from .content_store import ContentStore
+
+# !Header of a record: magic, codec, is deletion, key length, body length, crc32 of the body
+RECORD_HEADER = struct.Struct("<4sBBIII")
+RECORD_MAGIC = b"FGSR"
+SEGMENT_EXTENSION = ".seg"
+CODEC_NAMES = {codec_id: codec for codec, codec_id in CODECS.items()}
+
+# !A record read from a segment: the key, codec name, whether it is a deletion, offset and length of the body
+Record = Tuple[str, str, bool, int, int]
+
+
+@dataclass
+class _Segment:
+    """An append-only segment file and its read-only memory map"""
+
+    path: str
+    size: int = 0
+    live_records: int = 0
+    live_bytes: int = 0
+    # !Keys of deleted pages whose records are still in the segment
+    deleted_keys: Set[str] = field(default_factory=set)
+    view: mmap.mmap | None = None
+
+    def map(self, end: int) -> mmap.mmap:
+        """Gets a memory map covering the file up to end, remapping once the file grew past the current map
+
+        Args:
+            end (int): The offset the map has to reach
+
+        Returns:
+            mmap.mmap: The memory map
+        """
+        if self.view is None or len(self.view) < end:
+            self.close()
+            with open(self.path, "rb") as file:
+                self.view = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+        return self.view
+
+    def close(self) -> None:
+        """Closes the memory map"""
+        if self.view is not None:
+            self.view.close()
+            self.view = None
+
+    def records(self) -> Iterator[Record]:
+        """Reads the records of the segment up to a torn or corrupt one. size is left at the end of the last good one.
+
+        Returns:
+            Iterator[Record]: The records
+        """
+        end = os.path.getsize(self.path)
+        # !Empty files can not be mapped
+        data = self.map(end) if end else b""
+
+        self.size = 0
+        while self.size + RECORD_HEADER.size <= end:
+            magic, codec, is_deletion, key_length, length, checksum = RECORD_HEADER.unpack_from(data, self.size)
+            start = self.size + RECORD_HEADER.size + key_length
+            if magic != RECORD_MAGIC or start + length > end:
+                return
+            if zlib.crc32(data[start : start + length]) != checksum:
+                return
+
+            key = data[self.size + RECORD_HEADER.size : start].decode("utf8")
+            self.size = start + length
+            yield key, CODEC_NAMES[codec], bool(is_deletion), start, length
+
+
+def get_record_size(key: str, length: int) -> int:
+    """Gets the bytes a record takes up in its segment
+
+    Args:
+        key (str): The key of the page
+        length (int): The length of the body
+
+    Returns:
+        int: The size of the header, key and body
+    """
+    return RECORD_HEADER.size + len(key.encode("utf8")) + length
+
+
+# !Segment file content store
+class SegmentStore(ContentStore):  # pylint: disable=too-many-instance-attributes
+    """
+    Packs compressed pages into append-only segment files, like WARC files, with an in-memory offset index.
+
+    Each record holds its key, codec and a checksum, so the index is rebuilt by scanning the segments on start and a
+    torn write at the end of a segment is cut off. Deleting a page appends a deletion record. Once no more than
+    min_live_ratio of a segment is left, its remaining pages and the deletion records still needed are copied to the
+    active segment and the file is removed. Pages are read through memory maps, without copying whole segments.
+    """
+
+    def __init__(
+        self,
+        directory: str,
+        compression: str = CONTENT_COMPRESSION,
+        max_segment_bytes: int = SEGMENT_MAX_BYTES,
+        min_live_ratio: float = SEGMENT_MIN_LIVE_RATIO,
+    ) -> None:
+        """Opens the store, indexing the existing segments
+
+        Args:
+            directory (str): The directory the segments are stored in
+            compression (str, optional): "none", "zlib" or "zstd". Defaults to CONTENT_COMPRESSION.
+            max_segment_bytes (int, optional): Size after which a new segment is started. Defaults to
+                SEGMENT_MAX_BYTES.
+            min_live_ratio (float, optional): Share of a segment taken up by stored pages at or below which it is
+                compacted. Defaults to SEGMENT_MIN_LIVE_RATIO.
+        """
+        check_codec(compression)
+        self.directory = directory
+        self.compression = compression
+        self.max_segment_bytes = max_segment_bytes
+        self.min_live_ratio = min_live_ratio
+        self.lock = threading.Lock()
+        self.segments: Dict[int, _Segment] = {}
+
+        # !Key to segment number, offset and length of the body
+        self.index: Dict[str, Tuple[int, int, int, str]] = {}
+
+        # !Key of a deleted page to the oldest segment still holding one of its records, so the deletion records
+        # !that keep it from coming back are copied while that segment exists
+        self.deleted: Dict[str, int] = {}
+
+        os.makedirs(directory, exist_ok=True)
+        for file_name in sorted(os.listdir(directory)):
+            if file_name.endswith(SEGMENT_EXTENSION):
+                self.load_segment(int(file_name.removesuffix(SEGMENT_EXTENSION)))
+
+        self.active_number = max(self.segments, default=0)
+        self.active_file = self.open_segment(self.active_number)
+        self.compact_segments()
+
+    def put(self, content: str) -> str:
+        """Stores a page
+
+        Args:
+            content (str): The page body
+
+        Returns:
+            str: The key of the page
+        """
+        return self.put_stream((content,))
+
+    def put_stream(self, chunks: Iterable[str]) -> str:
+        """Stores a page that arrives in pieces, compressing each piece as it comes
+
+        Args:
+            chunks (Iterable[str]): The pieces of the page body
+
+        Returns:
+            str: The key of the page
+        """
+        # !A record is written with its length and checksum up front, so only the compressed body is held until then
+        body = b"".join(compress_stream(chunks, self.compression))
+
+        with self.lock:
+            key = self.new_key()
+            self.add_page(key, body, self.compression)
+            self.compact_segments()
+
+        return key
+
+    def get(self, key: str) -> str:
+        """Reads a page from the memory map of its segment
+
+        Args:
+            key (str): The key of the page
+
+        Returns:
+            str: The page body
+
+        Raises:
+            KeyError: If there is no page with the key
+        """
+        with self.lock:
+            number, offset, length, codec = self.index[key]
+            body = self.segments[number].map(offset + length)[offset : offset + length]
+
+        return decompress(body, codec)
+
+    def delete(self, key: str) -> None:
+        """Removes a page, and compacts its segment once most of it is deleted
+
+        Args:
+            key (str): The key of the page
+        """
+        with self.lock:
+            if (entry := self.index.pop(key, None)) is None:
+                return
+
+            self.append(key, b"", True, self.compression)
+            self.forget_record(key, entry)
+            self.compact_segments()
+
+    def keys(self) -> Iterator[str]:
+        """Gets the keys of every stored page, oldest first"""
+        with self.lock:
+            return iter(list(self.index))
+
+    def __contains__(self, key: object) -> bool:
+        """Checks if a page is stored
+
+        Args:
+            key (object): The key of the page
+        """
+        return key in self.index
+
+    def open_segment(self, number: int) -> BinaryIO:
+        """Opens a segment for appending
+
+        Args:
+            number (int): The number of the segment
+
+        Returns:
+            BinaryIO: The segment file
+        """
+        segment = self.segments.setdefault(number, _Segment(self.get_segment_path(number)))
+        file = open(segment.path, "ab")  # pylint: disable=consider-using-with
+        segment.size = file.tell()
+        return file
+
+    def add_page(self, key: str, body: bytes, codec: str) -> None:
+        """Appends a page to the active segment and indexes it, starting a new segment once the active one is full.
+        The caller must hold the lock.
+
+        Args:
+            key (str): The key of the page
+            body (bytes): The compressed body
+            codec (str): The codec the body is compressed with
+        """
+        if self.segments[self.active_number].size >= self.max_segment_bytes:
+            self.active_file.close()
+            self.active_number += 1
+            self.active_file = self.open_segment(self.active_number)
+
+        offset = self.append(key, body, False, codec)
+        self.index[key] = (self.active_number, offset, len(body), codec)
+        segment = self.segments[self.active_number]
+        segment.live_records += 1
+        segment.live_bytes += get_record_size(key, len(body))
+
+    def append(self, key: str, body: bytes, is_deletion: bool, codec: str) -> int:
+        """Appends a record to the active segment. The caller must hold the lock.
+
+        Args:
+            key (str): The key of the page
+            body (bytes): The compressed body, empty for deletions
+            is_deletion (bool): Whether the record deletes the page
+            codec (str): The codec the body is compressed with
+
+        Returns:
+            int: The offset of the body in the segment
+        """
+        encoded_key = key.encode("utf8")
+        header = RECORD_HEADER.pack(
+            RECORD_MAGIC, CODECS[codec], is_deletion, len(encoded_key), len(body), zlib.crc32(body)
+        )
+
+        segment = self.segments[self.active_number]
+        self.active_file.write(header + encoded_key + body)
+        self.active_file.flush()
+
+        offset = segment.size + RECORD_HEADER.size + len(encoded_key)
+        segment.size += RECORD_HEADER.size + len(encoded_key) + len(body)
+        return offset
+
+    def forget_record(self, key: str, entry: Tuple[int, int, int, str]) -> None:
+        """Counts the record of a page that was deleted or stored again as dead. The caller must hold the lock.
+
+        Args:
+            key (str): The key of the page
+            entry (Tuple[int, int, int, str]): Its entry in the index
+        """
+        segment = self.segments[entry[0]]
+        segment.live_records -= 1
+        segment.live_bytes -= get_record_size(key, entry[2])
+        segment.deleted_keys.add(key)
+        self.deleted.setdefault(key, entry[0])
+
+    def load_segment(self, number: int) -> None:
+        """Adds the records of a segment to the index through a memory map, cutting off a torn record at its end
+
+        Args:
+            number (int): The number of the segment
+        """
+        segment = self.segments[number] = _Segment(self.get_segment_path(number))
+        for key, codec, is_deletion, start, length in segment.records():
+            # !A page copied out of a compacted segment that was not yet removed is in both of them
+            if (entry := self.index.pop(key, None)) is not None:
+                self.forget_record(key, entry)
+            if not is_deletion:
+                self.index[key] = (number, start, length, codec)
+                segment.live_records += 1
+                segment.live_bytes += get_record_size(key, length)
+
+        if segment.size < os.path.getsize(segment.path):
+            # !The map is closed first, pages past the end of a truncated file can not be read through it
+            segment.close()
+            with open(segment.path, "r+b") as file:
+                file.truncate(segment.size)
+
+    def compact_segments(self) -> None:
+        """Compacts every segment but the active one once no more than min_live_ratio of it is left. The caller must
+        hold the lock."""
+        for number in sorted(self.segments):
+            segment = self.segments[number]
+            if number != self.active_number and segment.live_bytes <= segment.size * self.min_live_ratio:
+                self.compact_segment(number)
+
+    def compact_segment(self, number: int) -> None:
+        """Copies the pages left in a segment and the deletion records still needed to the active segment, then
+        removes it. The caller must hold the lock.
+
+        Args:
+            number (int): The number of the segment
+        """
+        segment = self.segments[number]
+        for key, codec, is_deletion, start, length in segment.records():
+            if is_deletion:
+                # !Needed while an older segment still holds the page, otherwise it comes back on the next start
+                if self.deleted.get(key, number) != number and self.deleted[key] in self.segments:
+                    self.append(key, b"", True, self.compression)
+            elif self.index.get(key, (None, None))[:2] == (number, start):
+                self.add_page(key, bytes(segment.map(start + length)[start : start + length]), codec)
+
+        del self.segments[number]
+        segment.close()
+        os.remove(segment.path)
+        for key in segment.deleted_keys:
+            if self.deleted.get(key) == number:
+                del self.deleted[key]
+
+    def get_segment_path(self, number: int) -> str:
+        """Gets the path of a segment
+
+        Args:
+            number (int): The number of the segment
+
+        Returns:
+            str: The path of the segment
+        """
+        return os.path.join(self.directory, f"{number:08d}{SEGMENT_EXTENSION}")